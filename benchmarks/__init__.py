@@ -0,0 +1 @@
+# Módulo benchmarks - Mediciones de rendimiento con datos sintéticos
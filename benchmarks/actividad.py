@@ -0,0 +1,265 @@
+"""
+Generador y reproductor de actividad para el sistema de turnos (sin interfaz).
+Genera un día realista de actividad (búsquedas, reservas, cancelaciones, atenciones,
+ausencias, cambios de monto y consultas) sobre datos sintéticos, y reproduce trazas
+generadas o grabadas (ver sistema_turnos.traza) contra el servicio de turnos, que usa
+las funciones de logica/ y utils/filtros.py. Informa operaciones por segundo y
+percentiles de latencia por operación.
+
+Uso:
+    python -m benchmarks.actividad generar --eventos 20000 --reservas 10000 --turnos 20000 --salida dia.jsonl
+    python -m benchmarks.actividad reproducir --traza dia.jsonl --velocidad 600 --motor bitacora
+    python -m benchmarks.actividad reproducir --traza grabada.jsonl --datos copia_de_los_datos/
+    python -m benchmarks.actividad simular --eventos 50000          # generar y reproducir en un paso
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+from benchmarks.datos_sinteticos import (
+    APELLIDOS, NOMBRES_CLIENTES, PRECIOS, SERVICIOS, generar_datos, profesionales_para
+)
+from sistema_turnos.datos import persistencia
+from sistema_turnos.datos.persistencia import MOTORES
+from sistema_turnos.servicio import ServicioTurnos, cargar_datos
+from sistema_turnos.traza import escribir_traza, leer_traza
+from sistema_turnos.utils.claves import id_registro
+from sistema_turnos.utils.metricas import formatear_resumen, resumir_latencias
+
+# Proporción de cada operación en un día típico
+MEZCLA = {
+    "filtrar_turnos": 0.45,
+    "reservar": 0.18,
+    "reservas_de": 0.10,
+    "cancelar": 0.04,
+    "marcar_como_atendida": 0.11,
+    "marcar_como_no_asistio": 0.02,
+    "cambiar_monto_cobrado": 0.04,
+    "reservas_pendientes": 0.04,
+    "estadisticas": 0.02
+}
+# Peso de cada hora del día (de 9 a 20): más actividad a media mañana y a la tarde
+PESOS_HORARIOS = (4, 8, 10, 9, 6, 5, 7, 9, 10, 8, 4)
+INICIO_JORNADA = 9 * 3600
+
+def _momentos(cantidad, azar):
+    """
+    Momentos de llegada (segundos desde las 00:00) repartidos según PESOS_HORARIOS, ordenados.
+    """
+    horas = azar.choices(range(len(PESOS_HORARIOS)), weights=PESOS_HORARIOS, k=cantidad)
+    return sorted(INICIO_JORNADA + hora * 3600 + azar.random() * 3600 for hora in horas)
+
+class _Conjunto:
+    """
+    Conjunto con elección al azar en tiempo constante (para simular el estado al generar).
+    """
+
+    def __init__(self, elementos=()):
+        self.elementos = list(elementos)
+
+    def __len__(self):
+        return len(self.elementos)
+
+    def agregar(self, elemento):
+        self.elementos.append(elemento)
+
+    def elegir(self, azar):
+        return self.elementos[azar.randrange(len(self.elementos))]
+
+    def sacar(self, azar):
+        posicion = azar.randrange(len(self.elementos))
+        self.elementos[posicion], self.elementos[-1] = self.elementos[-1], self.elementos[posicion]
+        return self.elementos.pop()
+
+def generar_actividad(turnos, reservas, cantidad, semilla=1234):
+    """
+    Genera los eventos de un día sobre esos turnos y reservas, en orden de llegada.
+    Lleva el estado simulado para que cada evento tenga sentido: se reservan turnos
+    libres, se cancelan y atienden reservas pendientes, se cobra lo ya atendido.
+    FUNCIONALIDAD: Simular un día de actividad realista sin la interfaz
+    """
+    azar = random.Random(semilla)
+    profesionales = sorted({t["profesional"] for t in turnos} or profesionales_para(len(reservas)))
+    libres = _Conjunto(turnos)
+    pendientes = _Conjunto(r for r in reservas if r["estado"] == "Pendiente")
+    atendidas = _Conjunto(r for r in reservas if r["estado"] == "Atendida")
+    documentos = _Conjunto(r["documento"] for r in reservas)
+    siguiente_documento = 50_000_000
+
+    operaciones = list(MEZCLA)
+    pesos = list(MEZCLA.values())
+    eventos = []
+    for momento in _momentos(cantidad, azar):
+        operacion = azar.choices(operaciones, weights=pesos)[0]
+        parametros = None
+
+        if operacion == "filtrar_turnos":
+            parametros = {
+                "servicio": azar.choice(SERVICIOS + (None,)),
+                "profesional": azar.choice(profesionales) if azar.random() < 0.7 else None
+            }
+        elif operacion == "reservar" and libres:
+            siguiente_documento += 1
+            turno = libres.sacar(azar)
+            reserva = {
+                "nombre": f"{azar.choice(NOMBRES_CLIENTES)} {azar.choice(APELLIDOS)}",
+                "telefono": f"11{azar.randrange(10 ** 8):08d}",
+                "documento": str(siguiente_documento),
+                "turno": turno
+            }
+            pendientes.agregar(dict(reserva, estado="Pendiente"))
+            documentos.agregar(reserva["documento"])
+            parametros = reserva
+        elif operacion == "reservas_de" and documentos:
+            parametros = {"documento": documentos.elegir(azar)}
+        elif operacion == "cancelar" and pendientes:
+            reserva = pendientes.sacar(azar)
+            libres.agregar(reserva["turno"])
+            parametros = {"documento": reserva["documento"], "turno": reserva["turno"]}
+        elif operacion in ("marcar_como_atendida", "marcar_como_no_asistio") and pendientes:
+            reserva = pendientes.sacar(azar)
+            if operacion == "marcar_como_atendida":
+                atendidas.agregar(reserva)
+            parametros = {"reserva": id_registro("reservas", dict(reserva))}
+        elif operacion == "cambiar_monto_cobrado" and atendidas:
+            reserva = atendidas.elegir(azar)
+            monto = float(round(PRECIOS.get(reserva["turno"]["servicio"], 10000) * azar.uniform(0.9, 1.2), -2))
+            parametros = {"reserva": id_registro("reservas", dict(reserva)), "monto": monto}
+        elif operacion in ("reservas_pendientes", "estadisticas"):
+            parametros = {}
+
+        if parametros is not None:
+            eventos.append({"t": round(momento - INICIO_JORNADA, 3), "operacion": operacion, "parametros": parametros})
+    return eventos
+
+@contextmanager
+def datos_de_prueba(cabecera, motor="json", directorio_datos=None):
+    """
+    Prepara un directorio temporal con los datos iniciales de una traza y configura
+    el almacenamiento ahí. Devuelve el servicio de turnos listo para reproducir.
+    Con directorio_datos se copian esos turnos.json y reservas.json (trazas grabadas);
+    si no, se regeneran los datos sintéticos indicados en la cabecera.
+    """
+    with tempfile.TemporaryDirectory() as directorio:
+        if directorio_datos is not None:
+            for nombre in ("turnos.json", "reservas.json"):
+                origen = os.path.join(directorio_datos, nombre)
+                if os.path.exists(origen):
+                    shutil.copy(origen, directorio)
+            persistencia.configurar_almacenamiento(motor, directorio=directorio)
+            # Los datos se leen del directorio temporal; la agenda (si hay) se busca en el actual
+            turnos, reservas = cargar_datos()
+        else:
+            sinteticos = (cabecera or {}).get("sinteticos")
+            if sinteticos is None:
+                raise ValueError("La traza no indica sus datos sintéticos: indique el directorio de datos")
+            turnos, reservas = generar_datos(sinteticos["reservas"], sinteticos["turnos"], sinteticos["semilla"])
+            persistencia.configurar_almacenamiento(motor, directorio=directorio)
+            persistencia.guardar_turnos(turnos)
+            persistencia.guardar_reservas(reservas)
+        try:
+            yield ServicioTurnos(turnos, reservas)
+        finally:
+            persistencia.configurar_almacenamiento("json")
+
+def reproducir(eventos, servicio, velocidad=None):
+    """
+    Ejecuta los eventos contra el servicio. Con velocidad (por ejemplo 600: diez minutos
+    de la traza por segundo) respeta los tiempos entre eventos; sin velocidad los ejecuta
+    lo más rápido posible. Devuelve el resumen de latencias por operación, más "total",
+    "fallidas" (operaciones rechazadas) y "atraso_maximo_ms" (cuánto se atrasó respecto
+    de la traza, si no dio abasto).
+    FUNCIONALIDAD: Medir rendimiento y latencia reproduciendo actividad real o simulada
+    """
+    latencias = {}
+    fallidas = {}
+    atraso_maximo = 0.0
+    inicio = time.perf_counter()
+    primero = eventos[0]["t"] if eventos else 0.0
+    for evento in eventos:
+        if velocidad:
+            programado = inicio + (evento["t"] - primero) / velocidad
+            espera = programado - time.perf_counter()
+            if espera > 0:
+                time.sleep(espera)
+            else:
+                atraso_maximo = max(atraso_maximo, -espera)
+
+        operacion = evento["operacion"]
+        comienzo = time.perf_counter()
+        resultado = getattr(servicio, operacion)(**evento["parametros"])
+        latencias.setdefault(operacion, []).append(time.perf_counter() - comienzo)
+        if isinstance(resultado, dict) and resultado.get("exito") is False:
+            fallidas[operacion] = fallidas.get(operacion, 0) + 1
+    persistencia.vaciar_escrituras()
+    duracion = time.perf_counter() - inicio
+
+    resumen = {nombre: resumir_latencias(valores, duracion) for nombre, valores in sorted(latencias.items())}
+    resumen["total"] = resumir_latencias(sum(latencias.values(), []), duracion)
+    resumen["fallidas"] = fallidas
+    resumen["atraso_maximo_ms"] = atraso_maximo * 1000
+    return resumen
+
+def _informar(resumen):
+    for nombre, datos in resumen.items():
+        if isinstance(datos, dict) and "operaciones" in datos:
+            print(formatear_resumen(nombre, datos))
+    if resumen["fallidas"]:
+        print("Rechazadas: " + ", ".join(f"{nombre}={cantidad}" for nombre, cantidad in resumen["fallidas"].items()))
+    print(f"Atraso máximo respecto de la traza: {resumen['atraso_maximo_ms']:.1f}ms")
+
+def main(argumentos=None):
+    """
+    Punto de entrada de línea de comandos: generar, reproducir o simular.
+    """
+    parser = argparse.ArgumentParser(description="Actividad sintética y reproducción de trazas")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    for nombre in ("generar", "simular"):
+        sub = subcomandos.add_parser(nombre)
+        sub.add_argument("--eventos", type=int, default=20000)
+        sub.add_argument("--reservas", type=int, default=10000, help="reservas existentes al empezar el día")
+        sub.add_argument("--turnos", type=int, default=20000, help="turnos libres al empezar el día")
+        sub.add_argument("--semilla", type=int, default=1234)
+    subcomandos.choices["generar"].add_argument("--salida", required=True)
+
+    reproducir_parser = subcomandos.add_parser("reproducir")
+    reproducir_parser.add_argument("--traza", required=True)
+    reproducir_parser.add_argument("--datos", help="directorio con los datos iniciales (trazas grabadas)")
+    for sub in (reproducir_parser, subcomandos.choices["simular"]):
+        sub.add_argument("--velocidad", type=float, help="aceleración respecto del tiempo real (por defecto, sin esperas)")
+        sub.add_argument("--motor", choices=sorted(MOTORES), default="json")
+        sub.add_argument("--json", action="store_true", help="imprimir el resumen como JSON")
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.comando in ("generar", "simular"):
+        cabecera = {"sinteticos": {"reservas": opciones.reservas, "turnos": opciones.turnos, "semilla": opciones.semilla}}
+        turnos, reservas = generar_datos(opciones.reservas, opciones.turnos, opciones.semilla)
+        eventos = generar_actividad(turnos, reservas, opciones.eventos, opciones.semilla)
+        if opciones.comando == "generar":
+            escribir_traza(opciones.salida, eventos, cabecera)
+            print(f"{len(eventos)} eventos escritos en {opciones.salida}")
+            return
+        datos = None
+    else:
+        cabecera, eventos = leer_traza(opciones.traza)
+        datos = opciones.datos
+
+    with datos_de_prueba(cabecera, opciones.motor, datos) as servicio:
+        resumen = reproducir(eventos, servicio, opciones.velocidad)
+    if opciones.json:
+        print(json.dumps(resumen, ensure_ascii=False, indent=4))
+    else:
+        _informar(resumen)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Generador de datos sintéticos para los benchmarks.
+Crea turnos disponibles y reservas con profesionales, servicios, horarios,
+DNIs, teléfonos, estados y montos realistas. Con la misma semilla los datos son
+siempre los mismos, así las mediciones se pueden comparar entre corridas.
+
+Uso:
+    python -m benchmarks.datos_sinteticos --reservas 100000 --turnos 20000 --directorio /tmp/datos
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+from datetime import date, timedelta
+
+NOMBRES_PROFESIONALES = (
+    "Gisela", "Marisol", "Valentina", "Camila", "Lucía", "Florencia",
+    "Agustina", "Sofía", "Julieta", "Carolina", "Micaela", "Romina"
+)
+NOMBRES_CLIENTES = (
+    "Ana", "María", "Laura", "Paula", "Daniela", "Natalia", "Victoria", "Martina",
+    "Belén", "Rocío", "Milagros", "Antonella", "Lorena", "Silvina", "Gabriela", "Andrea"
+)
+APELLIDOS = (
+    "González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez",
+    "Pérez", "García", "Sánchez", "Romero", "Sosa", "Torres", "Álvarez", "Ruiz"
+)
+# Precio base de cada servicio (el monto cobrado varía alrededor de este valor)
+PRECIOS = {"Kapping": 12000, "Semi": 9000, "Soft Gel": 15000}
+SERVICIOS = tuple(PRECIOS)
+# Cada 90 minutos: alcanza para el servicio más largo, así las reservas nunca se superponen
+HORARIOS = ("09:00", "10:30", "12:00", "13:30", "15:00", "16:30", "18:00")
+# Lunes a sábado, un año de agenda por profesional
+DIAS_POR_ANIO = 312
+ESTADOS = (("Atendida", 0.55), ("Pendiente", 0.35), ("No asistió", 0.10))
+
+def profesionales_para(cantidad_turnos):
+    """
+    Devuelve los nombres de las profesionales necesarias para ofrecer esa cantidad de turnos
+    en un año (con sucursales numeradas cuando no alcanzan los nombres).
+    """
+    necesarias = max(3, math.ceil(cantidad_turnos / (len(HORARIOS) * DIAS_POR_ANIO)))
+    nombres = []
+    for numero in range(necesarias):
+        nombre = NOMBRES_PROFESIONALES[numero % len(NOMBRES_PROFESIONALES)]
+        sucursal = numero // len(NOMBRES_PROFESIONALES)
+        nombres.append(nombre if sucursal == 0 else f"{nombre} {sucursal + 1}")
+    return nombres
+
+def generar_horarios(cantidad, desde, azar):
+    """
+    Genera cantidad de turnos distintos (día, hora y profesional), de lunes a sábado.
+    """
+    profesionales = profesionales_para(cantidad)
+    dia = desde
+    generados = 0
+    while generados < cantidad:
+        if dia.weekday() < 6:
+            fecha = dia.isoformat()
+            for profesional in profesionales:
+                for hora in HORARIOS:
+                    if generados == cantidad:
+                        return
+                    generados += 1
+                    yield {"fecha_hora": [fecha, hora], "profesional": profesional, "servicio": azar.choice(SERVICIOS)}
+        dia += timedelta(days=1)
+
+def _reserva(turno, documento, azar):
+    estado = azar.choices([e for e, _ in ESTADOS], weights=[p for _, p in ESTADOS])[0]
+    monto = None
+    if estado == "Atendida":
+        monto = float(round(PRECIOS[turno["servicio"]] * azar.uniform(0.9, 1.2), -2))
+    return {
+        "nombre": f"{azar.choice(NOMBRES_CLIENTES)} {azar.choice(APELLIDOS)}",
+        "telefono": f"11{azar.randrange(10 ** 8):08d}",
+        "documento": str(documento),
+        "turno": turno,
+        "estado": estado,
+        "montoCobrado": monto
+    }
+
+def generar_datos(cantidad_reservas, cantidad_turnos=0, semilla=1234, desde=date(2025, 1, 6)):
+    """
+    Genera (turnos, reservas): turnos disponibles y reservas sobre otros horarios,
+    sin turnos repetidos ni superpuestos y con un DNI distinto por reserva.
+    FUNCIONALIDAD: Crear datos realistas y reproducibles para medir rendimiento
+    """
+    azar = random.Random(semilla)
+    total = cantidad_reservas + cantidad_turnos
+    documentos = azar.sample(range(10_000_000, 50_000_000), cantidad_reservas)
+    turnos = []
+    reservas = []
+    for turno in generar_horarios(total, desde, azar):
+        # Repartir los horarios en proporción, así reservas y turnos libres se mezclan en las fechas
+        faltan_reservas = cantidad_reservas - len(reservas)
+        faltan_turnos = cantidad_turnos - len(turnos)
+        if faltan_reservas and azar.random() * (faltan_reservas + faltan_turnos) < faltan_reservas:
+            reservas.append(_reserva(turno, documentos[len(reservas)], azar))
+        else:
+            turnos.append(turno)
+    return turnos, reservas
+
+def main(argumentos=None):
+    """
+    Escribe turnos.json y reservas.json sintéticos en un directorio.
+    """
+    parser = argparse.ArgumentParser(description="Datos sintéticos para el sistema de turnos")
+    parser.add_argument("--reservas", type=int, default=1000)
+    parser.add_argument("--turnos", type=int, default=1000)
+    parser.add_argument("--semilla", type=int, default=1234)
+    parser.add_argument("--directorio", default=".")
+    opciones = parser.parse_args(argumentos)
+
+    turnos, reservas = generar_datos(opciones.reservas, opciones.turnos, opciones.semilla)
+    os.makedirs(opciones.directorio, exist_ok=True)
+    for nombre, datos in (("turnos.json", turnos), ("reservas.json", reservas)):
+        with open(os.path.join(opciones.directorio, nombre), "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo, ensure_ascii=False, indent=4)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Benchmarks del sistema de turnos.
+Mide reservas, filtros, persistencia y estadísticas con datos sintéticos de distintos
+tamaños: tiempo (mediana y mínimo de varias repeticiones) y pico de memoria
+(tracemalloc). Los resultados se pueden guardar como base y comparar contra ella
+para detectar regresiones.
+
+Uso:
+    python -m benchmarks.ejecutar                                   # 1.000 y 100.000 registros
+    python -m benchmarks.ejecutar --tamanios 1000,100000,1000000 --motor bitacora
+    python -m benchmarks.ejecutar --guardar-base benchmarks/base.json
+    python -m benchmarks.ejecutar --comparar benchmarks/base.json --tolerancia 0.25
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import gc
+import json
+import math
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.datos_sinteticos import generar_datos
+from sistema_turnos.datos import persistencia
+from sistema_turnos.datos.persistencia import MOTORES, cargar_reservas, guardar_reservas
+from sistema_turnos.logica.atencion import obtener_estadisticas_reservas
+from sistema_turnos.logica.reservas import crear_reserva
+from sistema_turnos.utils.filtros import filtrar_turnos
+from sistema_turnos.utils.indices import ColeccionIndexada
+
+CASOS = {}
+# Casos que recorren listas completas: a partir de este tamaño tardan minutos y se saltean
+MAXIMO_CASOS_LISTA = 100_000
+# Duración mínima de cada medición, en segundos
+TIEMPO_MINIMO = 0.1
+
+def caso(nombre, maximo=None):
+    """
+    Registra un caso de benchmark. La función recibe (turnos, reservas, directorio)
+    y devuelve (funcion_a_medir, operaciones_por_llamada). Con maximo, el caso no se
+    corre para tamaños mayores.
+    """
+    def registrar(preparar):
+        preparar.maximo = maximo
+        CASOS[nombre] = preparar
+        return preparar
+    return registrar
+
+def _criterios(turnos, cantidad):
+    combinaciones = sorted({(t["servicio"], t["profesional"]) for t in turnos[:1000]})
+    return [combinaciones[indice % len(combinaciones)] for indice in range(cantidad)]
+
+@caso("crear_reserva")
+def _crear_reserva(turnos, reservas, directorio):
+    indexadas = ColeccionIndexada("reservas", reservas)
+    muestra = turnos[:1000]
+
+    def medir():
+        for indice, turno in enumerate(muestra):
+            # DNIs de 7 dígitos: no chocan con los de los datos sintéticos
+            crear_reserva(turno, "Ana Gómez", "1122334455", str(9_000_000 + indice), indexadas)
+    return medir, len(muestra)
+
+@caso("crear_reserva_lista", maximo=MAXIMO_CASOS_LISTA)
+def _crear_reserva_lista(turnos, reservas, directorio):
+    muestra = turnos[:10]
+
+    def medir():
+        for indice, turno in enumerate(muestra):
+            crear_reserva(turno, "Ana Gómez", "1122334455", str(9_000_000 + indice), reservas)
+    return medir, len(muestra)
+
+@caso("filtrar_turnos")
+def _filtrar_turnos(turnos, reservas, directorio):
+    indexados = ColeccionIndexada("turnos", turnos)
+    criterios = _criterios(turnos, 100)
+
+    def medir():
+        for servicio, profesional in criterios:
+            filtrar_turnos(indexados, servicio, profesional)
+    return medir, len(criterios)
+
+@caso("filtrar_turnos_lista", maximo=MAXIMO_CASOS_LISTA)
+def _filtrar_turnos_lista(turnos, reservas, directorio):
+    criterios = _criterios(turnos, 5)
+
+    def medir():
+        for servicio, profesional in criterios:
+            filtrar_turnos(turnos, servicio, profesional)
+    return medir, len(criterios)
+
+@caso("indexar_reservas")
+def _indexar_reservas(turnos, reservas, directorio):
+    return lambda: ColeccionIndexada("reservas", reservas), 1
+
+@caso("guardar_reservas")
+def _guardar_reservas(turnos, reservas, directorio):
+    return lambda: guardar_reservas(reservas), 1
+
+@caso("cargar_reservas")
+def _cargar_reservas(turnos, reservas, directorio):
+    guardar_reservas(reservas)
+    return cargar_reservas, 1
+
+@caso("estadisticas_recalculo")
+def _estadisticas_recalculo(turnos, reservas, directorio):
+    return lambda: obtener_estadisticas_reservas(reservas), 1
+
+@caso("estadisticas_indexadas")
+def _estadisticas_indexadas(turnos, reservas, directorio):
+    indexadas = ColeccionIndexada("reservas", reservas)
+    # La primera lectura calcula los totales; las siguientes solo los leen
+    obtener_estadisticas_reservas(indexadas)
+
+    def medir():
+        for _ in range(1000):
+            obtener_estadisticas_reservas(indexadas)
+    return medir, 1000
+
+def medir(funcion, repeticiones, memoria=True):
+    """
+    Ejecuta una función varias veces y devuelve (tiempos por llamada en segundos, pico de memoria en bytes).
+    Las funciones rápidas se repiten dentro de cada medición hasta durar TIEMPO_MINIMO,
+    como hace timeit, para que el ruido de la máquina pese menos.
+    El pico de memoria se mide en una ejecución aparte, porque tracemalloc hace todo más lento.
+    """
+    gc.collect()
+    inicio = time.perf_counter()
+    funcion()
+    vueltas = max(1, math.ceil(TIEMPO_MINIMO / max(time.perf_counter() - inicio, 1e-9)))
+
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        inicio = time.perf_counter()
+        for _ in range(vueltas):
+            funcion()
+        tiempos.append((time.perf_counter() - inicio) / vueltas)
+
+    pico = None
+    if memoria:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            funcion()
+            pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return tiempos, pico
+
+def ejecutar(tamanios, casos=None, motor="json", repeticiones=3, memoria=True, semilla=1234, informar=print):
+    """
+    Corre los casos pedidos para cada tamaño y devuelve los resultados por "caso@tamaño".
+    FUNCIONALIDAD: Medir tiempo y memoria de las operaciones principales a escala
+    """
+    resultados = {}
+    for tamanio in tamanios:
+        turnos, reservas = generar_datos(tamanio, tamanio, semilla)
+        with tempfile.TemporaryDirectory() as directorio:
+            persistencia.configurar_almacenamiento(motor, directorio=directorio)
+            try:
+                for nombre in casos or CASOS:
+                    preparar = CASOS[nombre]
+                    if preparar.maximo is not None and tamanio > preparar.maximo:
+                        continue
+                    funcion, operaciones = preparar(turnos, reservas, directorio)
+                    tiempos, pico = medir(funcion, repeticiones, memoria)
+                    mediana = statistics.median(tiempos)
+                    resultado = {
+                        "caso": nombre,
+                        "tamanio": tamanio,
+                        "mediana_s": mediana,
+                        "minimo_s": min(tiempos),
+                        "por_operacion_us": mediana / operaciones * 1e6,
+                        "memoria_pico_kb": pico / 1024 if pico is not None else None
+                    }
+                    resultados[f"{nombre}@{tamanio}"] = resultado
+                    informar(formatear_resultado(resultado))
+            finally:
+                persistencia.configurar_almacenamiento("json")
+    return resultados
+
+def formatear_resultado(resultado):
+    """
+    Devuelve una línea de texto con el resultado de un caso.
+    """
+    memoria = resultado["memoria_pico_kb"]
+    memoria = f"{memoria:>12.1f} KB" if memoria is not None else f"{'-':>15}"
+    return (
+        f"{resultado['caso']:<24} {resultado['tamanio']:>9}  "
+        f"mediana={resultado['mediana_s'] * 1000:>10.3f}ms  min={resultado['minimo_s'] * 1000:>10.3f}ms  "
+        f"{resultado['por_operacion_us']:>12.2f}us/op  {memoria}"
+    )
+
+def comparar(actuales, base, tolerancia=0.25):
+    """
+    Compara los mínimos con los de la base: el mínimo de varias repeticiones es el
+    valor menos afectado por otros procesos de la máquina. Devuelve una lista de
+    (clave, proporción actual/base, estado) con estado "regresion", "mejora" o "igual".
+    FUNCIONALIDAD: Detectar regresiones de rendimiento entre versiones
+    """
+    comparacion = []
+    for clave, resultado in actuales.items():
+        if clave not in base:
+            continue
+        anterior = base[clave]["minimo_s"]
+        proporcion = resultado["minimo_s"] / anterior if anterior > 0 else 1.0
+        if proporcion > 1 + tolerancia:
+            estado = "regresion"
+        elif proporcion < 1 / (1 + tolerancia):
+            estado = "mejora"
+        else:
+            estado = "igual"
+        comparacion.append((clave, proporcion, estado))
+    return comparacion
+
+def _guardar(ruta, resultados, opciones):
+    datos = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "motor": opciones.motor,
+        "semilla": opciones.semilla,
+        "resultados": resultados
+    }
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, ensure_ascii=False, indent=4)
+
+def main(argumentos=None):
+    """
+    Punto de entrada de línea de comandos de los benchmarks.
+    Devuelve 1 si la comparación con la base encontró regresiones.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks del sistema de turnos")
+    parser.add_argument("--tamanios", default="1000,100000", help="cantidades de registros, separadas por coma")
+    parser.add_argument("--casos", help=f"casos a correr, separados por coma ({', '.join(CASOS)})")
+    parser.add_argument("--motor", choices=sorted(MOTORES), default="json")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=1234)
+    parser.add_argument("--sin-memoria", action="store_true", help="no medir el pico de memoria")
+    parser.add_argument("--salida", help="guardar los resultados en este archivo JSON")
+    parser.add_argument("--guardar-base", help="guardar los resultados como base para comparar")
+    parser.add_argument("--comparar", help="comparar contra una base guardada")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="proporción de diferencia aceptada")
+    opciones = parser.parse_args(argumentos)
+
+    tamanios = [int(tamanio) for tamanio in opciones.tamanios.split(",")]
+    casos = opciones.casos.split(",") if opciones.casos else None
+    for nombre in casos or ():
+        if nombre not in CASOS:
+            parser.error(f"Caso desconocido: {nombre}")
+
+    resultados = ejecutar(
+        tamanios, casos, opciones.motor, opciones.repeticiones, not opciones.sin_memoria, opciones.semilla
+    )
+    for ruta in (opciones.salida, opciones.guardar_base):
+        if ruta:
+            _guardar(ruta, resultados, opciones)
+
+    if not opciones.comparar:
+        return 0
+    with open(opciones.comparar, "r", encoding="utf-8") as archivo:
+        base = json.load(archivo)["resultados"]
+    comparacion = comparar(resultados, base, opciones.tolerancia)
+    print()
+    for clave, proporcion, estado in comparacion:
+        print(f"{clave:<36} {proporcion:>6.2f}x  {estado.upper() if estado == 'regresion' else estado}")
+    return 1 if any(estado == "regresion" for _, _, estado in comparacion) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
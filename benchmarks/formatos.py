@@ -0,0 +1,82 @@
+"""
+Benchmark de formatos de archivo del sistema de turnos.
+Guarda y carga las mismas reservas sintéticas con el motor JSON en cada formato de
+datos/formatos.py (con y sin compresión) e informa el tiempo de guardado, el de carga
+y el tamaño del archivo.
+
+Uso:
+    python -m benchmarks.formatos                                   # 100.000 reservas, todos los formatos
+    python -m benchmarks.formatos --cantidad 1000000 --formatos json,orjson,binario+gzip
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import statistics
+import tempfile
+
+from benchmarks.datos_sinteticos import generar_datos
+from benchmarks.ejecutar import medir
+from sistema_turnos.datos.formatos import formatos_disponibles, validar_formato
+from sistema_turnos.datos.persistencia import AlmacenJSON
+
+def comparar_formatos(cantidad, formatos=None, repeticiones=3, semilla=1234, informar=print):
+    """
+    Mide guardado, carga y tamaño de cantidad reservas en cada formato.
+    Devuelve una lista de resultados (uno por formato, en el orden pedido).
+    FUNCIONALIDAD: Elegir el formato de archivo con números medidos
+    """
+    reservas = generar_datos(cantidad, semilla=semilla)[1]
+    resultados = []
+    informar(f"{'formato':<22} {'guardar':>12} {'cargar':>12} {'tamaño':>12} {'vs json':>8}")
+    for formato in formatos or formatos_disponibles():
+        validar_formato(formato)
+        with tempfile.TemporaryDirectory() as directorio:
+            almacen = AlmacenJSON(directorio, durable=False, formato=formato)
+            guardado, _ = medir(lambda: almacen.guardar("reservas", reservas), repeticiones, memoria=False)
+            carga, _ = medir(lambda: almacen.cargar("reservas"), repeticiones, memoria=False)
+            assert len(almacen.cargar("reservas")) == cantidad
+            resultado = {
+                "formato": formato,
+                "cantidad": cantidad,
+                "guardar_s": statistics.median(guardado),
+                "cargar_s": statistics.median(carga),
+                "tamanio_bytes": os.path.getsize(almacen.ruta("reservas"))
+            }
+        resultados.append(resultado)
+        informar(formatear_resultado(resultado, resultados[0]["tamanio_bytes"]))
+    return resultados
+
+def formatear_resultado(resultado, tamanio_base):
+    """
+    Devuelve una línea de texto con el resultado de un formato (tamaño relativo a tamanio_base).
+    """
+    return (
+        f"{resultado['formato']:<22} {resultado['guardar_s'] * 1000:>10.1f}ms {resultado['cargar_s'] * 1000:>10.1f}ms "
+        f"{resultado['tamanio_bytes'] / 1024 / 1024:>10.2f}MB {resultado['tamanio_bytes'] / tamanio_base:>7.0%}"
+    )
+
+def main(argumentos=None):
+    """
+    Punto de entrada de línea de comandos del benchmark de formatos.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark de formatos de archivo")
+    parser.add_argument("--cantidad", type=int, default=100_000, help="cantidad de reservas")
+    parser.add_argument("--formatos", help=f"formatos, separados por coma ({', '.join(formatos_disponibles())})")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=1234)
+    opciones = parser.parse_args(argumentos)
+
+    formatos = opciones.formatos.split(",") if opciones.formatos else None
+    for formato in formatos or ():
+        try:
+            validar_formato(formato)
+        except ValueError as error:
+            parser.error(str(error))
+    comparar_formatos(opciones.cantidad, formatos, opciones.repeticiones, opciones.semilla)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
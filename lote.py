@@ -0,0 +1,56 @@
+"""
+Punto de entrada por lotes del sistema de turnos (sin interfaz).
+Aplica muchas reservas, atenciones o cancelaciones leídas de un CSV o JSON,
+con una sola carga y un solo guardado de los datos.
+
+Uso:
+    python lote.py reservar reservas.csv
+    python lote.py atender atenciones.json
+    python lote.py no-asistio ausencias.csv
+    python lote.py cancelar cancelaciones.csv --salida resultado.json
+
+Columnas de cada operación:
+    reservar:    fecha, hora, profesional, servicio, nombre, telefono, documento
+    atender:     id, o documento (y opcionalmente fecha, hora, profesional, servicio); monto opcional
+    no-asistio:  igual que atender, sin monto
+    cancelar:    igual que atender, sin monto
+"""
+
+import argparse
+import json
+import sys
+
+from sistema_turnos.lotes import OPERACIONES_LOTE, leer_filas, procesar_lote
+from sistema_turnos.servicio import ServicioTurnos
+
+def main(argumentos=None):
+    """
+    Lee el lote, lo aplica y muestra cuántas filas se aplicaron y los errores.
+    Devuelve 1 si alguna fila falló.
+    """
+    parser = argparse.ArgumentParser(description="Operaciones por lotes del sistema de turnos")
+    parser.add_argument("operacion", choices=list(OPERACIONES_LOTE))
+    parser.add_argument("archivo", help="archivo CSV (con encabezado) o JSON (lista de objetos)")
+    parser.add_argument("--formato", choices=("csv", "json"), help="formato del archivo (por defecto, según la extensión)")
+    parser.add_argument("--salida", help="guardar el resultado de cada fila en este archivo JSON")
+    opciones = parser.parse_args(argumentos)
+
+    try:
+        filas = leer_filas(opciones.archivo, opciones.formato)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    resumen = procesar_lote(ServicioTurnos(), opciones.operacion, filas)
+
+    for resultado in resumen["resultados"]:
+        if not resultado["exito"]:
+            print(f"Fila {resultado['fila']}: {resultado['error']}")
+    print(f"{opciones.operacion}: {resumen['aplicadas']} de {resumen['total']} filas aplicadas")
+
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resumen, archivo, ensure_ascii=False, indent=4)
+    return 1 if resumen["fallidas"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+"""
+API HTTP/JSON para reservas en línea.
+Servidor HTTP/1.1 mínimo sobre asyncio (sin dependencias externas) que expone el
+servicio de turnos: búsqueda de turnos disponibles, reservas, cancelaciones y
+acciones de las manicuristas. Cada pedido se atiende completo en el bucle de
+eventos, sin esperas en el medio, así dos pedidos nunca reservan el mismo turno;
+las escrituras a disco se hacen en segundo plano.
+
+Rutas para clientas (sin token; solo ven sus propias reservas):
+    GET    /turnos?servicio=&profesional=&limite=   turnos disponibles
+    POST   /reservas                                 {"turno", "nombre", "telefono", "documento"}
+    GET    /reservas?documento=                      reservas de ese documento
+    GET    /reservas/<id>?documento=                 una reserva (el documento debe coincidir)
+    DELETE /reservas/<id>?documento=                 cancelar (el documento debe coincidir)
+
+Rutas del personal (encabezado "Authorization: Bearer <token>"):
+    GET    /reservas  o  /reservas?estado=           todas las reservas
+    GET    /reservas/<id>                            cualquier reserva
+    POST   /reservas/<id>/atendida                   {"monto": opcional}
+    POST   /reservas/<id>/no-asistio
+    PUT    /reservas/<id>/monto                      {"monto"}
+    GET    /estadisticas
+    GET    /reportes?periodo=mes&por=profesional
+
+Uso:
+    python -m sistema_turnos.api_http --puerto 8080 --token <token del personal>
+"""
+
+import argparse
+import asyncio
+import hmac
+import json
+import os
+import re
+import secrets
+from datetime import datetime
+from itertools import islice
+from urllib.parse import parse_qs, urlsplit
+
+from sistema_turnos.datos.modelos import serializar
+from sistema_turnos.datos.persistencia import activar_escritura_diferida, activar_registro_de_cambios, vaciar_escrituras
+from sistema_turnos.logica.atencion import validar_monto
+from sistema_turnos.logica.reportes import AGRUPACIONES, PERIODOS
+from sistema_turnos.servicio import ServicioTurnos
+from sistema_turnos.traza import ServicioGrabado
+
+TAMANIO_MAXIMO_CUERPO = 64 * 1024
+
+# Acceso de cada ruta: cualquiera, clientas (ven solo lo de su documento) o solo el personal
+PUBLICA, CLIENTA, PERSONAL = "publica", "clienta", "personal"
+
+MOTIVOS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed",
+    409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"
+}
+
+class ErrorPedido(Exception):
+    """
+    Pedido HTTP que no se puede atender; lleva el código de estado a devolver.
+    """
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+def _resultado(resultado, estado_exito=200):
+    # Las reglas de negocio rechazadas (turno ocupado, DNI repetido...) son conflictos
+    if not resultado["exito"]:
+        return 409, {"error": resultado["error"]}
+    return estado_exito, resultado
+
+def _monto(cuerpo, obligatorio=True):
+    # Se valida antes de cambiar nada (por ejemplo antes de marcar la reserva como atendida)
+    monto = cuerpo.get("monto")
+    if monto is None and not obligatorio:
+        return None
+    monto, error = validar_monto(monto)
+    if error is not None:
+        raise ErrorPedido(400, error)
+    return monto
+
+def _es_turno(turno):
+    return (
+        isinstance(turno, dict)
+        and isinstance(turno.get("fecha_hora"), list) and len(turno["fecha_hora"]) == 2
+        and all(isinstance(valor, str) for valor in turno["fecha_hora"])
+        and isinstance(turno.get("profesional"), str) and isinstance(turno.get("servicio"), str)
+    )
+
+class ApiTurnos:
+    """
+    Traduce pedidos HTTP a operaciones del servicio de turnos.
+    Las acciones del personal (y ver reservas ajenas) piden el token del personal; sin
+    token configurado, esas rutas quedan cerradas.
+    """
+
+    def __init__(self, servicio=None, token=None):
+        self.servicio = servicio if servicio is not None else ServicioTurnos()
+        self.token = token
+        self._servidor = None
+        self.rutas = [
+            ("GET", r"/turnos", self.buscar_turnos, PUBLICA),
+            ("GET", r"/reservas", self.listar_reservas, CLIENTA),
+            ("POST", r"/reservas", self.reservar, PUBLICA),
+            ("GET", r"/reservas/(?P<identificador>[0-9a-f]+)", self.ver_reserva, CLIENTA),
+            ("DELETE", r"/reservas/(?P<identificador>[0-9a-f]+)", self.cancelar, PUBLICA),
+            ("POST", r"/reservas/(?P<identificador>[0-9a-f]+)/atendida", self.marcar_atendida, PERSONAL),
+            ("POST", r"/reservas/(?P<identificador>[0-9a-f]+)/no-asistio", self.marcar_no_asistio, PERSONAL),
+            ("PUT", r"/reservas/(?P<identificador>[0-9a-f]+)/monto", self.cambiar_monto, PERSONAL),
+            ("GET", r"/estadisticas", self.estadisticas, PERSONAL),
+            ("GET", r"/reportes", self.reporte, PERSONAL),
+        ]
+        self.rutas = [
+            (metodo, re.compile(patron + r"/?"), accion, acceso) for metodo, patron, accion, acceso in self.rutas
+        ]
+
+    def procesar(self, metodo, destino, cuerpo=b"", encabezados=None):
+        """
+        Atiende un pedido y devuelve (estado, datos). encabezados (nombres en minúscula)
+        lleva el token del personal, si lo hay.
+        FUNCIONALIDAD: Reservar y gestionar turnos en línea
+        """
+        partes = urlsplit(destino)
+        consulta = {clave: valores[-1] for clave, valores in parse_qs(partes.query).items()}
+        try:
+            permitidos = False
+            for metodo_ruta, patron, accion, acceso in self.rutas:
+                coincidencia = patron.fullmatch(partes.path)
+                if coincidencia is None:
+                    continue
+                permitidos = True
+                if metodo_ruta == metodo:
+                    argumentos = coincidencia.groupdict()
+                    personal = self._es_personal(encabezados or {})
+                    if acceso == PERSONAL and not personal:
+                        raise ErrorPedido(401, "Esta acción es solo para el personal.")
+                    if acceso == CLIENTA:
+                        argumentos["personal"] = personal
+                    return accion(consulta, self._leer_cuerpo(cuerpo), **argumentos)
+            if permitidos:
+                raise ErrorPedido(405, f"Método {metodo} no permitido en {partes.path}")
+            raise ErrorPedido(404, f"No existe la ruta {partes.path}")
+        except ErrorPedido as error:
+            return error.estado, {"error": str(error)}
+
+    def _es_personal(self, encabezados):
+        tipo, _, token = encabezados.get("authorization", "").partition(" ")
+        return (
+            self.token is not None and tipo.lower() == "bearer"
+            and hmac.compare_digest(token.strip().encode("utf-8"), self.token.encode("utf-8"))
+        )
+
+    def _leer_cuerpo(self, cuerpo):
+        if not cuerpo:
+            return {}
+        try:
+            datos = json.loads(cuerpo)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise ErrorPedido(400, "El cuerpo no es JSON válido.")
+        if not isinstance(datos, dict):
+            raise ErrorPedido(400, "El cuerpo debe ser un objeto JSON.")
+        return datos
+
+    def _reserva(self, identificador):
+        reserva = self.servicio.reserva(identificador)
+        if reserva is None:
+            raise ErrorPedido(404, "Reserva no encontrada.")
+        return reserva
+
+    def buscar_turnos(self, consulta, cuerpo):
+        turnos = self.servicio.filtrar_turnos(consulta.get("servicio"), consulta.get("profesional"))
+        limite = consulta.get("limite")
+        if limite is not None:
+            if not limite.isdigit():
+                raise ErrorPedido(400, "El límite debe ser un número entero.")
+            turnos = islice(turnos, int(limite))
+        return 200, list(turnos)
+
+    def listar_reservas(self, consulta, cuerpo, personal):
+        if "documento" in consulta:
+            return 200, list(self.servicio.reservas_de(consulta["documento"]))
+        # Sin documento se ven las reservas de todas las clientas: solo el personal
+        if not personal:
+            raise ErrorPedido(401, "Indique su documento para ver sus reservas.")
+        if "estado" in consulta:
+            return 200, list(self.servicio.filtrar_reservas_por_estado(consulta["estado"]))
+        return 200, list(self.servicio.listar_reservas())
+
+    def reservar(self, consulta, cuerpo):
+        faltantes = [campo for campo in ("turno", "nombre", "telefono", "documento") if not cuerpo.get(campo)]
+        if faltantes:
+            raise ErrorPedido(400, f"Faltan datos: {', '.join(faltantes)}")
+        if not all(isinstance(cuerpo[campo], str) for campo in ("nombre", "telefono", "documento")):
+            raise ErrorPedido(400, "Nombre, teléfono y documento deben ser textos.")
+        turno = cuerpo["turno"]
+        if not _es_turno(turno):
+            raise ErrorPedido(400, "El turno debe tener fecha_hora [fecha, hora], profesional y servicio.")
+        # Un turno que no se ofrece (o ya se reservó) se rechaza como conflicto
+        resultado = self.servicio.reservar(turno, cuerpo["nombre"], cuerpo["telefono"], cuerpo["documento"])
+        return _resultado(resultado, 201)
+
+    def ver_reserva(self, consulta, cuerpo, identificador, personal):
+        if personal:
+            return 200, self._reserva(identificador)
+        return 200, self._reserva_de_clienta(identificador, consulta, cuerpo)
+
+    def cancelar(self, consulta, cuerpo, identificador):
+        # Solo quien reservó (con su documento) puede cancelar
+        reserva = self._reserva_de_clienta(identificador, consulta, cuerpo)
+        return _resultado(self.servicio.cancelar(reserva["documento"], reserva["turno"]))
+
+    def _reserva_de_clienta(self, identificador, consulta, cuerpo):
+        reserva = self._reserva(identificador)
+        documento = consulta.get("documento") or cuerpo.get("documento") or ""
+        # Con otro documento, la reserva "no existe" (no se confirma que el id sea válido)
+        if not isinstance(documento, str) or documento.lower() != reserva["documento"].lower():
+            raise ErrorPedido(404, "Reserva no encontrada.")
+        return reserva
+
+    def marcar_atendida(self, consulta, cuerpo, identificador):
+        self._reserva(identificador)
+        monto = _monto(cuerpo, obligatorio=False)
+        resultado = self.servicio.marcar_como_atendida(identificador)
+        if resultado["exito"] and monto is not None:
+            resultado = self.servicio.cambiar_monto_cobrado(identificador, monto)
+        return _resultado(resultado)
+
+    def marcar_no_asistio(self, consulta, cuerpo, identificador):
+        self._reserva(identificador)
+        return _resultado(self.servicio.marcar_como_no_asistio(identificador))
+
+    def cambiar_monto(self, consulta, cuerpo, identificador):
+        self._reserva(identificador)
+        return _resultado(self.servicio.cambiar_monto_cobrado(identificador, _monto(cuerpo)))
+
+    def estadisticas(self, consulta, cuerpo):
+        return 200, self.servicio.estadisticas()
+
+    def reporte(self, consulta, cuerpo):
+        periodo = consulta.get("periodo", "mes")
+        agrupar_por = consulta.get("por", "profesional")
+        if periodo not in PERIODOS or agrupar_por not in AGRUPACIONES:
+            raise ErrorPedido(400, f"Período ({', '.join(PERIODOS)}) o agrupación ({', '.join(AGRUPACIONES)}) inválidos.")
+        return 200, list(self.servicio.reporte(periodo, agrupar_por))
+
+    async def atender(self, lector, escritor):
+        """
+        Atiende una conexión HTTP/1.1, con varios pedidos seguidos (keep-alive).
+        """
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea.strip():
+                    break
+                try:
+                    metodo, destino, version = linea.decode("latin-1").split()
+                except ValueError:
+                    await self._responder(escritor, 400, {"error": "Pedido HTTP inválido."}, False)
+                    break
+
+                encabezados = {}
+                while True:
+                    encabezado = await lector.readline()
+                    if encabezado in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = encabezado.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+
+                mantener = (
+                    encabezados.get("connection", "").lower() != "close"
+                    and version.upper() == "HTTP/1.1"
+                )
+                try:
+                    longitud = int(encabezados.get("content-length", 0))
+                except ValueError:
+                    longitud = -1
+                if longitud < 0 or longitud > TAMANIO_MAXIMO_CUERPO:
+                    await self._responder(escritor, 413 if longitud > 0 else 400, {"error": "Cuerpo inválido o demasiado grande."}, False)
+                    break
+                cuerpo = await lector.readexactly(longitud) if longitud else b""
+
+                try:
+                    estado, datos = self.procesar(metodo.upper(), destino, cuerpo, encabezados)
+                except Exception as error:
+                    estado, datos = 500, {"error": f"Error interno: {error}"}
+                await self._responder(escritor, estado, datos, mantener)
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, escritor, estado, datos, mantener):
+        contenido = json.dumps(datos, ensure_ascii=False, default=serializar).encode("utf-8")
+        encabezado = (
+            f"HTTP/1.1 {estado} {MOTIVOS.get(estado, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(contenido)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+        )
+        escritor.write(encabezado.encode("latin-1") + contenido)
+        await escritor.drain()
+
+    async def iniciar(self, host="127.0.0.1", puerto=8080):
+        """
+        Empieza a escuchar y devuelve el puerto real (útil con puerto 0).
+        """
+        self._servidor = await asyncio.start_server(self.atender, host, puerto)
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def servir(self, host="127.0.0.1", puerto=8080):
+        """
+        Escucha hasta que se cancele, y escribe lo pendiente al terminar.
+        """
+        await self.iniciar(host, puerto)
+        try:
+            async with self._servidor:
+                await self._servidor.serve_forever()
+        finally:
+            vaciar_escrituras()
+
+    async def detener(self):
+        """
+        Deja de aceptar conexiones.
+        """
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+
+def main(argumentos=None):
+    """
+    Punto de entrada de línea de comandos de la API HTTP.
+    """
+    parser = argparse.ArgumentParser(description="API HTTP/JSON de reservas")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--grabar", help="anotar cada operación en esta traza (ver sistema_turnos.traza)")
+    parser.add_argument("--token", default=os.environ.get("SISTEMA_TURNOS_TOKEN"),
+                        help="token del personal (o SISTEMA_TURNOS_TOKEN); sin él se genera uno al iniciar")
+    opciones = parser.parse_args(argumentos)
+    token = opciones.token or secrets.token_urlsafe(24)
+
+    activar_escritura_diferida()
+    # Anotar los cambios para poder volver a cualquier momento (ver datos/recuperacion.py)
+    activar_registro_de_cambios()
+    servicio = ServicioTurnos()
+    if opciones.grabar:
+        servicio = ServicioGrabado(servicio, opciones.grabar, {"inicio": datetime.now().isoformat(timespec="seconds")})
+    api = ApiTurnos(servicio, token)
+    print(f"API de reservas escuchando en http://{opciones.host}:{opciones.puerto}")
+    if not opciones.token:
+        print(f"Token del personal (encabezado Authorization: Bearer ...): {token}")
+    try:
+        asyncio.run(api.servir(opciones.host, opciones.puerto))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
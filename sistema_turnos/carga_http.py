@@ -0,0 +1,187 @@
+"""
+Generador de carga para la API HTTP de reservas.
+Simula varias clientas a la vez (conexiones keep-alive sobre asyncio) que buscan
+turnos, reservan y a veces cancelan, y mide el tiempo de respuesta de cada pedido.
+Al terminar informa operaciones por segundo y percentiles de latencia por operación.
+
+Uso:
+    python -m sistema_turnos.carga_http --puerto 8080 --clientes 20 --duracion 10
+    python -m sistema_turnos.carga_http --con-servidor --turnos 5000
+        (levanta la API en el mismo proceso, con turnos sintéticos y datos en un directorio temporal)
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sistema_turnos.utils.metricas import formatear_resumen, resumir_latencias
+
+PROFESIONALES = ("Gisela", "Marisol", "Valentina")
+SERVICIOS = ("Kapping", "Semi", "Soft Gel")
+
+class ClienteHttp:
+    """
+    Cliente HTTP/1.1 mínimo con conexión persistente, para medir sin el costo de reconectar.
+    """
+
+    def __init__(self, host, puerto):
+        self.host = host
+        self.puerto = puerto
+        self._lector = None
+        self._escritor = None
+
+    async def pedir(self, metodo, ruta, datos=None):
+        """
+        Envía un pedido y devuelve (estado, datos de la respuesta).
+        """
+        if self._escritor is None:
+            self._lector, self._escritor = await asyncio.open_connection(self.host, self.puerto)
+        cuerpo = json.dumps(datos).encode("utf-8") if datos is not None else b""
+        self._escritor.write(
+            f"{metodo} {ruta} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(cuerpo)}\r\n\r\n".encode("latin-1") + cuerpo
+        )
+        await self._escritor.drain()
+
+        estado = int((await self._lector.readline()).split()[1])
+        longitud = 0
+        while True:
+            linea = await self._lector.readline()
+            if linea in (b"\r\n", b""):
+                break
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            if nombre.strip().lower() == "content-length":
+                longitud = int(valor)
+        return estado, json.loads(await self._lector.readexactly(longitud))
+
+    async def cerrar(self):
+        """
+        Cierra la conexión.
+        """
+        if self._escritor is not None:
+            self._escritor.close()
+            await self._escritor.wait_closed()
+            self._escritor = None
+
+async def _clienta(numero, host, puerto, fin, proporcion_reservas, azar, latencias):
+    cliente = ClienteHttp(host, puerto)
+    reservadas = []
+    reservas_hechas = 0
+
+    async def medir(nombre, metodo, ruta, datos=None):
+        inicio = time.perf_counter()
+        estado, respuesta = await cliente.pedir(metodo, ruta, datos)
+        latencias.setdefault(nombre, []).append(time.perf_counter() - inicio)
+        return estado, respuesta
+
+    try:
+        while time.perf_counter() < fin:
+            _, turnos = await medir(
+                "buscar_turnos", "GET", f"/turnos?profesional={azar.choice(PROFESIONALES)}&limite=20"
+            )
+            if turnos and azar.random() < proporcion_reservas:
+                reservas_hechas += 1
+                # Un DNI distinto por reserva: solo se admite una reserva por DNI
+                documento = str(20000000 + numero * 100000 + reservas_hechas)
+                estado, respuesta = await medir("reservar", "POST", "/reservas", {
+                    "turno": azar.choice(turnos), "nombre": "Clienta Prueba",
+                    "telefono": "1122334455", "documento": documento
+                })
+                if estado == 201:
+                    reservadas.append(respuesta["reserva"])
+            if reservadas and azar.random() < proporcion_reservas / 4:
+                reserva = reservadas.pop(azar.randrange(len(reservadas)))
+                await medir("cancelar", "DELETE", f"/reservas/{reserva['id']}?documento={reserva['documento']}")
+    finally:
+        await cliente.cerrar()
+
+async def generar_carga(host="127.0.0.1", puerto=8080, clientes=10, duracion=5.0,
+                        proporcion_reservas=0.3, semilla=None):
+    """
+    Corre la carga durante duracion segundos y devuelve el resumen de latencias
+    por operación, más "total" con todos los pedidos.
+    FUNCIONALIDAD: Medir tiempos de respuesta de la API bajo carga concurrente
+    """
+    azar = random.Random(semilla)
+    latencias = {}
+    inicio = time.perf_counter()
+    fin = inicio + duracion
+    await asyncio.gather(*(
+        _clienta(numero, host, puerto, fin, proporcion_reservas, random.Random(azar.random()), latencias)
+        for numero in range(clientes)
+    ))
+    transcurrido = time.perf_counter() - inicio
+
+    resumen = {nombre: resumir_latencias(valores, transcurrido) for nombre, valores in sorted(latencias.items())}
+    resumen["total"] = resumir_latencias(sum(latencias.values(), []), transcurrido)
+    return resumen
+
+def turnos_sinteticos(cantidad, desde=None):
+    """
+    Genera turnos de prueba repartidos entre profesionales, servicios y días hábiles.
+    """
+    desde = desde or date.today()
+    horas = ("09:00", "10:30", "12:00", "13:30", "15:00", "16:30")
+    turnos = []
+    dia = desde
+    while len(turnos) < cantidad:
+        if dia.weekday() < 5:
+            for hora in horas:
+                for indice, profesional in enumerate(PROFESIONALES):
+                    turnos.append({
+                        "fecha_hora": [dia.isoformat(), hora],
+                        "profesional": profesional,
+                        "servicio": SERVICIOS[(indice + len(turnos)) % len(SERVICIOS)]
+                    })
+        dia += timedelta(days=1)
+    return turnos[:cantidad]
+
+async def _con_servidor(opciones):
+    from sistema_turnos.api_http import ApiTurnos
+    from sistema_turnos.datos import persistencia
+    from sistema_turnos.servicio import ServicioTurnos
+
+    with tempfile.TemporaryDirectory() as directorio:
+        persistencia.configurar_almacenamiento(opciones.motor, diferido=True, directorio=directorio)
+        api = ApiTurnos(ServicioTurnos(turnos_sinteticos(opciones.turnos), []))
+        puerto = await api.iniciar("127.0.0.1", 0)
+        try:
+            return await generar_carga(
+                "127.0.0.1", puerto, opciones.clientes, opciones.duracion, opciones.reservas, opciones.semilla
+            )
+        finally:
+            await api.detener()
+            persistencia.configurar_almacenamiento("json")
+
+def main(argumentos=None):
+    """
+    Punto de entrada de línea de comandos del generador de carga.
+    """
+    parser = argparse.ArgumentParser(description="Generador de carga para la API HTTP de reservas")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--clientes", type=int, default=10, help="clientas simultáneas")
+    parser.add_argument("--duracion", type=float, default=5.0, help="segundos de carga")
+    parser.add_argument("--reservas", type=float, default=0.3, help="proporción de búsquedas que terminan en reserva")
+    parser.add_argument("--semilla", type=int)
+    parser.add_argument("--con-servidor", action="store_true", help="levantar la API en este proceso")
+    parser.add_argument("--turnos", type=int, default=2000, help="turnos sintéticos para --con-servidor")
+    parser.add_argument("--motor", choices=("json", "bitacora", "sqlite"), default="json",
+                        help="almacenamiento para --con-servidor")
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.con_servidor:
+        resumen = asyncio.run(_con_servidor(opciones))
+    else:
+        resumen = asyncio.run(generar_carga(
+            opciones.host, opciones.puerto, opciones.clientes, opciones.duracion, opciones.reservas, opciones.semilla
+        ))
+    for nombre, datos in resumen.items():
+        print(formatear_resumen(nombre, datos))
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,17 @@ Controlador para funcionalidades de cliente.
 Maneja la coordinación entre interfaz y lógica de negocio para clientes.
 """
 
-from sistema_turnos.utils.filtros import filtrar_turnos, filtrar_reservas_por_dni
-from sistema_turnos.logica.reservas import (
-    confirmar_reserva, crear_reserva, cancelar_reserva,
-    procesar_reserva_exitosa, procesar_cancelacion_exitosa
-)
+from sistema_turnos.logica.reservas import confirmar_reserva
 
 class ControladorCliente:
     """
     Controlador que maneja las operaciones específicas de clientes.
+    Usa un servicio de turnos: local (ServicioTurnos) o el servidor de reservas (ServicioRemoto).
     """
     
-    def __init__(self, interfaz, turnos, reservas):
+    def __init__(self, interfaz, servicio):
         self.interfaz = interfaz
-        self.turnos = turnos
-        self.reservas = reservas
+        self.servicio = servicio
     
     def filtrar_turnos(self):
         """
@@ -38,7 +34,7 @@ class ControladorCliente:
             return
         
         # Aplicar filtros y mostrar resultados
-        filtrados = filtrar_turnos(self.turnos, servicio, profesional)
+        filtrados = self.servicio.filtrar_turnos(servicio=servicio, profesional=profesional)
         self.interfaz.mostrar_turnos(filtrados)
     
     def _pedir_filtro_servicio(self, opciones_servicio):
@@ -58,14 +54,15 @@ class ControladorCliente:
         Maneja la reserva de turnos para clientes.
         FUNCIONALIDAD: Permitir que las clientas puedan reservar turnos
         """
-        resultado = self.interfaz.reservar_turno_columna_lateral(self.turnos)
+        turnos = self.servicio.turnos_disponibles()
+        resultado = self.interfaz.reservar_turno_columna_lateral(turnos)
         if resultado is None:
             return
         
         opcion, nombre, telefono, documento = resultado
         
         try:
-            turno = self.turnos[opcion]
+            turno = turnos[opcion]
             
             # Validar y confirmar reserva
             resultado_validacion = confirmar_reserva(turno, nombre, telefono, documento)
@@ -76,21 +73,15 @@ class ControladorCliente:
             if not self.interfaz.confirmar_reserva(turno, nombre, telefono, documento):
                 return
             
-            # Crear la reserva
-            resultado_creacion = crear_reserva(turno, nombre, telefono, documento, self.reservas)
-            if not resultado_creacion["exito"]:
-                self.interfaz.mostrar_mensaje(resultado_creacion["error"], "error")
-                return
-            
-            # Procesar la reserva exitosa
-            resultado_procesamiento = procesar_reserva_exitosa(
-                resultado_creacion["reserva"], self.turnos, self.reservas
+            # Crear y guardar la reserva
+            resultado_reserva = self.servicio.reservar(
+                turno=turno, nombre=nombre, telefono=telefono, documento=documento
             )
             
-            if resultado_procesamiento["exito"]:
-                self.turnos = resultado_procesamiento["turnos_actualizados"]
-                self.reservas = resultado_procesamiento["reservas_actualizadas"]
+            if resultado_reserva["exito"]:
                 self.interfaz.mostrar_mensaje("¡Turno reservado exitosamente!", "exito")
+            else:
+                self.interfaz.mostrar_mensaje(resultado_reserva["error"], "error")
             
         except Exception as e:
             self.interfaz.mostrar_mensaje(f"Error al reservar turno: {str(e)}", "error")
@@ -105,7 +96,7 @@ class ControladorCliente:
             return
         
         # Buscar reservas del cliente
-        reservas_cliente = filtrar_reservas_por_dni(self.reservas, dni)
+        reservas_cliente = self.servicio.reservas_de(documento=dni)
         if not reservas_cliente:
             self.interfaz.mostrar_mensaje("No se encontraron reservas para este DNI.", "error")
             return
@@ -120,14 +111,14 @@ class ControladorCliente:
             return
         
         # Procesar cancelación
-        resultado_cancelacion = procesar_cancelacion_exitosa(
-            reserva_seleccionada, self.turnos, self.reservas
+        resultado_cancelacion = self.servicio.cancelar(
+            documento=reserva_seleccionada["documento"], turno=reserva_seleccionada["turno"]
         )
         
         if resultado_cancelacion["exito"]:
-            self.turnos = resultado_cancelacion["turnos_actualizados"]
-            self.reservas = resultado_cancelacion["reservas_actualizadas"]
             self.interfaz.mostrar_mensaje("Turno cancelado exitosamente.", "exito")
+        else:
+            self.interfaz.mostrar_mensaje(resultado_cancelacion["error"], "error")
     
     def ver_turnos_reservados(self):
         """
@@ -139,7 +130,7 @@ class ControladorCliente:
             return
         
         # Buscar reservas del cliente
-        reservas_cliente = filtrar_reservas_por_dni(self.reservas, dni)
+        reservas_cliente = self.servicio.reservas_de(documento=dni)
         if not reservas_cliente:
             self.interfaz.mostrar_mensaje("No se encontraron reservas para este DNI.", "info")
             return
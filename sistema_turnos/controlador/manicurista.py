@@ -3,21 +3,17 @@ Controlador para funcionalidades de manicurista.
 Maneja la coordinación entre interfaz y lógica de negocio para manicuristas.
 """
 
-from sistema_turnos.utils.filtros import filtrar_reservas_por_estado, filtrar_reservas_por_profesional
-from sistema_turnos.logica.atencion import (
-    marcar_como_atendida, marcar_como_no_asistio, cambiar_monto_cobrado,
-    obtener_estadisticas_reservas, obtener_reservas_pendientes
-)
+from sistema_turnos.logica.reportes import PERIODOS
 
 class ControladorManicurista:
     """
     Controlador que maneja las operaciones específicas de manicuristas.
+    Usa un servicio de turnos: local (ServicioTurnos) o el servidor de reservas (ServicioRemoto).
     """
     
-    def __init__(self, interfaz, turnos, reservas):
+    def __init__(self, interfaz, servicio):
         self.interfaz = interfaz
-        self.turnos = turnos
-        self.reservas = reservas
+        self.servicio = servicio
     
     def mostrar_resumen_reservas(self):
         """
@@ -25,7 +21,7 @@ class ControladorManicurista:
         FUNCIONALIDAD: Ver estado general de reservas y detalles específicos
         """
         # Mostrar resumen navegable y permitir selección
-        reserva_seleccionada = self.interfaz.mostrar_resumen_reservas(self.reservas)
+        reserva_seleccionada = self.interfaz.mostrar_resumen_reservas(self.servicio.listar_reservas())
         
         if reserva_seleccionada is not None:
             # Mostrar detalles de la reserva seleccionada
@@ -33,22 +29,28 @@ class ControladorManicurista:
     
     def gestionar_reservas_pendientes(self):
         """
-        Maneja la gestión de reservas pendientes.
+        Maneja la gestión de reservas pendientes, una tras otra hasta volver al menú.
+        Cada cambio confirmado se guarda enseguida (ver mostrar_opciones_reserva): un
+        corte no pierde lo ya marcado y las otras terminales lo ven al momento.
         FUNCIONALIDAD: Gestionar reservas que requieren atención
         """
-        reservas_pendientes = obtener_reservas_pendientes(self.reservas)
+        reservas_pendientes = self.servicio.reservas_pendientes()
         
         if not reservas_pendientes:
             self.interfaz.mostrar_mensaje("No hay reservas pendientes.", "info")
             return
         
-        # Mostrar lista navegable de reservas
-        reserva_seleccionada = self.interfaz.mostrar_lista_reservas_navegable(reservas_pendientes)
-        if reserva_seleccionada is None:
-            return
-        
-        # Mostrar opciones para la reserva seleccionada
-        self.interfaz.mostrar_opciones_reserva(reserva_seleccionada, self.reservas)
+        while reservas_pendientes:
+            # Mostrar lista navegable de reservas
+            reserva_seleccionada = self.interfaz.mostrar_lista_reservas_navegable(
+                reservas_pendientes, nota=self._nota_meses_recientes()
+            )
+            if reserva_seleccionada is None:
+                return
+            
+            # Mostrar opciones para la reserva seleccionada
+            self.interfaz.mostrar_opciones_reserva(reserva_seleccionada, self.servicio)
+            reservas_pendientes = self.servicio.reservas_pendientes()
     
     def filtrar_turnos(self):
         """
@@ -63,13 +65,22 @@ class ControladorManicurista:
             return
         
         # Aplicar filtro y mostrar resultados
-        filtradas = filtrar_reservas_por_estado(self.reservas, estado)
+        filtradas = self.servicio.filtrar_reservas_por_estado(estado=estado)
         if not filtradas:
             self.interfaz.mostrar_mensaje(f"No hay reservas con estado '{estado}'.", "info")
             return
         
-        self.interfaz.mostrar_lista_reservas_navegable(filtradas)
+        self.interfaz.mostrar_lista_reservas_navegable(filtradas, nota=self._nota_meses_recientes())
     
+    def _nota_meses_recientes(self):
+        """
+        Devuelve el aviso para las listas que solo cubren los meses recientes, o None si están todas.
+        """
+        desde = getattr(self.servicio, "desde", None)
+        if desde is None:
+            return None
+        return f"Solo reservas desde {desde}: las anteriores están en Ver reportes."
+
     def _pedir_filtro_estado(self, opciones_estado):
         """
         Pide al usuario que ingrese un filtro de estado.
@@ -81,7 +92,7 @@ class ControladorManicurista:
         Marca una reserva como atendida.
         FUNCIONALIDAD: Registrar que un cliente fue atendido
         """
-        resultado = marcar_como_atendida(reserva, self.reservas)
+        resultado = self.servicio.marcar_como_atendida(reserva=reserva)
         if resultado["exito"]:
             self.interfaz.mostrar_mensaje(resultado["mensaje"], "exito")
         else:
@@ -92,7 +103,7 @@ class ControladorManicurista:
         Marca una reserva como no asistió.
         FUNCIONALIDAD: Registrar que un cliente no asistió
         """
-        resultado = marcar_como_no_asistio(reserva, self.reservas)
+        resultado = self.servicio.marcar_como_no_asistio(reserva=reserva)
         if resultado["exito"]:
             self.interfaz.mostrar_mensaje(resultado["mensaje"], "exito")
         else:
@@ -107,7 +118,7 @@ class ControladorManicurista:
         if monto is None:
             return
         
-        resultado = cambiar_monto_cobrado(reserva, monto, self.reservas)
+        resultado = self.servicio.cambiar_monto_cobrado(reserva=reserva, monto=monto)
         if resultado["exito"]:
             self.interfaz.mostrar_mensaje(resultado["mensaje"], "exito")
         else:
@@ -118,5 +129,22 @@ class ControladorManicurista:
         Muestra estadísticas de las reservas.
         FUNCIONALIDAD: Generar reportes y estadísticas
         """
-        stats = obtener_estadisticas_reservas(self.reservas)
-        self.interfaz.mostrar_estadisticas(stats) 
\ No newline at end of file
+        stats = self.servicio.estadisticas()
+        self.interfaz.mostrar_estadisticas(stats)
+    
+    def mostrar_reportes(self):
+        """
+        Muestra un reporte de ingresos, ausencias y utilización por período y profesional.
+        FUNCIONALIDAD: Analizar ingresos y asistencia a lo largo del tiempo
+        """
+        opcion = self.interfaz.menu_periodo_reporte()
+        if opcion < 0 or opcion >= len(PERIODOS):
+            return
+        
+        periodo = PERIODOS[opcion]
+        filas = self.servicio.reporte(periodo=periodo, agrupar_por="profesional")
+        if not filas:
+            self.interfaz.mostrar_mensaje("No hay reservas para generar reportes.", "info")
+            return
+        
+        self.interfaz.mostrar_reporte(filas)
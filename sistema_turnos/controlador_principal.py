@@ -3,7 +3,16 @@ Controlador principal del sistema de turnos.
 Coordina los controladores específicos y maneja el flujo principal.
 """
 
-from sistema_turnos.datos.persistencia import cargar_turnos, cargar_reservas
+import os
+from contextlib import suppress
+
+from sistema_turnos.datos.persistencia import (
+    RETENCION_BACKUPS, activar_escritura_diferida, activar_registro_de_cambios, crear_backup,
+    revisar_escrituras, vaciar_escrituras, hay_cambios
+)
+from sistema_turnos.logica.agenda import TurnosAgenda
+from sistema_turnos.servicio import ServicioTurnos, cargar_datos
+from sistema_turnos.servidor import ServicioRemoto
 from sistema_turnos.controlador.cliente import ControladorCliente
 from sistema_turnos.controlador.manicurista import ControladorManicurista
 from sistema_turnos.interfaz.menus import MenusInterfaz
@@ -19,38 +28,67 @@ class ControladorPrincipal:
         self.menus = MenusInterfaz(interfaz.stdscr, interfaz.altura, interfaz.ancho)
         self.pantalla = PantallaInterfaz(interfaz.stdscr, interfaz.altura, interfaz.ancho)
         
-        # Cargar datos
-        self.turnos = cargar_turnos()
-        self.reservas = cargar_reservas()
+        # Con un servidor de reservas, los datos viven en el servidor y no en esta terminal
+        direccion = os.environ.get("SISTEMA_TURNOS_SERVIDOR")
+        if direccion:
+            self.servicio = ServicioRemoto(direccion)
+        else:
+            # Guardar en segundo plano para que la interfaz no espere al disco
+            activar_escritura_diferida()
+            # Anotar los cambios para poder volver a cualquier momento (ver datos/recuperacion.py)
+            activar_registro_de_cambios()
+            # Cargar datos e indexarlos una sola vez
+            self.servicio = ServicioTurnos()
         
         # Inicializar controladores específicos
-        self.controlador_cliente = ControladorCliente(interfaz, self.turnos, self.reservas)
-        self.controlador_manicurista = ControladorManicurista(interfaz, self.turnos, self.reservas)
+        self.controlador_cliente = ControladorCliente(interfaz, self.servicio)
+        self.controlador_manicurista = ControladorManicurista(interfaz, self.servicio)
     
     def ejecutar(self):
         """
         Método principal que ejecuta el sistema.
         """
-        while True:
-            opcion = self.menus.mostrar_menu_principal()
-            
-            if opcion == 0:  # Cliente
-                self.ejecutar_menu_cliente()
-            elif opcion == 1:  # Manicurista
-                self.ejecutar_menu_manicurista()
-            elif opcion == 2:  # Salir
-                self.pantalla.mostrar_mensaje("Gracias por usar el sistema de turnos. ¡Hasta luego!")
-                break
+        try:
+            while True:
+                self.avisar_errores_de_escritura()
+                opcion = self.menus.mostrar_menu_principal()
+                
+                if opcion == 0:  # Cliente
+                    self.ejecutar_menu_cliente()
+                elif opcion == 1:  # Manicurista
+                    self.ejecutar_menu_manicurista()
+                elif opcion == 2:  # Salir
+                    self.pantalla.mostrar_mensaje("Gracias por usar el sistema de turnos. ¡Hasta luego!")
+                    break
+        except BaseException:
+            # Un error al cerrar no debe tapar el que hizo salir
+            with suppress(Exception):
+                self.cerrar()
+            raise
+        self.cerrar()
+
+    def cerrar(self):
+        """
+        Cierra la conexión con el servidor de reservas o, con datos locales, escribe
+        lo pendiente y deja un backup de cierre.
+        """
+        if isinstance(self.servicio, ServicioRemoto):
+            self.servicio.cerrar()
+        else:
+            vaciar_escrituras()
+            crear_backup(retencion=RETENCION_BACKUPS)
     
     def ejecutar_menu_cliente(self):
         """
         Maneja el menú de cliente.
         """
         while True:
+            self.avisar_errores_de_escritura()
+            self.actualizar_datos(solo_cambios=True)
             opcion_cliente = self.menus.menu_cliente()
             
             if opcion_cliente == 0:  # Ver turnos disponibles
-                self.pantalla.mostrar_turnos(self.turnos)
+                self.pantalla.mostrar_turnos(self.servicio.turnos_disponibles())
             elif opcion_cliente == 1:  # Filtrar turnos
                 self.controlador_cliente.filtrar_turnos()
             elif opcion_cliente == 2:  # Reservar turno
@@ -67,6 +105,8 @@ class ControladorPrincipal:
         Maneja el menú de manicurista.
         """
         while True:
+            self.avisar_errores_de_escritura()
+            self.actualizar_datos(solo_cambios=True)
             opcion_manicurista = self.menus.menu_manicurista()
             
             if opcion_manicurista == 0:  # Ver resumen de reservas
@@ -75,18 +115,42 @@ class ControladorPrincipal:
                 self.controlador_manicurista.gestionar_reservas_pendientes()
             elif opcion_manicurista == 2:  # Filtrar reservas por estado
                 self.controlador_manicurista.filtrar_turnos()
-            elif opcion_manicurista == 3:  # Volver
+            elif opcion_manicurista == 3:  # Ver estadísticas
+                self.controlador_manicurista.mostrar_estadisticas()
+            elif opcion_manicurista == 4:  # Ver reportes
+                self.controlador_manicurista.mostrar_reportes()
+            elif opcion_manicurista == 5:  # Volver
                 break
     
-    def actualizar_datos(self):
+    def avisar_errores_de_escritura(self):
+        """
+        Muestra el error de un guardado en segundo plano que falló, en cuanto se
+        vuelve a un menú (los cambios se vuelven a guardar completos con el próximo).
+        """
+        if isinstance(self.servicio, ServicioRemoto):
+            return
+        try:
+            revisar_escrituras()
+        except Exception as error:
+            self.pantalla.mostrar_mensaje(f"No se pudieron guardar los últimos cambios: {error}")
+    
+    def actualizar_datos(self, solo_cambios=False):
         """
         Actualiza los datos desde los archivos.
+        Con solo_cambios=True recarga únicamente lo que otra terminal modificó,
+        y no hace nada si no hubo cambios. Devuelve True si recargó algo.
+        Con un servidor de reservas no hace falta: cada consulta ve el estado del servidor.
         """
-        self.turnos = cargar_turnos()
-        self.reservas = cargar_reservas()
+        if isinstance(self.servicio, ServicioRemoto):
+            return False
+        
+        cambiaron_reservas = not solo_cambios or hay_cambios("reservas")
+        # Los turnos de la agenda no se guardan: se derivan de las reservas
+        cambiaron_turnos = not solo_cambios or (
+            not isinstance(self.servicio.turnos, TurnosAgenda) and hay_cambios("turnos")
+        )
+        if not cambiaron_reservas and not cambiaron_turnos:
+            return False
         
-        # Actualizar referencias en controladores específicos
-        self.controlador_cliente.turnos = self.turnos
-        self.controlador_cliente.reservas = self.reservas
-        self.controlador_manicurista.turnos = self.turnos
-        self.controlador_manicurista.reservas = self.reservas 
\ No newline at end of file
+        self.servicio.turnos, self.servicio.reservas = cargar_datos(self.servicio.desde)
+        return True 
\ No newline at end of file
@@ -0,0 +1,219 @@
+"""
+Módulo de almacenamiento en SQLite para el sistema de turnos.
+Guarda cada turno y reserva como una fila indexada, de modo que las búsquedas
+y los cambios puntuales no necesiten cargar ni reescribir todos los datos.
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import closing, contextmanager, nullcontext
+
+from sistema_turnos.datos.formatos import leer_datos
+from sistema_turnos.datos.modelos import serializar
+from sistema_turnos.utils.claves import CLAVES_POR_COLECCION, valores_indexados
+
+# Columnas indexadas por colección (además de la clave y el registro completo)
+COLUMNAS = {
+    "turnos": ("fecha", "hora", "profesional", "servicio"),
+    "reservas": ("documento", "fecha", "hora", "profesional", "servicio", "estado")
+}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS turnos (
+    orden INTEGER PRIMARY KEY AUTOINCREMENT,
+    clave TEXT NOT NULL UNIQUE,
+    fecha TEXT, hora TEXT, profesional TEXT, servicio TEXT,
+    datos TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_turnos_fecha ON turnos (fecha, hora);
+CREATE INDEX IF NOT EXISTS idx_turnos_profesional ON turnos (profesional);
+CREATE INDEX IF NOT EXISTS idx_turnos_servicio ON turnos (servicio);
+
+CREATE TABLE IF NOT EXISTS reservas (
+    orden INTEGER PRIMARY KEY AUTOINCREMENT,
+    clave TEXT NOT NULL UNIQUE,
+    documento TEXT, fecha TEXT, hora TEXT, profesional TEXT, servicio TEXT, estado TEXT,
+    datos TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reservas_documento ON reservas (documento);
+CREATE INDEX IF NOT EXISTS idx_reservas_fecha ON reservas (fecha, hora);
+CREATE INDEX IF NOT EXISTS idx_reservas_profesional ON reservas (profesional);
+CREATE INDEX IF NOT EXISTS idx_reservas_servicio ON reservas (servicio);
+CREATE INDEX IF NOT EXISTS idx_reservas_estado ON reservas (estado);
+"""
+
+def _columnas_de(coleccion, registro):
+    """
+    Devuelve los valores de las columnas indexadas de un registro.
+    """
+    valores = valores_indexados(coleccion, registro)
+    return tuple(valores[columna] for columna in COLUMNAS[coleccion])
+
+class AlmacenSQLite:
+    """
+    Almacén basado en una base SQLite (modo WAL) con índices por
+    documento, profesional, servicio, estado y fecha.
+    """
+
+    # Un cambio se guarda sin la colección entera (ver EscritorDiferido)
+    registro_incremental = True
+
+    def __init__(self, ruta="turnos.db", directorio="."):
+        self.ruta = os.path.join(directorio, ruta)
+        self.directorio = directorio
+        self._en_grupo = False
+        nueva = not os.path.exists(self.ruta)
+
+        self.conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        self.conexion.executescript(ESQUEMA)
+
+        if nueva:
+            self.importar_json()
+
+    def importar_json(self):
+        """
+        Importa turnos.json y reservas.json del mismo directorio (en cualquier formato), si existen.
+        FUNCIONALIDAD: Migrar los datos existentes al crear la base
+        """
+        for coleccion in COLUMNAS:
+            ruta_json = os.path.join(self.directorio, f"{coleccion}.json")
+            try:
+                datos = leer_datos(ruta_json)
+            except (FileNotFoundError, ValueError):
+                continue
+            self.guardar(coleccion, datos)
+
+    def archivos(self):
+        """
+        Devuelve las rutas de los archivos de datos (para los backups).
+        Antes pasa a la base los cambios confirmados que están en el WAL, así el backup
+        nota que el archivo cambió. Se usa una conexión aparte: la del almacén puede
+        estar en medio de una transacción de otro hilo.
+        """
+        with closing(sqlite3.connect(self.ruta)) as conexion:
+            conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return [self.ruta]
+
+    def copiar_archivo(self, origen, destino):
+        """
+        Copia la base con la API de backup de SQLite: una foto coherente de lo
+        confirmado, incluido lo que todavía está en el WAL (para los backups).
+        """
+        with closing(sqlite3.connect(origen)) as fuente, closing(sqlite3.connect(destino)) as copia:
+            fuente.backup(copia)
+
+    def cargar(self, coleccion):
+        """
+        Carga todos los registros de una colección en orden de alta.
+        """
+        filas = self.conexion.execute(f"SELECT datos FROM {coleccion} ORDER BY orden")
+        return [json.loads(datos) for (datos,) in filas]
+
+    def recorrer(self, coleccion):
+        """
+        Recorre los registros de una colección en orden de alta, fila por fila.
+        """
+        for (datos,) in self.conexion.execute(f"SELECT datos FROM {coleccion} ORDER BY orden"):
+            yield json.loads(datos)
+
+    def guardar(self, coleccion, datos):
+        """
+        Reemplaza el contenido completo de una colección en una sola transacción.
+        """
+        with self._transaccion():
+            self.conexion.execute(f"DELETE FROM {coleccion}")
+            self.conexion.executemany(
+                self._sentencia_insertar(coleccion),
+                (self._fila(coleccion, registro) for registro in datos)
+            )
+
+    def registrar(self, coleccion, operacion, registro, datos):
+        """
+        Aplica un único cambio sobre la fila afectada.
+        """
+        with self._transaccion():
+            if operacion == "baja":
+                self.conexion.execute(
+                    f"DELETE FROM {coleccion} WHERE clave = ?",
+                    (self._clave(coleccion, registro),)
+                )
+            elif operacion == "alta":
+                self.conexion.execute(self._sentencia_insertar(coleccion), self._fila(coleccion, registro))
+            elif operacion == "modificacion":
+                columnas = COLUMNAS[coleccion]
+                asignaciones = ", ".join(f"{columna} = ?" for columna in columnas)
+                fila = self._fila(coleccion, registro)
+                self.conexion.execute(
+                    f"UPDATE {coleccion} SET {asignaciones}, datos = ? WHERE clave = ?",
+                    fila[1:] + (fila[0],)
+                )
+            else:
+                raise ValueError(f"Operación desconocida: {operacion}")
+
+    @contextmanager
+    def grupo(self):
+        """
+        Agrupa los cambios hechos dentro del bloque en una sola transacción,
+        confirmada al final (una sola espera al disco para todos).
+        FUNCIONALIDAD: Guardar varios cambios juntos (escritura agrupada)
+        """
+        if self._en_grupo:
+            yield
+            return
+        self._en_grupo = True
+        try:
+            yield
+        finally:
+            # Como en los demás almacenes, lo hecho en memoria se guarda aunque el bloque falle
+            self._en_grupo = False
+            self.conexion.commit()
+
+    def buscar(self, coleccion, **criterios):
+        """
+        Busca registros por columnas indexadas sin cargar toda la colección.
+        Los valores se comparan sin distinguir mayúsculas.
+        FUNCIONALIDAD: Consultar rápidamente turnos o reservas por criterio
+        """
+        condiciones = []
+        parametros = []
+        for columna, valor in criterios.items():
+            if valor is None:
+                continue
+            if columna not in COLUMNAS[coleccion]:
+                raise ValueError(f"No se puede buscar {coleccion} por '{columna}'")
+            condiciones.append(f"{columna} = ?")
+            parametros.append(valor if columna in ("fecha", "hora") else valor.lower())
+
+        consulta = f"SELECT datos FROM {coleccion}"
+        if condiciones:
+            consulta += " WHERE " + " AND ".join(condiciones)
+        consulta += " ORDER BY orden"
+        return [json.loads(datos) for (datos,) in self.conexion.execute(consulta, parametros)]
+
+    def cerrar(self):
+        """
+        Cierra la conexión con la base.
+        """
+        self.conexion.close()
+
+    def _transaccion(self):
+        # Dentro de un grupo, la transacción la confirma grupo() al terminar
+        return nullcontext() if self._en_grupo else self.conexion
+
+    def _clave(self, coleccion, registro):
+        return json.dumps(CLAVES_POR_COLECCION[coleccion](registro), ensure_ascii=False)
+
+    def _fila(self, coleccion, registro):
+        return (
+            (self._clave(coleccion, registro),)
+            + _columnas_de(coleccion, registro)
+            + (json.dumps(registro, ensure_ascii=False, separators=(",", ":"), default=serializar),)
+        )
+
+    def _sentencia_insertar(self, coleccion):
+        columnas = ("clave",) + COLUMNAS[coleccion] + ("datos",)
+        marcadores = ", ".join("?" for _ in columnas)
+        return f"INSERT OR REPLACE INTO {coleccion} ({', '.join(columnas)}) VALUES ({marcadores})"
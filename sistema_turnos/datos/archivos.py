@@ -0,0 +1,106 @@
+"""
+Módulo de archivos seguros para el sistema de turnos.
+Escribe en un archivo temporal, lo sincroniza con el disco (fsync) y recién entonces
+lo renombra sobre el original, así un corte nunca deja un archivo a medio escribir.
+La versión anterior queda como respaldo (.bak) para recuperarse de archivos dañados.
+"""
+
+import os
+import tempfile
+from datetime import datetime
+
+from sistema_turnos.datos.formatos import leer_datos
+
+def ruta_respaldo(ruta):
+    """
+    Devuelve la ruta de la última versión buena de un archivo.
+    """
+    return f"{ruta}.bak"
+
+def sincronizar_directorio(directorio):
+    """
+    Sincroniza un directorio para que los renombres queden en disco (solo en sistemas POSIX).
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descriptor = os.open(directorio, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+def _escribir_temporal(ruta, escribir, durable, binario=False):
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(prefix=f".{os.path.basename(ruta)}.", suffix=".tmp", dir=directorio)
+    try:
+        with (os.fdopen(descriptor, "wb") if binario else os.fdopen(descriptor, "w", encoding="utf-8")) as archivo:
+            try:
+                # mkstemp crea el archivo solo para el dueño: mantener los permisos del original
+                os.chmod(temporal, os.stat(ruta).st_mode & 0o777)
+            except FileNotFoundError:
+                pass
+            escribir(archivo)
+            archivo.flush()
+            if durable:
+                os.fsync(archivo.fileno())
+    except BaseException:
+        os.remove(temporal)
+        raise
+    return temporal
+
+def escribir_atomicos(escrituras, respaldo=True, durable=True, binario=False):
+    """
+    Escribe varios archivos de una vez: todos los temporales, luego todos los renombres
+    y una sola sincronización por directorio (escritura agrupada).
+    escrituras es una lista de (ruta, escribir), donde escribir(archivo) vuelca el contenido
+    (texto UTF-8, o bytes con binario=True).
+    FUNCIONALIDAD: Guardar sin dejar archivos cortados ante un corte de luz o un cierre inesperado
+    """
+    temporales = []
+    try:
+        for ruta, escribir in escrituras:
+            temporales.append((ruta, _escribir_temporal(ruta, escribir, durable, binario)))
+    except BaseException:
+        for _, temporal in temporales:
+            os.remove(temporal)
+        raise
+
+    directorios = set()
+    for ruta, temporal in temporales:
+        if respaldo:
+            try:
+                os.replace(ruta, ruta_respaldo(ruta))
+            except FileNotFoundError:
+                pass
+        os.replace(temporal, ruta)
+        directorios.add(os.path.dirname(os.path.abspath(ruta)))
+    if durable:
+        for directorio in directorios:
+            sincronizar_directorio(directorio)
+
+def escribir_atomico(ruta, escribir, respaldo=True, durable=True, binario=False):
+    """
+    Escribe un archivo completo de forma atómica (ver escribir_atomicos).
+    """
+    escribir_atomicos([(ruta, escribir)], respaldo, durable, binario)
+
+def leer_json(ruta, vacio=list):
+    """
+    Lee un archivo JSON (o de cualquiera de los formatos de formatos.py, que se
+    reconocen por sus primeros bytes). Si está dañado (escritura cortada), lo aparta
+    como <ruta>.danado-<fecha> y devuelve la última versión buena (.bak); si no hay
+    ninguna, devuelve vacio().
+    FUNCIONALIDAD: Recuperar la última copia buena en lugar de perder los datos
+    """
+    try:
+        return leer_datos(ruta)
+    except FileNotFoundError:
+        pass
+    except ValueError:
+        # Se conserva el archivo dañado para poder revisarlo, y no se pisa el respaldo al guardar
+        os.replace(ruta, f"{ruta}.danado-{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+    try:
+        return leer_datos(ruta_respaldo(ruta))
+    except (FileNotFoundError, ValueError):
+        return vacio()
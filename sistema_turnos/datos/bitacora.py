@@ -0,0 +1,232 @@
+"""
+Módulo de almacenamiento con bitácora (journal) para el sistema de turnos.
+Cada cambio se agrega como una línea JSON compacta al final de un archivo de bitácora,
+y periódicamente se compacta en una instantánea completa.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+
+from sistema_turnos.datos.archivos import escribir_atomico, leer_json
+from sistema_turnos.datos.formatos import leer_datos
+from sistema_turnos.datos.modelos import serializar
+from sistema_turnos.utils.claves import CLAVES_POR_COLECCION
+
+OPERACIONES = ("alta", "baja", "modificacion")
+
+class AlmacenBitacora:
+    """
+    Almacén que guarda una instantánea por colección más una bitácora de cambios.
+    Al cargar se lee la instantánea y se reaplican los cambios de la bitácora.
+    registrar no necesita la colección (datos puede ser None): si hay que compactar,
+    se reconstruye del disco.
+    """
+
+    # Un cambio se guarda sin la colección entera (ver EscritorDiferido)
+    registro_incremental = True
+
+    def __init__(self, directorio=".", limite_bitacora=500, durable=True):
+        self.directorio = directorio
+        self.limite_bitacora = limite_bitacora
+        self.durable = durable
+        self._lineas_bitacora = {}
+        self._grupo = None
+
+    def ruta_instantanea(self, coleccion):
+        """
+        Devuelve la ruta del archivo de instantánea de una colección.
+        """
+        return os.path.join(self.directorio, f"{coleccion}.json")
+
+    def ruta_bitacora(self, coleccion):
+        """
+        Devuelve la ruta del archivo de bitácora de una colección.
+        """
+        return os.path.join(self.directorio, f"{coleccion}.bitacora.jsonl")
+
+    def archivos(self):
+        """
+        Devuelve las rutas de los archivos de datos (para los backups): instantánea y bitácora de cada colección.
+        """
+        return [
+            ruta
+            for coleccion in CLAVES_POR_COLECCION
+            for ruta in (self.ruta_instantanea(coleccion), self.ruta_bitacora(coleccion))
+        ]
+
+    def cargar(self, coleccion):
+        """
+        Carga una colección reaplicando la bitácora sobre la última instantánea.
+        FUNCIONALIDAD: Reconstruir el estado actual a partir de instantánea + cambios
+        """
+        clave = CLAVES_POR_COLECCION[coleccion]
+        registros = {}
+        for registro in self._leer_instantanea(coleccion):
+            registros[clave(registro)] = registro
+
+        lineas = 0
+        for cambio in self._leer_bitacora(coleccion):
+            lineas += 1
+            aplicar_cambio(registros, tuple(cambio["clave"]), cambio["op"], cambio.get("registro"))
+
+        self._lineas_bitacora[coleccion] = lineas
+        return list(registros.values())
+
+    def guardar(self, coleccion, datos):
+        """
+        Escribe una instantánea completa y vacía la bitácora.
+        FUNCIONALIDAD: Compactar la bitácora en una instantánea
+        """
+        def escribir(archivo):
+            json.dump(list(datos), archivo, ensure_ascii=False, separators=(",", ":"), default=serializar)
+        escribir_atomico(self.ruta_instantanea(coleccion), escribir, durable=self.durable)
+
+        # Los cambios agrupados sin escribir ya están en la instantánea
+        if self._grupo is not None:
+            self._grupo.pop(coleccion, None)
+
+        # La bitácora se vacía después de escribir la instantánea (ya en disco si es durable):
+        # si se corta en el medio, reaplicar cambios ya incluidos no altera el resultado.
+        with open(self.ruta_bitacora(coleccion), "w", encoding="utf-8") as archivo:
+            if self.durable:
+                os.fsync(archivo.fileno())
+        self._lineas_bitacora[coleccion] = 0
+
+    def registrar(self, coleccion, operacion, registro, datos):
+        """
+        Agrega un cambio a la bitácora y compacta si se superó el límite.
+        FUNCIONALIDAD: Guardar un cambio sin reescribir toda la colección
+        """
+        if operacion not in OPERACIONES:
+            raise ValueError(f"Operación desconocida: {operacion}")
+
+        cambio = {
+            "op": operacion,
+            "clave": list(CLAVES_POR_COLECCION[coleccion](registro))
+        }
+        if operacion != "baja":
+            cambio["registro"] = registro
+
+        if coleccion not in self._lineas_bitacora:
+            self._lineas_bitacora[coleccion] = sum(1 for _ in self._leer_bitacora(coleccion))
+
+        linea = json.dumps(cambio, ensure_ascii=False, separators=(",", ":"), default=serializar) + "\n"
+        if self._grupo is not None:
+            self._grupo.setdefault(coleccion, []).append(linea)
+        else:
+            self._agregar_lineas(coleccion, [linea])
+        self._lineas_bitacora[coleccion] += 1
+
+        if self._lineas_bitacora[coleccion] >= self.limite_bitacora:
+            if datos is not None:
+                self.guardar(coleccion, datos)
+            elif self._grupo is None:
+                self.guardar(coleccion, self.cargar(coleccion))
+
+    @contextmanager
+    def grupo(self):
+        """
+        Agrupa los cambios registrados dentro del bloque: se agregan a la bitácora
+        al final, con una sola espera al disco por colección.
+        FUNCIONALIDAD: Guardar varios cambios juntos (escritura agrupada)
+        """
+        if self._grupo is not None:
+            yield
+            return
+        self._grupo = {}
+        try:
+            yield
+        finally:
+            pendientes, self._grupo = self._grupo, None
+            for coleccion, lineas in pendientes.items():
+                self._agregar_lineas(coleccion, lineas)
+                # Compactación que quedó esperando el fin del grupo (cambios sin datos)
+                if self._lineas_bitacora.get(coleccion, 0) >= self.limite_bitacora:
+                    self.guardar(coleccion, self.cargar(coleccion))
+
+    def _agregar_lineas(self, coleccion, lineas):
+        self._recortar_linea_incompleta(coleccion)
+        with open(self.ruta_bitacora(coleccion), "a", encoding="utf-8") as archivo:
+            archivo.writelines(lineas)
+            if self.durable:
+                archivo.flush()
+                os.fsync(archivo.fileno())
+
+    def _recortar_linea_incompleta(self, coleccion):
+        """
+        Si un cierre inesperado dejó la bitácora terminada en una línea cortada, la recorta
+        hasta la última línea completa. Si no, el próximo cambio quedaría pegado a la línea
+        cortada y no se volvería a leer.
+        """
+        try:
+            archivo = open(self.ruta_bitacora(coleccion), "r+b")
+        except FileNotFoundError:
+            return
+        with archivo:
+            fin = archivo.seek(0, os.SEEK_END)
+            if fin == 0:
+                return
+            posicion = fin
+            # Se busca hacia atrás el último salto de línea (las líneas son cortas)
+            while posicion > 0:
+                inicio = max(0, posicion - 4096)
+                archivo.seek(inicio)
+                bloque = archivo.read(posicion - inicio)
+                if posicion == fin and bloque.endswith(b"\n"):
+                    return
+                salto = bloque.rfind(b"\n")
+                if salto >= 0:
+                    posicion = inicio + salto + 1
+                    break
+                posicion = inicio
+            archivo.truncate(posicion)
+            if self.durable:
+                os.fsync(archivo.fileno())
+
+    def _leer_instantanea(self, coleccion):
+        """
+        Lee la instantánea de una colección, o una lista vacía si no existe.
+        Si falta porque se cortó su reemplazo, se usa la anterior (.bak): la bitácora
+        todavía no se había vaciado. Si está dañada no se vuelve a la anterior, porque
+        los cambios que se compactaron en ella ya no están en la bitácora: ValueError.
+        """
+        ruta = self.ruta_instantanea(coleccion)
+        try:
+            return leer_datos(ruta)
+        except FileNotFoundError:
+            return leer_json(ruta)
+        except ValueError as error:
+            raise ValueError(
+                f"La instantánea {ruta} está dañada y sus cambios ya no están en la bitácora: "
+                "hay que restaurar un backup (python -m sistema_turnos.datos.recuperacion)"
+            ) from error
+
+    def _leer_bitacora(self, coleccion):
+        """
+        Recorre los cambios de la bitácora, salteando una línea incompleta (escritura
+        cortada por un cierre inesperado; ver _recortar_linea_incompleta).
+        """
+        try:
+            with open(self.ruta_bitacora(coleccion), "r", encoding="utf-8") as archivo:
+                for linea in archivo:
+                    linea = linea.strip()
+                    if not linea:
+                        continue
+                    try:
+                        yield json.loads(linea)
+                    except json.JSONDecodeError:
+                        # Escritura cortada: los cambios que siguen (si los hay) se aplican igual
+                        continue
+        except FileNotFoundError:
+            return
+
+def aplicar_cambio(registros, clave, operacion, registro):
+    """
+    Aplica un cambio de bitácora sobre un diccionario clave -> registro.
+    FUNCIONALIDAD: Reproducir cambios de forma idempotente
+    """
+    if operacion == "baja":
+        registros.pop(clave, None)
+    else:
+        registros[clave] = registro
@@ -0,0 +1,248 @@
+"""
+Módulo de acceso compartido para el sistema de turnos.
+Permite que varias terminales usen los mismos archivos: cada escritura se hace con
+un bloqueo de archivo (fcntl, o msvcrt en Windows) y un número de versión por
+colección. Si otra terminal escribió desde la última carga, el cambio se vuelve a
+aplicar sobre los datos actuales del disco, y se rechaza si choca con ellos
+(por ejemplo, dos terminales reservando el mismo turno).
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+from sistema_turnos.datos.archivos import escribir_atomico
+from sistema_turnos.utils.claves import CLAVES_POR_COLECCION, clave_turno
+from sistema_turnos.utils.intervalos import se_superpone_con_reservas
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+class ConflictoConcurrencia(Exception):
+    """
+    Otra terminal cambió los datos de forma incompatible con el cambio pedido.
+    """
+
+class BloqueoArchivo:
+    """
+    Bloqueo exclusivo entre procesos sobre un archivo. Se puede anidar en un mismo proceso.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._archivo = None
+        self._profundidad = 0
+        self._hilos = threading.RLock()
+
+    def __enter__(self):
+        self._hilos.acquire()
+        if self._profundidad == 0:
+            archivo = open(self.ruta, "a+")
+            try:
+                _bloquear(archivo)
+            except BaseException:
+                archivo.close()
+                self._hilos.release()
+                raise
+            self._archivo = archivo
+        self._profundidad += 1
+        return self
+
+    def __exit__(self, *error):
+        self._profundidad -= 1
+        if self._profundidad == 0:
+            try:
+                _desbloquear(self._archivo)
+            finally:
+                self._archivo.close()
+                self._archivo = None
+        self._hilos.release()
+
+def _bloquear(archivo):
+    if fcntl is not None:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+        return
+    archivo.seek(0)
+    while True:
+        try:
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            # LK_LOCK se rinde después de 10 intentos: seguir esperando
+            continue
+
+def _desbloquear(archivo):
+    if fcntl is not None:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+        return
+    archivo.seek(0)
+    msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+class AlmacenCompartido:
+    """
+    Almacén que envuelve a otro para usarlo desde varias terminales a la vez.
+    Recuerda la versión de cada colección que cargó; al escribir, si la versión
+    del disco es otra, aplica el cambio sobre los datos del disco en lugar de
+    pisarlos con los de memoria.
+    """
+
+    def __init__(self, almacen, directorio="."):
+        self.almacen = almacen
+        self.directorio = directorio
+        self.bloqueo = BloqueoArchivo(os.path.join(directorio, "turnos.lock"))
+        self._versiones = {}
+        # Dentro de grupo(): colección -> datos combinados que todavía no se escribieron
+        self._combinados = None
+
+    def ruta_version(self, coleccion):
+        """
+        Devuelve la ruta del archivo con el número de versión de una colección.
+        """
+        return os.path.join(self.directorio, f"{coleccion}.version")
+
+    def version(self, coleccion):
+        """
+        Lee el número de versión de una colección (0 si nunca se escribió).
+        """
+        try:
+            with open(self.ruta_version(coleccion), "r", encoding="utf-8") as archivo:
+                return int(archivo.read() or 0)
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            # Archivo de versión cortado: forzar a releer los datos
+            return -1
+
+    def hay_cambios(self, coleccion):
+        """
+        Indica si otra terminal escribió la colección desde la última carga.
+        FUNCIONALIDAD: Detectar cambios de otras terminales sin releer los datos
+        """
+        return self._versiones.get(coleccion) != self.version(coleccion)
+
+    def cargar(self, coleccion, **rango):
+        """
+        Carga una colección (o los meses de rango, si el almacén lo permite) y recuerda su versión.
+        """
+        with self.bloqueo:
+            # Leer solo la historia (meses hasta un límite) no actualiza lo que tiene la memoria
+            if rango.get("hasta") is None:
+                self._versiones[coleccion] = self.version(coleccion)
+            return self.almacen.cargar(coleccion, **rango)
+
+    def guardar(self, coleccion, datos):
+        """
+        Guarda una colección completa, solo si nadie la cambió desde la última carga.
+        """
+        with self.bloqueo:
+            if self.hay_cambios(coleccion):
+                raise ConflictoConcurrencia(
+                    f"Otra terminal modificó {coleccion}. Actualice los datos antes de guardar."
+                )
+            self._versiones[coleccion] = self._nueva_version(coleccion)
+            self.almacen.guardar(coleccion, datos)
+
+    def registrar(self, coleccion, operacion, registro, datos):
+        """
+        Registra un cambio. Si otra terminal escribió antes, el cambio se aplica sobre
+        los datos actuales del disco (y se rechaza si choca con ellos).
+        FUNCIONALIDAD: Evitar que dos terminales se pisen o reserven el mismo turno
+        """
+        with self.bloqueo:
+            if not self.hay_cambios(coleccion):
+                self._versiones[coleccion] = self._nueva_version(coleccion)
+                self.almacen.registrar(coleccion, operacion, registro, datos)
+                return
+
+            # Dentro de un grupo, el disco todavía no tiene los cambios anteriores del grupo
+            actuales = (self._combinados or {}).get(coleccion)
+            if actuales is None:
+                actuales = self.almacen.cargar(coleccion)
+            combinados = combinar_cambio(coleccion, operacion, registro, actuales)
+            if self._combinados is not None:
+                self._combinados[coleccion] = combinados
+            # La versión conocida no se actualiza: la memoria de esta terminal sigue
+            # sin los cambios de las otras hasta que se vuelva a cargar
+            self._nueva_version(coleccion)
+            self.almacen.registrar(coleccion, operacion, registro, combinados)
+
+    @contextmanager
+    def grupo(self):
+        """
+        Mantiene el bloqueo durante todo el bloque, y agrupa las escrituras si el almacén lo permite.
+        Los cambios que chocan con otra terminal se combinan sobre lo ya combinado en el grupo.
+        """
+        with self.bloqueo:
+            if self._combinados is not None:
+                yield
+                return
+            self._combinados = {}
+            try:
+                if hasattr(self.almacen, "grupo"):
+                    with self.almacen.grupo():
+                        yield
+                else:
+                    yield
+            finally:
+                self._combinados = None
+
+    def cerrar(self):
+        """
+        Cierra el almacén envuelto.
+        """
+        if hasattr(self.almacen, "cerrar"):
+            self.almacen.cerrar()
+
+    def __getattr__(self, nombre):
+        # Otras operaciones del almacén envuelto (buscar, ruta...)
+        if nombre.startswith("_") or nombre == "almacen":
+            raise AttributeError(nombre)
+        return getattr(self.almacen, nombre)
+
+    def _nueva_version(self, coleccion):
+        # Se incrementa antes de escribir los datos: si la escritura se corta, las
+        # demás terminales solo releen de más, nunca se pierden un cambio
+        version = max(self.version(coleccion), 0) + 1
+        escribir_atomico(self.ruta_version(coleccion), lambda archivo: archivo.write(str(version)), respaldo=False)
+        return version
+
+def combinar_cambio(coleccion, operacion, registro, actuales):
+    """
+    Aplica un cambio sobre los datos actuales del disco y devuelve la lista resultante.
+    Lanza ConflictoConcurrencia si el cambio ya no es válido.
+    """
+    clave = CLAVES_POR_COLECCION[coleccion]
+    identidad = clave(registro)
+    posicion = next(
+        (indice for indice, actual in enumerate(actuales) if clave(actual) == identidad),
+        None
+    )
+
+    if operacion == "alta":
+        if posicion is not None:
+            return actuales
+        if coleccion == "reservas":
+            # La misma regla que crear_reserva: un turno reservado por DNI
+            documento = registro["documento"].lower()
+            if any(actual["documento"].lower() == documento for actual in actuales):
+                raise ConflictoConcurrencia("Ya hay un turno reservado con este DNI desde otra terminal.")
+            turno = registro["turno"]
+            if any(clave_turno(actual["turno"]) == clave_turno(turno) for actual in actuales):
+                raise ConflictoConcurrencia("El turno seleccionado ya fue reservado desde otra terminal.")
+            if se_superpone_con_reservas(turno, actuales):
+                raise ConflictoConcurrencia("El turno se superpone con una reserva hecha desde otra terminal.")
+        return actuales + [registro]
+
+    if operacion == "baja":
+        if posicion is None:
+            if coleccion == "reservas":
+                raise ConflictoConcurrencia("La reserva ya fue cancelada desde otra terminal.")
+            return actuales
+        return actuales[:posicion] + actuales[posicion + 1:]
+
+    if posicion is None:
+        raise ConflictoConcurrencia("El registro ya no existe: fue eliminado desde otra terminal.")
+    return actuales[:posicion] + [registro] + actuales[posicion + 1:]
@@ -0,0 +1,208 @@
+"""
+Módulo de escritura diferida para el sistema de turnos.
+Envuelve un almacén y hace las escrituras en un hilo aparte, para que la interfaz
+no se congele mientras se guarda en disco. Si llegan varios guardados de la misma
+colección antes de escribirla, solo se escribe el último, y lo pendiente de varias
+colecciones se escribe junto cuando el almacén permite agrupar escrituras.
+Con almacenes incrementales (registro_incremental: bitácora, SQLite, particionado)
+un cambio copia solo el registro cambiado, no la colección entera.
+"""
+
+import functools
+import queue
+import threading
+from contextlib import contextmanager, nullcontext
+
+def copiar_registro(registro):
+    """
+    Copia un registro para que los cambios posteriores en memoria no afecten lo que se escribe.
+    """
+    if isinstance(registro, dict):
+        return dict(registro)
+    if hasattr(registro, "a_dict"):
+        return registro.a_dict()
+    return registro
+
+class EscritorDiferido:
+    """
+    Almacén que delega en otro almacén, escribiendo en segundo plano.
+    Las lecturas esperan a que se escriba lo pendiente, así siempre ven el último estado.
+    Si una escritura falla, el error queda en self.error (ver revisar) y el próximo
+    cambio de esa colección se escribe como guardado completo, para no perder nada.
+    """
+
+    def __init__(self, almacen, tamanio_cola=16):
+        self.almacen = almacen
+        self.error = None
+        self._incremental = getattr(almacen, "registro_incremental", False)
+        self._fallidas = set()
+        self._pendientes = {}
+        self._grupo = None
+        self._bloqueo = threading.Lock()
+        self._cola = queue.Queue(maxsize=tamanio_cola)
+        self._hilo = threading.Thread(target=self._trabajar, name="escritor-turnos", daemon=True)
+        self._hilo.start()
+
+    def cargar(self, coleccion, **rango):
+        """
+        Carga una colección (o los meses de rango, si el almacén lo permite) después de escribir lo pendiente.
+        """
+        self.vaciar()
+        return self.almacen.cargar(coleccion, **rango)
+
+    def __getattr__(self, nombre):
+        # Otras operaciones del almacén envuelto (buscar, archivos...) ven lo ya escrito;
+        # los atributos simples (y preguntar si existen) no esperan al disco
+        if nombre.startswith("_") or nombre == "almacen":
+            raise AttributeError(nombre)
+        atributo = getattr(self.almacen, nombre)
+        if not callable(atributo):
+            return atributo
+
+        @functools.wraps(atributo)
+        def despues_de_vaciar(*argumentos, **parametros):
+            self.vaciar()
+            return atributo(*argumentos, **parametros)
+        return despues_de_vaciar
+
+    def guardar(self, coleccion, datos):
+        """
+        Encola el guardado completo de una colección.
+        """
+        self._encolar(coleccion, ("guardar", [copiar_registro(r) for r in datos]))
+
+    def registrar(self, coleccion, operacion, registro, datos):
+        """
+        Encola un cambio.
+        Con un almacén incremental se copia solo el registro, y los cambios pendientes
+        de una colección se escriben juntos, en orden. Con los demás el cambio lleva una
+        copia de la colección; si ya había otro pendiente, los dos se reemplazan por un
+        guardado completo del estado actual.
+        Dentro de grupo() el cambio se anota y se encola al final del grupo.
+        """
+        if self._grupo is not None:
+            cambios, _ = self._grupo.get(coleccion, ([], None))
+            cambios.append((operacion, registro))
+            self._grupo[coleccion] = (cambios, datos)
+            return
+        cambio = (operacion, copiar_registro(registro))
+        with self._bloqueo:
+            pendiente = self._pendientes.get(coleccion)
+            completo = pendiente is not None or coleccion in self._fallidas
+            if self._incremental and coleccion not in self._fallidas:
+                if pendiente is not None and pendiente[0] == "cambios":
+                    pendiente[1].append(cambio)
+                    return
+                if pendiente is None:
+                    self._pendientes[coleccion] = ("cambios", [cambio])
+                    completo = None
+        if completo is None:
+            # Con la cola llena se espera: el almacenamiento marca el ritmo
+            self._cola.put(coleccion)
+        elif completo:
+            self.guardar(coleccion, datos)
+        else:
+            self._encolar(coleccion, ("registrar", *cambio, [copiar_registro(r) for r in datos]))
+
+    @contextmanager
+    def grupo(self):
+        """
+        Junta los cambios registrados dentro del bloque: al final se encola uno solo
+        por colección (el cambio mismo si fue uno, o un guardado completo si fueron
+        varios), así los datos se copian una vez y no una por cambio. Con un almacén
+        incremental se encolan los cambios mismos, sin copiar la colección.
+        FUNCIONALIDAD: Guardar varios cambios juntos (escritura agrupada)
+        """
+        if self._grupo is not None:
+            yield
+            return
+        self._grupo = {}
+        try:
+            yield
+        finally:
+            pendientes, self._grupo = self._grupo, None
+            for coleccion, (cambios, datos) in pendientes.items():
+                if len(cambios) == 1 or self._incremental:
+                    for operacion, registro in cambios:
+                        self.registrar(coleccion, operacion, registro, datos)
+                else:
+                    self.guardar(coleccion, datos)
+
+    def vaciar(self):
+        """
+        Espera a que se escriba todo lo pendiente (barrera).
+        Si una escritura en segundo plano falló, relanza el error.
+        FUNCIONALIDAD: Asegurar que los cambios ya están en disco
+        """
+        self._cola.join()
+        self.revisar()
+
+    def revisar(self):
+        """
+        Relanza, sin esperar lo pendiente, el error de una escritura en segundo plano
+        que ya falló (la interfaz lo consulta a menudo para avisar enseguida).
+        """
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def cerrar(self):
+        """
+        Escribe lo pendiente, detiene el hilo y cierra el almacén envuelto.
+        """
+        if self._hilo.is_alive():
+            self._cola.put(None)
+            self._hilo.join()
+        if hasattr(self.almacen, "cerrar"):
+            self.almacen.cerrar()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _encolar(self, coleccion, tarea):
+        with self._bloqueo:
+            ya_encolada = coleccion in self._pendientes
+            self._pendientes[coleccion] = tarea
+        if not ya_encolada:
+            # Con la cola llena se espera: el almacenamiento marca el ritmo
+            self._cola.put(coleccion)
+
+    def _trabajar(self):
+        while True:
+            coleccion = self._cola.get()
+            try:
+                if coleccion is None:
+                    return
+                # Se toma todo lo pendiente, no solo esta colección: las entradas de las
+                # otras quedan vacías en la cola y se saltean
+                with self._bloqueo:
+                    tareas, self._pendientes = self._pendientes, {}
+                grupo = getattr(self.almacen, "grupo", None)
+                with grupo() if grupo is not None and len(tareas) > 1 else nullcontext():
+                    for coleccion_tarea, tarea in tareas.items():
+                        self._escribir(coleccion_tarea, tarea)
+            except Exception as error:
+                self.error = error
+            finally:
+                self._cola.task_done()
+
+    def _escribir(self, coleccion, tarea):
+        try:
+            if tarea[0] == "guardar":
+                self.almacen.guardar(coleccion, tarea[1])
+                with self._bloqueo:
+                    self._fallidas.discard(coleccion)
+            elif tarea[0] == "cambios":
+                # Sin la colección: el almacén incremental aplica cada cambio por su cuenta
+                grupo = getattr(self.almacen, "grupo", None)
+                with grupo() if grupo is not None and len(tarea[1]) > 1 else nullcontext():
+                    for operacion, registro in tarea[1]:
+                        self.almacen.registrar(coleccion, operacion, registro, None)
+            else:
+                _, operacion, registro, datos = tarea
+                self.almacen.registrar(coleccion, operacion, registro, datos)
+        except Exception as error:
+            self.error = error
+            # Lo que no se escribió se recupera con un guardado completo en el próximo cambio
+            with self._bloqueo:
+                self._fallidas.add(coleccion)
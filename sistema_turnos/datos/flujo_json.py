@@ -0,0 +1,144 @@
+"""
+Módulo de lectura y escritura de listas JSON de a un registro para el sistema de turnos.
+leer_registros recorre un archivo con una lista JSON (turnos.json, reservas.json)
+devolviendo los registros de a uno, leyendo el archivo por bloques; EscritorRegistros
+escribe una lista de a un registro. Así se pueden filtrar, exportar y resumir archivos
+más grandes que la memoria sin armar el documento entero.
+"""
+
+import json
+import re
+
+from sistema_turnos.datos.modelos import serializar
+
+# Tamaño de cada lectura del archivo
+TAMANIO_BLOQUE = 64 * 1024
+# Registros que EscritorRegistros codifica juntos
+REGISTROS_POR_TANDA = 256
+# Un registro pendiente más largo que esto se considera un archivo dañado (no se sigue leyendo)
+TAMANIO_MAXIMO_REGISTRO = 16 * 1024 * 1024
+
+_ESPACIOS = re.compile(r"[ \t\n\r]*")
+
+def leer_registros(origen, tamanio_bloque=TAMANIO_BLOQUE):
+    """
+    Recorre los registros de una lista JSON de a uno (generador).
+    origen es una ruta o un archivo de texto abierto. La memoria usada depende
+    del tamaño de cada registro, no del archivo.
+    Lanza json.JSONDecodeError si el archivo no es una lista JSON válida
+    (después de devolver los registros buenos anteriores).
+    FUNCIONALIDAD: Procesar archivos de datos más grandes que la memoria
+    """
+    if hasattr(origen, "read"):
+        yield from _recorrer_lista(origen, tamanio_bloque)
+        return
+    with open(origen, "r", encoding="utf-8") as archivo:
+        yield from _recorrer_lista(archivo, tamanio_bloque)
+
+def _recorrer_lista(archivo, tamanio_bloque):
+    decodificador = json.JSONDecoder()
+    texto, posicion, fin = "", 0, False
+
+    def siguiente_caracter():
+        # Saltea espacios leyendo más bloques si hace falta; "" al final del archivo
+        nonlocal texto, posicion, fin
+        while True:
+            posicion = _ESPACIOS.match(texto, posicion).end()
+            if posicion < len(texto) or fin:
+                return texto[posicion:posicion + 1]
+            texto, posicion = archivo.read(tamanio_bloque), 0
+            fin = not texto
+
+    def siguiente_registro():
+        # Decodifica un registro; si quedó cortado al final del bloque, lee otro y reintenta
+        nonlocal texto, posicion, fin
+        siguiente_caracter()
+        while True:
+            try:
+                registro, final = decodificador.raw_decode(texto, posicion)
+                if final < len(texto) or fin:
+                    posicion = final
+                    return registro
+            except json.JSONDecodeError:
+                if fin or len(texto) - posicion > TAMANIO_MAXIMO_REGISTRO:
+                    raise
+            bloque = archivo.read(tamanio_bloque)
+            fin = not bloque
+            texto, posicion = texto[posicion:] + bloque, 0
+
+    if siguiente_caracter() != "[":
+        raise json.JSONDecodeError("Se esperaba una lista JSON", texto, posicion)
+    posicion += 1
+    if siguiente_caracter() == "]":
+        return
+    while True:
+        yield siguiente_registro()
+        caracter = siguiente_caracter()
+        posicion += 1
+        if caracter == "]":
+            return
+        if caracter != ",":
+            raise json.JSONDecodeError("Se esperaba ',' o ']'", texto, posicion - 1)
+
+class EscritorRegistros:
+    """
+    Escribe una lista JSON en un archivo de texto abierto, de a un registro.
+    Con indent el resultado es igual al de json.dump(..., indent=indent); sin indent
+    es compacto. Los registros se codifican de a REGISTROS_POR_TANDA (tan rápido como
+    json.dump, con memoria acotada). Se usa como contexto: al salir se cierra la lista.
+    """
+
+    def __init__(self, archivo, indent=None):
+        self.archivo = archivo
+        self.indent = indent
+        self.cantidad = 0
+        self._tanda = []
+        self._codificar = json.JSONEncoder(
+            ensure_ascii=False, indent=indent, default=serializar,
+            separators=(",", ":") if indent is None else None
+        ).encode
+
+    def escribir(self, registro):
+        """
+        Agrega un registro (diccionario o modelo) a la lista.
+        """
+        self._tanda.append(registro)
+        if len(self._tanda) >= REGISTROS_POR_TANDA:
+            self._volcar()
+
+    def cerrar(self):
+        """
+        Escribe lo pendiente y cierra la lista (no cierra el archivo).
+        """
+        self._volcar()
+        if not self.cantidad:
+            self.archivo.write("[]")
+        else:
+            self.archivo.write("]" if self.indent is None else "\n]")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *error):
+        self.cerrar()
+
+    def _volcar(self):
+        if not self._tanda:
+            return
+        # La tanda se codifica como lista y se le sacan los corchetes: con indent,
+        # sus registros ya quedan con la sangría de los elementos de la lista
+        if self.indent is None:
+            self.archivo.write(("," if self.cantidad else "[") + self._codificar(self._tanda)[1:-1])
+        else:
+            self.archivo.write((",\n" if self.cantidad else "[\n") + self._codificar(self._tanda)[2:-2])
+        self.cantidad += len(self._tanda)
+        self._tanda = []
+
+def escribir_registros(archivo, registros, indent=None):
+    """
+    Escribe los registros de un iterable como lista JSON, de a uno. Devuelve cuántos escribió.
+    """
+    with EscritorRegistros(archivo, indent) as escritor:
+        for registro in registros:
+            escritor.escribir(registro)
+    return escritor.cantidad
@@ -0,0 +1,349 @@
+"""
+Módulo de formatos de archivo para el sistema de turnos.
+Los datos de una colección se pueden guardar como:
+    json            lista JSON con sangría (el formato de siempre, fácil de leer a mano)
+    json-compacto   lista JSON sin espacios
+    orjson          lista JSON compacta escrita con orjson (si está instalado; enteros de hasta 64 bits)
+    binario         registros binarios compactos (textos repetidos guardados una sola vez)
+y cualquiera de ellos comprimido con gzip o lzma ("json-compacto+gzip", "binario+lzma").
+Al leer, el formato se reconoce por los primeros bytes del archivo, así se puede
+cambiar de formato sin convertir nada: el nombre del archivo no cambia.
+Si orjson está instalado, todos los JSON se leen con orjson.
+"""
+
+import gzip
+import io
+import json
+import lzma
+import struct
+
+from sistema_turnos.datos.flujo_json import EscritorRegistros, leer_registros
+from sistema_turnos.datos.modelos import serializar
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FORMATOS = ("json", "json-compacto", "orjson", "binario")
+
+# Compresiones: (primeros bytes del archivo, abrir para escribir, descomprimir, abrir para leer)
+COMPRESIONES = {
+    "gzip": (
+        b"\x1f\x8b",
+        lambda archivo: gzip.GzipFile(fileobj=archivo, mode="wb", compresslevel=6, mtime=0),
+        gzip.decompress,
+        lambda archivo: gzip.GzipFile(fileobj=archivo, mode="rb")
+    ),
+    "lzma": (
+        b"\xfd7zXZ\x00",
+        lambda archivo: lzma.LZMAFile(archivo, "wb", preset=1),
+        lzma.decompress,
+        lambda archivo: lzma.LZMAFile(archivo, "rb")
+    )
+}
+
+MAGIA_BINARIA = b"TURNOSB1"
+
+# Etiquetas de los valores del formato binario
+_NULO, _FALSO, _VERDADERO, _ENTERO, _REAL, _REAL_ENTERO, _TEXTO, _LISTA, _OBJETO = range(9)
+
+def formatos_disponibles():
+    """
+    Devuelve los nombres de formato que se pueden usar (orjson solo si está instalado).
+    """
+    bases = [formato for formato in FORMATOS if formato != "orjson" or orjson is not None]
+    return bases + [f"{base}+{compresion}" for base in bases for compresion in COMPRESIONES]
+
+def validar_formato(formato):
+    """
+    Lanza ValueError si el formato no existe o no se puede usar.
+    """
+    base, separador, compresion = formato.partition("+")
+    if base not in FORMATOS or (separador and compresion not in COMPRESIONES):
+        raise ValueError(f"Formato desconocido: {formato}. Opciones: {', '.join(formatos_disponibles())}")
+    if base == "orjson" and orjson is None:
+        raise ValueError("El formato orjson necesita el paquete orjson (pip install orjson)")
+
+def escribir_datos(archivo, registros, formato="json"):
+    """
+    Escribe los registros en un archivo binario abierto, en el formato pedido.
+    FUNCIONALIDAD: Elegir entre archivos legibles y archivos chicos y rápidos
+    """
+    base, _, compresion = formato.partition("+")
+    if compresion:
+        with COMPRESIONES[compresion][1](archivo) as comprimido:
+            _escribir_base(comprimido, registros, base)
+    else:
+        _escribir_base(archivo, registros, base)
+
+def _escribir_base(archivo, registros, base):
+    if base == "binario":
+        archivo.write(codificar_binario(registros))
+    elif base == "orjson":
+        archivo.write(orjson.dumps(list(registros), default=serializar))
+    else:
+        texto = io.TextIOWrapper(archivo, encoding="utf-8")
+        with EscritorRegistros(texto, indent=4 if base == "json" else None) as escritor:
+            for registro in registros:
+                escritor.escribir(registro)
+        texto.flush()
+        # Se suelta el archivo sin cerrarlo: lo cierra quien lo abrió
+        texto.detach()
+
+def detectar_formato(contenido):
+    """
+    Devuelve el formato de un archivo a partir de sus primeros bytes
+    ("json" para cualquier JSON, "binario", y "+gzip"/"+lzma" si está comprimido).
+    Para saber el formato de lo comprimido hacen falta los bytes ya descomprimidos.
+    """
+    for compresion, (magia, *_) in COMPRESIONES.items():
+        if contenido.startswith(magia):
+            return f"{_detectar_base(COMPRESIONES[compresion][2](contenido))}+{compresion}"
+    return _detectar_base(contenido)
+
+def _detectar_base(contenido):
+    return "binario" if contenido.startswith(MAGIA_BINARIA) else "json"
+
+def leer_datos(ruta):
+    """
+    Lee la lista de registros de un archivo en cualquiera de los formatos.
+    Un archivo dañado o cortado lanza ValueError (json.JSONDecodeError es un ValueError).
+    """
+    with open(ruta, "rb") as archivo:
+        contenido = archivo.read()
+    try:
+        for magia, _, descomprimir, _ in COMPRESIONES.values():
+            if contenido.startswith(magia):
+                contenido = descomprimir(contenido)
+                break
+        if contenido.startswith(MAGIA_BINARIA):
+            return decodificar_binario(contenido)
+    except (EOFError, OSError, lzma.LZMAError, struct.error, IndexError, KeyError) as error:
+        raise ValueError(f"Archivo dañado: {ruta} ({error})") from error
+    if orjson is not None:
+        try:
+            return orjson.loads(contenido)
+        except orjson.JSONDecodeError as error:
+            raise ValueError(f"Archivo dañado: {ruta} ({error})") from error
+    return json.loads(contenido)
+
+def archivo_completo(ruta):
+    """
+    Indica, sin decodificar los registros, si un archivo parece escrito hasta el final:
+    un JSON tiene que terminar en "]", un lzma en su marca de cierre y un gzip se
+    descomprime hasta el final sin guardar lo descomprimido. Así un archivo cortado se
+    nota antes de empezar a recorrerlo. Los binarios se verifican al decodificarlos.
+    """
+    with open(ruta, "rb") as archivo:
+        inicio = archivo.read(len(MAGIA_BINARIA))
+        if inicio.startswith(COMPRESIONES["gzip"][0]):
+            archivo.seek(0)
+            try:
+                with COMPRESIONES["gzip"][3](archivo) as flujo:
+                    while flujo.read(1024 * 1024):
+                        pass
+            except (EOFError, OSError):
+                return False
+            return True
+        if inicio.startswith(COMPRESIONES["lzma"][0]):
+            archivo.seek(0, io.SEEK_END)
+            archivo.seek(max(archivo.tell() - 2, 0))
+            return archivo.read() == b"YZ"
+        if inicio.startswith(MAGIA_BINARIA):
+            return True
+        archivo.seek(0, io.SEEK_END)
+        archivo.seek(max(archivo.tell() - 64, 0))
+        return archivo.read().rstrip().endswith(b"]")
+
+def recorrer_datos(ruta):
+    """
+    Recorre los registros de un archivo en cualquiera de los formatos, de a uno.
+    Los JSON (comprimidos o no) se leen por bloques (ver flujo_json); los binarios
+    se leen enteros, así su daño se nota antes del primer registro.
+    Un archivo dañado lanza ValueError (ver archivo_completo para notarlo antes).
+    """
+    with open(ruta, "rb") as archivo:
+        inicio = archivo.read(len(MAGIA_BINARIA))
+        archivo.seek(0)
+        flujo = archivo
+        for magia, _, _, abrir in COMPRESIONES.values():
+            if inicio.startswith(magia):
+                flujo = abrir(archivo)
+                inicio = flujo.read(len(MAGIA_BINARIA))
+                flujo.seek(0)
+                break
+        if inicio.startswith(MAGIA_BINARIA):
+            try:
+                registros = decodificar_binario(flujo.read())
+            except (EOFError, OSError, lzma.LZMAError, struct.error, IndexError, KeyError) as error:
+                raise ValueError(f"Archivo dañado: {ruta} ({error})") from error
+            yield from registros
+            return
+        try:
+            yield from leer_registros(io.TextIOWrapper(flujo, encoding="utf-8"))
+        except (EOFError, OSError, lzma.LZMAError) as error:
+            raise ValueError(f"Archivo dañado: {ruta} ({error})") from error
+
+def codificar_binario(registros):
+    """
+    Codifica registros (diccionarios, listas, textos, números, None, booleanos o modelos)
+    en el formato binario: MAGIA_BINARIA, la tabla de textos, la tabla de formas de
+    objeto (sus claves) y los registros. Cada texto y cada forma se guardan una vez
+    y los registros los nombran por su número; los enteros van como varint.
+    """
+    textos = {}
+    formas = {}
+    cuerpo = bytearray()
+    cantidad = 0
+
+    def texto(valor):
+        indice = textos.get(valor)
+        if indice is None:
+            indice = textos[valor] = len(textos)
+        return indice
+
+    def codificar(valor):
+        if valor is None:
+            cuerpo.append(_NULO)
+        elif valor is True:
+            cuerpo.append(_VERDADERO)
+        elif valor is False:
+            cuerpo.append(_FALSO)
+        elif isinstance(valor, str):
+            cuerpo.append(_TEXTO)
+            _varint(cuerpo, texto(valor))
+        elif isinstance(valor, int):
+            cuerpo.append(_ENTERO)
+            _varint(cuerpo, valor * 2 if valor >= 0 else -valor * 2 - 1)
+        elif isinstance(valor, float):
+            if valor.is_integer() and abs(valor) < 2 ** 53:
+                # Montos como 4500.0: como entero, pero se leen como float
+                entero = int(valor)
+                cuerpo.append(_REAL_ENTERO)
+                _varint(cuerpo, entero * 2 if entero >= 0 else -entero * 2 - 1)
+            else:
+                cuerpo.append(_REAL)
+                cuerpo.extend(struct.pack("<d", valor))
+        elif isinstance(valor, dict):
+            forma = tuple(valor)
+            indice = formas.get(forma)
+            if indice is None:
+                indice = formas[forma] = len(formas)
+            cuerpo.append(_OBJETO)
+            _varint(cuerpo, indice)
+            for elemento in valor.values():
+                codificar(elemento)
+        elif isinstance(valor, (list, tuple)):
+            cuerpo.append(_LISTA)
+            _varint(cuerpo, len(valor))
+            for elemento in valor:
+                codificar(elemento)
+        else:
+            codificar(serializar(valor))
+
+    for registro in registros:
+        codificar(registro)
+        cantidad += 1
+
+    # Las claves de las formas también van a la tabla de textos
+    formas_codificadas = bytearray()
+    _varint(formas_codificadas, len(formas))
+    for forma in formas:
+        _varint(formas_codificadas, len(forma))
+        for clave in forma:
+            _varint(formas_codificadas, texto(clave))
+
+    salida = bytearray(MAGIA_BINARIA)
+    _varint(salida, len(textos))
+    for valor in textos:
+        codificado = valor.encode("utf-8")
+        _varint(salida, len(codificado))
+        salida += codificado
+    salida += formas_codificadas
+    _varint(salida, cantidad)
+    salida += cuerpo
+    return bytes(salida)
+
+def decodificar_binario(contenido):
+    """
+    Decodifica el formato binario y devuelve la lista de registros.
+    """
+    if not contenido.startswith(MAGIA_BINARIA):
+        raise ValueError("No es un archivo binario de turnos")
+    posicion = len(MAGIA_BINARIA)
+
+    cantidad_textos, posicion = _leer_varint(contenido, posicion)
+    textos = []
+    for _ in range(cantidad_textos):
+        largo, posicion = _leer_varint(contenido, posicion)
+        textos.append(contenido[posicion:posicion + largo].decode("utf-8"))
+        posicion += largo
+
+    cantidad_formas, posicion = _leer_varint(contenido, posicion)
+    formas = []
+    for _ in range(cantidad_formas):
+        largo, posicion = _leer_varint(contenido, posicion)
+        claves = []
+        for _ in range(largo):
+            indice, posicion = _leer_varint(contenido, posicion)
+            claves.append(textos[indice])
+        formas.append(claves)
+
+    def decodificar(posicion):
+        etiqueta = contenido[posicion]
+        posicion += 1
+        if etiqueta == _TEXTO:
+            indice, posicion = _leer_varint(contenido, posicion)
+            return textos[indice], posicion
+        if etiqueta == _OBJETO:
+            indice, posicion = _leer_varint(contenido, posicion)
+            objeto = {}
+            for clave in formas[indice]:
+                objeto[clave], posicion = decodificar(posicion)
+            return objeto, posicion
+        if etiqueta == _LISTA:
+            largo, posicion = _leer_varint(contenido, posicion)
+            lista = []
+            for _ in range(largo):
+                elemento, posicion = decodificar(posicion)
+                lista.append(elemento)
+            return lista, posicion
+        if etiqueta == _NULO:
+            return None, posicion
+        if etiqueta in (_ENTERO, _REAL_ENTERO):
+            valor, posicion = _leer_varint(contenido, posicion)
+            valor = valor // 2 if not valor & 1 else -(valor + 1) // 2
+            return (float(valor) if etiqueta == _REAL_ENTERO else valor), posicion
+        if etiqueta == _REAL:
+            return struct.unpack_from("<d", contenido, posicion)[0], posicion + 8
+        if etiqueta in (_FALSO, _VERDADERO):
+            return etiqueta == _VERDADERO, posicion
+        raise ValueError(f"Etiqueta desconocida en el archivo binario: {etiqueta}")
+
+    cantidad, posicion = _leer_varint(contenido, posicion)
+    registros = []
+    for _ in range(cantidad):
+        registro, posicion = decodificar(posicion)
+        registros.append(registro)
+    return registros
+
+def _varint(salida, valor):
+    while valor >= 0x80:
+        salida.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    salida.append(valor)
+
+def _leer_varint(contenido, posicion):
+    byte = contenido[posicion]
+    if byte < 0x80:
+        return byte, posicion + 1
+    valor = 0
+    desplazamiento = 0
+    while True:
+        byte = contenido[posicion]
+        posicion += 1
+        valor |= (byte & 0x7F) << desplazamiento
+        if byte < 0x80:
+            return valor, posicion
+        desplazamiento += 7
@@ -0,0 +1,203 @@
+"""
+Módulo de modelos compactos para el sistema de turnos.
+Turno y Reserva usan __slots__, cadenas internadas y la fecha y hora en un
+único entero (AAAAMMDDHHMM), para ocupar menos memoria y comparar/ordenar rápido.
+Admiten acceso estilo diccionario (turno["fecha_hora"], reserva.get("estado"))
+para poder usarse donde hoy se usan diccionarios.
+"""
+
+import sys
+
+def momento_desde_fecha_hora(fecha, hora):
+    """
+    Convierte ("2025-07-10", "13:30") en el entero 202507101330.
+    """
+    return int(fecha.replace("-", "") + hora.replace(":", ""))
+
+def fecha_hora_desde_momento(momento):
+    """
+    Convierte el entero 202507101330 en ("2025-07-10", "13:30").
+    """
+    texto = f"{momento:012d}"
+    return f"{texto[0:4]}-{texto[4:6]}-{texto[6:8]}", f"{texto[8:10]}:{texto[10:12]}"
+
+def _internar(texto):
+    return sys.intern(texto) if texto is not None else None
+
+class Turno:
+    """
+    Turno disponible: momento, profesional y servicio.
+    """
+
+    __slots__ = ("id", "momento", "profesional", "servicio")
+
+    def __init__(self, momento, profesional, servicio, id=None):
+        self.id = id
+        self.momento = momento
+        self.profesional = _internar(profesional)
+        self.servicio = _internar(servicio)
+
+    @classmethod
+    def desde_dict(cls, datos):
+        """
+        Crea un Turno desde su forma JSON.
+        """
+        fecha, hora = datos["fecha_hora"]
+        return cls(momento_desde_fecha_hora(fecha, hora), datos["profesional"], datos["servicio"], datos.get("id"))
+
+    def a_dict(self):
+        """
+        Devuelve la forma JSON del turno.
+        """
+        datos = {
+            "fecha_hora": self.fecha_hora,
+            "profesional": self.profesional,
+            "servicio": self.servicio
+        }
+        if self.id is not None:
+            datos["id"] = self.id
+        return datos
+
+    @property
+    def fecha_hora(self):
+        # Lista, como en la forma JSON: turno["fecha_hora"] compara igual con el de un diccionario
+        return list(fecha_hora_desde_momento(self.momento))
+
+    def _identidad(self):
+        return (self.momento, self.profesional, self.servicio)
+
+    def __eq__(self, otro):
+        if not isinstance(otro, Turno):
+            return NotImplemented
+        return self._identidad() == otro._identidad()
+
+    def __lt__(self, otro):
+        if not isinstance(otro, Turno):
+            return NotImplemented
+        return self._identidad() < otro._identidad()
+
+    def __hash__(self):
+        return hash(self._identidad())
+
+    def __repr__(self):
+        fecha, hora = self.fecha_hora
+        return f"Turno({fecha} {hora}, {self.profesional}, {self.servicio})"
+
+    # Acceso estilo diccionario
+    def __getitem__(self, campo):
+        if campo == "fecha_hora":
+            return self.fecha_hora
+        if campo in ("id", "profesional", "servicio"):
+            return getattr(self, campo)
+        raise KeyError(campo)
+
+    def __setitem__(self, campo, valor):
+        if campo != "id":
+            raise KeyError(campo)
+        self.id = valor
+
+    def __contains__(self, campo):
+        return campo in ("fecha_hora", "profesional", "servicio") or (campo == "id" and self.id is not None)
+
+    def get(self, campo, defecto=None):
+        return self[campo] if campo in self else defecto
+
+class Reserva:
+    """
+    Reserva de un turno por un cliente.
+    """
+
+    __slots__ = ("id", "nombre", "telefono", "documento", "turno", "estado", "monto_cobrado")
+
+    # Nombre en JSON -> atributo
+    _CAMPOS = {
+        "id": "id",
+        "nombre": "nombre",
+        "telefono": "telefono",
+        "documento": "documento",
+        "turno": "turno",
+        "estado": "estado",
+        "montoCobrado": "monto_cobrado"
+    }
+
+    def __init__(self, nombre, telefono, documento, turno, estado="Pendiente", monto_cobrado=None, id=None):
+        self.id = id
+        self.nombre = nombre
+        self.telefono = telefono
+        self.documento = documento
+        self.turno = turno
+        self.estado = _internar(estado)
+        self.monto_cobrado = monto_cobrado
+
+    @classmethod
+    def desde_dict(cls, datos):
+        """
+        Crea una Reserva (con su Turno) desde su forma JSON.
+        """
+        return cls(
+            datos["nombre"], datos["telefono"], datos["documento"],
+            Turno.desde_dict(datos["turno"]),
+            datos.get("estado", "Pendiente"), datos.get("montoCobrado"), datos.get("id")
+        )
+
+    def a_dict(self):
+        """
+        Devuelve la forma JSON de la reserva.
+        """
+        datos = {
+            "nombre": self.nombre,
+            "telefono": self.telefono,
+            "documento": self.documento,
+            "turno": self.turno.a_dict(),
+            "estado": self.estado,
+            "montoCobrado": self.monto_cobrado
+        }
+        if self.id is not None:
+            datos["id"] = self.id
+        return datos
+
+    def _identidad(self):
+        return (self.turno._identidad(), self.documento)
+
+    def __eq__(self, otro):
+        if not isinstance(otro, Reserva):
+            return NotImplemented
+        return self._identidad() == otro._identidad()
+
+    def __lt__(self, otro):
+        if not isinstance(otro, Reserva):
+            return NotImplemented
+        return self._identidad() < otro._identidad()
+
+    def __hash__(self):
+        return hash(self._identidad())
+
+    def __repr__(self):
+        return f"Reserva({self.documento}, {self.turno!r}, {self.estado})"
+
+    # Acceso estilo diccionario
+    def __getitem__(self, campo):
+        if campo not in self._CAMPOS:
+            raise KeyError(campo)
+        return getattr(self, self._CAMPOS[campo])
+
+    def __setitem__(self, campo, valor):
+        if campo not in self._CAMPOS:
+            raise KeyError(campo)
+        if campo == "estado":
+            valor = _internar(valor)
+        setattr(self, self._CAMPOS[campo], valor)
+
+    def __contains__(self, campo):
+        return campo in self._CAMPOS and (campo != "id" or self.id is not None)
+
+    def get(self, campo, defecto=None):
+        return self[campo] if campo in self else defecto
+
+def serializar(objeto):
+    """
+    Función default para json.dump: convierte modelos a su forma JSON.
+    """
+    if isinstance(objeto, (Turno, Reserva)):
+        return objeto.a_dict()
+    raise TypeError(f"No se puede serializar {type(objeto).__name__}")
@@ -0,0 +1,300 @@
+"""
+Módulo de almacenamiento particionado por mes para el sistema de turnos.
+Cada colección se guarda en un archivo JSON compacto por mes, según la fecha de su
+turno (reservas-2025-08.json), más un índice con los meses que existen
+(reservas.particiones.json). Así se pueden cargar solo los meses que se necesitan
+(por ejemplo, desde el mes anterior en adelante) y la historia queda en disco sin
+leerse: el arranque y la memoria no crecen con los años de reservas.
+Para las reservas de la historia hay además un índice documento -> meses
+(reservas.documentos.json), así buscar un DNI en los meses anteriores no lee cada mes.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+
+from sistema_turnos.datos.archivos import escribir_atomicos, leer_json
+from sistema_turnos.datos.bitacora import OPERACIONES, aplicar_cambio
+from sistema_turnos.datos.formatos import leer_datos
+from sistema_turnos.datos.modelos import serializar
+from sistema_turnos.utils.claves import CLAVES_POR_COLECCION, valores_indexados
+
+# Partición de los registros sin fecha (queda después de todos los meses: siempre se carga)
+SIN_FECHA = "sin-fecha"
+
+def mes_de(coleccion, registro):
+    """
+    Devuelve el mes ("AAAA-MM") de la partición de un turno o reserva.
+    """
+    turno = registro if coleccion == "turnos" else (registro.get("turno") or {})
+    fecha = (turno.get("fecha_hora") or [""])[0] or ""
+    return fecha[:7] or SIN_FECHA
+
+def en_rango(mes, desde=None, hasta=None):
+    """
+    Indica si un mes está en el rango [desde, hasta) (cualquiera de los dos puede ser None).
+    """
+    return (desde is None or mes >= desde) and (hasta is None or mes < hasta)
+
+class AlmacenParticionado:
+    """
+    Almacén con un archivo por mes y colección.
+    cargar(coleccion, desde, hasta) lee solo los meses del rango; cada cambio
+    reescribe solo el mes del registro.
+    Los meses anteriores al primero que se cargó con desde quedan "fríos": guardar
+    no los borra aunque falten en los datos (la memoria no los tiene).
+    """
+
+    # Un cambio se guarda sin la colección entera (ver EscritorDiferido)
+    registro_incremental = True
+
+    def __init__(self, directorio=".", durable=True):
+        self.directorio = directorio
+        self.durable = durable
+        self._desde = {}
+        self._grupo = None
+        # (firma del archivo, índice de documentos) leído por última vez
+        self._documentos = None
+        for coleccion in CLAVES_POR_COLECCION:
+            if not os.path.exists(self.ruta_indice(coleccion)):
+                self.importar_json(coleccion)
+
+    def ruta(self, coleccion, mes):
+        """
+        Devuelve la ruta del archivo de un mes de una colección.
+        """
+        return os.path.join(self.directorio, f"{coleccion}-{mes}.json")
+
+    def ruta_indice(self, coleccion):
+        """
+        Devuelve la ruta del índice con los meses de una colección.
+        """
+        return os.path.join(self.directorio, f"{coleccion}.particiones.json")
+
+    def ruta_documentos(self):
+        """
+        Devuelve la ruta del índice documento -> meses de las reservas de la historia.
+        """
+        return os.path.join(self.directorio, "reservas.documentos.json")
+
+    def importar_json(self, coleccion):
+        """
+        Reparte por mes el <coleccion>.json del mismo directorio, si existe.
+        FUNCIONALIDAD: Migrar los datos existentes al empezar a particionar
+        """
+        ruta_json = os.path.join(self.directorio, f"{coleccion}.json")
+        if os.path.exists(ruta_json):
+            self.guardar(coleccion, leer_json(ruta_json))
+
+    def particiones(self, coleccion):
+        """
+        Devuelve los meses de una colección, ordenados.
+        El índice manda: un archivo de un mes que no figura (por ejemplo después de
+        restaurar un backup anterior) no se lee.
+        """
+        return leer_json(self.ruta_indice(coleccion))
+
+    def archivos(self):
+        """
+        Devuelve las rutas de los archivos de datos (para los backups): índice y meses de cada colección.
+        """
+        return [
+            ruta
+            for coleccion in CLAVES_POR_COLECCION
+            for ruta in [self.ruta_indice(coleccion)] + [self.ruta(coleccion, mes) for mes in self.particiones(coleccion)]
+        ] + [self.ruta_documentos()]
+
+    def cargar(self, coleccion, desde=None, hasta=None):
+        """
+        Carga los registros de los meses en [desde, hasta) ("AAAA-MM"; sin límites, todos).
+        Solo se leen los archivos de esos meses.
+        FUNCIONALIDAD: Cargar solo la parte de la historia que se necesita
+        """
+        if desde is not None:
+            self._desde[coleccion] = min(self._desde.get(coleccion, desde), desde)
+        registros = []
+        for mes in self.particiones(coleccion):
+            if en_rango(mes, desde, hasta):
+                registros.extend(leer_json(self.ruta(coleccion, mes)))
+        return registros
+
+    def recorrer(self, coleccion, desde=None, hasta=None):
+        """
+        Recorre los registros de los meses en [desde, hasta) de a uno, leyendo un mes por vez.
+        """
+        for mes in self.particiones(coleccion):
+            if en_rango(mes, desde, hasta):
+                yield from leer_json(self.ruta(coleccion, mes))
+
+    def guardar(self, coleccion, datos):
+        """
+        Guarda una colección: reescribe los meses que aparecen en los datos y vacía
+        los que ya no tienen registros. Los meses fríos (anteriores a lo cargado)
+        no se vacían, y si aparecen en los datos se combinan con lo que tenían.
+        """
+        clave = CLAVES_POR_COLECCION[coleccion]
+        desde = self._desde.get(coleccion)
+        por_mes = {}
+        for registro in datos:
+            por_mes.setdefault(mes_de(coleccion, registro), {})[clave(registro)] = registro
+        for mes in self.particiones(coleccion):
+            if mes in por_mes:
+                if desde is not None and mes < desde:
+                    frios = self._leer_mes(coleccion, mes)
+                    frios.update(por_mes[mes])
+                    por_mes[mes] = frios
+            elif desde is None or mes >= desde:
+                por_mes[mes] = {}
+
+        # Los cambios agrupados sin escribir ya están en los datos
+        if self._grupo is not None:
+            for pendiente in [p for p in self._grupo if p[0] == coleccion]:
+                del self._grupo[pendiente]
+        self._escribir(coleccion, por_mes)
+
+    def registrar(self, coleccion, operacion, registro, datos):
+        """
+        Aplica un cambio reescribiendo solo el mes del registro (leído del disco,
+        así no importa qué meses tenga la memoria).
+        FUNCIONALIDAD: Guardar un cambio sin reescribir toda la historia
+        """
+        if operacion not in OPERACIONES:
+            raise ValueError(f"Operación desconocida: {operacion}")
+        mes = mes_de(coleccion, registro)
+        if self._grupo is not None:
+            if (coleccion, mes) not in self._grupo:
+                self._grupo[(coleccion, mes)] = self._leer_mes(coleccion, mes)
+            registros = self._grupo[(coleccion, mes)]
+        else:
+            registros = self._leer_mes(coleccion, mes)
+        aplicar_cambio(registros, CLAVES_POR_COLECCION[coleccion](registro), operacion, registro)
+        if self._grupo is None:
+            self._escribir(coleccion, {mes: registros})
+
+    @contextmanager
+    def grupo(self):
+        """
+        Agrupa los cambios registrados dentro del bloque: cada mes tocado se escribe
+        una vez al final, con una sola espera al disco para todos.
+        FUNCIONALIDAD: Guardar varios cambios juntos (escritura agrupada)
+        """
+        if self._grupo is not None:
+            yield
+            return
+        self._grupo = {}
+        try:
+            yield
+        finally:
+            pendientes, self._grupo = self._grupo, None
+            por_coleccion = {}
+            for (coleccion, mes), registros in pendientes.items():
+                por_coleccion.setdefault(coleccion, {})[mes] = registros
+            escrituras = []
+            for coleccion, por_mes in por_coleccion.items():
+                escrituras.extend(self._escrituras(coleccion, por_mes))
+            escribir_atomicos(escrituras, durable=self.durable)
+
+    def buscar(self, coleccion, **criterios):
+        """
+        Busca registros por fecha, hora, profesional, servicio, documento o estado.
+        Con fecha solo se lee el mes de esa fecha.
+        Los valores se comparan sin distinguir mayúsculas.
+        """
+        criterios = {
+            campo: valor if campo in ("fecha", "hora") else valor.lower()
+            for campo, valor in criterios.items() if valor is not None
+        }
+        meses = self.particiones(coleccion)
+        if "fecha" in criterios:
+            meses = [mes for mes in meses if mes == (criterios["fecha"][:7] or SIN_FECHA)]
+        return [
+            registro
+            for mes in meses
+            for registro in leer_json(self.ruta(coleccion, mes))
+            if all(valores_indexados(coleccion, registro).get(campo) == valor for campo, valor in criterios.items())
+        ]
+
+    def meses_de_documento(self, documento, hasta):
+        """
+        Devuelve los meses anteriores a hasta ("AAAA-MM") con reservas de un documento.
+        Usa el índice de documentos: solo se leen los meses que todavía no cubre (la
+        primera vez, toda la historia; después, los que pasaron a ser anteriores).
+        FUNCIONALIDAD: Verificar un DNI en la historia sin leer todos los meses
+        """
+        indice = self._leer_documentos()
+        cubiertos = indice["hasta"]
+        if cubiertos is None or cubiertos < hasta:
+            documentos = {documento: list(meses) for documento, meses in indice["documentos"].items()}
+            for mes in self.particiones("reservas"):
+                if en_rango(mes, cubiertos, hasta):
+                    _anotar_documentos(documentos, mes, leer_json(self.ruta("reservas", mes)))
+            indice = {"hasta": hasta, "documentos": documentos}
+            escribir_atomicos([(self.ruta_documentos(), _volcar(indice))], respaldo=False, durable=self.durable)
+        return [mes for mes in indice["documentos"].get(documento.lower(), []) if mes < hasta]
+
+    def _leer_documentos(self):
+        ruta = self.ruta_documentos()
+        try:
+            estado = os.stat(ruta)
+        except FileNotFoundError:
+            return {"hasta": None, "documentos": {}}
+        firma = (estado.st_size, estado.st_mtime_ns, estado.st_ino)
+        if self._documentos is None or self._documentos[0] != firma:
+            try:
+                indice = leer_datos(ruta)
+            except (FileNotFoundError, ValueError):
+                # Dañado: se vuelve a armar desde los meses
+                indice = None
+            if not isinstance(indice, dict) or "hasta" not in indice:
+                indice = {"hasta": None, "documentos": {}}
+            self._documentos = (firma, indice)
+        return self._documentos[1]
+
+    def _escrituras_documentos(self, por_mes):
+        # Si se reescribe un mes que el índice de documentos ya cubre, el índice se
+        # actualiza en la misma escritura (es poco común: la historia casi no cambia)
+        indice = self._leer_documentos()
+        cubiertos = indice["hasta"]
+        meses = {mes for mes in por_mes if cubiertos is not None and mes < cubiertos}
+        if not meses:
+            return []
+        documentos = {}
+        for documento, meses_documento in indice["documentos"].items():
+            restantes = [mes for mes in meses_documento if mes not in meses]
+            if restantes:
+                documentos[documento] = restantes
+        for mes in meses:
+            _anotar_documentos(documentos, mes, por_mes[mes].values())
+        return [(self.ruta_documentos(), _volcar({"hasta": cubiertos, "documentos": documentos}))]
+
+    def _leer_mes(self, coleccion, mes):
+        if mes not in self.particiones(coleccion):
+            return {}
+        clave = CLAVES_POR_COLECCION[coleccion]
+        return {clave(registro): registro for registro in leer_json(self.ruta(coleccion, mes))}
+
+    def _escribir(self, coleccion, por_mes):
+        escribir_atomicos(self._escrituras(coleccion, por_mes), durable=self.durable)
+
+    def _escrituras(self, coleccion, por_mes):
+        # El índice va primero: si la escritura se corta, un mes nuevo figura con su
+        # archivo viejo (o ninguno, que se lee vacío), nunca hay un archivo sin figurar
+        meses = sorted(set(self.particiones(coleccion)) | set(por_mes))
+        escrituras = [(self.ruta_indice(coleccion), _volcar(meses))]
+        for mes, registros in por_mes.items():
+            escrituras.append((self.ruta(coleccion, mes), _volcar(list(registros.values()))))
+        if coleccion == "reservas":
+            escrituras.extend(self._escrituras_documentos(por_mes))
+        return escrituras
+
+def _anotar_documentos(documentos, mes, reservas):
+    for reserva in reservas:
+        meses = documentos.setdefault((reserva.get("documento") or "").lower(), [])
+        if mes not in meses:
+            meses.append(mes)
+            meses.sort()
+
+def _volcar(datos):
+    def escribir(archivo):
+        json.dump(datos, archivo, ensure_ascii=False, separators=(",", ":"), default=serializar)
+    return escribir
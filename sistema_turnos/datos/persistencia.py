@@ -1,91 +1,596 @@
 """
 Módulo de persistencia de datos para el sistema de turnos.
-Maneja la carga y guardado de datos en archivos JSON.
+Maneja la carga y guardado de datos en archivos JSON, en una bitácora de cambios,
+en SQLite o en archivos por mes.
 """
 
 import json
 import os
-from datetime import datetime
+import shutil
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime
 
-def cargar_turnos():
+from sistema_turnos.datos.bitacora import AlmacenBitacora
+from sistema_turnos.datos.almacen_sqlite import AlmacenSQLite
+from sistema_turnos.datos.particiones import AlmacenParticionado, en_rango, mes_de
+from sistema_turnos.datos.escritor import EscritorDiferido
+from sistema_turnos.datos.compartido import AlmacenCompartido, ConflictoConcurrencia
+from sistema_turnos.datos.recuperacion import RegistroCambios, diferencias, reconstruir
+from sistema_turnos.datos.respaldos import FORMATO_IDENTIFICADOR, RepositorioRespaldos, RespaldoPeriodico
+from sistema_turnos.datos.archivos import escribir_atomico, escribir_atomicos, leer_json
+from sistema_turnos.datos.flujo_json import escribir_registros
+from sistema_turnos.datos.formatos import archivo_completo, escribir_datos, recorrer_datos, validar_formato
+from sistema_turnos.datos.modelos import Turno, Reserva
+from sistema_turnos.utils.claves import CLAVES_POR_COLECCION, valores_indexados
+
+class AlmacenJSON:
+    """
+    Almacén por defecto: un archivo JSON completo por colección.
+    Cada cambio reescribe el archivo entero, de forma atómica (temporal + fsync + renombre).
+    Con durable=False no se espera al disco (más rápido, menos seguro ante cortes de luz).
+    formato elige cómo se escribe el archivo (ver datos/formatos.py: "json" con sangría,
+    "json-compacto", "orjson", "binario", y sus variantes "+gzip" y "+lzma"); al leer
+    se reconoce cualquiera, así se puede cambiar de formato sin convertir los datos.
+    """
+
+    def __init__(self, directorio=".", durable=True, formato="json"):
+        validar_formato(formato)
+        self.directorio = directorio
+        self.durable = durable
+        self.formato = formato
+        self._grupo = None
+
+    def ruta(self, coleccion):
+        """
+        Devuelve la ruta del archivo JSON de una colección.
+        """
+        return os.path.join(self.directorio, f"{coleccion}.json")
+
+    def archivos(self):
+        """
+        Devuelve las rutas de los archivos de datos (para los backups).
+        """
+        return [self.ruta(coleccion) for coleccion in CLAVES_POR_COLECCION]
+
+    def cargar(self, coleccion):
+        """
+        Carga una colección completa desde su archivo JSON.
+        Si el archivo quedó dañado, se usa la última versión buena.
+        """
+        return leer_json(self.ruta(coleccion))
+
+    def recorrer(self, coleccion):
+        """
+        Recorre los registros de una colección de a uno; los JSON se leen por bloques
+        (ver formatos.recorrer_datos). Si el archivo quedó cortado se recorre la última
+        versión buena, como en cargar: el corte se nota antes del primer registro
+        (ver formatos.archivo_completo).
+        """
+        ruta = self.ruta(coleccion)
+        try:
+            completo = archivo_completo(ruta)
+        except FileNotFoundError:
+            return
+        registros = recorrer_datos(ruta)
+        if completo:
+            try:
+                primero = next(registros, None)
+            except ValueError:
+                completo = False
+        if not completo:
+            yield from leer_json(ruta)
+            return
+        if primero is not None:
+            yield primero
+            yield from registros
+
+    def guardar(self, coleccion, datos):
+        """
+        Guarda una colección completa en su archivo JSON.
+        Dentro de grupo() el guardado se posterga hasta el final del grupo.
+        """
+        if self._grupo is not None:
+            self._grupo[coleccion] = list(datos)
+            return
+        escribir_atomicos([self._escritura(coleccion, datos)], durable=self.durable, binario=True)
+
+    def registrar(self, coleccion, operacion, registro, datos):
+        """
+        Registra un cambio reescribiendo la colección completa.
+        Dentro de grupo() se anota la colección misma, sin copiarla: al final del
+        grupo se escribe como haya quedado (así un lote de cambios no copia todo cada vez).
+        """
+        if self._grupo is not None:
+            self._grupo[coleccion] = datos
+            return
+        self.guardar(coleccion, datos)
+
+    @contextmanager
+    def grupo(self):
+        """
+        Agrupa los guardados hechos dentro del bloque: cada colección se escribe una vez
+        al final, con una sola espera al disco para todas.
+        FUNCIONALIDAD: Guardar varios cambios juntos (escritura agrupada)
+        """
+        if self._grupo is not None:
+            yield
+            return
+        self._grupo = {}
+        try:
+            yield
+        finally:
+            pendientes, self._grupo = self._grupo, None
+            escribir_atomicos(
+                [self._escritura(coleccion, datos) for coleccion, datos in pendientes.items()],
+                durable=self.durable, binario=True
+            )
+
+    def _escritura(self, coleccion, datos):
+        def escribir(archivo):
+            # Los formatos JSON se escriben de a tandas: no se arma el documento entero en memoria
+            escribir_datos(archivo, datos, self.formato)
+        return self.ruta(coleccion), escribir
+
+# Motores de almacenamiento disponibles
+MOTORES = {
+    "json": AlmacenJSON,
+    "bitacora": AlmacenBitacora,
+    "sqlite": AlmacenSQLite,
+    "particionado": AlmacenParticionado
+}
+
+_almacen = None
+# Motor y opciones del almacén activo, para volver a abrirlo (por ejemplo al restaurar un backup)
+_configuracion = None
+# Hilo de los backups en segundo plano (uno a la vez)
+_hilo_backup = None
+# Lo toman las escrituras de este proceso; el backup lo toma para copiar datos quietos
+_bloqueo_escrituras = threading.RLock()
+# Retención usada por la interfaz al hacer el backup de cierre
+RETENCION_BACKUPS = {"ultimos": 10, "diarios": 7, "semanales": 4}
+# Registro de cambios para volver a cualquier momento (ver activar_registro_de_cambios)
+_registro_cambios = None
+# Meses anteriores al actual que se cargan al iniciar con el motor particionado
+MESES_RECIENTES = 1
+
+def configurar_almacenamiento(motor="json", diferido=False, compartido=False, **opciones):
+    """
+    Selecciona el motor de almacenamiento usado por cargar_/guardar_.
+    Con diferido=True las escrituras se hacen en segundo plano (ver activar_escritura_diferida).
+    Con compartido=True varias terminales pueden usar los mismos archivos (ver AlmacenCompartido).
+    FUNCIONALIDAD: Elegir entre archivos JSON completos, bitácora de cambios, SQLite o archivos por mes
+    """
+    global _almacen, _configuracion
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de almacenamiento desconocido: {motor}")
+    if _almacen is not None and hasattr(_almacen, "cerrar"):
+        _almacen.cerrar()
+    # El registro de cambios corresponde a los datos anteriores
+    desactivar_registro_de_cambios()
+    _almacen = MOTORES[motor](**opciones)
+    _configuracion = {"motor": motor, "diferido": diferido, "compartido": compartido, "opciones": opciones}
+    if compartido:
+        _almacen = AlmacenCompartido(_almacen, opciones.get("directorio", "."))
+    elif diferido:
+        _almacen = EscritorDiferido(_almacen)
+    return _almacen
+
+def activar_escritura_diferida():
+    """
+    Hace que el almacén activo escriba en un hilo aparte, sin bloquear a quien guarda.
+    Con almacenamiento compartido no se activa: cada reserva debe confirmarse contra
+    el disco antes de avisar a la clienta.
+    FUNCIONALIDAD: Guardar sin congelar la interfaz en discos lentos
+    """
+    global _almacen
+    almacen = obtener_almacen()
+    if not isinstance(almacen, (EscritorDiferido, AlmacenCompartido)):
+        _almacen = EscritorDiferido(almacen)
+        _configuracion["diferido"] = True
+    return _almacen
+
+def vaciar_escrituras():
+    """
+    Espera a que terminen las escrituras en segundo plano (no hace nada si no las hay).
+    """
+    if isinstance(_almacen, EscritorDiferido):
+        _almacen.vaciar()
+
+def revisar_escrituras():
+    """
+    Relanza, sin esperar, el error de una escritura en segundo plano que ya falló
+    (no hace nada si no hay escritura diferida o no hubo errores).
+    """
+    if isinstance(_almacen, EscritorDiferido):
+        _almacen.revisar()
+
+def obtener_almacen():
+    """
+    Devuelve el almacén activo, creándolo según SISTEMA_TURNOS_ALMACENAMIENTO (y
+    SISTEMA_TURNOS_FORMATO) si hace falta.
     """
-    Carga los turnos disponibles desde el archivo JSON.
+    if _almacen is None:
+        motor = os.environ.get("SISTEMA_TURNOS_ALMACENAMIENTO", "json")
+        # SISTEMA_TURNOS_FORMATO elige el formato de los archivos del motor json
+        formato = os.environ.get("SISTEMA_TURNOS_FORMATO")
+        configurar_almacenamiento(
+            motor,
+            compartido=os.environ.get("SISTEMA_TURNOS_COMPARTIDO") == "1",
+            **({"formato": formato} if formato and motor == "json" else {})
+        )
+    return _almacen
+
+def hay_cambios(coleccion):
+    """
+    Indica si otra terminal cambió una colección desde que se cargó (solo en modo compartido).
+    """
+    almacen = obtener_almacen()
+    return hasattr(almacen, "hay_cambios") and almacen.hay_cambios(coleccion)
+
+def cargar_turnos(como_modelos=False):
+    """
+    Carga los turnos disponibles desde el almacén activo.
+    Con como_modelos=True devuelve objetos Turno en lugar de diccionarios.
     FUNCIONALIDAD: Cargar información de turnos disponibles
     """
-    try:
-        with open("turnos.json", "r", encoding="utf-8") as archivo:
-            return json.load(archivo)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        return []
+    turnos = obtener_almacen().cargar("turnos")
+    return turnos_desde_json(turnos) if como_modelos else turnos
 
 def guardar_turnos(turnos):
     """
-    Guarda los turnos disponibles en el archivo JSON.
+    Guarda los turnos disponibles (diccionarios o Turno) en el almacén activo.
     FUNCIONALIDAD: Guardar cambios en los turnos disponibles
     """
-    with open("turnos.json", "w", encoding="utf-8") as archivo:
-        json.dump(turnos, archivo, indent=4, ensure_ascii=False)
+    _guardar_coleccion("turnos", turnos)
 
-def cargar_reservas():
+def cargar_reservas(como_modelos=False, desde=None, hasta=None):
     """
-    Carga las reservas desde el archivo JSON.
+    Carga las reservas desde el almacén activo.
+    Con como_modelos=True devuelve objetos Reserva en lugar de diccionarios.
+    desde y hasta ("AAAA-MM", hasta excluido) limitan los meses de los turnos:
+    con el motor particionado solo se leen esos meses.
     FUNCIONALIDAD: Cargar información de reservas existentes
     """
+    almacen = obtener_almacen()
+    if desde is None and hasta is None:
+        reservas = almacen.cargar("reservas")
+    elif hasattr(almacen, "particiones"):
+        reservas = almacen.cargar("reservas", desde=desde, hasta=hasta)
+    else:
+        reservas = [r for r in almacen.cargar("reservas") if en_rango(mes_de("reservas", r), desde, hasta)]
+    return reservas_desde_json(reservas) if como_modelos else reservas
+
+def primer_mes_reciente(hoy=None):
+    """
+    Devuelve el primer mes ("AAAA-MM") de reservas que conviene tener en memoria:
+    con el motor particionado, MESES_RECIENTES antes del actual (las pantallas del día
+    a día solo usan reservas recientes y futuras); con los demás motores, None (todas).
+    """
+    if not hasattr(obtener_almacen(), "particiones"):
+        return None
+    hoy = hoy or date.today()
+    anio, mes = divmod(hoy.year * 12 + hoy.month - 1 - MESES_RECIENTES, 12)
+    return f"{anio:04d}-{mes + 1:02d}"
+
+def guardar_reservas(reservas):
+    """
+    Guarda las reservas (diccionarios o Reserva) en el almacén activo.
+    FUNCIONALIDAD: Guardar cambios en las reservas
+    """
+    _guardar_coleccion("reservas", reservas)
+
+def recorrer_turnos():
+    """
+    Recorre los turnos del almacén activo de a uno (iterador).
+    """
+    return _recorrer("turnos")
+
+def recorrer_reservas(desde=None, hasta=None):
+    """
+    Recorre las reservas del almacén activo de a una (iterador), opcionalmente
+    solo las de los meses en [desde, hasta) ("AAAA-MM").
+    Con el motor JSON el archivo se lee por bloques, con SQLite fila por fila y con el
+    particionado mes por mes: la memoria no depende de la cantidad de reservas
+    (la bitácora sí necesita cargarlas para reaplicar sus cambios).
+    FUNCIONALIDAD: Filtrar, exportar y resumir reservas sin cargarlas todas
+    """
+    return _recorrer("reservas", desde, hasta)
+
+def _recorrer(coleccion, desde=None, hasta=None):
+    almacen = obtener_almacen()
+    if hasattr(almacen, "particiones"):
+        return almacen.recorrer(coleccion, desde=desde, hasta=hasta)
+    recorrer = getattr(almacen, "recorrer", None)
+    registros = recorrer(coleccion) if recorrer is not None else iter(almacen.cargar(coleccion))
+    if desde is None and hasta is None:
+        return registros
+    return (r for r in registros if en_rango(mes_de(coleccion, r), desde, hasta))
+
+def _guardar_coleccion(coleccion, datos):
+    with _bloqueo_escrituras:
+        obtener_almacen().guardar(coleccion, datos)
+        if _registro_cambios is not None:
+            _registro_cambios.anotar(coleccion, "completa", datos=datos)
+
+def cargar_reglas_agenda(ruta="agenda.json"):
+    """
+    Carga los horarios de la agenda (profesionales, días, horas y servicios).
+    Devuelve None si no hay archivo de agenda: en ese caso se usan los turnos de turnos.json.
+    FUNCIONALIDAD: Configurar la agenda sin escribir cada turno
+    """
     try:
-        with open("reservas.json", "r", encoding="utf-8") as archivo:
+        with open(ruta, "r", encoding="utf-8") as archivo:
             return json.load(archivo)
     except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        return []
+        return None
 
-def guardar_reservas(reservas):
+def turnos_desde_json(turnos):
     """
-    Guarda las reservas en el archivo JSON.
-    FUNCIONALIDAD: Guardar cambios en las reservas
+    Convierte una lista de turnos en formato JSON a objetos Turno.
+    """
+    desde_dict = Turno.desde_dict
+    return [desde_dict(turno) for turno in turnos]
+
+def turnos_a_json(turnos):
+    """
+    Convierte objetos Turno a su formato JSON.
+    """
+    return [turno.a_dict() for turno in turnos]
+
+def reservas_desde_json(reservas):
+    """
+    Convierte una lista de reservas en formato JSON a objetos Reserva.
+    """
+    desde_dict = Reserva.desde_dict
+    return [desde_dict(reserva) for reserva in reservas]
+
+def reservas_a_json(reservas):
+    """
+    Convierte objetos Reserva a su formato JSON.
+    """
+    return [reserva.a_dict() for reserva in reservas]
+
+@contextmanager
+def grupo_de_escrituras():
+    """
+    Agrupa las escrituras del bloque cuando el almacén lo permite (ver AlmacenJSON.grupo).
+    Con escritura diferida los cambios del bloque se encolan juntos (ver EscritorDiferido.grupo).
+    Un backup no empieza en medio del bloque.
     """
-    with open("reservas.json", "w", encoding="utf-8") as archivo:
-        json.dump(reservas, archivo, indent=4, ensure_ascii=False)
+    with _bloqueo_escrituras:
+        almacen = obtener_almacen()
+        if not hasattr(almacen, "grupo"):
+            yield
+        else:
+            with almacen.grupo():
+                yield
 
-def crear_backup():
+def registrar_cambio(coleccion, operacion, registro, datos):
     """
-    Crea un backup de los archivos de datos.
+    Persiste un único cambio ("alta", "baja" o "modificacion") sobre una colección.
+    FUNCIONALIDAD: Guardar solo lo que cambió cuando el motor lo permite
+    """
+    with _bloqueo_escrituras:
+        obtener_almacen().registrar(coleccion, operacion, registro, datos)
+        if _registro_cambios is not None:
+            _registro_cambios.anotar(coleccion, operacion, registro)
+
+def consultar(coleccion, **criterios):
+    """
+    Busca turnos o reservas por fecha, hora, profesional, servicio, documento o estado.
+    Usa los índices del motor cuando existen; si no, recorre la colección de a un registro.
+    FUNCIONALIDAD: Consultar datos sin cargar toda la colección cuando el motor lo permite
+    """
+    almacen = obtener_almacen()
+    if hasattr(almacen, "buscar"):
+        return almacen.buscar(coleccion, **criterios)
+    return list(_filtrar(coleccion, _recorrer(coleccion), criterios))
+
+def hay_reservas_anteriores(documento, hasta):
+    """
+    Indica si un documento tiene reservas en los meses anteriores a hasta ("AAAA-MM").
+    Con el motor particionado se usa su índice de documentos, sin leer cada mes.
+    FUNCIONALIDAD: Verificar un DNI en la historia que no está en memoria
+    """
+    almacen = obtener_almacen()
+    if hasattr(almacen, "meses_de_documento"):
+        return bool(almacen.meses_de_documento(documento, hasta))
+    return any(en_rango(mes_de("reservas", r), hasta=hasta) for r in consultar("reservas", documento=documento))
+
+def exportar(coleccion, ruta, **criterios):
+    """
+    Escribe en ruta (lista JSON con indent=4) los turnos o reservas que cumplen los
+    criterios de consultar, de a un registro: exportar no carga la colección entera.
+    Devuelve la cantidad de registros exportados.
+    FUNCIONALIDAD: Exportar datos para otros programas o para archivar
+    """
+    cantidad = 0
+
+    def escribir(archivo):
+        nonlocal cantidad
+        cantidad = escribir_registros(archivo, _filtrar(coleccion, _recorrer(coleccion), criterios), indent=4)
+
+    escribir_atomico(ruta, escribir, respaldo=False)
+    return cantidad
+
+def _filtrar(coleccion, registros, criterios):
+    criterios = {
+        campo: valor if campo in ("fecha", "hora") else valor.lower()
+        for campo, valor in criterios.items() if valor is not None
+    }
+    for registro in registros:
+        valores = valores_indexados(coleccion, registro)
+        if all(valores.get(campo) == valor for campo, valor in criterios.items()):
+            yield registro
+
+def _repositorio_backups(directorio=None, compresion="gzip"):
+    if directorio is None:
+        directorio = os.path.join(getattr(obtener_almacen(), "directorio", "."), "backups")
+    return RepositorioRespaldos(directorio, compresion)
+
+def crear_backup(directorio=None, compresion="gzip", retencion=None, segundo_plano=False):
+    """
+    Crea un backup incremental de los archivos de datos del almacén activo
+    (ver datos/respaldos.py): solo se guardan, comprimidos, los fragmentos que
+    cambiaron desde el backup anterior. Por defecto los backups van a la carpeta
+    backups/ junto a los datos.
+    retencion es un diccionario con ultimos, diarios y semanales: después del backup
+    se borran los que la política no conserva.
+    Con segundo_plano=True el backup se hace en un hilo aparte y se devuelve el hilo.
+    Las escrituras (y, en modo compartido, las de las otras terminales) esperan
+    solo mientras se copian los archivos que cambiaron; la compresión se hace después.
+    Devuelve el identificador del backup.
     FUNCIONALIDAD: Proteger datos importantes
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    # Backup de turnos
-    if os.path.exists("turnos.json"):
-        backup_turnos = f"turnos_backup_{timestamp}.json"
-        with open("turnos.json", "r", encoding="utf-8") as original:
-            with open(backup_turnos, "w", encoding="utf-8") as backup:
-                backup.write(original.read())
-    
-    # Backup de reservas
-    if os.path.exists("reservas.json"):
-        backup_reservas = f"reservas_backup_{timestamp}.json"
-        with open("reservas.json", "r", encoding="utf-8") as original:
-            with open(backup_reservas, "w", encoding="utf-8") as backup:
-                backup.write(original.read())
-    
-    return timestamp
-
-def restaurar_backup(timestamp):
-    """
-    Restaura los archivos desde un backup específico.
+    global _hilo_backup
+    if segundo_plano:
+        if _hilo_backup is not None and _hilo_backup.is_alive():
+            return _hilo_backup
+        _hilo_backup = threading.Thread(
+            target=crear_backup, args=(directorio, compresion, retencion),
+            name="backup-turnos", daemon=True
+        )
+        _hilo_backup.start()
+        return _hilo_backup
+
+    almacen = obtener_almacen()
+    repositorio = _repositorio_backups(directorio, compresion)
+    # Con el bloqueo del directorio de backups, ninguna otra terminal hace un backup
+    # ni aplica la retención en el medio
+    with repositorio.bloqueo:
+        identificador = datetime.now().strftime(FORMATO_IDENTIFICADOR)
+
+        @contextmanager
+        def datos_quietos():
+            with _escrituras_detenidas():
+                # Los cambios desde este momento van a un segmento nuevo del registro
+                if _registro_cambios is not None:
+                    _registro_cambios.rotar(identificador)
+                yield
+
+        manifiesto = repositorio.crear(
+            almacen.archivos, {"motor": _configuracion["motor"]}, identificador,
+            bloqueo=datos_quietos(), copiar=getattr(almacen, "copiar_archivo", shutil.copyfile)
+        )
+        if retencion is not None:
+            repositorio.aplicar_retencion(**retencion)
+            if _registro_cambios is not None:
+                _registro_cambios.borrar_anteriores(repositorio.listar()[0])
+    return manifiesto["identificador"]
+
+@contextmanager
+def _escrituras_detenidas():
+    # Ni este proceso ni (en modo compartido) las otras terminales escriben durante el bloque
+    with _bloqueo_escrituras:
+        vaciar_escrituras()
+        bloqueo = getattr(obtener_almacen(), "bloqueo", None)
+        with bloqueo if bloqueo is not None else nullcontext():
+            yield
+
+def listar_backups(directorio=None):
+    """
+    Devuelve los identificadores de los backups, del más viejo al más nuevo.
+    """
+    return _repositorio_backups(directorio).listar()
+
+def iniciar_backups_periodicos(intervalo=300, **opciones):
+    """
+    Hace un backup cada intervalo segundos en segundo plano (con las opciones de crear_backup).
+    Devuelve el RespaldoPeriodico; detener() lo termina haciendo un último backup.
+    """
+    return RespaldoPeriodico(lambda: crear_backup(**opciones), intervalo).iniciar()
+
+def restaurar_backup(timestamp, directorio=None):
+    """
+    Restaura los archivos desde un backup específico y vuelve a abrir el almacén.
+    También acepta los backups viejos (turnos_backup_<fecha>.json).
     FUNCIONALIDAD: Recuperar datos en caso de problemas
     """
-    backup_turnos = f"turnos_backup_{timestamp}.json"
-    backup_reservas = f"reservas_backup_{timestamp}.json"
-    
-    if os.path.exists(backup_turnos):
-        with open(backup_turnos, "r", encoding="utf-8") as backup:
-            with open("turnos.json", "w", encoding="utf-8") as original:
-                original.write(backup.read())
-    
-    if os.path.exists(backup_reservas):
-        with open(backup_reservas, "r", encoding="utf-8") as backup:
-            with open("reservas.json", "w", encoding="utf-8") as original:
-                original.write(backup.read()) 
\ No newline at end of file
+    global _almacen, _registro_cambios
+    vaciar_escrituras()
+    almacen = obtener_almacen()
+    destino = getattr(almacen, "directorio", ".")
+    repositorio = _repositorio_backups(directorio)
+    if timestamp not in repositorio.listar():
+        _restaurar_backup_viejo(timestamp)
+        return
+
+    # El almacén se cierra mientras se reemplazan sus archivos (SQLite los tiene abiertos)
+    if hasattr(almacen, "cerrar"):
+        almacen.cerrar()
+    _almacen = None
+    registro = _registro_cambios
+    _registro_cambios = None
+    try:
+        repositorio.restaurar(timestamp, destino)
+    finally:
+        configurar_almacenamiento(
+            _configuracion["motor"], _configuracion["diferido"], _configuracion["compartido"],
+            **_configuracion["opciones"]
+        )
+        _registro_cambios = registro
+    # Un backup nuevo marca el punto desde el que se vuelven a reaplicar cambios
+    if _registro_cambios is not None:
+        crear_backup(directorio)
+
+def activar_registro_de_cambios(directorio=None):
+    """
+    Empieza a anotar cada cambio persistido, con su momento, junto a los backups
+    (backups/cambios/), para poder volver a cualquier momento con restaurar_a_momento.
+    Si todavía no hay backups, hace el primero.
+    FUNCIONALIDAD: Poder deshacer un cierre de día equivocado
+    """
+    global _registro_cambios
+    repositorio = _repositorio_backups(directorio)
+    if _registro_cambios is None:
+        _registro_cambios = RegistroCambios(os.path.join(repositorio.directorio, "cambios"))
+    if not repositorio.listar():
+        crear_backup(directorio)
+    return _registro_cambios
+
+def desactivar_registro_de_cambios():
+    """
+    Deja de anotar cambios.
+    """
+    global _registro_cambios
+    if _registro_cambios is not None:
+        _registro_cambios.cerrar()
+        _registro_cambios = None
+
+def restaurar_a_momento(momento, simular=True, directorio=None):
+    """
+    Reconstruye los datos como estaban en un momento (datetime): el último backup
+    anterior más los cambios registrados hasta ese momento. Con simular=True solo
+    informa las diferencias con los datos actuales; si no, además los reemplaza.
+    Devuelve {"backup", "cambios_reaplicados", "diferencias": {coleccion: ...}, "aplicado"}.
+    FUNCIONALIDAD: Recuperar los datos tal como estaban antes de un error
+    """
+    vaciar_escrituras()
+    repositorio = _repositorio_backups(directorio)
+    registro = _registro_cambios
+    if registro is None and os.path.isdir(os.path.join(repositorio.directorio, "cambios")):
+        registro = RegistroCambios(os.path.join(repositorio.directorio, "cambios"))
+    identificador, colecciones, reaplicados = reconstruir(repositorio, registro, momento, MOTORES)
+
+    almacen = obtener_almacen()
+    resultado = {
+        "backup": identificador,
+        "cambios_reaplicados": reaplicados,
+        "diferencias": {
+            coleccion: diferencias(almacen.cargar(coleccion), datos, coleccion)
+            for coleccion, datos in colecciones.items()
+        },
+        "aplicado": not simular
+    }
+    if not simular:
+        for coleccion, datos in colecciones.items():
+            _guardar_coleccion(coleccion, datos)
+    return resultado
+
+def _restaurar_backup_viejo(timestamp):
+    for coleccion in ("turnos", "reservas"):
+        backup = f"{coleccion}_backup_{timestamp}.json"
+        if os.path.exists(backup):
+            with open(backup, "rb") as origen:
+                escribir_atomico(f"{coleccion}.json", lambda archivo: shutil.copyfileobj(origen, archivo), binario=True)
@@ -0,0 +1,235 @@
+"""
+Módulo de recuperación a un momento dado para el sistema de turnos.
+Mientras el registro de cambios está activo, cada cambio persistido se anota con su
+momento en un segmento JSON lines (backups/cambios/<identificador>.jsonl); cada backup
+empieza un segmento nuevo. Los segmentos son compartidos: todas las terminales anotan,
+con un bloqueo de archivo, en el segmento más nuevo. Para volver a cualquier momento se toma el último backup
+anterior a ese momento (buscado con bisect entre los identificadores, que se ordenan
+como las fechas) y se le reaplican los cambios anotados hasta ese momento.
+
+Uso:
+    python -m sistema_turnos.datos.recuperacion --momento "2025-08-01 18:30"            # solo muestra las diferencias
+    python -m sistema_turnos.datos.recuperacion --momento "2025-08-01 18:30" --aplicar
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from bisect import bisect_right
+from datetime import datetime
+
+from sistema_turnos.datos.bitacora import aplicar_cambio
+from sistema_turnos.datos.compartido import BloqueoArchivo
+from sistema_turnos.datos.modelos import serializar
+from sistema_turnos.datos.respaldos import FORMATO_IDENTIFICADOR
+from sistema_turnos.utils.claves import CLAVES_POR_COLECCION
+
+class RegistroCambios:
+    """
+    Anota los cambios persistidos, con su momento, en segmentos JSON lines.
+    Las operaciones son las de la bitácora ("alta", "baja", "modificacion") más
+    "completa", que guarda la colección entera (por ejemplo guardar_reservas).
+    """
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+        self._bloqueo = BloqueoArchivo(os.path.join(directorio, "cambios.lock"))
+        self._archivo = None
+        self._segmento = None
+
+    def segmentos(self):
+        """
+        Devuelve los nombres de los segmentos (sin extensión), del más viejo al más nuevo.
+        """
+        return sorted(nombre[:-6] for nombre in os.listdir(self.directorio) if nombre.endswith(".jsonl"))
+
+    def rotar(self, identificador=None):
+        """
+        Empieza un segmento nuevo (por ejemplo al hacer un backup con ese identificador).
+        Desde ese momento todas las terminales anotan en él.
+        """
+        identificador = identificador or datetime.now().strftime(FORMATO_IDENTIFICADOR)
+        with self._bloqueo:
+            open(os.path.join(self.directorio, f"{identificador}.jsonl"), "a", encoding="utf-8").close()
+
+    def anotar(self, coleccion, operacion, registro=None, datos=None):
+        """
+        Anota un cambio con el momento actual en el segmento más nuevo.
+        FUNCIONALIDAD: Guardar la historia de cambios para poder volver atrás
+        """
+        cambio = {"coleccion": coleccion, "op": operacion}
+        if operacion == "completa":
+            cambio["datos"] = list(datos)
+        else:
+            cambio["clave"] = list(CLAVES_POR_COLECCION[coleccion](registro))
+            if operacion != "baja":
+                cambio["registro"] = registro
+        with self._bloqueo:
+            segmentos = self.segmentos()
+            segmento = segmentos[-1] if segmentos else datetime.now().strftime(FORMATO_IDENTIFICADOR)
+            if segmento != self._segmento:
+                # Otra terminal (o un backup) empezó un segmento nuevo
+                self._cerrar_archivo()
+                self._archivo = open(os.path.join(self.directorio, f"{segmento}.jsonl"), "a", encoding="utf-8")
+                self._segmento = segmento
+            # El momento se toma con el bloqueo: dentro de un segmento los cambios quedan en orden
+            cambio = {"t": datetime.now().isoformat(timespec="microseconds"), **cambio}
+            self._archivo.write(json.dumps(cambio, ensure_ascii=False, separators=(",", ":"), default=serializar) + "\n")
+            self._archivo.flush()
+
+    def leer(self, desde, hasta):
+        """
+        Devuelve, en orden, los cambios de los segmentos que empiezan en desde o después
+        (identificador) y que ocurrieron hasta el momento indicado (datetime).
+        """
+        limite = hasta.isoformat(timespec="microseconds")
+        for segmento in self.segmentos():
+            if segmento < desde:
+                continue
+            with open(os.path.join(self.directorio, f"{segmento}.jsonl"), "r", encoding="utf-8") as archivo:
+                for linea in archivo:
+                    try:
+                        cambio = json.loads(linea)
+                    except json.JSONDecodeError:
+                        # Una línea cortada por un cierre inesperado
+                        continue
+                    if cambio["t"] > limite:
+                        return
+                    yield cambio
+
+    def borrar_anteriores(self, identificador):
+        """
+        Borra los segmentos anteriores a un backup (ya no sirven sin un backup previo).
+        """
+        with self._bloqueo:
+            for segmento in self.segmentos():
+                if segmento < identificador:
+                    if segmento == self._segmento:
+                        self._cerrar_archivo()
+                    os.remove(os.path.join(self.directorio, f"{segmento}.jsonl"))
+
+    def cerrar(self):
+        """
+        Cierra el segmento actual.
+        """
+        with self._bloqueo:
+            self._cerrar_archivo()
+
+    def _cerrar_archivo(self):
+        if self._archivo is not None:
+            self._archivo.close()
+        self._archivo = None
+        self._segmento = None
+
+def backup_anterior(identificadores, momento):
+    """
+    Devuelve el identificador del último backup hecho hasta ese momento, o None.
+    identificadores debe estar ordenado (los identificadores se ordenan como las fechas).
+    """
+    posicion = bisect_right(identificadores, momento.strftime(FORMATO_IDENTIFICADOR))
+    return identificadores[posicion - 1] if posicion else None
+
+def reconstruir(repositorio, registro, momento, motores):
+    """
+    Reconstruye las colecciones como estaban en un momento: restaura el último backup
+    anterior en un directorio temporal, lo carga con su motor y le reaplica los cambios
+    anotados hasta ese momento. Devuelve (identificador del backup, {coleccion: registros}, cambios reaplicados).
+    FUNCIONALIDAD: Recuperar los datos tal como estaban en cualquier momento
+    """
+    identificador = backup_anterior(repositorio.listar(), momento)
+    if identificador is None:
+        raise ValueError(f"No hay backups anteriores a {momento.isoformat(sep=' ')}")
+    motor = repositorio.manifiesto(identificador)["datos"].get("motor", "json")
+
+    temporal = tempfile.mkdtemp(prefix="recuperacion-")
+    try:
+        repositorio.restaurar(identificador, temporal, respaldo=False)
+        almacen = motores[motor](directorio=temporal)
+        try:
+            colecciones = {
+                coleccion: {clave(r): r for r in almacen.cargar(coleccion)}
+                for coleccion, clave in CLAVES_POR_COLECCION.items()
+            }
+        finally:
+            if hasattr(almacen, "cerrar"):
+                almacen.cerrar()
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+    reaplicados = 0
+    if registro is not None:
+        for cambio in registro.leer(identificador, momento):
+            registros = colecciones[cambio["coleccion"]]
+            if cambio["op"] == "completa":
+                clave = CLAVES_POR_COLECCION[cambio["coleccion"]]
+                registros.clear()
+                registros.update((clave(r), r) for r in cambio["datos"])
+            else:
+                aplicar_cambio(registros, tuple(cambio["clave"]), cambio["op"], cambio.get("registro"))
+            reaplicados += 1
+    return identificador, {coleccion: list(registros.values()) for coleccion, registros in colecciones.items()}, reaplicados
+
+def diferencias(actuales, objetivo, coleccion):
+    """
+    Compara dos versiones de una colección. Devuelve un diccionario con las listas
+    "altas" (registros que volverían), "bajas" (que se quitarían) y "modificadas"
+    (pares [actual, objetivo]).
+    """
+    clave = CLAVES_POR_COLECCION[coleccion]
+    antes = {clave(r): r for r in actuales}
+    despues = {clave(r): r for r in objetivo}
+    return {
+        "altas": [r for c, r in despues.items() if c not in antes],
+        "bajas": [r for c, r in antes.items() if c not in despues],
+        "modificadas": [
+            [antes[c], r] for c, r in despues.items()
+            if c in antes and not _iguales(antes[c], r)
+        ]
+    }
+
+def _iguales(uno, otro):
+    # El id se deriva de la clave: que uno lo tenga guardado y el otro no, no es una diferencia
+    if uno == otro:
+        return True
+    return {k: v for k, v in uno.items() if k != "id"} == {k: v for k, v in otro.items() if k != "id"}
+
+def _describir(coleccion, registro):
+    fecha, hora = (registro.get("turno", registro).get("fecha_hora") or ["", ""])
+    quien = f" {registro['documento']} ({registro.get('estado')})" if coleccion == "reservas" else ""
+    return f"{fecha} {hora}{quien}"
+
+def main(argumentos=None):
+    """
+    Muestra (o aplica con --aplicar) cómo quedarían los datos al volver a un momento.
+    """
+    from sistema_turnos.datos import persistencia
+
+    parser = argparse.ArgumentParser(description="Recuperar los datos a un momento dado")
+    parser.add_argument("--momento", required=True, help='fecha y hora, por ejemplo "2025-08-01 18:30"')
+    parser.add_argument("--aplicar", action="store_true", help="reemplazar los datos (por defecto solo se muestran las diferencias)")
+    parser.add_argument("--backups", help="directorio de los backups (por defecto backups/ junto a los datos)")
+    opciones = parser.parse_args(argumentos)
+    try:
+        momento = datetime.fromisoformat(opciones.momento)
+    except ValueError:
+        parser.error(f"Momento inválido: {opciones.momento}")
+
+    resultado = persistencia.restaurar_a_momento(momento, simular=not opciones.aplicar, directorio=opciones.backups)
+    print(f"Backup {resultado['backup']} + {resultado['cambios_reaplicados']} cambios reaplicados")
+    for coleccion, diferencia in resultado["diferencias"].items():
+        print(f"{coleccion}: {len(diferencia['altas'])} altas, {len(diferencia['bajas'])} bajas, "
+              f"{len(diferencia['modificadas'])} modificadas")
+        for signo, registros in (("+", diferencia["altas"]), ("-", diferencia["bajas"])):
+            for registro in registros[:20]:
+                print(f"  {signo} {_describir(coleccion, registro)}")
+        for actual, objetivo in diferencia["modificadas"][:20]:
+            print(f"  ~ {_describir(coleccion, actual)} -> {objetivo.get('estado')}")
+    print("Datos restaurados." if opciones.aplicar else "Simulación: no se cambió nada (usar --aplicar).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
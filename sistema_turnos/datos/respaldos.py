@@ -0,0 +1,327 @@
+"""
+Módulo de backups incrementales para el sistema de turnos.
+Cada archivo de datos se parte en fragmentos según su contenido (los cortes caen en
+finales de línea elegidos por un hash, así insertar un registro solo cambia los
+fragmentos vecinos) y cada fragmento se guarda una sola vez, comprimido, con su hash
+SHA-256 como nombre. Un backup es un manifiesto con la lista de fragmentos de cada
+archivo: los backups seguidos solo agregan los fragmentos que cambiaron.
+Los archivos se leen y se restauran de a un fragmento, sin cargarlos enteros en memoria.
+Si los datos se siguen escribiendo, los archivos que cambiaron se copian primero con
+las escrituras detenidas, y se fragmentan y comprimen después, desde las copias.
+
+Estructura del directorio de backups:
+    fragmentos/ab/abcdef....gz     (o .xz con lzma)
+    instantaneas/<identificador>.json
+"""
+
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from datetime import datetime
+
+from sistema_turnos.datos.archivos import escribir_atomico
+from sistema_turnos.datos.compartido import BloqueoArchivo
+
+# Tamaños de los fragmentos: se corta en un final de línea elegido por su hash
+# (en promedio cada DIVISOR_CORTE líneas) una vez superado el mínimo
+TAMANIO_MINIMO_FRAGMENTO = 16 * 1024
+TAMANIO_MAXIMO_FRAGMENTO = 1024 * 1024
+DIVISOR_CORTE = 1024
+
+COMPRESIONES = {
+    "gzip": (".gz", lambda datos: gzip.compress(datos, compresslevel=6, mtime=0), gzip.decompress),
+    "lzma": (".xz", lzma.compress, lzma.decompress)
+}
+FORMATO_IDENTIFICADOR = "%Y%m%d_%H%M%S_%f"
+
+def fragmentar(archivo):
+    """
+    Recorre un archivo binario abierto y devuelve sus fragmentos (bytes) de a uno.
+    Los cortes dependen solo del contenido, así dos versiones parecidas de un
+    archivo comparten casi todos sus fragmentos.
+    """
+    fragmento = bytearray()
+    while True:
+        linea = archivo.readline(TAMANIO_MAXIMO_FRAGMENTO)
+        if not linea:
+            break
+        fragmento += linea
+        if len(fragmento) >= TAMANIO_MAXIMO_FRAGMENTO or (
+            len(fragmento) >= TAMANIO_MINIMO_FRAGMENTO and zlib.crc32(linea) % DIVISOR_CORTE == 0
+        ):
+            yield bytes(fragmento)
+            fragmento = bytearray()
+    if fragmento:
+        yield bytes(fragmento)
+
+def politica_de_retencion(momentos, ultimos=10, diarios=7, semanales=4):
+    """
+    Elige qué backups conservar: los últimos N, el más reciente de cada uno de los
+    últimos días con backups y el más reciente de cada una de las últimas semanas.
+    Recibe y devuelve momentos (datetime); el resultado es un conjunto.
+    FUNCIONALIDAD: Evitar que los backups se acumulen para siempre
+    """
+    ordenados = sorted(momentos, reverse=True)
+    conservar = set(ordenados[:ultimos])
+    for cantidad, periodo in ((diarios, lambda m: m.date()), (semanales, lambda m: m.isocalendar()[:2])):
+        vistos = []
+        for momento in ordenados:
+            if len(vistos) == cantidad:
+                break
+            if periodo(momento) not in vistos:
+                vistos.append(periodo(momento))
+                conservar.add(momento)
+    return conservar
+
+class RepositorioRespaldos:
+    """
+    Directorio de backups con fragmentos deduplicados y comprimidos.
+    Crear backups y aplicar la retención se hacen con un bloqueo de archivo
+    (self.bloqueo, sobre respaldos.lock): varias terminales pueden usar el mismo
+    directorio sin que una borre los fragmentos que otra está guardando.
+    """
+
+    def __init__(self, directorio="backups", compresion="gzip"):
+        if compresion not in COMPRESIONES:
+            raise ValueError(f"Compresión desconocida: {compresion}")
+        self.directorio = directorio
+        self.compresion = compresion
+        os.makedirs(os.path.join(directorio, "fragmentos"), exist_ok=True)
+        os.makedirs(os.path.join(directorio, "instantaneas"), exist_ok=True)
+        self.bloqueo = BloqueoArchivo(os.path.join(directorio, "respaldos.lock"))
+
+    def crear(self, archivos, datos=None, identificador=None, bloqueo=None, copiar=shutil.copyfile):
+        """
+        Crea un backup de los archivos indicados y devuelve su manifiesto.
+        Los archivos que no cambiaron desde el último backup (mismo tamaño, fecha de
+        modificación e inodo) no se vuelven a leer. datos se guarda en el manifiesto
+        (por ejemplo el motor de almacenamiento). Sin identificador se usa el momento actual.
+        Con bloqueo (un context manager que detiene las escrituras) se piden las rutas
+        (archivos puede ser una función) y se copian los archivos que cambiaron con
+        copiar(origen, destino) dentro del bloqueo; los fragmentos se cortan y comprimen
+        después, desde las copias. Así el backup es una foto coherente de los datos y
+        las escrituras esperan solo lo que tarda la copia.
+        FUNCIONALIDAD: Proteger datos importantes con backups baratos y frecuentes
+        """
+        with self.bloqueo:
+            if identificador is None:
+                identificador = datetime.now().strftime(FORMATO_IDENTIFICADOR)
+            momento = datetime.strptime(identificador, FORMATO_IDENTIFICADOR)
+            anterior = self._ultimo_manifiesto()
+            anteriores = anterior["archivos"] if anterior else {}
+
+            manifiesto = {
+                "identificador": identificador,
+                "momento": momento.isoformat(),
+                "compresion": self.compresion,
+                "datos": datos or {},
+                "archivos": {},
+                "ausentes": [],
+                "fragmentos_nuevos": 0,
+                "bytes_nuevos": 0
+            }
+            if bloqueo is None:
+                for nombre, ruta, firma in self._cambiados(archivos, anteriores, manifiesto):
+                    manifiesto["archivos"][nombre] = self._guardar_archivo(ruta, firma, manifiesto)
+            else:
+                with tempfile.TemporaryDirectory(dir=self.directorio) as temporal:
+                    copias = []
+                    with bloqueo:
+                        rutas = archivos() if callable(archivos) else archivos
+                        for nombre, ruta, firma in self._cambiados(rutas, anteriores, manifiesto):
+                            copia = os.path.join(temporal, nombre)
+                            copiar(ruta, copia)
+                            copias.append((nombre, copia, firma))
+                    for nombre, copia, firma in copias:
+                        manifiesto["archivos"][nombre] = self._guardar_archivo(copia, firma, manifiesto)
+
+            escribir_atomico(
+                self._ruta_manifiesto(identificador),
+                lambda archivo: json.dump(manifiesto, archivo, ensure_ascii=False, indent=2)
+            )
+            return manifiesto
+
+    def listar(self):
+        """
+        Devuelve los identificadores de los backups, del más viejo al más nuevo.
+        """
+        directorio = os.path.join(self.directorio, "instantaneas")
+        return sorted(nombre[:-5] for nombre in os.listdir(directorio) if nombre.endswith(".json"))
+
+    def manifiesto(self, identificador):
+        """
+        Devuelve el manifiesto de un backup.
+        """
+        with open(self._ruta_manifiesto(identificador), "r", encoding="utf-8") as archivo:
+            return json.load(archivo)
+
+    def restaurar(self, identificador, destino, respaldo=True):
+        """
+        Reconstruye en el directorio destino los archivos de un backup, de a un
+        fragmento, verificando el hash de cada archivo, y borra los que no existían
+        cuando se hizo el backup. Devuelve las rutas escritas.
+        FUNCIONALIDAD: Recuperar datos en caso de problemas
+        """
+        manifiesto = self.manifiesto(identificador)
+        escritas = []
+        for nombre, entrada in manifiesto["archivos"].items():
+            ruta = os.path.join(destino, nombre)
+
+            def escribir(archivo, entrada=entrada, nombre=nombre):
+                resumen = hashlib.sha256()
+                for huella in entrada["fragmentos"]:
+                    contenido = self._leer_fragmento(huella)
+                    resumen.update(contenido)
+                    archivo.write(contenido)
+                if resumen.hexdigest() != entrada["sha256"]:
+                    raise ValueError(f"El backup de {nombre} está dañado")
+
+            escribir_atomico(ruta, escribir, respaldo=respaldo, binario=True)
+            escritas.append(ruta)
+        for nombre in manifiesto.get("ausentes", ()):
+            try:
+                os.remove(os.path.join(destino, nombre))
+            except FileNotFoundError:
+                pass
+        return escritas
+
+    def aplicar_retencion(self, ultimos=10, diarios=7, semanales=4):
+        """
+        Borra los backups que la política de retención no conserva y los fragmentos
+        que ya no usa ningún backup. Devuelve (backups borrados, fragmentos borrados).
+        """
+        with self.bloqueo:
+            momentos = {datetime.strptime(i, FORMATO_IDENTIFICADOR): i for i in self.listar()}
+            conservar = politica_de_retencion(momentos, ultimos, diarios, semanales)
+            borrados = [i for momento, i in sorted(momentos.items()) if momento not in conservar]
+            for identificador in borrados:
+                os.remove(self._ruta_manifiesto(identificador))
+            return borrados, self._podar()
+
+    def _cambiados(self, archivos, anteriores, manifiesto):
+        # Anota en el manifiesto los archivos ausentes y los que no cambiaron;
+        # devuelve (nombre, ruta, firma) de los que hay que leer
+        cambiados = []
+        for ruta in archivos:
+            nombre = os.path.basename(ruta)
+            try:
+                estado = os.stat(ruta)
+            except FileNotFoundError:
+                # Al restaurar se borra, para no mezclarlo con los datos del backup
+                manifiesto["ausentes"].append(nombre)
+                continue
+            firma = [estado.st_size, estado.st_mtime_ns, estado.st_ino]
+            previo = anteriores.get(nombre)
+            if previo is not None and previo.get("firma") == firma:
+                manifiesto["archivos"][nombre] = previo
+            else:
+                cambiados.append((nombre, ruta, firma))
+        return cambiados
+
+    def _guardar_archivo(self, ruta, firma, manifiesto):
+        resumen = hashlib.sha256()
+        huellas = []
+        with open(ruta, "rb") as archivo:
+            for contenido in fragmentar(archivo):
+                resumen.update(contenido)
+                huella = hashlib.sha256(contenido).hexdigest()
+                huellas.append(huella)
+                if self._buscar_fragmento(huella) is None:
+                    manifiesto["bytes_nuevos"] += self._escribir_fragmento(huella, contenido)
+                    manifiesto["fragmentos_nuevos"] += 1
+        return {"firma": firma, "sha256": resumen.hexdigest(), "fragmentos": huellas}
+
+    def _ruta_fragmento(self, huella, extension):
+        return os.path.join(self.directorio, "fragmentos", huella[:2], huella + extension)
+
+    def _buscar_fragmento(self, huella):
+        # El fragmento puede estar comprimido con cualquier algoritmo (si se cambió la compresión)
+        for extension, _, descomprimir in COMPRESIONES.values():
+            ruta = self._ruta_fragmento(huella, extension)
+            if os.path.exists(ruta):
+                return ruta, descomprimir
+        return None
+
+    def _escribir_fragmento(self, huella, contenido):
+        extension, comprimir, _ = COMPRESIONES[self.compresion]
+        ruta = self._ruta_fragmento(huella, extension)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        comprimido = comprimir(contenido)
+        # Los fragmentos no cambian nunca: no hace falta conservar versión anterior
+        escribir_atomico(ruta, lambda archivo: archivo.write(comprimido), respaldo=False, binario=True)
+        return len(comprimido)
+
+    def _leer_fragmento(self, huella):
+        encontrado = self._buscar_fragmento(huella)
+        if encontrado is None:
+            raise FileNotFoundError(f"Falta el fragmento {huella} del backup")
+        ruta, descomprimir = encontrado
+        with open(ruta, "rb") as archivo:
+            contenido = descomprimir(archivo.read())
+        if hashlib.sha256(contenido).hexdigest() != huella:
+            raise ValueError(f"El fragmento {huella} está dañado")
+        return contenido
+
+    def _ultimo_manifiesto(self):
+        identificadores = self.listar()
+        return self.manifiesto(identificadores[-1]) if identificadores else None
+
+    def _podar(self):
+        usados = set()
+        for identificador in self.listar():
+            for entrada in self.manifiesto(identificador)["archivos"].values():
+                usados.update(entrada["fragmentos"])
+        borrados = 0
+        raiz = os.path.join(self.directorio, "fragmentos")
+        for carpeta in os.listdir(raiz):
+            for nombre in os.listdir(os.path.join(raiz, carpeta)):
+                if nombre.split(".")[0] not in usados:
+                    os.remove(os.path.join(raiz, carpeta, nombre))
+                    borrados += 1
+        return borrados
+
+    def _ruta_manifiesto(self, identificador):
+        return os.path.join(self.directorio, "instantaneas", f"{identificador}.json")
+
+class RespaldoPeriodico:
+    """
+    Hace un backup cada cierto intervalo (en segundos) en un hilo aparte.
+    crear es la función que hace cada backup (por ejemplo persistencia.crear_backup).
+    Si un backup falla, el error queda en self.error y se sigue intentando.
+    """
+
+    def __init__(self, crear, intervalo=300):
+        self.crear = crear
+        self.intervalo = intervalo
+        self.error = None
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._trabajar, name="backups-turnos", daemon=True)
+
+    def iniciar(self):
+        """
+        Empieza a hacer backups en segundo plano.
+        """
+        self._hilo.start()
+        return self
+
+    def detener(self, ultimo=True):
+        """
+        Detiene los backups; con ultimo=True hace uno más antes de terminar.
+        """
+        self._detener.set()
+        self._hilo.join()
+        if ultimo:
+            self.crear()
+
+    def _trabajar(self):
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.crear()
+            except Exception as error:
+                self.error = error
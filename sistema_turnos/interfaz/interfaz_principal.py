@@ -4,8 +4,11 @@ Clase principal que coordina los módulos de interfaz.
 """
 
 import curses
+from contextlib import nullcontext
 from sistema_turnos.interfaz.menus import MenusInterfaz
-from sistema_turnos.interfaz.pantalla import PantallaInterfaz
+from sistema_turnos.interfaz.pantalla import PantallaInterfaz, formatear_turno
+from sistema_turnos.interfaz.lista_virtual import ListaVirtual
+from sistema_turnos.logica.reportes import ENCABEZADO, formatear_fila
 
 class InterfazTurnos:
     """
@@ -97,6 +100,12 @@ class InterfazTurnos:
         """
         return self.menus.menu_manicurista()
     
+    def menu_periodo_reporte(self):
+        """
+        Muestra el menú para elegir el período de un reporte.
+        """
+        return self.menus.menu_periodo_reporte()
+    
     def pedir_filtro_servicio(self, opciones_servicio):
         """
         Pide al usuario que ingrese un filtro de servicio.
@@ -135,68 +144,63 @@ class InterfazTurnos:
         for r in reservas:
             servicios_unicos.add(r["turno"]["servicio"])
         
-        seleccion = 0
+        # Filas en el orden visual (una sola vez): encabezado por profesional, sus reservas y un espacio
+        filas = []
+        total = 0
+        for profesional, reservas_prof in profesionales.items():
+            filas.append(("profesional", f"{profesional} ({len(reservas_prof)} reservas)", None))
+            for r in reservas_prof:
+                total += 1
+                filas.append(("reserva", r, total))
+            filas.append(("espacio", "", None))
+        
+        def formatear(posicion, fila):
+            tipo, valor, _ = fila
+            if tipo != "reserva":
+                return valor
+            # Usar tupla para fecha y hora
+            fecha, hora = valor["turno"]["fecha_hora"]
+            estado = valor.get("estado", "Pendiente")
+            monto = valor.get("montoCobrado")
+            texto = f"- {fecha} {hora} - {valor['turno']['servicio']} - {valor['nombre']} ({estado})"
+            if monto is not None:
+                texto += f" - ${monto:.2f}"
+            return texto
+        
+        self.stdscr.clear()
+        self.stdscr.addstr(1, (self.ancho - len("RESUMEN DE RESERVAS")) // 2, "RESUMEN DE RESERVAS")
+        # Mostrar estadísticas usando conjuntos
+        self.stdscr.attron(curses.color_pair(2))
+        self.stdscr.addstr(3, 2, f"Servicios disponibles: {', '.join(sorted(servicios_unicos))}"[:self.ancho - 4])
+        self.stdscr.attroff(curses.color_pair(2))
+        
+        lista = ListaVirtual(
+            self.stdscr, filas, formatear, 5, 2, self.altura - 9, self.ancho - 4,
+            seleccionable=lambda fila: fila[0] == "reserva",
+            estilo=lambda fila: curses.color_pair(1) if fila[0] == "profesional" else 0
+        )
         while True:
-            self.stdscr.clear()
-            self.stdscr.addstr(1, (self.ancho - len("RESUMEN DE RESERVAS")) // 2, "RESUMEN DE RESERVAS")
-            y = 3
-            max_lineas = self.altura - 5
-            visibles = []  # Lista de reservas en el orden visual
-            
-            # Mostrar estadísticas usando conjuntos
-            self.stdscr.attron(curses.color_pair(2))
-            self.stdscr.addstr(y, 2, f"Servicios disponibles: {', '.join(sorted(servicios_unicos))}")
-            self.stdscr.attroff(curses.color_pair(2))
-            y += 2
-            
-            # Construir la lista de reservas visibles y pintar usando .items()
-            for profesional, reservas_prof in profesionales.items():
-                if y >= max_lineas + 3:
-                    break
-                self.stdscr.attron(curses.color_pair(1))
-                self.stdscr.addstr(y, 2, f"{profesional} ({len(reservas_prof)} reservas)")
-                self.stdscr.attroff(curses.color_pair(1))
-                y += 1
-                for r in reservas_prof:
-                    if y >= max_lineas + 3:
-                        break
-                    # Usar tupla para fecha y hora
-                    fecha, hora = r["turno"]["fecha_hora"]
-                    estado = r.get("estado", "Pendiente")
-                    monto = r.get("montoCobrado")
-                    texto = f"- {fecha} {hora} - {r['turno']['servicio']} - {r['nombre']} ({estado})"
-                    if monto is not None:
-                        texto += f" - ${monto:.2f}"
-                    visibles.append(r)
-                    idx_visual = len(visibles) - 1
-                    if idx_visual == seleccion:
-                        self.stdscr.attron(curses.color_pair(2))
-                        self.stdscr.addstr(y, 2, texto[:self.ancho-4])
-                        self.stdscr.attroff(curses.color_pair(2))
-                    else:
-                        self.stdscr.addstr(y, 2, texto[:self.ancho-4])
-                    y += 1
-                if y < max_lineas + 3:
-                    y += 1  # Espacio entre profesionales
-            
+            numero = lista.elemento_seleccionado()[2]
+            self.stdscr.move(self.altura - 3, 0)
+            self.stdscr.clrtoeol()
             self.stdscr.attron(curses.color_pair(4))
-            self.stdscr.addstr(self.altura - 3, 2, f"↑↓ para navegar ({seleccion+1}/{len(visibles)}), ENTER para ver detalles, ESC para volver")
+            self.stdscr.addstr(self.altura - 3, 2, f"↑↓ para navegar ({numero}/{total}), ENTER para ver detalles, ESC para volver"[:self.ancho - 4])
             self.stdscr.attroff(curses.color_pair(4))
-            self.stdscr.refresh()
+            lista.dibujar()
             
             tecla = self.stdscr.getch()
-            if tecla == curses.KEY_UP and seleccion > 0:
-                seleccion -= 1
-            elif tecla == curses.KEY_DOWN and seleccion < len(visibles) - 1:
-                seleccion += 1
-            elif tecla == 10 and visibles:
-                return visibles[seleccion]
+            if lista.manejar_tecla(tecla):
+                continue
+            if tecla == 10:
+                return lista.elemento_seleccionado()[1]
             elif tecla == 27:
                 return None
 
-    def mostrar_lista_reservas_navegable(self, reservas):
+    def mostrar_lista_reservas_navegable(self, reservas, nota=None):
         """
         Muestra una lista navegable de reservas y permite seleccionar una.
+        nota es un aviso que se muestra debajo del título (por ejemplo, que la lista
+        solo cubre los meses recientes).
         Devuelve la reserva seleccionada o None si cancela.
         """
         if not reservas:
@@ -208,6 +212,10 @@ class InterfazTurnos:
         while True:
             self.stdscr.clear()
             self.stdscr.addstr(1, (self.ancho - len("RESERVAS")) // 2, "RESERVAS")
+            if nota:
+                self.stdscr.attron(curses.color_pair(4))
+                self.stdscr.addstr(2, 2, nota[:self.ancho - 4])
+                self.stdscr.attroff(curses.color_pair(4))
             y = 3
             reservas_vista = reservas[scroll:scroll+max_vista]
             for idx, r in enumerate(reservas_vista):
@@ -239,10 +247,12 @@ class InterfazTurnos:
             elif tecla == 27:
                 return None
 
-    def mostrar_opciones_reserva(self, reserva, reservas):
+    def mostrar_opciones_reserva(self, reserva, servicio):
         """
         Permite a la manicurista gestionar una reserva de forma intuitiva.
         Muestra datos del cliente a la izquierda y opciones de estado a la derecha.
+        Los cambios se aplican con el servicio de turnos (local o el servidor de reservas)
+        y se guardan al confirmarlos, antes de mostrar el resultado: estado y monto juntos.
         """
         while True:
             self.stdscr.clear()
@@ -343,10 +353,13 @@ class InterfazTurnos:
                     curses.noecho()
                     # Aplicar cambios
                     if estado == "atendida":
-                        from sistema_turnos.logica.atencion import marcar_como_atendida, cambiar_monto_cobrado
-                        resultado = marcar_como_atendida(reserva, reservas)
+                        # Estado y monto en una sola escritura, hecha al salir del bloque
+                        transaccion = getattr(servicio, "transaccion", None)
+                        with transaccion(atomica=False) if transaccion is not None else nullcontext():
+                            resultado = servicio.marcar_como_atendida(reserva=reserva)
+                            if resultado["exito"] and monto is not None:
+                                resultado_monto = servicio.cambiar_monto_cobrado(reserva=reserva, monto=monto)
                         if resultado["exito"] and monto is not None:
-                            resultado_monto = cambiar_monto_cobrado(reserva, monto, reservas)
                             if resultado_monto["exito"]:
                                 self.mostrar_mensaje("Reserva marcada como atendida y monto registrado.", "exito")
                             else:
@@ -356,8 +369,7 @@ class InterfazTurnos:
                         else:
                             self.mostrar_mensaje(resultado["error"], "error")
                     else:
-                        from sistema_turnos.logica.atencion import marcar_como_no_asistio
-                        resultado = marcar_como_no_asistio(reserva, reservas)
+                        resultado = servicio.marcar_como_no_asistio(reserva=reserva)
                         if resultado["exito"]:
                             self.mostrar_mensaje("Reserva marcada como no asistió.", "exito")
                         else:
@@ -540,47 +552,23 @@ class InterfazTurnos:
         ancho_turnos = int(self.ancho * 0.65)
         ancho_form = self.ancho - ancho_turnos - 4
         max_turnos_vista = self.altura - 7
-        scroll = 0
-        seleccion = 0
-        while True:
-            self.stdscr.clear()
+        x_form = ancho_turnos + 4
+        self.stdscr.attron(curses.color_pair(4))
+        if solo_vista:
+            self.stdscr.addstr(self.altura - 3, 2, "↑↓ RePág/AvPág Inicio/Fin para navegar, ESC para volver")
+        else:
+            self.stdscr.addstr(self.altura - 3, 2, "↑↓ para navegar, ENTER para elegir, ESC para cancelar")
+        self.stdscr.attroff(curses.color_pair(4))
+        if not solo_vista:
             self.stdscr.attron(curses.color_pair(1))
-            self.stdscr.addstr(1, 2, "TURNOS DISPONIBLES:")
+            self.stdscr.addstr(1, x_form, "RESERVAR TURNO:")
             self.stdscr.attroff(curses.color_pair(1))
-            y = 3
-            turnos_vista = turnos[scroll:scroll+max_turnos_vista]
-            for idx, turno in enumerate(turnos_vista):
-                if y < self.altura - 3:
-                    fecha, hora = turno["fecha_hora"]
-                    texto = f"{scroll+idx+1}. {fecha} {hora} - {turno['servicio']} con {turno['profesional']}"
-                    if scroll+idx == seleccion:
-                        self.stdscr.attron(curses.color_pair(2))
-                        self.stdscr.addstr(y, 2, texto[:ancho_turnos-4])
-                        self.stdscr.attroff(curses.color_pair(2))
-                    else:
-                        self.stdscr.addstr(y, 2, texto[:ancho_turnos-4])
-                    y += 1
-            self.stdscr.attron(curses.color_pair(4))
-            if solo_vista:
-                self.stdscr.addstr(self.altura - 3, 2, "↑↓ para navegar, ESC para volver")
-            else:
-                self.stdscr.addstr(self.altura - 3, 2, "↑↓ para navegar, ENTER para elegir, ESC para cancelar")
-            self.stdscr.attroff(curses.color_pair(4))
-            x_form = ancho_turnos + 4
-            if not solo_vista:
-                self.stdscr.attron(curses.color_pair(1))
-                self.stdscr.addstr(1, x_form, "RESERVAR TURNO:")
-                self.stdscr.attroff(curses.color_pair(1))
-            self.stdscr.refresh()
+        lista = ListaVirtual(self.stdscr, turnos, formatear_turno, 3, 2, max_turnos_vista, ancho_turnos - 4)
+        while True:
+            lista.dibujar()
             tecla = self.stdscr.getch()
-            if tecla == curses.KEY_UP and seleccion > 0:
-                seleccion -= 1
-                if seleccion < scroll:
-                    scroll -= 1
-            elif tecla == curses.KEY_DOWN and seleccion < len(turnos) - 1:
-                seleccion += 1
-                if seleccion >= scroll + max_turnos_vista:
-                    scroll += 1
+            if lista.manejar_tecla(tecla):
+                continue
             elif solo_vista:
                 if tecla == 27:
                     return None
@@ -589,6 +577,7 @@ class InterfazTurnos:
                     break
                 elif tecla == 27:
                     return None
+        seleccion = lista.seleccion
         self.stdscr.move(self.altura - 3, 0)
         self.stdscr.clrtoeol()
         if solo_vista:
@@ -701,6 +690,77 @@ class InterfazTurnos:
             else:
                 error = True 
 
+    def mostrar_estadisticas(self, stats):
+        """
+        Muestra las estadísticas de reservas: totales por estado, ingresos y por profesional.
+        """
+        self.stdscr.clear()
+        self.stdscr.attron(curses.color_pair(1))
+        self.stdscr.addstr(1, (self.ancho - len("ESTADÍSTICAS")) // 2, "ESTADÍSTICAS")
+        self.stdscr.attroff(curses.color_pair(1))
+        
+        y = 3
+        self.stdscr.addstr(y, 4, f"Total de reservas: {stats['total_reservas']}")
+        self.stdscr.addstr(y+1, 4, f"Pendientes: {stats['pendientes']}")
+        self.stdscr.addstr(y+2, 4, f"Atendidas: {stats['atendidas']}")
+        self.stdscr.addstr(y+3, 4, f"No asistieron: {stats['no_asistieron']}")
+        self.stdscr.addstr(y+4, 4, f"Ingresos totales: ${stats['ingresos_totales']:.2f}")
+        if stats.get("desde"):
+            self.stdscr.attron(curses.color_pair(4))
+            self.stdscr.addstr(2, 4, f"Solo reservas desde {stats['desde']}: la historia completa está en Ver reportes."[:self.ancho - 8])
+            self.stdscr.attroff(curses.color_pair(4))
+        y += 6
+        
+        self.stdscr.attron(curses.color_pair(2))
+        self.stdscr.addstr(y, 4, "POR PROFESIONAL:")
+        self.stdscr.attroff(curses.color_pair(2))
+        y += 1
+        for profesional, totales in sorted(stats["por_profesional"].items()):
+            if y >= self.altura - 3:
+                break
+            texto = (f"{profesional}: {totales['total']} reservas, "
+                     f"{totales['atendidas']} atendidas, ${totales['ingresos']:.2f}")
+            self.stdscr.addstr(y, 6, texto[:self.ancho - 8])
+            y += 1
+        
+        self.stdscr.attron(curses.color_pair(4))
+        self.stdscr.addstr(self.altura - 2, 4, "Presione cualquier tecla para volver...")
+        self.stdscr.attroff(curses.color_pair(4))
+        self.stdscr.refresh()
+        self.stdscr.getch()
+
+    def mostrar_reporte(self, filas):
+        """
+        Muestra un reporte por período como tabla desplazable.
+        """
+        scroll = 0
+        max_vista = self.altura - 7
+        while True:
+            self.stdscr.clear()
+            self.stdscr.attron(curses.color_pair(1))
+            self.stdscr.addstr(1, (self.ancho - len("REPORTES")) // 2, "REPORTES")
+            self.stdscr.attroff(curses.color_pair(1))
+            
+            self.stdscr.attron(curses.color_pair(2))
+            self.stdscr.addstr(3, 2, ENCABEZADO[:self.ancho - 4])
+            self.stdscr.attroff(curses.color_pair(2))
+            y = 4
+            for fila in filas[scroll:scroll + max_vista]:
+                self.stdscr.addstr(y, 2, formatear_fila(fila)[:self.ancho - 4])
+                y += 1
+            
+            self.stdscr.attron(curses.color_pair(4))
+            self.stdscr.addstr(self.altura - 2, 2, "↑↓ para desplazarse, ESC para volver")
+            self.stdscr.attroff(curses.color_pair(4))
+            self.stdscr.refresh()
+            tecla = self.stdscr.getch()
+            if tecla == curses.KEY_UP and scroll > 0:
+                scroll -= 1
+            elif tecla == curses.KEY_DOWN and scroll + max_vista < len(filas):
+                scroll += 1
+            elif tecla in (27, 10):
+                return
+
     def mostrar_detalles_reserva(self, reserva):
         """
         Muestra los detalles completos de una reserva seleccionada.
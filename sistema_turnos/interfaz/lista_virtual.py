@@ -0,0 +1,162 @@
+"""
+Módulo de lista virtual para el sistema de turnos.
+Muestra listas largas en curses pintando solo las filas visibles: cada línea se
+formatea la primera vez que aparece en pantalla y queda guardada, y en cada tecla
+se vuelven a pintar solo las filas que cambiaron (contenido o selección).
+"""
+
+import curses
+
+class ListaVirtual:
+    """
+    Lista navegable de cualquier largo dentro de una zona de la pantalla.
+    Los elementos pueden ser una lista, una ColeccionIndexada o una vista perezosa
+    (TurnosAgenda): solo se piden las porciones visibles.
+    """
+
+    def __init__(self, stdscr, elementos, formatear, y, x, alto, ancho,
+                 seleccionable=None, estilo=None, atributo_seleccion=None):
+        self.stdscr = stdscr
+        self.elementos = elementos
+        self.formatear = formatear
+        self.y = y
+        self.x = x
+        self.alto = max(1, alto)
+        self.ancho = max(1, ancho)
+        self.seleccionable = seleccionable
+        self.estilo = estilo
+        self.atributo_seleccion = curses.color_pair(2) if atributo_seleccion is None else atributo_seleccion
+        self.scroll = 0
+        self._lineas = {}
+        self._pintadas = {}
+        self.seleccion = self._buscar_seleccionable(0, 1) or 0
+
+    def __len__(self):
+        return len(self.elementos)
+
+    def elemento_seleccionado(self):
+        """
+        Devuelve el elemento seleccionado, o None si la lista está vacía.
+        """
+        if not len(self.elementos):
+            return None
+        return self.elementos[self.seleccion]
+
+    def invalidar(self):
+        """
+        Fuerza a volver a pintar todas las filas (por ejemplo después de un clear()).
+        """
+        self._pintadas = {}
+
+    def linea(self, posicion, elemento):
+        """
+        Devuelve el texto ya recortado de una fila, formateándolo solo la primera vez.
+        """
+        texto = self._lineas.get(posicion)
+        if texto is None:
+            texto = self.formatear(posicion, elemento)[:self.ancho]
+            self._lineas[posicion] = texto
+        return texto
+
+    def mover(self, desplazamiento):
+        """
+        Mueve la selección, saltando las filas que no se pueden elegir.
+        """
+        total = len(self.elementos)
+        if not total:
+            return
+        destino = min(max(self.seleccion + desplazamiento, 0), total - 1)
+        direccion = 1 if desplazamiento > 0 else -1
+        nueva = self._buscar_seleccionable(destino, direccion)
+        if nueva is None:
+            nueva = self._buscar_seleccionable(destino, -direccion)
+        if nueva is not None:
+            self.seleccion = nueva
+        self._ajustar_scroll()
+
+    def ir_a(self, posicion):
+        """
+        Selecciona una posición (negativa para contar desde el final).
+        """
+        total = len(self.elementos)
+        if posicion < 0:
+            posicion += total
+        self.mover(posicion - self.seleccion)
+
+    def manejar_tecla(self, tecla):
+        """
+        Procesa las teclas de navegación (↑↓, RePág/AvPág, Inicio/Fin).
+        Devuelve True si la tecla se usó para navegar.
+        """
+        if tecla == curses.KEY_UP:
+            self.mover(-1)
+        elif tecla == curses.KEY_DOWN:
+            self.mover(1)
+        elif tecla == curses.KEY_PPAGE:
+            self.mover(-self.alto)
+        elif tecla == curses.KEY_NPAGE:
+            self.mover(self.alto)
+        elif tecla == curses.KEY_HOME:
+            self.ir_a(0)
+        elif tecla == curses.KEY_END:
+            self.ir_a(-1)
+        else:
+            return False
+        return True
+
+    def dibujar(self):
+        """
+        Pinta las filas visibles que cambiaron desde el último dibujo y actualiza la terminal.
+        FUNCIONALIDAD: Navegar listas largas sin repintar toda la pantalla
+        """
+        vista = self.elementos[self.scroll:self.scroll + self.alto]
+        if vista and self.seleccion >= self.scroll + len(vista):
+            # Una vista perezosa puede terminar antes de lo que anunciaba len()
+            self.seleccion = self.scroll + len(vista) - 1
+        for fila in range(self.alto):
+            posicion = self.scroll + fila
+            if fila < len(vista):
+                elemento = vista[fila]
+                estado = (posicion, posicion == self.seleccion)
+            else:
+                elemento = None
+                estado = None
+            if self._pintadas.get(fila, False) == estado:
+                continue
+            self._pintar_fila(fila, posicion, elemento, estado)
+            self._pintadas[fila] = estado
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def _pintar_fila(self, fila, posicion, elemento, estado):
+        y = self.y + fila
+        try:
+            self.stdscr.addstr(y, self.x, " " * self.ancho)
+            if estado is None:
+                return
+            texto = self.linea(posicion, elemento)
+            if estado[1]:
+                atributo = self.atributo_seleccion
+            else:
+                atributo = self.estilo(elemento) if self.estilo else 0
+            self.stdscr.addstr(y, self.x, texto, atributo)
+        except curses.error:
+            pass
+
+    def _es_seleccionable(self, posicion):
+        return self.seleccionable is None or self.seleccionable(self.elementos[posicion])
+
+    def _buscar_seleccionable(self, desde, direccion):
+        total = len(self.elementos)
+        posicion = desde
+        while 0 <= posicion < total:
+            if self._es_seleccionable(posicion):
+                return posicion
+            posicion += direccion
+        return None if total else 0
+
+    def _ajustar_scroll(self):
+        if self.seleccion < self.scroll:
+            self.scroll = self.seleccion
+        elif self.seleccion >= self.scroll + self.alto:
+            self.scroll = self.seleccion - self.alto + 1
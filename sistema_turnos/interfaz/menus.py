@@ -44,10 +44,19 @@ class MenusInterfaz:
             "Ver resumen de reservas",
             "Gestionar reservas pendientes",
             "Filtrar reservas por estado",
+            "Ver estadísticas",
+            "Ver reportes",
             "Volver"
         ]
         return self.menu_seleccion(opciones, 3)
     
+    def menu_periodo_reporte(self):
+        """
+        Muestra el menú para elegir el período de un reporte.
+        """
+        opciones = ["Por día", "Por semana", "Por mes", "Volver"]
+        return self.menu_seleccion(opciones, 3)
+    
     def menu_seleccion(self, opciones, inicio_y):
         """
         Maneja la selección en un menú de forma segura.
@@ -6,6 +6,15 @@ Contiene funciones para limpieza, colores y helpers visuales.
 import curses
 import time
 
+from sistema_turnos.interfaz.lista_virtual import ListaVirtual
+
+def formatear_turno(posicion, turno):
+    """
+    Devuelve la línea de un turno en las listas navegables.
+    """
+    fecha, hora = turno["fecha_hora"]
+    return f"{posicion+1}. {fecha} {hora} - {turno['servicio']} con {turno['profesional']}"
+
 class PantallaInterfaz:
     """
     Clase que maneja la presentación visual del sistema.
@@ -113,42 +122,14 @@ class PantallaInterfaz:
         x, titulo_seguro = self.centrar_texto("TURNOS DISPONIBLES", 1)
         self.stdscr.addstr(1, x, titulo_seguro)
         self.stdscr.attroff(curses.color_pair(1))
-        y = 3
-        max_turnos_por_pantalla = self.altura - 5
-        seleccion = 0
-        scroll = 0
+        self.stdscr.addstr(self.altura - 2, 2, "↑↓ RePág/AvPág Inicio/Fin para navegar, ESC o ENTER para salir")
+        lista = ListaVirtual(self.stdscr, turnos, formatear_turno, 3, 2, self.altura - 6, self.ancho - 4)
         while True:
-            self.stdscr.clear()
-            self.stdscr.attron(curses.color_pair(1))
-            x, titulo_seguro = self.centrar_texto("TURNOS DISPONIBLES", 1)
-            self.stdscr.addstr(1, x, titulo_seguro)
-            self.stdscr.attroff(curses.color_pair(1))
-            y = 3
-            turnos_vista = turnos[scroll:scroll+max_turnos_por_pantalla]
-            for idx, turno in enumerate(turnos_vista):
-                if y < self.altura - 3:
-                    fecha, hora = turno["fecha_hora"]
-                    texto = f"{scroll+idx+1}. {fecha} {hora} - {turno['servicio']} con {turno['profesional']}"
-                    texto_seguro = texto[:self.ancho - 4] if len(texto) > self.ancho - 4 else texto
-                    if scroll+idx == seleccion:
-                        self.stdscr.attron(curses.color_pair(2))
-                        self.stdscr.addstr(y, 2, texto_seguro)
-                        self.stdscr.attroff(curses.color_pair(2))
-                    else:
-                        self.stdscr.addstr(y, 2, texto_seguro)
-                    y += 1
-            self.stdscr.addstr(self.altura - 2, 2, "↑↓ para navegar, ESC o ENTER para salir")
-            self.stdscr.refresh()
+            lista.dibujar()
             tecla = self.stdscr.getch()
-            if tecla == curses.KEY_UP and seleccion > 0:
-                seleccion -= 1
-                if seleccion < scroll:
-                    scroll -= 1
-            elif tecla == curses.KEY_DOWN and seleccion < len(turnos) - 1:
-                seleccion += 1
-                if seleccion >= scroll + max_turnos_por_pantalla:
-                    scroll += 1
-            elif tecla == 27 or tecla == 10:
+            if lista.manejar_tecla(tecla):
+                continue
+            if tecla == 27 or tecla == 10:
                 break
     
     def limpiar_pantalla(self):
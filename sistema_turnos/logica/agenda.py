@@ -0,0 +1,256 @@
+"""
+Módulo de agenda para el sistema de turnos.
+Genera los turnos disponibles a partir de los horarios de cada profesional,
+la duración de los servicios y las reservas existentes, sin guardar cada turno.
+"""
+
+from datetime import date, datetime, timedelta
+
+from sistema_turnos.utils.claves import id_registro
+from sistema_turnos.utils.indices import ColeccionIndexada
+from sistema_turnos.utils.intervalos import duracion_servicio
+
+# Horarios por defecto: días de la semana (0 = lunes), rango horario y servicios ofrecidos
+REGLAS_POR_DEFECTO = {
+    "paso_minutos": 90,
+    "profesionales": {
+        "Gisela": {"dias": [0, 1, 2, 3, 4], "desde": "09:00", "hasta": "15:00",
+                   "servicios": ["Kapping", "Semi", "Soft Gel"]},
+        "Marisol": {"dias": [1, 2, 3, 4, 5], "desde": "09:00", "hasta": "15:00",
+                    "servicios": ["Kapping", "Semi", "Soft Gel"]},
+        "Valentina": {"dias": [0, 2, 4, 5], "desde": "10:30", "hasta": "16:30",
+                      "servicios": ["Kapping", "Semi", "Soft Gel"]}
+    }
+}
+
+def a_minutos(hora):
+    """
+    Convierte "HH:MM" en minutos desde medianoche.
+    """
+    horas, minutos = hora.split(":")
+    return int(horas) * 60 + int(minutos)
+
+def a_hora(minutos):
+    """
+    Convierte minutos desde medianoche en "HH:MM".
+    """
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+def _ocupados_del_dia(reservas, fecha):
+    """
+    Devuelve {profesional: [(inicio, fin), ...]} con los intervalos reservados de un día.
+    """
+    if isinstance(reservas, ColeccionIndexada):
+        del_dia = reservas.buscar(fecha=fecha)
+    else:
+        del_dia = [r for r in reservas if (r.get("turno") or {}).get("fecha_hora", [""])[0] == fecha]
+
+    ocupados = {}
+    for reserva in del_dia:
+        turno = reserva["turno"]
+        inicio = a_minutos(turno["fecha_hora"][1])
+        fin = inicio + duracion_servicio(turno["servicio"])
+        ocupados.setdefault(turno["profesional"].lower(), []).append((inicio, fin))
+    return ocupados
+
+def generar_turnos(desde, hasta, reservas=(), reglas=None, servicio=None, profesional=None):
+    """
+    Genera de forma perezosa los turnos libres entre dos fechas (inclusive),
+    en orden de fecha y hora. Si desde es un momento (datetime), ese día solo se
+    generan los turnos que empiezan a esa hora o después.
+    FUNCIONALIDAD: Derivar turnos disponibles sin tener que escribirlos uno por uno
+    """
+    reglas = reglas or REGLAS_POR_DEFECTO
+    paso = reglas.get("paso_minutos", 90)
+    servicio = servicio.lower() if servicio else None
+    profesional = profesional.lower() if profesional else None
+    primer_minuto = desde.hour * 60 + desde.minute if isinstance(desde, datetime) else 0
+    if isinstance(desde, datetime):
+        desde = desde.date()
+
+    dia = desde
+    while dia <= hasta:
+        fecha = dia.isoformat()
+        ocupados = None
+        candidatos = []
+        for nombre, regla in reglas["profesionales"].items():
+            if profesional and nombre.lower() != profesional:
+                continue
+            if dia.weekday() not in regla["dias"]:
+                continue
+            if ocupados is None:
+                ocupados = _ocupados_del_dia(reservas, fecha)
+            intervalos = ocupados.get(nombre.lower(), [])
+            limite = a_minutos(regla["hasta"])
+
+            for inicio in range(a_minutos(regla["desde"]), limite, paso):
+                if dia == desde and inicio < primer_minuto:
+                    continue
+                for nombre_servicio in regla["servicios"]:
+                    if servicio and nombre_servicio.lower() != servicio:
+                        continue
+                    fin = inicio + duracion_servicio(nombre_servicio)
+                    if fin > limite:
+                        continue
+                    if any(inicio < fin_ocupado and inicio_ocupado < fin for inicio_ocupado, fin_ocupado in intervalos):
+                        continue
+                    candidatos.append((inicio, nombre, nombre_servicio))
+
+        for inicio, nombre, nombre_servicio in sorted(candidatos):
+            turno = {
+                "fecha_hora": [fecha, a_hora(inicio)],
+                "profesional": nombre,
+                "servicio": nombre_servicio
+            }
+            id_registro("turnos", turno)
+            yield turno
+        dia += timedelta(days=1)
+
+class TurnosAgenda:
+    """
+    Vista perezosa de los turnos generados por la agenda.
+    Se recorre como una lista (posición, porciones, len, in, remove), pero solo
+    genera los turnos a medida que se piden, página por página.
+    len() devuelve los turnos ya generados (al menos una página): nunca anuncia uno
+    que no existe. Pedir una porción genera uno más de lo pedido, así la navegación
+    en pantalla siempre ve que puede seguir avanzando.
+    desde es una fecha o un momento (datetime, ver generar_turnos). Sin desde se usa
+    el momento actual, tomado de nuevo cada vez que se regeneran los turnos: los de
+    hoy que ya empezaron no se ofrecen.
+    """
+
+    # Los turnos se derivan de la agenda, no se guardan en turnos.json
+    persistente = False
+
+    def __init__(self, reservas, reglas=None, desde=None, dias=60, servicio=None, profesional=None, tamanio_pagina=50):
+        self.reservas = reservas
+        self.reglas = reglas or REGLAS_POR_DEFECTO
+        self.dias = dias
+        self._desde_fijo = desde
+        self.servicio = servicio
+        self.profesional = profesional
+        self.tamanio_pagina = tamanio_pagina
+        self.reiniciar()
+
+    def reiniciar(self):
+        """
+        Descarta los turnos ya generados para volver a derivarlos de la agenda.
+        """
+        self._actualizar_rango()
+        self._generados = []
+        self._ids = {}
+        self._agotado = False
+        self._generador = generar_turnos(
+            self._inicio, self.hasta, self.reservas, self.reglas, self.servicio, self.profesional
+        )
+
+    def _actualizar_rango(self):
+        self._inicio = self._desde_fijo or datetime.now()
+        self.desde = self._inicio.date() if isinstance(self._inicio, datetime) else self._inicio
+        self.hasta = self.desde + timedelta(days=self.dias)
+
+    def _completar(self, cantidad):
+        while not self._agotado and len(self._generados) < cantidad:
+            for _ in range(self.tamanio_pagina):
+                try:
+                    turno = next(self._generador)
+                except StopIteration:
+                    self._agotado = True
+                    break
+                self._ids[turno["id"]] = turno
+                self._generados.append(turno)
+
+    def pagina(self, numero):
+        """
+        Devuelve la página pedida (empezando en 0) de turnos disponibles.
+        FUNCIONALIDAD: Recorrer la agenda por páginas bajo demanda
+        """
+        inicio = numero * self.tamanio_pagina
+        return self[inicio:inicio + self.tamanio_pagina]
+
+    def filtrar(self, servicio=None, profesional=None):
+        """
+        Devuelve otra vista de la agenda restringida a un servicio y/o profesional.
+        """
+        return TurnosAgenda(
+            self.reservas, self.reglas, self._desde_fijo, self.dias,
+            servicio or self.servicio, profesional or self.profesional, self.tamanio_pagina
+        )
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            if indice.stop is None or indice.stop < 0 or (indice.start or 0) < 0:
+                self._completar(float("inf"))
+            else:
+                # Uno más que lo pedido, para saber si la navegación puede seguir
+                self._completar(indice.stop + 1)
+            return self._generados[indice]
+        self._completar(float("inf") if indice < 0 else indice + 1)
+        return self._generados[indice]
+
+    def __len__(self):
+        self._completar(1)
+        return len(self._generados)
+
+    def __iter__(self):
+        posicion = 0
+        while True:
+            self._completar(posicion + 1)
+            if posicion >= len(self._generados):
+                return
+            yield self._generados[posicion]
+            posicion += 1
+
+    def por_turno(self, turno):
+        """
+        Devuelve el turno libre de la agenda que coincide con el pedido (fecha_hora,
+        profesional y servicio, con los nombres como en las reglas), o None si no se
+        ofrece. Solo se genera el día del turno, no las páginas anteriores.
+        """
+        return self._buscar(turno, self.reservas)
+
+    def _buscar(self, turno, reservas):
+        try:
+            fecha, hora = turno["fecha_hora"]
+            dia = date.fromisoformat(fecha)
+            profesional, servicio = turno["profesional"].lower(), turno["servicio"].lower()
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+        if self._desde_fijo is None:
+            # Un turno de hoy que ya empezó no se ofrece, aunque la vista se haya generado antes
+            self._actualizar_rango()
+        if not self.desde <= dia <= self.hasta:
+            return None
+        if (self.servicio and servicio != self.servicio.lower()) or (self.profesional and profesional != self.profesional.lower()):
+            return None
+        inicio = self._inicio if dia == self.desde else dia
+        for candidato in generar_turnos(inicio, dia, reservas, self.reglas, servicio, profesional):
+            if candidato["fecha_hora"][1] == hora:
+                return candidato
+        return None
+
+    def __contains__(self, turno):
+        return self.por_turno(turno) is not None
+
+    def remove(self, turno):
+        """
+        Saca de la vista un turno que acaba de reservarse, junto con los que se superponen.
+        Como los turnos se derivan de las reservas, alcanza con volver a generarlos.
+        La reserva ya puede estar agregada: se comprueba que el turno sea de la agenda sin mirarlas.
+        """
+        if self._buscar(turno, ()) is None:
+            raise ValueError("El turno no está en la agenda")
+        self.reiniciar()
+
+    def append(self, turno):
+        """
+        Devuelve un turno a la agenda (por ejemplo al cancelar una reserva).
+        Como los turnos se derivan de las reservas, alcanza con volver a generarlos.
+        """
+        self.reiniciar()
+
+    def copy(self):
+        """
+        Devuelve una lista con todos los turnos del rango.
+        """
+        return list(self)
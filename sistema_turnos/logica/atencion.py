@@ -3,7 +3,9 @@ Módulo de lógica de negocio para atención.
 Contiene las reglas de negocio para gestionar la atención de clientes.
 """
 
-from sistema_turnos.datos.persistencia import guardar_reservas
+from sistema_turnos.datos.persistencia import registrar_cambio
+from sistema_turnos.utils.indices import ColeccionIndexada, asignar_campo
+from sistema_turnos.logica.estadisticas import EstadisticasReservas, adjuntar_estadisticas
 
 def marcar_como_atendida(reserva, reservas):
     """
@@ -11,8 +13,8 @@ def marcar_como_atendida(reserva, reservas):
     FUNCIONALIDAD: Registrar que un cliente fue atendido
     """
     if reserva in reservas:
-        reserva["estado"] = "Atendida"
-        guardar_reservas(reservas)
+        asignar_campo(reservas, reserva, "estado", "Atendida")
+        registrar_cambio("reservas", "modificacion", reserva, reservas)
         return {
             "exito": True,
             "mensaje": f"Cliente {reserva['nombre']} marcado como atendido."
@@ -28,8 +30,8 @@ def marcar_como_no_asistio(reserva, reservas):
     FUNCIONALIDAD: Registrar que un cliente no asistió
     """
     if reserva in reservas:
-        reserva["estado"] = "No asistió"
-        guardar_reservas(reservas)
+        asignar_campo(reservas, reserva, "estado", "No asistió")
+        registrar_cambio("reservas", "modificacion", reserva, reservas)
         return {
             "exito": True,
             "mensaje": f"Cliente {reserva['nombre']} marcado como no asistió."
@@ -39,69 +41,52 @@ def marcar_como_no_asistio(reserva, reservas):
         "error": "Reserva no encontrada."
     }
 
+def validar_monto(monto):
+    """
+    Valida un monto cobrado. Devuelve (monto como número, None) o (None, mensaje de error).
+    """
+    try:
+        monto_float = float(monto)
+    except (TypeError, ValueError):
+        return None, "El monto debe ser un número válido."
+    if monto_float < 0:
+        return None, "El monto no puede ser negativo."
+    return monto_float, None
+
 def cambiar_monto_cobrado(reserva, monto, reservas):
     """
     Cambia el monto cobrado por un servicio.
     FUNCIONALIDAD: Registrar el monto cobrado por un servicio
     """
-    try:
-        monto_float = float(monto)
-        if monto_float < 0:
-            return {
-                "exito": False,
-                "error": "El monto no puede ser negativo."
-            }
-        
-        if reserva in reservas:
-            reserva["montoCobrado"] = monto_float
-            guardar_reservas(reservas)
-            return {
-                "exito": True,
-                "mensaje": f"Monto actualizado: ${monto_float:.2f}"
-            }
+    monto_float, error = validar_monto(monto)
+    if error is not None:
         return {
             "exito": False,
-            "error": "Reserva no encontrada."
+            "error": error
         }
-    except ValueError:
+    
+    if reserva in reservas:
+        asignar_campo(reservas, reserva, "montoCobrado", monto_float)
+        registrar_cambio("reservas", "modificacion", reserva, reservas)
         return {
-            "exito": False,
-            "error": "El monto debe ser un número válido."
+            "exito": True,
+            "mensaje": f"Monto actualizado: ${monto_float:.2f}"
         }
+    return {
+        "exito": False,
+        "error": "Reserva no encontrada."
+    }
 
 def obtener_estadisticas_reservas(reservas):
     """
     Obtiene estadísticas de las reservas.
+    Con una colección indexada los totales se calculan una vez y luego se
+    mantienen con cada cambio, así que leerlos no recorre las reservas.
     FUNCIONALIDAD: Generar reportes y estadísticas
     """
-    total_reservas = len(reservas)
-    pendientes = len([r for r in reservas if r["estado"] == "Pendiente"])
-    atendidas = len([r for r in reservas if r["estado"] == "Atendida"])
-    no_asistieron = len([r for r in reservas if r["estado"] == "No asistió"])
-    
-    # Calcular ingresos totales
-    ingresos_totales = sum(r["montoCobrado"] or 0 for r in reservas)
-    
-    # Estadísticas por profesional
-    stats_profesional = {}
-    for reserva in reservas:
-        prof = reserva["turno"]["profesional"]
-        if prof not in stats_profesional:
-            stats_profesional[prof] = {"total": 0, "atendidas": 0, "ingresos": 0}
-        
-        stats_profesional[prof]["total"] += 1
-        if reserva["estado"] == "Atendida":
-            stats_profesional[prof]["atendidas"] += 1
-            stats_profesional[prof]["ingresos"] += reserva["montoCobrado"] or 0
-    
-    return {
-        "total_reservas": total_reservas,
-        "pendientes": pendientes,
-        "atendidas": atendidas,
-        "no_asistieron": no_asistieron,
-        "ingresos_totales": ingresos_totales,
-        "por_profesional": stats_profesional
-    }
+    if isinstance(reservas, ColeccionIndexada):
+        return adjuntar_estadisticas(reservas).resumen()
+    return EstadisticasReservas(reservas).resumen()
 
 def obtener_reservas_pendientes(reservas):
     """
@@ -0,0 +1,116 @@
+"""
+Módulo de estadísticas incrementales para el sistema de turnos.
+Mantiene los totales de reservas (por estado, ingresos y por profesional)
+actualizados con cada cambio, para leerlos sin recorrer todas las reservas.
+Los ingresos se acumulan en centavos enteros: sumar y restar montos con decimales
+miles de veces no arrastra errores de redondeo.
+"""
+
+ESTADOS = {
+    "Pendiente": "pendientes",
+    "Atendida": "atendidas",
+    "No asistió": "no_asistieron"
+}
+
+class EstadisticasReservas:
+    """
+    Totales de reservas que se actualizan con cada alta, baja o cambio.
+    Se puede suscribir a una ColeccionIndexada para enterarse de los cambios.
+    """
+
+    def __init__(self, reservas=()):
+        self.reconstruir(reservas)
+
+    def reconstruir(self, reservas):
+        """
+        Recalcula todos los totales recorriendo las reservas.
+        FUNCIONALIDAD: Calcular estadísticas desde cero
+        """
+        self.total_reservas = 0
+        self.por_estado = {campo: 0 for campo in ESTADOS.values()}
+        self.centavos_totales = 0
+        self.por_profesional = {}
+        for reserva in reservas:
+            self.al_agregar(reserva)
+
+    def verificar(self, reservas):
+        """
+        Indica si los totales incrementales coinciden con un recálculo completo
+        (exactamente: los dos cuentan los ingresos en centavos enteros).
+        FUNCIONALIDAD: Comprobar que las estadísticas incrementales son correctas
+        """
+        return self.resumen() == EstadisticasReservas(reservas).resumen()
+
+    def al_agregar(self, reserva):
+        """
+        Suma una reserva a los totales.
+        """
+        self._aplicar(reserva, 1)
+
+    def al_quitar(self, reserva):
+        """
+        Resta una reserva de los totales.
+        """
+        self._aplicar(reserva, -1)
+
+    def al_actualizar(self, reserva, campo, anterior):
+        """
+        Actualiza los totales cuando cambia un campo (estado o monto) de una reserva.
+        """
+        self._aplicar(dict(reserva, **{campo: anterior}), -1)
+        self._aplicar(reserva, 1)
+
+    def resumen(self):
+        """
+        Devuelve las estadísticas en el mismo formato que obtener_estadisticas_reservas.
+        """
+        return {
+            "total_reservas": self.total_reservas,
+            "pendientes": self.por_estado["pendientes"],
+            "atendidas": self.por_estado["atendidas"],
+            "no_asistieron": self.por_estado["no_asistieron"],
+            "ingresos_totales": self.centavos_totales / 100,
+            "por_profesional": {
+                profesional: {**totales, "ingresos": totales["ingresos"] / 100}
+                for profesional, totales in self.por_profesional.items()
+                if totales["total"]
+            }
+        }
+
+    def _aplicar(self, reserva, signo):
+        centavos = round((reserva.get("montoCobrado") or 0) * 100)
+        estado = reserva.get("estado")
+
+        self.total_reservas += signo
+        if estado in ESTADOS:
+            self.por_estado[ESTADOS[estado]] += signo
+        self.centavos_totales += signo * centavos
+
+        profesional = (reserva.get("turno") or {}).get("profesional")
+        if profesional is None:
+            return
+        totales = self.por_profesional.setdefault(profesional, {"total": 0, "atendidas": 0, "ingresos": 0})
+        totales["total"] += signo
+        if estado == "Atendida":
+            totales["atendidas"] += signo
+            totales["ingresos"] += signo * centavos
+
+def estadisticas_de(reservas):
+    """
+    Devuelve las estadísticas incrementales suscriptas a una colección, o None.
+    """
+    for observador in getattr(reservas, "observadores", ()):
+        if isinstance(observador, EstadisticasReservas):
+            return observador
+    return None
+
+def adjuntar_estadisticas(reservas):
+    """
+    Calcula las estadísticas una vez y las suscribe a la colección para mantenerlas al día.
+    FUNCIONALIDAD: Leer estadísticas en tiempo constante
+    """
+    estadisticas = estadisticas_de(reservas)
+    if estadisticas is None:
+        estadisticas = EstadisticasReservas(reservas)
+        reservas.observadores.append(estadisticas)
+    return estadisticas
@@ -0,0 +1,236 @@
+"""
+Módulo de reportes para el sistema de turnos.
+Convierte las reservas en columnas (arreglos compactos) y calcula por día, semana o mes
+los ingresos, la tasa de ausencia y la utilización por profesional o servicio.
+Si NumPy está instalado la agregación es vectorizada; si no, se usa el módulo array
+y una sola pasada sobre las columnas.
+
+Uso desde la línea de comandos:
+    python -m sistema_turnos.logica.reportes --periodo semana --por servicio
+"""
+
+import argparse
+from array import array
+from datetime import date
+
+from sistema_turnos.datos.persistencia import cargar_reglas_agenda, recorrer_reservas
+from sistema_turnos.utils.intervalos import duracion_servicio
+from sistema_turnos.logica.agenda import REGLAS_POR_DEFECTO, a_minutos
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PERIODOS = ("dia", "semana", "mes")
+AGRUPACIONES = ("profesional", "servicio")
+
+# Códigos de estado en la columna de estados
+PENDIENTE, ATENDIDA, NO_ASISTIO = 0, 1, 2
+CODIGOS_ESTADO = {"Pendiente": PENDIENTE, "Atendida": ATENDIDA, "No asistió": NO_ASISTIO}
+
+class ColumnasReservas:
+    """
+    Reservas en formato columnar: un arreglo por campo y categorías codificadas como enteros.
+    """
+
+    def __init__(self, reservas):
+        self.dias = array("l")
+        self.profesionales = array("H")
+        self.servicios = array("H")
+        self.estados = array("B")
+        self.montos = array("d")
+        self.minutos = array("H")
+        self.nombres_profesionales = []
+        self.nombres_servicios = []
+
+        codigos_profesional = {}
+        codigos_servicio = {}
+        for reserva in reservas:
+            turno = reserva["turno"]
+            profesional = turno["profesional"]
+            servicio = turno["servicio"]
+            if profesional not in codigos_profesional:
+                codigos_profesional[profesional] = len(self.nombres_profesionales)
+                self.nombres_profesionales.append(profesional)
+            if servicio not in codigos_servicio:
+                codigos_servicio[servicio] = len(self.nombres_servicios)
+                self.nombres_servicios.append(servicio)
+
+            self.dias.append(date.fromisoformat(turno["fecha_hora"][0]).toordinal())
+            self.profesionales.append(codigos_profesional[profesional])
+            self.servicios.append(codigos_servicio[servicio])
+            self.estados.append(CODIGOS_ESTADO.get(reserva.get("estado"), PENDIENTE))
+            self.montos.append(reserva.get("montoCobrado") or 0)
+            self.minutos.append(duracion_servicio(servicio))
+
+    def __len__(self):
+        return len(self.dias)
+
+def clave_periodo(ordinal, periodo):
+    """
+    Devuelve el ordinal del primer día del período (día, semana que empieza el lunes, o mes).
+    """
+    if periodo == "dia":
+        return ordinal
+    dia = date.fromordinal(ordinal)
+    if periodo == "semana":
+        return ordinal - dia.weekday()
+    return dia.replace(day=1).toordinal()
+
+def fin_periodo(ordinal, periodo):
+    """
+    Devuelve el ordinal del último día del período que contiene ese día.
+    """
+    if periodo == "dia":
+        return ordinal
+    if periodo == "semana":
+        return clave_periodo(ordinal, periodo) + 6
+    dia = date.fromordinal(ordinal)
+    siguiente = date(dia.year + dia.month // 12, dia.month % 12 + 1, 1)
+    return siguiente.toordinal() - 1
+
+def etiqueta_periodo(ordinal, periodo):
+    """
+    Devuelve la etiqueta legible de un período: "2025-07-10", "2025-W28" o "2025-07".
+    """
+    dia = date.fromordinal(ordinal)
+    if periodo == "semana":
+        anio, semana, _ = dia.isocalendar()
+        return f"{anio}-W{semana:02d}"
+    if periodo == "mes":
+        return dia.strftime("%Y-%m")
+    return dia.isoformat()
+
+def _agregar_numpy(periodos, grupos, columnas, cantidad_grupos):
+    unicos, posiciones = numpy.unique(numpy.asarray(periodos, dtype=numpy.int64), return_inverse=True)
+    claves = posiciones * cantidad_grupos + numpy.asarray(grupos, dtype=numpy.int64)
+    largo = len(unicos) * cantidad_grupos
+
+    estados = numpy.asarray(columnas.estados)
+    sumas = {
+        "reservas": numpy.bincount(claves, minlength=largo),
+        "atendidas": numpy.bincount(claves, weights=(estados == ATENDIDA).astype(numpy.float64), minlength=largo),
+        "no_asistieron": numpy.bincount(claves, weights=(estados == NO_ASISTIO).astype(numpy.float64), minlength=largo),
+        "ingresos": numpy.bincount(claves, weights=numpy.asarray(columnas.montos), minlength=largo),
+        "minutos": numpy.bincount(claves, weights=numpy.asarray(columnas.minutos, dtype=numpy.float64), minlength=largo)
+    }
+    resultado = {}
+    for clave in numpy.nonzero(sumas["reservas"])[0]:
+        periodo, grupo = divmod(int(clave), cantidad_grupos)
+        resultado[(int(unicos[periodo]), grupo)] = {nombre: valores[clave].item() for nombre, valores in sumas.items()}
+    return resultado
+
+def _agregar_array(periodos, grupos, columnas):
+    resultado = {}
+    for periodo, grupo, estado, monto, minutos in zip(periodos, grupos, columnas.estados, columnas.montos, columnas.minutos):
+        totales = resultado.get((periodo, grupo))
+        if totales is None:
+            totales = resultado[(periodo, grupo)] = {
+                "reservas": 0, "atendidas": 0, "no_asistieron": 0, "ingresos": 0.0, "minutos": 0
+            }
+        totales["reservas"] += 1
+        totales["atendidas"] += estado == ATENDIDA
+        totales["no_asistieron"] += estado == NO_ASISTIO
+        totales["ingresos"] += monto
+        totales["minutos"] += minutos
+    return resultado
+
+def _minutos_disponibles(reglas, desde, hasta, periodo):
+    """
+    Devuelve {(período, profesional): minutos de trabajo} según los horarios de la agenda,
+    contando cada día de desde a hasta (ordinales, inclusive).
+    """
+    disponibles = {}
+    for ordinal in range(desde, hasta + 1):
+        dia_semana = date.fromordinal(ordinal).weekday()
+        clave = clave_periodo(ordinal, periodo)
+        for nombre, regla in reglas["profesionales"].items():
+            if dia_semana in regla["dias"]:
+                minutos = a_minutos(regla["hasta"]) - a_minutos(regla["desde"])
+                disponibles[(clave, nombre.lower())] = disponibles.get((clave, nombre.lower()), 0) + minutos
+    return disponibles
+
+def generar_reporte(reservas, periodo="mes", agrupar_por="profesional", reglas=None, usar_numpy=True):
+    """
+    Calcula por período y por profesional o servicio: reservas, atendidas, ausencias,
+    ingresos, tasa de ausencia y utilización (minutos reservados / minutos de trabajo).
+    Devuelve una lista de filas ordenadas por período y grupo.
+    FUNCIONALIDAD: Generar reportes de ingresos y asistencia sobre todo el historial
+    """
+    if periodo not in PERIODOS:
+        raise ValueError(f"Período inválido: {periodo}. Opciones: {', '.join(PERIODOS)}")
+    if agrupar_por not in AGRUPACIONES:
+        raise ValueError(f"Agrupación inválida: {agrupar_por}. Opciones: {', '.join(AGRUPACIONES)}")
+
+    columnas = reservas if isinstance(reservas, ColumnasReservas) else ColumnasReservas(reservas)
+    if not len(columnas):
+        return []
+
+    if agrupar_por == "profesional":
+        grupos, nombres = columnas.profesionales, columnas.nombres_profesionales
+    else:
+        grupos, nombres = columnas.servicios, columnas.nombres_servicios
+
+    periodos = array("l", (clave_periodo(dia, periodo) for dia in columnas.dias)) if periodo != "dia" else columnas.dias
+    if numpy is not None and usar_numpy:
+        totales = _agregar_numpy(periodos, grupos, columnas, len(nombres))
+    else:
+        totales = _agregar_array(periodos, grupos, columnas)
+
+    # La utilización se mide sobre los períodos completos, no solo entre la primera y la última reserva
+    disponibles = _minutos_disponibles(
+        reglas or REGLAS_POR_DEFECTO,
+        clave_periodo(min(columnas.dias), periodo), fin_periodo(max(columnas.dias), periodo), periodo
+    )
+    disponibles_por_periodo = {}
+    for (clave, _), minutos in disponibles.items():
+        disponibles_por_periodo[clave] = disponibles_por_periodo.get(clave, 0) + minutos
+
+    filas = []
+    for (clave, grupo), valores in sorted(totales.items()):
+        nombre = nombres[grupo]
+        if agrupar_por == "profesional":
+            minutos_trabajo = disponibles.get((clave, nombre.lower()), 0)
+        else:
+            minutos_trabajo = disponibles_por_periodo.get(clave, 0)
+        cerradas = valores["atendidas"] + valores["no_asistieron"]
+        filas.append({
+            "periodo": etiqueta_periodo(clave, periodo),
+            "grupo": nombre,
+            "reservas": int(valores["reservas"]),
+            "atendidas": int(valores["atendidas"]),
+            "no_asistieron": int(valores["no_asistieron"]),
+            "ingresos": float(valores["ingresos"]),
+            "tasa_ausencia": valores["no_asistieron"] / cerradas if cerradas else 0.0,
+            "utilizacion": valores["minutos"] / minutos_trabajo if minutos_trabajo else 0.0
+        })
+    return filas
+
+def formatear_fila(fila):
+    """
+    Devuelve una fila de reporte como texto de ancho fijo.
+    """
+    return (f"{fila['periodo']:<10} {fila['grupo']:<10} {fila['reservas']:>5} {fila['atendidas']:>5} "
+            f"{fila['no_asistieron']:>5} {fila['ingresos']:>12.2f} {fila['tasa_ausencia']:>7.1%} {fila['utilizacion']:>7.1%}")
+
+ENCABEZADO = (f"{'Período':<10} {'Grupo':<10} {'Res.':>5} {'Aten.':>5} {'Aus.':>5} "
+              f"{'Ingresos':>12} {'Ausenc.':>7} {'Utiliz.':>7}")
+
+def main(argumentos=None):
+    """
+    Punto de entrada de línea de comandos para imprimir un reporte.
+    """
+    parser = argparse.ArgumentParser(description="Reportes de ingresos y asistencia")
+    parser.add_argument("--periodo", choices=PERIODOS, default="mes")
+    parser.add_argument("--por", choices=AGRUPACIONES, default="profesional")
+    opciones = parser.parse_args(argumentos)
+
+    # Las reservas se leen de a una: el reporte guarda solo columnas compactas
+    filas = generar_reporte(recorrer_reservas(), opciones.periodo, opciones.por, cargar_reglas_agenda())
+    print(ENCABEZADO)
+    for fila in filas:
+        print(formatear_fila(fila))
+
+if __name__ == "__main__":
+    main()
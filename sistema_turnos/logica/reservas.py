@@ -7,7 +7,10 @@ from sistema_turnos.utils.validaciones import (
     validar_documento, validar_telefono, validar_nombre
 )
 from sistema_turnos.utils.filtros import filtrar_reservas_por_dni
-from sistema_turnos.datos.persistencia import guardar_reservas, guardar_turnos
+from sistema_turnos.utils.indices import ColeccionIndexada
+from sistema_turnos.utils.claves import clave_turno, id_registro
+from sistema_turnos.utils.intervalos import se_superpone_con_reservas
+from sistema_turnos.datos.persistencia import registrar_cambio, grupo_de_escrituras, ConflictoConcurrencia
 
 def confirmar_reserva(turno, nombre, telefono, documento):
     """
@@ -53,12 +56,35 @@ def crear_reserva(turno, nombre, telefono, documento, reservas):
     FUNCIONALIDAD: Crear y almacenar una nueva reserva
     """
     # Verificar que no haya reserva previa con el mismo DNI
-    if any(r["documento"].lower() == documento.lower() for r in reservas):
+    if isinstance(reservas, ColeccionIndexada):
+        dni_repetido = reservas.contiene("documento", documento)
+        turno_ocupado = reservas.por_turno(turno) is not None
+        superpuesto = not turno_ocupado and reservas.se_superpone(turno)
+    else:
+        dni_repetido = any(r["documento"].lower() == documento.lower() for r in reservas)
+        turno_ocupado = any(clave_turno(r.get("turno") or {}) == clave_turno(turno) for r in reservas)
+        superpuesto = not turno_ocupado and se_superpone_con_reservas(turno, reservas)
+    
+    if dni_repetido:
         return {
             "exito": False,
             "error": "Ya hay un turno reservado con este DNI."
         }
     
+    # Verificar que el turno no haya sido reservado por otra persona
+    if turno_ocupado:
+        return {
+            "exito": False,
+            "error": "El turno seleccionado ya está reservado."
+        }
+    
+    # Verificar que la profesional no tenga otra reserva en ese horario
+    if superpuesto:
+        return {
+            "exito": False,
+            "error": "El turno se superpone con otra reserva de la profesional."
+        }
+    
     # Crear nueva reserva
     nueva_reserva = {
         "nombre": nombre,
@@ -68,6 +94,7 @@ def crear_reserva(turno, nombre, telefono, documento, reservas):
         "estado": "Pendiente",
         "montoCobrado": None
     }
+    id_registro("reservas", nueva_reserva)
     
     return {
         "exito": True,
@@ -79,15 +106,20 @@ def cancelar_reserva(documento, turno, reservas):
     Cancela una reserva existente.
     FUNCIONALIDAD: Permitir cancelar reservas
     """
-    # Buscar la reserva
+    # Buscar la reserva por la identidad del turno
     reserva_encontrada = None
-    for reserva in reservas:
-        if (reserva["documento"].lower() == documento.lower() and 
-            reserva["turno"]["fecha_hora"] == turno["fecha_hora"] and
-            reserva["turno"]["profesional"] == turno["profesional"] and
-            reserva["turno"]["servicio"] == turno["servicio"]):
+    if isinstance(reservas, ColeccionIndexada):
+        reserva = reservas.por_turno(turno)
+        if reserva is not None and reserva["documento"].lower() == documento.lower():
             reserva_encontrada = reserva
-            break
+    else:
+        for reserva in reservas:
+            if (reserva["documento"].lower() == documento.lower() and 
+                reserva["turno"]["fecha_hora"] == turno["fecha_hora"] and
+                reserva["turno"]["profesional"] == turno["profesional"] and
+                reserva["turno"]["servicio"] == turno["servicio"]):
+                reserva_encontrada = reserva
+                break
     
     if not reserva_encontrada:
         return {
@@ -105,15 +137,31 @@ def procesar_reserva_exitosa(reserva, turnos, reservas):
     Procesa una reserva exitosa actualizando los datos.
     FUNCIONALIDAD: Actualizar datos después de una reserva exitosa
     """
+    # Antes de agregar la reserva: la agenda deriva los turnos de las reservas, y con
+    # la reserva ya agregada el turno dejaría de estar ofrecido sin sacarlo de sus páginas
+    turno_removido = reserva["turno"] in turnos
+
     # Agregar la reserva
     reservas.append(reserva)
     
-    # Remover el turno de los disponibles
-    turnos = [t for t in turnos if t != reserva["turno"]]
+    # Remover el turno de los disponibles (en el lugar, para no perder los índices)
+    if turno_removido:
+        turnos.remove(reserva["turno"])
     
-    # Guardar cambios
-    guardar_reservas(reservas)
-    guardar_turnos(turnos)
+    # Guardar cambios (reservas y turnos en una sola escritura agrupada)
+    try:
+        with grupo_de_escrituras():
+            registrar_cambio("reservas", "alta", reserva, reservas)
+            _registrar_cambio_turnos("baja", reserva["turno"], turnos)
+    except ConflictoConcurrencia as error:
+        # Otra terminal tomó el turno: la reserva no quedó guardada y la memoria vuelve a como estaba
+        reservas.remove(reserva)
+        if turno_removido:
+            turnos.append(reserva["turno"])
+        return {
+            "exito": False,
+            "error": str(error)
+        }
     
     return {
         "exito": True,
@@ -132,12 +180,31 @@ def procesar_cancelacion_exitosa(reserva, turnos, reservas):
     # Devolver el turno a los disponibles
     turnos.append(reserva["turno"])
     
-    # Guardar cambios
-    guardar_reservas(reservas)
-    guardar_turnos(turnos)
+    # Guardar cambios (reservas y turnos en una sola escritura agrupada)
+    try:
+        with grupo_de_escrituras():
+            registrar_cambio("reservas", "baja", reserva, reservas)
+            _registrar_cambio_turnos("alta", reserva["turno"], turnos)
+    except ConflictoConcurrencia as error:
+        # La cancelación no quedó guardada: la memoria vuelve a como estaba
+        # (el turno sale antes de volver la reserva, así la agenda todavía lo ofrece)
+        if reserva["turno"] in turnos:
+            turnos.remove(reserva["turno"])
+        reservas.append(reserva)
+        return {
+            "exito": False,
+            "error": str(error)
+        }
     
     return {
         "exito": True,
         "turnos_actualizados": turnos,
         "reservas_actualizadas": reservas
-    } 
\ No newline at end of file
+    } 
+
+def _registrar_cambio_turnos(operacion, turno, turnos):
+    """
+    Persiste un cambio en los turnos, salvo que se deriven de la agenda.
+    """
+    if getattr(turnos, "persistente", True):
+        registrar_cambio("turnos", operacion, turno, turnos)
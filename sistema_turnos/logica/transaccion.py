@@ -0,0 +1,135 @@
+"""
+Módulo de transacciones para la atención de reservas.
+Una transacción aplica varios cambios de atención (atendida, no asistió, monto)
+en memoria y los guarda juntos al confirmar, en una sola escritura agrupada.
+Si algo falla, los cambios se deshacen y no se guarda nada.
+"""
+
+from sistema_turnos.datos.persistencia import grupo_de_escrituras, registrar_cambio
+from sistema_turnos.logica.atencion import validar_monto
+from sistema_turnos.utils.indices import asignar_campo
+
+class Transaccion:
+    """
+    Unidad de trabajo sobre las reservas.
+    Cada operación valida antes de cambiar nada: si no es válida, devuelve el error
+    y la reserva queda como estaba. Los cambios válidos se aplican en memoria (las
+    consultas ya los ven) y se guardan recién con confirmar().
+
+    Usada como bloque `with`, confirma al salir y deshace si hubo una excepción.
+    Con atomica=True también deshace todo si alguna operación fue rechazada
+    (todo o nada); con atomica=False se guardan las que sí se pudieron aplicar.
+    """
+
+    def __init__(self, reservas, atomica=True):
+        self.reservas = reservas
+        self.atomica = atomica
+        self.errores = []
+        self.resultado = None
+        # (reserva, campo, valor anterior) en el orden en que se cambiaron
+        self._anteriores = []
+        self._modificadas = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is not None:
+            self.revertir()
+        elif self.resultado is None:
+            self.confirmar()
+        return False
+
+    def marcar_como_atendida(self, reserva):
+        """
+        Marca una reserva como atendida (sin guardar todavía).
+        """
+        if not self._existe(reserva):
+            return self._rechazar("Reserva no encontrada.")
+        self._asignar(reserva, "estado", "Atendida")
+        return {
+            "exito": True,
+            "mensaje": f"Cliente {reserva['nombre']} marcado como atendido."
+        }
+
+    def marcar_como_no_asistio(self, reserva):
+        """
+        Marca una reserva como no asistió (sin guardar todavía).
+        """
+        if not self._existe(reserva):
+            return self._rechazar("Reserva no encontrada.")
+        self._asignar(reserva, "estado", "No asistió")
+        return {
+            "exito": True,
+            "mensaje": f"Cliente {reserva['nombre']} marcado como no asistió."
+        }
+
+    def cambiar_monto_cobrado(self, reserva, monto):
+        """
+        Registra el monto cobrado de una reserva (sin guardar todavía).
+        """
+        monto_float, error = validar_monto(monto)
+        if error is not None:
+            return self._rechazar(error)
+        if not self._existe(reserva):
+            return self._rechazar("Reserva no encontrada.")
+        self._asignar(reserva, "montoCobrado", monto_float)
+        return {
+            "exito": True,
+            "mensaje": f"Monto actualizado: ${monto_float:.2f}"
+        }
+
+    def pendientes(self):
+        """
+        Devuelve cuántas reservas cambiaron y todavía no se guardaron.
+        """
+        return len(self._modificadas)
+
+    def confirmar(self):
+        """
+        Guarda todas las reservas modificadas en una sola escritura agrupada.
+        Con atomica=True y alguna operación rechazada, deshace todo en lugar de guardar.
+        FUNCIONALIDAD: Guardar una tanda de cambios de atención de una sola vez
+        """
+        if self.atomica and self.errores:
+            self.revertir()
+            self.resultado = {
+                "exito": False,
+                "error": f"No se guardó ningún cambio: {self.errores[0]}"
+            }
+            return self.resultado
+
+        with grupo_de_escrituras():
+            for reserva in self._modificadas.values():
+                registrar_cambio("reservas", "modificacion", reserva, self.reservas)
+        self.resultado = {
+            "exito": True,
+            "cambios": len(self._modificadas)
+        }
+        self._anteriores = []
+        self._modificadas = {}
+        return self.resultado
+
+    def revertir(self):
+        """
+        Deshace en memoria los cambios sin guardar, del último al primero.
+        """
+        for reserva, campo, valor in reversed(self._anteriores):
+            asignar_campo(self.reservas, reserva, campo, valor)
+        self._anteriores = []
+        self._modificadas = {}
+
+    def _existe(self, reserva):
+        return reserva in self.reservas
+
+    def _rechazar(self, error):
+        self.errores.append(error)
+        return {
+            "exito": False,
+            "error": error
+        }
+
+    def _asignar(self, reserva, campo, valor):
+        self._anteriores.append((reserva, campo, reserva.get(campo)))
+        self._modificadas[id(reserva)] = reserva
+        asignar_campo(self.reservas, reserva, campo, valor)
@@ -0,0 +1,143 @@
+"""
+Operaciones por lotes para el sistema de turnos.
+Lee filas de un archivo CSV (con encabezado) o JSON (lista de objetos) y las aplica
+con el servicio de turnos: reservar, marcar como atendida o no asistió, cancelar.
+Los datos se cargan una sola vez y todos los cambios se guardan juntos al final
+(una escritura agrupada), en lugar de una carga y un guardado por fila.
+"""
+
+import csv
+import json
+import os
+
+from sistema_turnos.datos.persistencia import grupo_de_escrituras
+from sistema_turnos.logica.atencion import validar_monto
+
+# Campos de cada fila según la operación (además de los que identifican la reserva)
+CAMPOS_TURNO = ("fecha", "hora", "profesional", "servicio")
+CAMPOS_RESERVA = ("nombre", "telefono", "documento")
+
+def leer_filas(ruta, formato=None):
+    """
+    Lee las filas de un lote. El formato (csv o json) se deduce de la extensión si no se indica.
+    Devuelve una lista de diccionarios.
+    """
+    formato = formato or os.path.splitext(ruta)[1].lstrip(".").lower()
+    if formato == "csv":
+        with open(ruta, "r", encoding="utf-8-sig", newline="") as archivo:
+            return [_limpiar(fila) for fila in csv.DictReader(archivo)]
+    if formato == "json":
+        with open(ruta, "r", encoding="utf-8") as archivo:
+            filas = json.load(archivo)
+        if not isinstance(filas, list) or not all(isinstance(fila, dict) for fila in filas):
+            raise ValueError("El archivo JSON debe contener una lista de objetos.")
+        return [_limpiar(fila) for fila in filas]
+    raise ValueError(f"Formato desconocido: {formato or ruta} (se acepta csv o json)")
+
+def _limpiar(fila):
+    # Los valores vacíos de un CSV cuentan como ausentes
+    return {
+        clave.strip(): valor.strip() if isinstance(valor, str) else valor
+        for clave, valor in fila.items()
+        if clave is not None and valor not in (None, "")
+    }
+
+def _turno(fila):
+    faltantes = [campo for campo in CAMPOS_TURNO if campo not in fila]
+    if faltantes:
+        return None
+    return {
+        "fecha_hora": [str(fila["fecha"]), str(fila["hora"])],
+        "profesional": str(fila["profesional"]),
+        "servicio": str(fila["servicio"])
+    }
+
+def _buscar_reserva(servicio, fila):
+    """
+    Encuentra la reserva de una fila: por id, por documento y turno, o por documento
+    cuando esa persona tiene una sola reserva pendiente.
+    """
+    if "id" in fila:
+        return servicio.reserva(str(fila["id"]))
+
+    documento = str(fila.get("documento", ""))
+    if not documento:
+        return None
+    turno = _turno(fila)
+    if turno is not None:
+        reserva = servicio.reservas.por_turno(turno)
+        if reserva is not None and reserva["documento"].lower() == documento.lower():
+            return reserva
+        return None
+    pendientes = [r for r in servicio.reservas_de(documento) if r["estado"] == "Pendiente"]
+    return pendientes[0] if len(pendientes) == 1 else None
+
+def _reservar(servicio, fila):
+    turno = _turno(fila)
+    faltantes = [campo for campo in CAMPOS_TURNO + CAMPOS_RESERVA if campo not in fila]
+    if faltantes:
+        return {"exito": False, "error": f"Faltan campos: {', '.join(faltantes)}"}
+    return servicio.reservar(turno, str(fila["nombre"]), str(fila["telefono"]), str(fila["documento"]))
+
+def _atender(servicio, fila):
+    reserva = _buscar_reserva(servicio, fila)
+    if reserva is None:
+        return {"exito": False, "error": "Reserva no encontrada."}
+    # El monto se valida antes de marcar, así una fila inválida no queda a medias
+    if "monto" in fila:
+        _, error = validar_monto(fila["monto"])
+        if error is not None:
+            return {"exito": False, "error": error}
+    resultado = servicio.marcar_como_atendida(reserva)
+    if resultado["exito"] and "monto" in fila:
+        resultado = servicio.cambiar_monto_cobrado(reserva, fila["monto"])
+    return resultado
+
+def _no_asistio(servicio, fila):
+    reserva = _buscar_reserva(servicio, fila)
+    if reserva is None:
+        return {"exito": False, "error": "Reserva no encontrada."}
+    return servicio.marcar_como_no_asistio(reserva)
+
+def _cancelar(servicio, fila):
+    reserva = _buscar_reserva(servicio, fila)
+    if reserva is None:
+        return {"exito": False, "error": "No se encontró la reserva especificada."}
+    return servicio.cancelar(reserva["documento"], reserva["turno"])
+
+# Operaciones por lotes disponibles
+OPERACIONES_LOTE = {
+    "reservar": _reservar,
+    "atender": _atender,
+    "no-asistio": _no_asistio,
+    "cancelar": _cancelar
+}
+
+def procesar_lote(servicio, operacion, filas):
+    """
+    Aplica una operación a cada fila y guarda todos los cambios juntos al final.
+    Una fila con error no detiene el lote. Devuelve un resumen con el resultado de cada fila.
+    FUNCIONALIDAD: Reservar, atender o cancelar muchos turnos en un solo paso
+    """
+    if operacion not in OPERACIONES_LOTE:
+        raise ValueError(f"Operación desconocida: {operacion}")
+    aplicar = OPERACIONES_LOTE[operacion]
+
+    resultados = []
+    with grupo_de_escrituras():
+        for numero, fila in enumerate(filas, start=1):
+            resultado = aplicar(servicio, fila)
+            resultados.append({
+                "fila": numero,
+                "exito": resultado["exito"],
+                "error": resultado.get("error")
+            })
+
+    aplicadas = sum(1 for resultado in resultados if resultado["exito"])
+    return {
+        "operacion": operacion,
+        "total": len(resultados),
+        "aplicadas": aplicadas,
+        "fallidas": len(resultados) - aplicadas,
+        "resultados": resultados
+    }
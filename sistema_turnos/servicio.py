@@ -0,0 +1,245 @@
+"""
+Servicio de turnos: las operaciones del sistema sin interfaz.
+Agrupa la lógica de reservas y atención sobre los turnos y reservas en memoria
+(indexados), para usarla desde la interfaz curses, el servidor de reservas o
+procesos por lotes. Cada operación devuelve datos simples (diccionarios y listas)
+para poder enviarse como JSON.
+"""
+
+from contextlib import contextmanager
+
+from sistema_turnos.datos.persistencia import (
+    cargar_turnos, cargar_reservas, cargar_reglas_agenda, hay_reservas_anteriores, primer_mes_reciente
+)
+from sistema_turnos.logica.agenda import TurnosAgenda
+from sistema_turnos.logica.atencion import (
+    marcar_como_atendida, marcar_como_no_asistio, cambiar_monto_cobrado,
+    obtener_estadisticas_reservas, obtener_reservas_pendientes
+)
+from sistema_turnos.logica.reportes import generar_reporte
+from sistema_turnos.logica.transaccion import Transaccion
+from sistema_turnos.logica.reservas import (
+    confirmar_reserva, crear_reserva, cancelar_reserva,
+    procesar_reserva_exitosa, procesar_cancelacion_exitosa
+)
+from sistema_turnos.utils.filtros import filtrar_turnos, filtrar_reservas_por_dni, filtrar_reservas_por_estado
+from sistema_turnos.utils.indices import ColeccionIndexada
+
+# Operaciones que se pueden pedir por nombre (servidor de reservas, API HTTP)
+OPERACIONES = (
+    "turnos_disponibles", "filtrar_turnos", "reservar", "cancelar", "reserva", "reservas_de",
+    "listar_reservas", "reservas_pendientes", "filtrar_reservas_por_estado",
+    "marcar_como_atendida", "marcar_como_no_asistio", "cambiar_monto_cobrado",
+    "estadisticas", "reporte", "version"
+)
+# Las que no cambian nada: repetirlas no tiene efectos (ver ServicioRemoto.llamar)
+LECTURAS = tuple(
+    operacion for operacion in OPERACIONES
+    if operacion not in ("reservar", "cancelar", "marcar_como_atendida", "marcar_como_no_asistio", "cambiar_monto_cobrado")
+)
+
+def cargar_datos(desde=None):
+    """
+    Carga las reservas indexadas y los turnos (de la agenda si hay agenda.json).
+    Con desde ("AAAA-MM") solo se cargan las reservas de ese mes en adelante.
+    Devuelve (turnos, reservas).
+    """
+    reservas = ColeccionIndexada("reservas", cargar_reservas(desde=desde))
+    reglas = cargar_reglas_agenda()
+    if reglas is not None:
+        return TurnosAgenda(reservas, reglas), reservas
+    return ColeccionIndexada("turnos", cargar_turnos()), reservas
+
+class ServicioTurnos:
+    """
+    Operaciones de clientas y manicuristas sobre los datos en memoria.
+    Sin datos, los carga del almacén activo (con el motor particionado, solo las
+    reservas recientes y futuras: ver primer_mes_reciente). desde es el primer mes de
+    las reservas en memoria, o None si están todas.
+    Los turnos y reservas se indexan si llegan como lista.
+    version cuenta los cambios hechos, para que quien consulta sepa si algo cambió.
+    """
+
+    def __init__(self, turnos=None, reservas=None, desde=None):
+        if turnos is None or reservas is None:
+            desde = primer_mes_reciente()
+            turnos, reservas = cargar_datos(desde)
+        if not isinstance(reservas, ColeccionIndexada):
+            reservas = ColeccionIndexada("reservas", reservas)
+        if isinstance(turnos, list):
+            turnos = ColeccionIndexada("turnos", turnos)
+        self.turnos = turnos
+        self.reservas = reservas
+        self.desde = desde
+        self._version = 0
+        self._transaccion = None
+
+    def version(self):
+        """
+        Devuelve el número de cambios hechos desde que se cargaron los datos.
+        """
+        return self._version
+
+    def turnos_disponibles(self):
+        """
+        Devuelve los turnos disponibles.
+        """
+        return self.turnos
+
+    def filtrar_turnos(self, servicio=None, profesional=None):
+        """
+        Devuelve los turnos disponibles de un servicio y/o profesional.
+        """
+        return filtrar_turnos(self.turnos, servicio, profesional)
+
+    def turno_ofrecido(self, turno):
+        """
+        Devuelve el turno disponible que coincide con el pedido (con sus datos tal como
+        están guardados), o None si no se ofrece.
+        """
+        if hasattr(self.turnos, "por_turno"):
+            return self.turnos.por_turno(turno)
+        return turno if turno in self.turnos else None
+
+    def reservar(self, turno, nombre, telefono, documento):
+        """
+        Valida los datos, crea la reserva y la guarda.
+        Solo se reservan turnos ofrecidos: el pedido (que puede llegar por la red) se
+        cambia por el turno disponible que le corresponde.
+        FUNCIONALIDAD: Reservar un turno en un solo paso
+        """
+        turno = self.turno_ofrecido(turno)
+        if turno is None:
+            return {"exito": False, "error": "El turno no está disponible."}
+        validacion = confirmar_reserva(turno, nombre, telefono, documento)
+        if not validacion["valido"]:
+            return {"exito": False, "error": validacion["error"]}
+        if self._dni_en_meses_anteriores(validacion["documento"]):
+            return {"exito": False, "error": "Ya hay un turno reservado con este DNI."}
+
+        creacion = crear_reserva(turno, nombre, telefono, documento, self.reservas)
+        if not creacion["exito"]:
+            return creacion
+
+        resultado = procesar_reserva_exitosa(creacion["reserva"], self.turnos, self.reservas)
+        if not resultado["exito"]:
+            return resultado
+        self._version += 1
+        return {"exito": True, "reserva": creacion["reserva"]}
+
+    def cancelar(self, documento, turno):
+        """
+        Cancela la reserva de un turno hecha con ese documento.
+        FUNCIONALIDAD: Cancelar una reserva en un solo paso
+        """
+        busqueda = cancelar_reserva(documento, turno, self.reservas)
+        if not busqueda["exito"]:
+            return busqueda
+
+        resultado = procesar_cancelacion_exitosa(busqueda["reserva"], self.turnos, self.reservas)
+        if not resultado["exito"]:
+            return resultado
+        self._version += 1
+        return {"exito": True, "reserva": busqueda["reserva"]}
+
+    def reserva(self, identificador):
+        """
+        Devuelve la reserva con ese id, o None si no existe.
+        """
+        return self.reservas.obtener(identificador)
+
+    def reservas_de(self, documento):
+        """
+        Devuelve las reservas hechas con un documento.
+        """
+        return filtrar_reservas_por_dni(self.reservas, documento)
+
+    def listar_reservas(self):
+        """
+        Devuelve todas las reservas.
+        """
+        return self.reservas
+
+    def reservas_pendientes(self):
+        """
+        Devuelve las reservas pendientes de atención (las de memoria: desde self.desde).
+        """
+        return obtener_reservas_pendientes(self.reservas)
+
+    def filtrar_reservas_por_estado(self, estado):
+        """
+        Devuelve las reservas con un estado (Pendiente, Atendida, No asistió).
+        """
+        return filtrar_reservas_por_estado(self.reservas, estado)
+
+    def marcar_como_atendida(self, reserva):
+        """
+        Marca una reserva (o su id) como atendida.
+        """
+        return self._modificar(marcar_como_atendida, reserva)
+
+    def marcar_como_no_asistio(self, reserva):
+        """
+        Marca una reserva (o su id) como no asistió.
+        """
+        return self._modificar(marcar_como_no_asistio, reserva)
+
+    def cambiar_monto_cobrado(self, reserva, monto):
+        """
+        Registra el monto cobrado de una reserva (o su id).
+        """
+        return self._modificar(cambiar_monto_cobrado, reserva, monto)
+
+    @contextmanager
+    def transaccion(self, atomica=True):
+        """
+        Abre una transacción: los cambios de atención (atendida, no asistió, monto)
+        hechos con el servicio dentro del bloque se guardan juntos al salir.
+        Dentro de otra transacción, se suma a ella. Es para lotes y cambios de varios
+        pasos: lo que se muestra como hecho en pantalla se guarda antes de mostrarlo.
+        FUNCIONALIDAD: Atender varias reservas seguidas con un solo guardado
+        """
+        if self._transaccion is not None:
+            yield self._transaccion
+            return
+        try:
+            with Transaccion(self.reservas, atomica) as transaccion:
+                self._transaccion = transaccion
+                yield transaccion
+        finally:
+            self._transaccion = None
+
+    def estadisticas(self):
+        """
+        Devuelve las estadísticas de las reservas en memoria; "desde" indica el primer
+        mes que cubren (None si son todas). La historia completa está en reporte.
+        """
+        return {**obtener_estadisticas_reservas(self.reservas), "desde": self.desde}
+
+    def reporte(self, periodo="mes", agrupar_por="profesional"):
+        """
+        Devuelve el reporte de ingresos y asistencia por período.
+        Si en memoria solo están las reservas recientes, los meses anteriores se leen del almacén
+        como modelos compactos (Reserva), que ocupan menos memoria que los diccionarios.
+        """
+        reservas = self.reservas
+        if self.desde is not None:
+            reservas = cargar_reservas(como_modelos=True, hasta=self.desde) + list(self.reservas)
+        return generar_reporte(reservas, periodo, agrupar_por, cargar_reglas_agenda())
+
+    def _dni_en_meses_anteriores(self, documento):
+        # Las reservas en memoria empiezan en self.desde: un DNI de antes se busca en el almacén
+        return self.desde is not None and hay_reservas_anteriores(documento, self.desde)
+
+    def _modificar(self, operacion, reserva, *argumentos):
+        # Siempre se modifica el registro guardado, aunque llegue una copia (por ejemplo por la red)
+        registro = self.reservas.obtener(reserva) if isinstance(reserva, str) else self.reservas.guardado(reserva)
+        if registro is None:
+            return {"exito": False, "error": "Reserva no encontrada."}
+        if self._transaccion is not None:
+            resultado = getattr(self._transaccion, operacion.__name__)(registro, *argumentos)
+        else:
+            resultado = operacion(registro, *argumentos, self.reservas)
+        if resultado["exito"]:
+            self._version += 1
+        return resultado
@@ -0,0 +1,238 @@
+"""
+Servidor de reservas para el sistema de turnos.
+Un único proceso (asyncio) mantiene los turnos y reservas en memoria, indexados,
+y atiende pedidos de varias terminales por un socket Unix o TCP local. Cada pedido
+es una línea JSON {"id", "operacion", "parametros"} y cada respuesta una línea
+{"id", "resultado"} o {"id", "error"}. Los pedidos se procesan de a uno en el
+bucle de eventos, así los cambios nunca se mezclan.
+
+Uso:
+    python -m sistema_turnos.servidor --socket /tmp/turnos.sock
+    python -m sistema_turnos.servidor --puerto 8765
+
+Las terminales se conectan con SISTEMA_TURNOS_SERVIDOR=unix:/tmp/turnos.sock
+(o SISTEMA_TURNOS_SERVIDOR=127.0.0.1:8765) antes de ejecutar main.py.
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import threading
+from datetime import datetime
+
+from sistema_turnos.datos.modelos import serializar
+from sistema_turnos.datos.persistencia import activar_escritura_diferida, activar_registro_de_cambios, vaciar_escrituras
+from sistema_turnos.servicio import LECTURAS, OPERACIONES, ServicioTurnos
+from sistema_turnos.traza import ServicioGrabado
+
+PUERTO_POR_DEFECTO = 8765
+
+def parsear_direccion(direccion):
+    """
+    Convierte "unix:/ruta.sock" o "host:puerto" en ("unix", ruta) o ("tcp", (host, puerto)).
+    """
+    if direccion.startswith("unix:"):
+        return "unix", direccion[len("unix:"):]
+    host, _, puerto = direccion.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(puerto))
+
+def a_json(valor):
+    """
+    Convierte un resultado del servicio en algo serializable (las colecciones pasan a listas).
+    """
+    if valor is None or isinstance(valor, (dict, list, str, int, float, bool)):
+        return valor
+    return list(valor)
+
+class ServidorTurnos:
+    """
+    Atiende pedidos de las terminales sobre un ServicioTurnos compartido.
+    """
+
+    def __init__(self, servicio=None):
+        self.servicio = servicio if servicio is not None else ServicioTurnos()
+        self._servidor = None
+
+    def procesar(self, pedido):
+        """
+        Ejecuta un pedido y devuelve la respuesta (sin el id).
+        Cualquier error se devuelve como respuesta: un pedido no corta la conexión.
+        FUNCIONALIDAD: Atender reservas de varias terminales sobre un único estado en memoria
+        """
+        if not isinstance(pedido, dict):
+            return {"error": "Pedido inválido: se esperaba un objeto JSON"}
+        operacion = pedido.get("operacion")
+        if operacion not in OPERACIONES:
+            return {"error": f"Operación desconocida: {operacion}"}
+        try:
+            resultado = getattr(self.servicio, operacion)(**pedido.get("parametros", {}))
+        except (TypeError, ValueError, KeyError) as error:
+            return {"error": f"Pedido inválido: {error}"}
+        except Exception as error:
+            return {"error": f"Error del servidor al procesar {operacion}: {error}"}
+        return {"resultado": a_json(resultado)}
+
+    async def atender(self, lector, escritor):
+        """
+        Atiende una conexión: una línea JSON por pedido, una por respuesta.
+        """
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    pedido = json.loads(linea)
+                    respuesta = self.procesar(pedido)
+                    respuesta["id"] = pedido.get("id") if isinstance(pedido, dict) else None
+                except json.JSONDecodeError:
+                    respuesta = {"id": None, "error": "Pedido con JSON inválido"}
+                escritor.write(json.dumps(respuesta, ensure_ascii=False, default=serializar).encode("utf-8") + b"\n")
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def iniciar(self, direccion):
+        """
+        Empieza a escuchar en la dirección ("unix:/ruta.sock" o "host:puerto").
+        Devuelve la dirección real (útil con puerto 0).
+        """
+        tipo, destino = parsear_direccion(direccion)
+        if tipo == "unix":
+            self._servidor = await asyncio.start_unix_server(self.atender, path=destino)
+            return f"unix:{destino}"
+        self._servidor = await asyncio.start_server(self.atender, *destino)
+        host, puerto = self._servidor.sockets[0].getsockname()[:2]
+        return f"{host}:{puerto}"
+
+    async def servir(self, direccion):
+        """
+        Escucha en la dirección hasta que se cancele, y escribe lo pendiente al terminar.
+        """
+        await self.iniciar(direccion)
+        try:
+            async with self._servidor:
+                await self._servidor.serve_forever()
+        finally:
+            vaciar_escrituras()
+
+    async def detener(self):
+        """
+        Deja de aceptar conexiones.
+        """
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+
+class ErrorServidor(Exception):
+    """
+    El servidor de reservas rechazó un pedido o no respondió.
+    """
+
+class ServicioRemoto:
+    """
+    Adaptador para las terminales: tiene las mismas operaciones que ServicioTurnos,
+    pero cada una se envía al servidor de reservas.
+    """
+
+    def __init__(self, direccion, tiempo_espera=10):
+        self.direccion = direccion
+        self.tiempo_espera = tiempo_espera
+        self._conexion = None
+        self._archivo = None
+        self._siguiente_id = 0
+        self._bloqueo = threading.Lock()
+
+    def llamar(self, operacion, **parametros):
+        """
+        Envía un pedido y devuelve su resultado. Si la conexión se cortó, reintenta una
+        vez las consultas; un cambio solo se reintenta si no llegó a enviarse (el servidor
+        pudo haberlo hecho aunque no haya llegado la respuesta: repetirlo lo haría dos veces).
+        """
+        with self._bloqueo:
+            self._siguiente_id += 1
+            pedido = {"id": self._siguiente_id, "operacion": operacion, "parametros": parametros}
+            linea = json.dumps(pedido, ensure_ascii=False, default=serializar).encode("utf-8") + b"\n"
+            for intento in range(2):
+                enviado = False
+                try:
+                    self._conectar()
+                    enviado = True
+                    self._conexion.sendall(linea)
+                    respuesta = self._archivo.readline()
+                    if not respuesta:
+                        raise ConnectionError("El servidor cerró la conexión")
+                    break
+                except OSError as error:
+                    self.cerrar()
+                    if enviado and operacion not in LECTURAS:
+                        raise ErrorServidor(
+                            f"No se pudo confirmar {operacion} con el servidor de reservas ({error}): "
+                            "revise si se hizo antes de repetirlo"
+                        )
+                    if intento:
+                        raise ErrorServidor(f"No se pudo contactar al servidor de reservas: {error}")
+        respuesta = json.loads(respuesta)
+        if "error" in respuesta:
+            raise ErrorServidor(respuesta["error"])
+        return respuesta["resultado"]
+
+    def __getattr__(self, operacion):
+        if operacion not in OPERACIONES:
+            raise AttributeError(operacion)
+        return lambda **parametros: self.llamar(operacion, **parametros)
+
+    def cerrar(self):
+        """
+        Cierra la conexión con el servidor.
+        """
+        if self._conexion is not None:
+            self._archivo.close()
+            self._conexion.close()
+        self._conexion = None
+        self._archivo = None
+
+    def _conectar(self):
+        if self._conexion is not None:
+            return
+        tipo, destino = parsear_direccion(self.direccion)
+        if tipo == "unix":
+            conexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conexion.settimeout(self.tiempo_espera)
+            conexion.connect(destino)
+        else:
+            conexion = socket.create_connection(destino, timeout=self.tiempo_espera)
+        self._conexion = conexion
+        self._archivo = conexion.makefile("rb")
+
+def main(argumentos=None):
+    """
+    Punto de entrada de línea de comandos del servidor de reservas.
+    """
+    parser = argparse.ArgumentParser(description="Servidor de reservas del sistema de turnos")
+    parser.add_argument("--socket", help="ruta del socket Unix")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO_POR_DEFECTO)
+    parser.add_argument("--grabar", help="anotar cada operación en esta traza (ver sistema_turnos.traza)")
+    opciones = parser.parse_args(argumentos)
+
+    direccion = f"unix:{opciones.socket}" if opciones.socket else f"{opciones.host}:{opciones.puerto}"
+    # El servidor es el único dueño de los archivos: las escrituras no frenan a las terminales
+    activar_escritura_diferida()
+    # Anotar los cambios para poder volver a cualquier momento (ver datos/recuperacion.py)
+    activar_registro_de_cambios()
+    servicio = ServicioTurnos()
+    if opciones.grabar:
+        servicio = ServicioGrabado(servicio, opciones.grabar, {"inicio": datetime.now().isoformat(timespec="seconds")})
+    servidor = ServidorTurnos(servicio)
+    print(f"Servidor de reservas escuchando en {direccion}")
+    try:
+        asyncio.run(servidor.servir(direccion))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
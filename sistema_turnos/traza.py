@@ -0,0 +1,88 @@
+"""
+Trazas de actividad para el sistema de turnos.
+Una traza es un archivo JSON lines: una cabecera opcional ({"cabecera": {...}}) y
+luego un evento por línea con el momento (segundos desde el inicio), la operación
+del servicio de turnos y sus parámetros. Las trazas se pueden grabar de un servidor
+real (ServicioGrabado) o generar, y después reproducir para medir rendimiento.
+"""
+
+import inspect
+import json
+import threading
+import time
+
+from sistema_turnos.datos.modelos import serializar
+from sistema_turnos.servicio import OPERACIONES
+from sistema_turnos.utils.claves import id_registro
+
+def escribir_traza(ruta, eventos, cabecera=None):
+    """
+    Escribe una traza completa (cabecera y eventos).
+    """
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        if cabecera is not None:
+            archivo.write(json.dumps({"cabecera": cabecera}, ensure_ascii=False) + "\n")
+        for evento in eventos:
+            archivo.write(json.dumps(evento, ensure_ascii=False, default=serializar) + "\n")
+
+def leer_traza(ruta):
+    """
+    Lee una traza y devuelve (cabecera o None, lista de eventos ordenados por momento).
+    """
+    cabecera = None
+    eventos = []
+    with open(ruta, "r", encoding="utf-8") as archivo:
+        for linea in archivo:
+            if not linea.strip():
+                continue
+            dato = json.loads(linea)
+            if "cabecera" in dato:
+                cabecera = dato["cabecera"]
+            else:
+                eventos.append(dato)
+    eventos.sort(key=lambda evento: evento["t"])
+    return cabecera, eventos
+
+class ServicioGrabado:
+    """
+    Servicio de turnos que anota en una traza cada operación que recibe, con su momento,
+    antes de delegarla en el servicio envuelto.
+    FUNCIONALIDAD: Grabar la actividad real para reproducirla después
+    """
+
+    def __init__(self, servicio, ruta, cabecera=None):
+        self.servicio = servicio
+        self._archivo = open(ruta, "a", encoding="utf-8")
+        self._bloqueo = threading.Lock()
+        self._inicio = time.monotonic()
+        if cabecera is not None:
+            self._escribir({"cabecera": cabecera})
+
+    def __getattr__(self, nombre):
+        if nombre.startswith("_") or nombre == "servicio":
+            raise AttributeError(nombre)
+        atributo = getattr(self.servicio, nombre)
+        if nombre not in OPERACIONES:
+            return atributo
+
+        firma = inspect.signature(atributo)
+
+        def grabar(*argumentos, **parametros):
+            parametros = dict(firma.bind(*argumentos, **parametros).arguments)
+            # Las reservas se anotan por su id, que es lo que se necesita para repetir la operación
+            if isinstance(parametros.get("reserva"), dict):
+                parametros["reserva"] = id_registro("reservas", dict(parametros["reserva"]))
+            self._escribir({"t": round(time.monotonic() - self._inicio, 6), "operacion": nombre, "parametros": parametros})
+            return atributo(**parametros)
+        return grabar
+
+    def cerrar(self):
+        """
+        Cierra el archivo de la traza.
+        """
+        self._archivo.close()
+
+    def _escribir(self, dato):
+        with self._bloqueo:
+            self._archivo.write(json.dumps(dato, ensure_ascii=False, default=serializar) + "\n")
+            self._archivo.flush()
@@ -0,0 +1,69 @@
+"""
+Módulo de claves para el sistema de turnos.
+Contiene funciones para identificar turnos y reservas sin comparar diccionarios completos.
+"""
+
+import hashlib
+
+def clave_turno(turno):
+    """
+    Devuelve la identidad de un turno: (fecha, hora, profesional, servicio).
+    FUNCIONALIDAD: Identificar un turno de forma única y comparable
+    """
+    fecha_hora = turno.get("fecha_hora") or ["", ""]
+    return (
+        fecha_hora[0],
+        fecha_hora[1],
+        (turno.get("profesional") or "").lower(),
+        (turno.get("servicio") or "").lower()
+    )
+
+def clave_reserva(reserva):
+    """
+    Devuelve la identidad de una reserva: documento más la identidad de su turno.
+    FUNCIONALIDAD: Identificar una reserva de forma única y comparable
+    """
+    documento = (reserva.get("documento") or "").lower()
+    return (documento,) + clave_turno(reserva.get("turno") or {})
+
+def valores_indexados(coleccion, registro):
+    """
+    Devuelve los campos de búsqueda de un turno o reserva, normalizados en minúsculas.
+    FUNCIONALIDAD: Usar los mismos criterios de búsqueda en índices y bases de datos
+    """
+    turno = registro if coleccion == "turnos" else (registro.get("turno") or {})
+    fecha_hora = turno.get("fecha_hora") or ["", ""]
+    valores = {
+        "fecha": fecha_hora[0],
+        "hora": fecha_hora[1],
+        "profesional": (turno.get("profesional") or "").lower(),
+        "servicio": (turno.get("servicio") or "").lower()
+    }
+    if coleccion == "reservas":
+        valores["documento"] = (registro.get("documento") or "").lower()
+        valores["estado"] = (registro.get("estado") or "").lower()
+    return valores
+
+CLAVES_POR_COLECCION = {
+    "turnos": clave_turno,
+    "reservas": clave_reserva
+}
+
+def generar_id(clave, intento=0):
+    """
+    Genera un ID corto (12 caracteres hexadecimales) y estable a partir de una clave.
+    Es un alias para mostrar y pedir registros, no su identidad (que es la clave):
+    si choca con el de otro registro, se genera otro con el siguiente intento.
+    FUNCIONALIDAD: Dar a cada turno y reserva un identificador compacto
+    """
+    texto = "|".join(clave) + (f"|{intento}" if intento else "")
+    return hashlib.blake2b(texto.encode("utf-8"), digest_size=6).hexdigest()
+
+def id_registro(coleccion, registro):
+    """
+    Devuelve el ID de un turno o reserva, asignándolo si todavía no tiene.
+    Un ID guardado no se vuelve a calcular (puede venir de resolver un choque).
+    """
+    if "id" not in registro:
+        registro["id"] = generar_id(CLAVES_POR_COLECCION[coleccion](registro))
+    return registro["id"]
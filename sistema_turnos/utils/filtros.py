@@ -1,13 +1,22 @@
 """
 Módulo de filtros para el sistema de turnos.
 Contiene funciones para filtrar turnos por diferentes criterios.
+Si la colección es una ColeccionIndexada se usan sus índices en lugar de recorrerla.
 """
 
+from sistema_turnos.utils.indices import ColeccionIndexada
+
 def filtrar_turnos(turnos, servicio=None, profesional=None):
     """
     Filtra los turnos por servicio y/o profesional.
     FUNCIONALIDAD: Filtrar información para encontrar rápidamente lo que se busca
     """
+    if isinstance(turnos, ColeccionIndexada):
+        return turnos.buscar(servicio=servicio, profesional=profesional)
+    if hasattr(turnos, "filtrar"):
+        # Turnos derivados de la agenda: se filtran al generarlos
+        return turnos.filtrar(servicio=servicio, profesional=profesional)
+    
     turnos_filtrados = turnos.copy()
     
     if servicio:
@@ -25,6 +34,8 @@ def filtrar_reservas_por_dni(reservas, dni):
     Filtra las reservas por DNI del cliente.
     FUNCIONALIDAD: Encontrar rápidamente las reservas de un cliente específico
     """
+    if isinstance(reservas, ColeccionIndexada):
+        return reservas.buscar(documento=dni)
     dni = dni.lower()
     return [r for r in reservas if r["documento"].lower() == dni]
 
@@ -33,6 +44,8 @@ def filtrar_reservas_por_estado(reservas, estado):
     Filtra las reservas por estado (Pendiente, Atendida, No asistió).
     FUNCIONALIDAD: Gestionar reservas según su estado actual
     """
+    if isinstance(reservas, ColeccionIndexada):
+        return reservas.buscar(estado=estado)
     estado = estado.lower()
     return [r for r in reservas if r["estado"].lower() == estado]
 
@@ -41,6 +54,8 @@ def filtrar_reservas_por_fecha(reservas, fecha):
     Filtra las reservas por fecha específica.
     FUNCIONALIDAD: Ver reservas de un día específico
     """
+    if isinstance(reservas, ColeccionIndexada):
+        return reservas.buscar(fecha=fecha)
     return [r for r in reservas if r["turno"]["fecha_hora"][0] == fecha]
 
 def filtrar_reservas_por_profesional(reservas, profesional):
@@ -48,5 +63,7 @@ def filtrar_reservas_por_profesional(reservas, profesional):
     Filtra las reservas por profesional.
     FUNCIONALIDAD: Ver reservas de un profesional específico
     """
+    if isinstance(reservas, ColeccionIndexada):
+        return reservas.buscar(profesional=profesional)
     profesional = profesional.lower()
     return [r for r in reservas if r["turno"]["profesional"].lower() == profesional] 
\ No newline at end of file
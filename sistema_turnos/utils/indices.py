@@ -0,0 +1,266 @@
+"""
+Módulo de índices en memoria para el sistema de turnos.
+Mantiene turnos y reservas junto con índices por documento, profesional,
+servicio, estado y fecha, para que los filtros no recorran toda la colección.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import count
+
+from sistema_turnos.utils.claves import CLAVES_POR_COLECCION, clave_turno, generar_id, id_registro, valores_indexados
+from sistema_turnos.utils.intervalos import IndiceIntervalos, intervalo_de_turno
+
+# Campos indexados por colección
+CAMPOS_INDEXADOS = {
+    "turnos": ("profesional", "servicio", "fecha"),
+    "reservas": ("documento", "profesional", "servicio", "estado", "fecha")
+}
+
+class ColeccionIndexada:
+    """
+    Colección de turnos o reservas que se comporta como una lista
+    (len, iteración, posición, append, remove) y mantiene índices actualizados,
+    incluido un registro único por turno (fecha_hora, profesional, servicio)
+    y, para reservas, los intervalos ocupados por cada profesional.
+    Cada registro se guarda por su clave (documento y turno, ver utils/claves.py), así
+    que agregar, quitar y consultar pertenencia no dependen de comparar diccionarios.
+    El ID corto ("id") es un alias para obtener(): si dos registros chocan, el que
+    llega después recibe otro ID.
+    Los cambios de campos deben hacerse con actualizar() para que los índices se enteren.
+    Los observadores (al_agregar, al_quitar, al_actualizar) reciben cada cambio.
+    """
+
+    def __init__(self, coleccion, registros=()):
+        self.coleccion = coleccion
+        self._registros = {}
+        self._por_id = {}
+        self._indices = {campo: {} for campo in CAMPOS_INDEXADOS[coleccion]}
+        self._por_turno = {}
+        self._intervalos = IndiceIntervalos()
+        self._fechas = []
+        self._posicion_fecha = {}
+        self._secuencia = count()
+        self._lista = None
+        self.observadores = []
+        self.extend(registros)
+
+    def __len__(self):
+        return len(self._registros)
+
+    def __iter__(self):
+        return iter(self._como_lista())
+
+    def __getitem__(self, indice):
+        return self._como_lista()[indice]
+
+    def __contains__(self, registro):
+        return self._buscar_clave(registro) is not None
+
+    def __repr__(self):
+        return f"ColeccionIndexada({self.coleccion!r}, {self._como_lista()!r})"
+
+    def copy(self):
+        """
+        Devuelve una lista simple con los registros.
+        """
+        return list(self._como_lista())
+
+    def append(self, registro):
+        """
+        Agrega un registro y lo indexa. Si ya hay uno con la misma clave (por ejemplo
+        datos viejos duplicados), lo reemplaza: el nuevo queda al final.
+        """
+        clave = self._clave(registro)
+        if clave in self._registros:
+            self.remove(self._registros[clave])
+        self._registros[clave] = registro
+        self._asignar_id(clave, registro)
+        valores = valores_indexados(self.coleccion, registro)
+        for campo, indice in self._indices.items():
+            indice.setdefault(valores[campo], {})[clave] = registro
+        self._por_turno[self._clave_turno(registro)] = clave
+        intervalo = self._intervalo(registro)
+        if intervalo is not None:
+            self._intervalos.agregar(*intervalo, clave)
+        entrada = (valores["fecha"], valores["hora"], next(self._secuencia), clave)
+        insort(self._fechas, entrada)
+        self._posicion_fecha[clave] = entrada
+        self._lista = None
+        for observador in self.observadores:
+            observador.al_agregar(registro)
+
+    def extend(self, registros):
+        """
+        Agrega varios registros.
+        """
+        for registro in registros:
+            self.append(registro)
+
+    def remove(self, registro):
+        """
+        Quita un registro y lo saca de los índices.
+        """
+        clave = self._buscar_clave(registro)
+        if clave is None:
+            raise ValueError("El registro no está en la colección")
+        registro = self._registros.pop(clave)
+        if self._por_id.get(registro.get("id")) == clave:
+            del self._por_id[registro["id"]]
+        valores = valores_indexados(self.coleccion, registro)
+        for campo, indice in self._indices.items():
+            self._quitar_de_indice(indice, valores[campo], clave)
+        clave_del_turno = self._clave_turno(registro)
+        if self._por_turno.get(clave_del_turno) == clave:
+            del self._por_turno[clave_del_turno]
+        intervalo = self._intervalo(registro)
+        if intervalo is not None:
+            self._intervalos.quitar(*intervalo, clave)
+        entrada = self._posicion_fecha.pop(clave)
+        posicion = bisect_left(self._fechas, entrada)
+        del self._fechas[posicion]
+        self._lista = None
+        for observador in self.observadores:
+            observador.al_quitar(registro)
+
+    def actualizar(self, registro, campo, valor):
+        """
+        Cambia un campo de un registro y actualiza los índices afectados.
+        FUNCIONALIDAD: Mantener los índices al cambiar el estado de una reserva
+        """
+        clave = self._buscar_clave(registro)
+        if clave is None:
+            raise ValueError("El registro no está en la colección")
+        registro = self._registros[clave]
+        anteriores = valores_indexados(self.coleccion, registro)
+        valor_anterior = registro.get(campo)
+        registro[campo] = valor
+        nuevos = valores_indexados(self.coleccion, registro)
+        for nombre, indice in self._indices.items():
+            if anteriores[nombre] != nuevos[nombre]:
+                self._quitar_de_indice(indice, anteriores[nombre], clave)
+                indice.setdefault(nuevos[nombre], {})[clave] = registro
+        for observador in self.observadores:
+            observador.al_actualizar(registro, campo, valor_anterior)
+
+    def buscar(self, **criterios):
+        """
+        Devuelve los registros que cumplen todos los criterios (sin distinguir mayúsculas),
+        en el orden de la colección.
+        FUNCIONALIDAD: Filtrar turnos o reservas sin recorrer toda la colección
+        """
+        grupos = []
+        for campo, valor in criterios.items():
+            if valor is None:
+                continue
+            if campo not in self._indices:
+                raise ValueError(f"No se puede buscar {self.coleccion} por '{campo}'")
+            valor = valor if campo == "fecha" else valor.lower()
+            grupos.append(self._indices[campo].get(valor, {}))
+
+        if not grupos:
+            return self.copy()
+
+        grupos.sort(key=len)
+        menor, restantes = grupos[0], grupos[1:]
+        return self._en_orden(
+            (clave, registro) for clave, registro in menor.items()
+            if all(clave in grupo for grupo in restantes)
+        )
+
+    def obtener(self, identificador):
+        """
+        Devuelve el registro con ese id, o None.
+        """
+        clave = self._por_id.get(identificador)
+        return None if clave is None else self._registros[clave]
+
+    def guardado(self, registro):
+        """
+        Devuelve el registro de la colección con la misma identidad (por ejemplo de
+        una copia llegada por la red), o None.
+        """
+        return self._registros.get(self._clave(registro))
+
+    def contiene(self, campo, valor):
+        """
+        Indica si algún registro tiene ese valor en un campo indexado.
+        FUNCIONALIDAD: Verificar duplicados (por ejemplo de DNI) en tiempo constante
+        """
+        valor = valor if campo == "fecha" else valor.lower()
+        return valor in self._indices[campo]
+
+    def por_turno(self, turno):
+        """
+        Devuelve el registro asociado a un turno (fecha_hora, profesional, servicio), o None.
+        FUNCIONALIDAD: Encontrar la reserva de un turno sin recorrer la colección
+        """
+        clave = self._por_turno.get(clave_turno(turno))
+        return None if clave is None else self._registros[clave]
+
+    def se_superpone(self, turno):
+        """
+        Indica si un turno se superpone con alguna reserva de la misma profesional.
+        FUNCIONALIDAD: Rechazar reservas superpuestas en O(log n)
+        """
+        intervalo = intervalo_de_turno(turno)
+        return intervalo is not None and self._intervalos.se_superpone(*intervalo)
+
+    def entre_fechas(self, desde=None, hasta=None):
+        """
+        Devuelve los registros con fecha entre desde y hasta (inclusive), ordenados por fecha y hora.
+        FUNCIONALIDAD: Consultar rápidamente un rango de días
+        """
+        inicio = 0 if desde is None else bisect_left(self._fechas, (desde,))
+        fin = len(self._fechas) if hasta is None else bisect_right(self._fechas, (hasta, "\uffff"))
+        return [self._registros[entrada[3]] for entrada in self._fechas[inicio:fin]]
+
+    def _en_orden(self, pares):
+        # Un grupo de un índice queda en el orden en que le llegó cada registro (actualizar
+        # lo pasa al final): se ordena por la secuencia del alta, que es el orden de la colección
+        return [registro for _, registro in sorted(pares, key=lambda par: self._posicion_fecha[par[0]][2])]
+
+    def _como_lista(self):
+        if self._lista is None:
+            self._lista = list(self._registros.values())
+        return self._lista
+
+    def _clave_turno(self, registro):
+        turno = registro if self.coleccion == "turnos" else (registro.get("turno") or {})
+        return clave_turno(turno)
+
+    def _intervalo(self, registro):
+        if self.coleccion != "reservas":
+            return None
+        return intervalo_de_turno(registro.get("turno") or {})
+
+    def _clave(self, registro):
+        return CLAVES_POR_COLECCION[self.coleccion](registro)
+
+    def _asignar_id(self, clave, registro):
+        # El ID es corto (48 bits): ante un choque con otro registro se genera otro
+        identificador = id_registro(self.coleccion, registro)
+        intento = 0
+        while self._por_id.get(identificador, clave) != clave:
+            intento += 1
+            identificador = registro["id"] = generar_id(clave, intento)
+        self._por_id[identificador] = clave
+
+    def _buscar_clave(self, registro):
+        clave = self._clave(registro)
+        return clave if clave in self._registros else None
+
+    def _quitar_de_indice(self, indice, valor, clave):
+        grupo = indice.get(valor)
+        if grupo is not None:
+            grupo.pop(clave, None)
+            if not grupo:
+                del indice[valor]
+
+def asignar_campo(registros, registro, campo, valor):
+    """
+    Asigna un campo de un registro, manteniendo los índices si la colección los tiene.
+    """
+    if isinstance(registros, ColeccionIndexada):
+        registros.actualizar(registro, campo, valor)
+    else:
+        registro[campo] = valor
@@ -0,0 +1,97 @@
+"""
+Módulo de intervalos para el sistema de turnos.
+Cada servicio tiene una duración, así que una reserva ocupa un intervalo de tiempo
+de su profesional. El índice guarda esos intervalos ordenados por profesional para
+detectar superposiciones con búsqueda binaria.
+"""
+
+from bisect import bisect_left, insort
+from datetime import date
+
+# Duración de cada servicio en minutos
+DURACION_SERVICIOS = {
+    "kapping": 90,
+    "semi": 60,
+    "soft gel": 90
+}
+
+def duracion_servicio(servicio):
+    """
+    Devuelve la duración en minutos de un servicio (60 si no está configurado).
+    """
+    return DURACION_SERVICIOS.get((servicio or "").lower(), 60)
+
+def intervalo_de_turno(turno):
+    """
+    Devuelve (profesional, inicio, fin) de un turno, con inicio y fin en minutos absolutos,
+    o None si el turno no tiene fecha y hora.
+    """
+    fecha_hora = turno.get("fecha_hora")
+    if not fecha_hora:
+        return None
+    fecha, hora = fecha_hora
+    horas, minutos = hora.split(":")
+    inicio = date.fromisoformat(fecha).toordinal() * 1440 + int(horas) * 60 + int(minutos)
+    fin = inicio + duracion_servicio(turno.get("servicio"))
+    return (turno.get("profesional") or "").lower(), inicio, fin
+
+class IndiceIntervalos:
+    """
+    Intervalos ocupados por profesional, ordenados por inicio.
+    Los datos viejos pueden traer reservas superpuestas de una misma profesional, así
+    que no se supone que los intervalos estén ordenados por fin: se guarda la duración
+    más larga de cada profesional y solo se revisan los intervalos que empiezan desde
+    (inicio - duración más larga) hasta el nuevo fin. Con duraciones de servicio acotadas
+    son unos pocos: O(log n) por consulta.
+    """
+
+    def __init__(self):
+        self._por_profesional = {}
+        # Nunca baja al quitar: una cota más larga solo revisa algún intervalo de más
+        self._duracion_maxima = {}
+
+    def agregar(self, profesional, inicio, fin, clave):
+        """
+        Registra un intervalo ocupado.
+        """
+        insort(self._por_profesional.setdefault(profesional, []), (inicio, fin, clave))
+        self._duracion_maxima[profesional] = max(self._duracion_maxima.get(profesional, 0), fin - inicio)
+
+    def quitar(self, profesional, inicio, fin, clave):
+        """
+        Libera un intervalo ocupado.
+        """
+        intervalos = self._por_profesional.get(profesional, [])
+        posicion = bisect_left(intervalos, (inicio, fin, clave))
+        if posicion < len(intervalos) and intervalos[posicion] == (inicio, fin, clave):
+            del intervalos[posicion]
+
+    def se_superpone(self, profesional, inicio, fin):
+        """
+        Indica si [inicio, fin) se superpone con algún intervalo ocupado de la profesional.
+        FUNCIONALIDAD: Evitar reservas superpuestas para una misma profesional
+        """
+        intervalos = self._por_profesional.get(profesional)
+        if not intervalos:
+            return False
+        # Un intervalo que empieza antes de inicio - duración más larga ya terminó
+        posicion = bisect_left(intervalos, (inicio - self._duracion_maxima[profesional],))
+        while posicion < len(intervalos) and intervalos[posicion][0] < fin:
+            if intervalos[posicion][1] > inicio:
+                return True
+            posicion += 1
+        return False
+
+def se_superpone_con_reservas(turno, reservas):
+    """
+    Versión lineal para listas simples: indica si el turno se superpone con alguna reserva.
+    """
+    nuevo = intervalo_de_turno(turno)
+    if nuevo is None:
+        return False
+    profesional, inicio, fin = nuevo
+    for reserva in reservas:
+        existente = intervalo_de_turno(reserva.get("turno") or {})
+        if existente and existente[0] == profesional and existente[1] < fin and inicio < existente[2]:
+            return True
+    return False
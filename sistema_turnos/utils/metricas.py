@@ -0,0 +1,44 @@
+"""
+Módulo de métricas para el sistema de turnos.
+Contiene funciones para resumir tiempos de respuesta (percentiles y rendimiento)
+de las pruebas de carga y reproducción de actividad.
+"""
+
+import math
+
+PERCENTILES = (50, 90, 95, 99)
+
+def percentil(ordenados, porcentaje):
+    """
+    Devuelve el percentil de una lista ya ordenada (método del rango más cercano).
+    """
+    if not ordenados:
+        return 0.0
+    posicion = max(math.ceil(porcentaje / 100 * len(ordenados)) - 1, 0)
+    return ordenados[posicion]
+
+def resumir_latencias(latencias, duracion):
+    """
+    Resume una lista de latencias en segundos: cantidad, operaciones por segundo,
+    percentiles y máximo (en milisegundos).
+    FUNCIONALIDAD: Medir rendimiento y tiempos de respuesta bajo carga
+    """
+    ordenados = sorted(latencias)
+    resumen = {
+        "operaciones": len(ordenados),
+        "por_segundo": len(ordenados) / duracion if duracion > 0 else 0.0,
+        "maximo_ms": ordenados[-1] * 1000 if ordenados else 0.0
+    }
+    for porcentaje in PERCENTILES:
+        resumen[f"p{porcentaje}_ms"] = percentil(ordenados, porcentaje) * 1000
+    return resumen
+
+def formatear_resumen(nombre, resumen):
+    """
+    Devuelve una línea de texto con el resumen de latencias de una operación.
+    """
+    percentiles = " ".join(f"p{p}={resumen[f'p{p}_ms']:.2f}ms" for p in PERCENTILES)
+    return (
+        f"{nombre:<24} {resumen['operaciones']:>8} ops  {resumen['por_segundo']:>10.1f} ops/s  "
+        f"{percentiles}  max={resumen['maximo_ms']:.2f}ms"
+    )
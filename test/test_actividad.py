@@ -0,0 +1,66 @@
+"""
+Tests para la generación y reproducción de actividad, y la grabación de trazas.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import time
+
+from benchmarks.actividad import datos_de_prueba, generar_actividad, reproducir
+from benchmarks.datos_sinteticos import generar_datos
+from sistema_turnos.servicio import ServicioTurnos
+from sistema_turnos.traza import ServicioGrabado, escribir_traza, leer_traza
+
+def test_actividad_generada_es_coherente(tmp_path):
+    turnos, reservas = generar_datos(200, 300, semilla=5)
+    eventos = generar_actividad(turnos, reservas, 1000, semilla=5)
+    assert len(eventos) > 800
+    assert [e["t"] for e in eventos] == sorted(e["t"] for e in eventos)
+    assert {"filtrar_turnos", "reservar", "cancelar", "marcar_como_atendida"} <= {e["operacion"] for e in eventos}
+
+    ruta = str(tmp_path / "dia.jsonl")
+    escribir_traza(ruta, eventos, {"sinteticos": {"reservas": 200, "turnos": 300, "semilla": 5}})
+    cabecera, leidos = leer_traza(ruta)
+    assert leidos == eventos
+
+    with datos_de_prueba(cabecera, motor="bitacora") as servicio:
+        resumen = reproducir(leidos, servicio)
+    # Cada evento se puede aplicar: ninguna operación se rechaza
+    assert resumen["fallidas"] == {}
+    assert resumen["total"]["operaciones"] == len(eventos)
+    assert resumen["total"]["p50_ms"] <= resumen["total"]["p99_ms"]
+
+def test_reproducir_respeta_la_velocidad():
+    eventos = [{"t": t, "operacion": "estadisticas", "parametros": {}} for t in (0.0, 1.0, 2.0)]
+    servicio = ServicioTurnos([], [])
+    inicio = time.perf_counter()
+    reproducir(eventos, servicio, velocidad=10)
+    assert time.perf_counter() - inicio >= 0.2
+
+def test_grabar_y_reproducir_traza(tmp_path):
+    turnos, _ = generar_datos(0, 10, semilla=2)
+    datos = tmp_path / "datos"
+    datos.mkdir()
+    (datos / "turnos.json").write_text(json.dumps(turnos), encoding="utf-8")
+    (datos / "reservas.json").write_text("[]", encoding="utf-8")
+
+    ruta = str(tmp_path / "grabada.jsonl")
+    grabado = ServicioGrabado(ServicioTurnos(list(turnos), []), ruta, {"inicio": "prueba"})
+    # Como lo llaman la API (argumentos por posición) y el servidor (por nombre)
+    grabado.reservar(turnos[0], "Ana", "1234567890", "30111222")
+    reserva = grabado.reservas_de(documento="30111222")[0]
+    grabado.marcar_como_atendida(reserva=reserva)
+    grabado.cerrar()
+
+    cabecera, eventos = leer_traza(ruta)
+    assert cabecera == {"inicio": "prueba"}
+    assert [e["operacion"] for e in eventos] == ["reservar", "reservas_de", "marcar_como_atendida"]
+    assert eventos[2]["parametros"]["reserva"] == reserva["id"]
+
+    with datos_de_prueba(cabecera, directorio_datos=str(datos)) as servicio:
+        resumen = reproducir(eventos, servicio)
+        assert resumen["fallidas"] == {}
+        assert servicio.reservas_de("30111222")[0]["estado"] == "Atendida"
@@ -0,0 +1,96 @@
+"""
+Tests para la agenda que genera turnos a partir de horarios.
+"""
+
+import sys
+import os
+from datetime import date, datetime
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema_turnos.datos import persistencia
+from sistema_turnos.logica.agenda import generar_turnos, TurnosAgenda
+from sistema_turnos.servicio import ServicioTurnos
+from sistema_turnos.utils.indices import ColeccionIndexada
+from sistema_turnos.utils.filtros import filtrar_turnos
+
+REGLAS = {
+    "paso_minutos": 90,
+    "profesionales": {
+        "Marisol": {"dias": [0, 1, 2, 3, 4], "desde": "09:00", "hasta": "12:00", "servicios": ["Semi", "Kapping"]}
+    }
+}
+
+LUNES = date(2025, 7, 7)
+
+def test_generar_turnos_respeta_horarios_y_dias():
+    turnos = list(generar_turnos(LUNES, date(2025, 7, 13), reglas=REGLAS, servicio="semi"))
+    fechas = {t["fecha_hora"][0] for t in turnos}
+    assert len(fechas) == 5  # sábado y domingo no trabaja
+    assert [t["fecha_hora"][1] for t in turnos if t["fecha_hora"][0] == "2025-07-07"] == ["09:00", "10:30"]
+
+def test_generar_turnos_excluye_superposiciones_con_reservas():
+    reservas = [{
+        "documento": "12345678",
+        "turno": {"fecha_hora": ["2025-07-07", "09:00"], "profesional": "Marisol", "servicio": "Kapping"}
+    }]
+    turnos = list(generar_turnos(LUNES, LUNES, reservas, reglas=REGLAS))
+    assert [(t["fecha_hora"][1], t["servicio"]) for t in turnos] == [("10:30", "Kapping"), ("10:30", "Semi")]
+
+def test_turnos_agenda_genera_por_paginas():
+    agenda = TurnosAgenda([], REGLAS, desde=LUNES, dias=365, tamanio_pagina=10)
+    primera = agenda.pagina(0)
+    assert len(primera) == 10
+    assert len(agenda._generados) <= 21
+    assert agenda[0] in agenda
+
+    filtrada = filtrar_turnos(agenda, servicio="kapping")
+    assert all(t["servicio"] == "Kapping" for t in filtrada[0:5])
+
+def test_turno_ofrecido_por_la_agenda_sin_generar_paginas():
+    agenda = TurnosAgenda([], REGLAS, desde=LUNES, dias=365, tamanio_pagina=10)
+    lejano = {"fecha_hora": ["2026-03-02", "10:30"], "profesional": "marisol", "servicio": "semi"}
+    ofrecido = agenda.por_turno(lejano)
+    assert ofrecido["profesional"] == "Marisol" and ofrecido["servicio"] == "Semi"
+    assert len(agenda._generados) == 0
+    for inventado in (
+        dict(lejano, fecha_hora=["2026-03-02", "03:00"]), dict(lejano, profesional="Nadie"),
+        dict(lejano, fecha_hora=["2026-03-07", "10:30"]), dict(lejano, fecha_hora=["2030-01-01", "10:30"]),
+        dict(lejano, fecha_hora="2026-03-02")
+    ):
+        assert agenda.por_turno(inventado) is None
+
+def test_len_es_exacto_y_cada_posicion_existe():
+    # 4 turnos en el día, justo una página: len() no anuncia un quinto
+    agenda = TurnosAgenda([], REGLAS, desde=LUNES, dias=0, tamanio_pagina=4)
+    assert len(agenda) == 4
+    assert agenda[len(agenda) - 1]["fecha_hora"] == ["2025-07-07", "10:30"]
+    assert agenda[0:10] == list(agenda)
+
+def test_agenda_no_ofrece_turnos_de_hoy_que_ya_empezaron():
+    ahora = datetime(2025, 7, 7, 9, 30)
+    turnos = list(generar_turnos(ahora, LUNES, reglas=REGLAS, servicio="semi"))
+    assert [t["fecha_hora"] for t in turnos] == [["2025-07-07", "10:30"]]
+
+    agenda = TurnosAgenda([], REGLAS, desde=ahora, dias=1)
+    assert agenda[0]["fecha_hora"] == ["2025-07-07", "10:30"]
+    temprano = {"fecha_hora": ["2025-07-07", "09:00"], "profesional": "Marisol", "servicio": "Semi"}
+    assert temprano not in agenda
+    assert {**temprano, "fecha_hora": ["2025-07-08", "09:00"]} in agenda
+
+def test_reservar_saca_el_turno_y_los_superpuestos_de_la_pagina(tmp_path):
+    persistencia.configurar_almacenamiento("json", directorio=str(tmp_path))
+    try:
+        reservas = ColeccionIndexada("reservas")
+        agenda = TurnosAgenda(reservas, REGLAS, desde=date(2099, 7, 6), dias=0)
+        servicio = ServicioTurnos(agenda, reservas)
+        assert len(agenda.pagina(0)) == 4
+
+        kapping = next(t for t in agenda.pagina(0) if t["servicio"] == "Kapping" and t["fecha_hora"][1] == "09:00")
+        assert servicio.reservar(kapping, "Ana", "1234567890", "30111222")["exito"]
+        # El Kapping de 09:00 dura 90 minutos: el Semi de 09:00 también deja de ofrecerse
+        assert [t["fecha_hora"][1] for t in agenda.pagina(0)] == ["10:30", "10:30"]
+
+        assert servicio.cancelar("30111222", kapping)["exito"]
+        assert len(agenda.pagina(0)) == 4
+    finally:
+        persistencia.configurar_almacenamiento("json")
@@ -0,0 +1,130 @@
+"""
+Tests para la API HTTP de reservas y su generador de carga.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import http.client
+import json
+import threading
+
+import pytest
+
+from sistema_turnos.api_http import ApiTurnos
+from sistema_turnos.carga_http import generar_carga, turnos_sinteticos
+from sistema_turnos.datos import persistencia
+from sistema_turnos.servicio import ServicioTurnos
+from sistema_turnos.utils.claves import clave_turno
+
+TOKEN = "token-del-personal"
+PERSONAL = {"Authorization": f"Bearer {TOKEN}"}
+
+@pytest.fixture
+def api(tmp_path):
+    """
+    Levanta la API en un hilo con su propio bucle de eventos, en un puerto libre.
+    """
+    persistencia.configurar_almacenamiento("json", diferido=True, directorio=str(tmp_path))
+    servicio = ServicioTurnos(turnos_sinteticos(60), [])
+    api = ApiTurnos(servicio, token=TOKEN)
+    bucle = asyncio.new_event_loop()
+    puerto = bucle.run_until_complete(api.iniciar("127.0.0.1", 0))
+    hilo = threading.Thread(target=bucle.run_forever, daemon=True)
+    hilo.start()
+    try:
+        yield puerto, servicio
+    finally:
+        asyncio.run_coroutine_threadsafe(api.detener(), bucle).result(5)
+        bucle.call_soon_threadsafe(bucle.stop)
+        hilo.join(5)
+        bucle.close()
+        persistencia.configurar_almacenamiento("json")
+
+def _pedir(puerto, metodo, ruta, datos=None, encabezados=None):
+    conexion = http.client.HTTPConnection("127.0.0.1", puerto, timeout=5)
+    cuerpo = json.dumps(datos) if datos is not None else None
+    conexion.request(metodo, ruta, body=cuerpo, headers={"Content-Type": "application/json", **(encabezados or {})})
+    respuesta = conexion.getresponse()
+    resultado = respuesta.status, json.loads(respuesta.read())
+    conexion.close()
+    return resultado
+
+def _datos_reserva(turno, documento):
+    return {"turno": turno, "nombre": "Ana", "telefono": "1234567890", "documento": documento}
+
+def test_reservar_cancelar_y_atender(api):
+    puerto, _ = api
+    estado, turnos = _pedir(puerto, "GET", "/turnos?profesional=gisela&limite=5")
+    assert estado == 200 and len(turnos) == 5
+    assert all(t["profesional"] == "Gisela" for t in turnos)
+
+    estado, creada = _pedir(puerto, "POST", "/reservas", _datos_reserva(turnos[0], "30111222"))
+    assert estado == 201
+    reserva = creada["reserva"]
+
+    # Turno ocupado y datos inválidos
+    assert _pedir(puerto, "POST", "/reservas", _datos_reserva(turnos[0], "30111333"))[0] == 409
+    assert _pedir(puerto, "POST", "/reservas", {"nombre": "Ana"})[0] == 400
+    # Un turno que no se ofrece no se reserva, y los tipos se validan
+    inventado = {"fecha_hora": ["2030-09-09", "03:00"], "profesional": "Nadie", "servicio": "X"}
+    assert _pedir(puerto, "POST", "/reservas", _datos_reserva(inventado, "30111444"))[0] == 409
+    assert _pedir(puerto, "POST", "/reservas", _datos_reserva(turnos[1], 30111444))[0] == 400
+    assert _pedir(puerto, "POST", "/reservas", _datos_reserva(dict(turnos[1], fecha_hora="2030-09-09"), "30111444"))[0] == 400
+
+    estado, reservas = _pedir(puerto, "GET", "/reservas?documento=30111222")
+    assert estado == 200 and [r["id"] for r in reservas] == [reserva["id"]]
+
+    # Un monto inválido no deja la reserva marcada a medias
+    assert _pedir(puerto, "POST", f"/reservas/{reserva['id']}/atendida", {"monto": -10}, PERSONAL)[0] == 400
+    assert _pedir(puerto, "GET", f"/reservas/{reserva['id']}", encabezados=PERSONAL)[1]["estado"] == "Pendiente"
+    estado, _ = _pedir(puerto, "POST", f"/reservas/{reserva['id']}/atendida", {"monto": 4500}, PERSONAL)
+    assert estado == 200
+    estado, guardada = _pedir(puerto, "GET", f"/reservas/{reserva['id']}?documento=30111222")
+    assert guardada["estado"] == "Atendida" and guardada["montoCobrado"] == 4500
+
+    # Solo se cancela con el documento de quien reservó
+    assert _pedir(puerto, "DELETE", f"/reservas/{reserva['id']}?documento=99999999")[0] == 404
+    assert _pedir(puerto, "DELETE", f"/reservas/{reserva['id']}?documento=30111222")[0] == 200
+    assert _pedir(puerto, "GET", f"/reservas/{reserva['id']}", encabezados=PERSONAL)[0] == 404
+
+def test_acciones_del_personal_piden_token(api):
+    puerto, _ = api
+    _, turnos = _pedir(puerto, "GET", "/turnos?limite=1")
+    reserva = _pedir(puerto, "POST", "/reservas", _datos_reserva(turnos[0], "30111222"))[1]["reserva"]
+    otro_token = {"Authorization": "Bearer otro"}
+
+    for metodo, ruta in (("POST", f"/reservas/{reserva['id']}/atendida"), ("POST", f"/reservas/{reserva['id']}/no-asistio"),
+                         ("GET", "/estadisticas"), ("GET", "/reportes"), ("GET", "/reservas"), ("GET", "/reservas?estado=pendiente")):
+        assert _pedir(puerto, metodo, ruta)[0] == 401
+        assert _pedir(puerto, metodo, ruta, encabezados=otro_token)[0] == 401
+    assert _pedir(puerto, "PUT", f"/reservas/{reserva['id']}/monto", {"monto": 100})[0] == 401
+
+    # Una clienta ve solo lo de su documento
+    assert _pedir(puerto, "GET", f"/reservas/{reserva['id']}")[0] == 404
+    assert _pedir(puerto, "GET", f"/reservas/{reserva['id']}?documento=99999999")[0] == 404
+    assert _pedir(puerto, "GET", "/reservas?documento=99999999")[1] == []
+    assert _pedir(puerto, "GET", "/reservas", encabezados=PERSONAL)[1][0]["documento"] == "30111222"
+
+    # Sin token configurado, las rutas del personal quedan cerradas
+    assert ApiTurnos(ServicioTurnos([], []), token=None).procesar("GET", "/estadisticas", encabezados={"authorization": "Bearer "})[0] == 401
+
+def test_rutas_y_metodos_invalidos(api):
+    puerto, _ = api
+    assert _pedir(puerto, "GET", "/no-existe")[0] == 404
+    assert _pedir(puerto, "PATCH", "/turnos")[0] == 405
+    assert _pedir(puerto, "GET", "/reportes?periodo=anio", encabezados=PERSONAL)[0] == 400
+    assert _pedir(puerto, "GET", "/estadisticas", encabezados=PERSONAL)[0] == 200
+
+def test_carga_concurrente_no_reserva_dos_veces(api):
+    puerto, servicio = api
+    resumen = asyncio.run(generar_carga("127.0.0.1", puerto, clientes=8, duracion=0.5,
+                                        proporcion_reservas=0.8, semilla=3))
+    assert resumen["total"]["operaciones"] > 0
+    assert resumen["total"]["p50_ms"] <= resumen["total"]["p99_ms"]
+
+    claves = [clave_turno(r["turno"]) for r in servicio.reservas]
+    assert len(claves) == len(set(claves))
+    assert len(servicio.reservas) + len(servicio.turnos) == 60
@@ -0,0 +1,82 @@
+"""
+Tests para las escrituras atómicas y la recuperación de archivos dañados.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+
+import pytest
+
+from sistema_turnos.datos import archivos
+from sistema_turnos.datos.archivos import escribir_atomico, leer_json, ruta_respaldo
+from sistema_turnos.datos.bitacora import AlmacenBitacora
+from sistema_turnos.datos.persistencia import AlmacenJSON
+
+RESERVA = {
+    "nombre": "Ana", "telefono": "1234567890", "documento": "12345678",
+    "turno": {"fecha_hora": ["2025-07-10", "13:30"], "profesional": "Gisela", "servicio": "Semi"},
+    "estado": "Pendiente", "montoCobrado": None
+}
+
+def _volcar(datos):
+    return lambda archivo: json.dump(datos, archivo)
+
+def test_escritura_atomica_guarda_respaldo(tmp_path):
+    ruta = str(tmp_path / "reservas.json")
+    escribir_atomico(ruta, _volcar([1]))
+    escribir_atomico(ruta, _volcar([1, 2]))
+    assert leer_json(ruta) == [1, 2]
+    assert leer_json(ruta_respaldo(ruta)) == [1]
+    assert sorted(os.listdir(tmp_path)) == ["reservas.json", "reservas.json.bak"]
+
+def test_corte_durante_la_escritura_no_toca_el_original(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "reservas.json")
+    escribir_atomico(ruta, _volcar([1]))
+
+    def cortar(archivo):
+        archivo.write("[1, 2")
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        escribir_atomico(ruta, cortar)
+    assert leer_json(ruta) == [1]
+
+    def renombre_fallido(origen, destino):
+        raise OSError("disco desconectado")
+
+    monkeypatch.setattr(archivos.os, "replace", renombre_fallido)
+    with pytest.raises(OSError):
+        escribir_atomico(ruta, _volcar([1, 2]), respaldo=False)
+    monkeypatch.undo()
+    assert leer_json(ruta) == [1]
+
+def test_archivo_danado_vuelve_a_la_ultima_copia_buena(tmp_path):
+    almacen = AlmacenJSON(str(tmp_path))
+    almacen.guardar("reservas", [RESERVA])
+    almacen.guardar("reservas", [RESERVA, dict(RESERVA, documento="87654321")])
+    # Simular un archivo cortado a la mitad por una herramienta externa o un disco dañado
+    ruta = almacen.ruta("reservas")
+    with open(ruta, "r+", encoding="utf-8") as archivo:
+        archivo.truncate(40)
+
+    assert almacen.cargar("reservas") == [RESERVA]
+    assert any(nombre.startswith("reservas.json.danado-") for nombre in os.listdir(tmp_path))
+
+def test_grupo_escribe_al_final(tmp_path):
+    almacen = AlmacenJSON(str(tmp_path))
+    with almacen.grupo():
+        almacen.guardar("reservas", [RESERVA])
+        almacen.guardar("turnos", [RESERVA["turno"]])
+        assert not os.path.exists(almacen.ruta("reservas"))
+    assert almacen.cargar("reservas") == [RESERVA]
+    assert almacen.cargar("turnos") == [RESERVA["turno"]]
+
+def test_grupo_en_bitacora(tmp_path):
+    almacen = AlmacenBitacora(str(tmp_path))
+    with almacen.grupo():
+        almacen.registrar("reservas", "alta", RESERVA, [RESERVA])
+        assert not os.path.exists(almacen.ruta_bitacora("reservas"))
+    assert AlmacenBitacora(str(tmp_path)).cargar("reservas") == [RESERVA]
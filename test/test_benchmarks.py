@@ -0,0 +1,44 @@
+"""
+Tests para el generador de datos sintéticos y la comparación de benchmarks.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import ejecutar
+from benchmarks.datos_sinteticos import generar_datos
+from sistema_turnos.logica.reservas import confirmar_reserva
+from sistema_turnos.utils.claves import clave_turno
+from sistema_turnos.utils.indices import ColeccionIndexada
+
+def test_datos_sinteticos_validos_y_reproducibles():
+    turnos, reservas = generar_datos(500, 300, semilla=7)
+    assert len(reservas) == 500 and len(turnos) == 300
+    assert generar_datos(500, 300, semilla=7) == (turnos, reservas)
+
+    claves = [clave_turno(t) for t in turnos] + [clave_turno(r["turno"]) for r in reservas]
+    assert len(set(claves)) == len(claves)
+    assert len({r["documento"] for r in reservas}) == len(reservas)
+    for reserva in reservas[:50]:
+        validacion = confirmar_reserva(reserva["turno"], reserva["nombre"], reserva["telefono"], reserva["documento"])
+        assert validacion["valido"], validacion
+
+    # Ninguna reserva se superpone con otra de la misma profesional
+    indexadas = ColeccionIndexada("reservas", [])
+    for reserva in reservas:
+        assert not indexadas.se_superpone(reserva["turno"])
+        indexadas.append(reserva)
+
+def test_ejecutar_y_comparar_con_base(tmp_path, monkeypatch):
+    monkeypatch.setattr(ejecutar, "TIEMPO_MINIMO", 0)
+    resultados = ejecutar.ejecutar([200], ["crear_reserva", "guardar_reservas", "cargar_reservas"],
+                                   repeticiones=1, informar=lambda linea: None)
+    assert set(resultados) == {"crear_reserva@200", "guardar_reservas@200", "cargar_reservas@200"}
+    assert all(r["memoria_pico_kb"] is not None for r in resultados.values())
+
+    base = {clave: dict(r, minimo_s=r["minimo_s"] * 2) for clave, r in resultados.items()}
+    lenta = {clave: dict(r, minimo_s=r["minimo_s"] / 2) for clave, r in resultados.items()}
+    assert {estado for _, _, estado in ejecutar.comparar(resultados, base)} == {"mejora"}
+    assert {estado for _, _, estado in ejecutar.comparar(resultados, lenta)} == {"regresion"}
+    assert {estado for _, _, estado in ejecutar.comparar(resultados, resultados)} == {"igual"}
@@ -0,0 +1,107 @@
+"""
+Tests para el almacenamiento con bitácora de cambios.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from sistema_turnos.datos.bitacora import AlmacenBitacora
+
+def _reserva(documento, hora):
+    return {
+        "nombre": "Ana",
+        "telefono": "1234567890",
+        "documento": documento,
+        "turno": {"fecha_hora": ["2025-07-01", hora], "profesional": "Marisol", "servicio": "Semi"},
+        "estado": "Pendiente",
+        "montoCobrado": None
+    }
+
+def test_bitacora_reaplica_cambios(tmp_path):
+    almacen = AlmacenBitacora(str(tmp_path))
+    reservas = [_reserva("11111111", "09:00")]
+    almacen.guardar("reservas", reservas)
+
+    nueva = _reserva("22222222", "10:30")
+    reservas.append(nueva)
+    almacen.registrar("reservas", "alta", nueva, reservas)
+    reservas[0]["estado"] = "Atendida"
+    almacen.registrar("reservas", "modificacion", reservas[0], reservas)
+
+    cargadas = AlmacenBitacora(str(tmp_path)).cargar("reservas")
+    assert [r["documento"] for r in cargadas] == ["11111111", "22222222"]
+    assert cargadas[0]["estado"] == "Atendida"
+
+    almacen.registrar("reservas", "baja", nueva, reservas[:1])
+    cargadas = AlmacenBitacora(str(tmp_path)).cargar("reservas")
+    assert [r["documento"] for r in cargadas] == ["11111111"]
+
+def test_bitacora_compacta_al_superar_limite(tmp_path):
+    almacen = AlmacenBitacora(str(tmp_path), limite_bitacora=3)
+    reservas = []
+    for i in range(3):
+        reserva = _reserva(f"1000000{i}", f"0{i}:00")
+        reservas.append(reserva)
+        almacen.registrar("reservas", "alta", reserva, reservas)
+
+    assert os.path.getsize(almacen.ruta_bitacora("reservas")) == 0
+    assert len(AlmacenBitacora(str(tmp_path)).cargar("reservas")) == 3
+
+    # Sin la colección (escritura diferida) la instantánea se reconstruye del disco
+    for i in range(3, 6):
+        with almacen.grupo():
+            almacen.registrar("reservas", "alta", _reserva(f"1000000{i}", f"0{i}:00"), None)
+    assert os.path.getsize(almacen.ruta_bitacora("reservas")) == 0
+    assert len(AlmacenBitacora(str(tmp_path)).cargar("reservas")) == 6
+
+def test_bitacora_ignora_linea_incompleta(tmp_path):
+    almacen = AlmacenBitacora(str(tmp_path))
+    reserva = _reserva("11111111", "09:00")
+    almacen.registrar("reservas", "alta", reserva, [reserva])
+    with open(almacen.ruta_bitacora("reservas"), "a", encoding="utf-8") as archivo:
+        archivo.write('{"op":"alta","clave":[')
+
+    cargadas = AlmacenBitacora(str(tmp_path)).cargar("reservas")
+    assert len(cargadas) == 1
+
+def test_instantanea_danada_no_vuelve_a_la_anterior(tmp_path):
+    almacen = AlmacenBitacora(str(tmp_path), limite_bitacora=2)
+    reservas = [_reserva("11111111", "09:00")]
+    almacen.guardar("reservas", reservas)
+    for documento, hora in (("22222222", "10:30"), ("33333333", "12:00")):
+        reservas.append(_reserva(documento, hora))
+        almacen.registrar("reservas", "alta", reservas[-1], reservas)
+    assert os.path.getsize(almacen.ruta_bitacora("reservas")) == 0
+
+    # Con la bitácora ya vaciada, el .bak no tiene las altas: se avisa en lugar de perderlas
+    ruta = almacen.ruta_instantanea("reservas")
+    with open(ruta, "r+b") as archivo:
+        archivo.truncate(os.path.getsize(ruta) // 2)
+    with pytest.raises(ValueError, match="restaurar un backup"):
+        AlmacenBitacora(str(tmp_path)).cargar("reservas")
+    assert os.path.exists(ruta)
+
+    # Si falta (corte entre apartar la anterior y poner la nueva), la anterior más la bitácora sirven
+    os.remove(ruta)
+    almacen.registrar("reservas", "alta", _reserva("44444444", "13:30"), None)
+    assert [r["documento"] for r in AlmacenBitacora(str(tmp_path)).cargar("reservas")] == ["11111111", "44444444"]
+
+def test_cambio_despues_de_una_linea_cortada_no_se_pierde(tmp_path):
+    almacen = AlmacenBitacora(str(tmp_path))
+    reservas = [_reserva("11111111", "09:00")]
+    almacen.registrar("reservas", "alta", reservas[0], reservas)
+    with open(almacen.ruta_bitacora("reservas"), "a", encoding="utf-8") as archivo:
+        archivo.write('{"op":"alta","clave":[')
+
+    # Otra instancia (después del cierre) agrega una reserva
+    despues = AlmacenBitacora(str(tmp_path))
+    nueva = _reserva("22222222", "10:30")
+    despues.registrar("reservas", "alta", nueva, None)
+    assert [r["documento"] for r in AlmacenBitacora(str(tmp_path)).cargar("reservas")] == ["11111111", "22222222"]
+
+    # Y sigue ahí después de compactar
+    despues.guardar("reservas", despues.cargar("reservas"))
+    assert [r["documento"] for r in AlmacenBitacora(str(tmp_path)).cargar("reservas")] == ["11111111", "22222222"]
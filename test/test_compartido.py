@@ -0,0 +1,152 @@
+"""
+Tests para el acceso compartido desde varias terminales (varios procesos).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import multiprocessing
+
+import pytest
+
+from sistema_turnos.datos import persistencia
+from sistema_turnos.datos.compartido import AlmacenCompartido, ConflictoConcurrencia
+from sistema_turnos.datos.persistencia import AlmacenJSON
+from sistema_turnos.logica.reservas import crear_reserva, procesar_reserva_exitosa
+from sistema_turnos.servicio import ServicioTurnos
+from sistema_turnos.utils.claves import clave_turno
+from sistema_turnos.utils.indices import ColeccionIndexada
+
+TURNOS = [
+    {"fecha_hora": [f"2025-08-{dia:02d}", "09:00"], "profesional": "Gisela", "servicio": "Semi"}
+    for dia in range(1, 21)
+]
+
+def _reserva(documento, turno):
+    return {
+        "nombre": "Ana", "telefono": "1234567890", "documento": documento, "turno": turno,
+        "estado": "Pendiente", "montoCobrado": None
+    }
+
+def _terminal(directorio, numero, turnos, resultados):
+    """
+    Una terminal: carga una vez y reserva turnos sin volver a cargar.
+    """
+    persistencia.configurar_almacenamiento("json", compartido=True, directorio=directorio)
+    reservas = ColeccionIndexada("reservas", persistencia.cargar_reservas())
+    disponibles = list(turnos)
+    reservados = []
+    for indice, turno in enumerate(turnos):
+        creacion = crear_reserva(turno, "Ana", "1234567890", f"{numero}{indice:04d}", reservas)
+        if creacion["exito"] and procesar_reserva_exitosa(creacion["reserva"], disponibles, reservas)["exito"]:
+            reservados.append(turno["fecha_hora"][0])
+    resultados.put(reservados)
+
+def _correr_terminales(directorio, turnos_por_terminal):
+    contexto = multiprocessing.get_context("fork")
+    resultados = contexto.Queue()
+    procesos = [
+        contexto.Process(target=_terminal, args=(directorio, numero + 1, turnos, resultados))
+        for numero, turnos in enumerate(turnos_por_terminal)
+    ]
+    for proceso in procesos:
+        proceso.start()
+    reservados = [resultados.get(timeout=60) for _ in procesos]
+    for proceso in procesos:
+        proceso.join()
+    return reservados
+
+necesita_fork = pytest.mark.skipif(not hasattr(os, "fork"), reason="requiere fork")
+
+@necesita_fork
+def test_terminales_no_pierden_reservas(tmp_path):
+    # Cada terminal reserva turnos distintos: no se debe perder ninguna
+    repartidos = [TURNOS[numero::4] for numero in range(4)]
+    reservados = _correr_terminales(str(tmp_path), repartidos)
+    assert sorted(sum(reservados, [])) == sorted(t["fecha_hora"][0] for t in TURNOS)
+    guardadas = AlmacenJSON(str(tmp_path)).cargar("reservas")
+    assert len(guardadas) == len(TURNOS)
+
+@necesita_fork
+def test_terminales_no_reservan_dos_veces_el_mismo_turno(tmp_path):
+    # Todas las terminales intentan los mismos turnos: cada uno queda reservado una sola vez
+    reservados = _correr_terminales(str(tmp_path), [TURNOS] * 4)
+    assert sorted(sum(reservados, [])) == sorted(t["fecha_hora"][0] for t in TURNOS)
+    guardadas = AlmacenJSON(str(tmp_path)).cargar("reservas")
+    claves = [clave_turno(r["turno"]) for r in guardadas]
+    assert len(claves) == len(set(claves)) == len(TURNOS)
+
+def test_detecta_cambios_y_rechaza_conflictos(tmp_path):
+    una = AlmacenCompartido(AlmacenJSON(str(tmp_path)), str(tmp_path))
+    otra = AlmacenCompartido(AlmacenJSON(str(tmp_path)), str(tmp_path))
+    reservas_una = una.cargar("reservas")
+    otra.cargar("reservas")
+
+    primera = _reserva("1", TURNOS[0])
+    una.registrar("reservas", "alta", primera, reservas_una + [primera])
+    assert not una.hay_cambios("reservas")
+    assert otra.hay_cambios("reservas")
+
+    # La otra terminal no vio la reserva: se combina sobre el disco en lugar de pisarla
+    segunda = _reserva("2", TURNOS[1])
+    otra.registrar("reservas", "alta", segunda, [segunda])
+    assert len(AlmacenJSON(str(tmp_path)).cargar("reservas")) == 2
+
+    with pytest.raises(ConflictoConcurrencia):
+        otra.registrar("reservas", "alta", _reserva("3", TURNOS[0]), [])
+    with pytest.raises(ConflictoConcurrencia):
+        otra.guardar("reservas", [])
+
+def test_grupo_combina_todos_sus_cambios_y_aplica_la_regla_del_dni(tmp_path):
+    una = AlmacenCompartido(AlmacenJSON(str(tmp_path)), str(tmp_path))
+    otra = AlmacenCompartido(AlmacenJSON(str(tmp_path)), str(tmp_path))
+    reservas_una = una.cargar("reservas")
+    reservas_otra = otra.cargar("reservas")
+
+    novena = _reserva("9", TURNOS[9])
+    otra.registrar("reservas", "alta", novena, reservas_otra + [novena])
+
+    # Tres altas agrupadas de la terminal que no vio la novena: ninguna pisa a las otras
+    with una.grupo():
+        for numero in range(1, 4):
+            reserva = _reserva(str(numero), TURNOS[numero])
+            reservas_una = reservas_una + [reserva]
+            una.registrar("reservas", "alta", reserva, reservas_una)
+    documentos = sorted(r["documento"] for r in AlmacenJSON(str(tmp_path)).cargar("reservas"))
+    assert documentos == ["1", "2", "3", "9"]
+
+    # El mismo DNI desde la otra terminal, en otro turno: se rechaza como en crear_reserva
+    with pytest.raises(ConflictoConcurrencia, match="DNI"):
+        otra.registrar("reservas", "alta", _reserva("1", TURNOS[5]), [novena])
+
+def test_conflicto_deja_la_memoria_como_estaba(tmp_path):
+    turnos = [
+        {"fecha_hora": [f"2099-08-{dia:02d}", "09:00"], "profesional": "Gisela", "servicio": "Semi"}
+        for dia in range(1, 4)
+    ]
+    AlmacenJSON(str(tmp_path)).guardar("turnos", turnos[:2])
+    AlmacenJSON(str(tmp_path)).guardar("reservas", [_reserva("30000009", turnos[2])])
+    persistencia.configurar_almacenamiento("json", compartido=True, directorio=str(tmp_path))
+    try:
+        servicio = ServicioTurnos()
+        otra = AlmacenCompartido(AlmacenJSON(str(tmp_path)), str(tmp_path))
+        otra.cargar("turnos")
+        reservas_otra = otra.cargar("reservas")
+
+        # Otra terminal reserva el mismo turno: la reserva se rechaza y el turno sigue ofrecido
+        tomada = _reserva("30000001", turnos[0])
+        otra.registrar("reservas", "alta", tomada, reservas_otra + [tomada])
+        resultado = servicio.reservar(turnos[0], "Ana", "1234567890", "30000002")
+        assert not resultado["exito"]
+        assert turnos[0] in servicio.turnos
+        assert servicio.reservas_de("30000002") == []
+
+        # Otra terminal cancela la reserva: la cancelación se rechaza y la reserva sigue
+        otra.registrar("reservas", "baja", reservas_otra[0], [tomada])
+        resultado = servicio.cancelar("30000009", turnos[2])
+        assert not resultado["exito"]
+        assert len(servicio.reservas_de("30000009")) == 1
+        assert turnos[2] not in servicio.turnos
+    finally:
+        persistencia.configurar_almacenamiento("json")
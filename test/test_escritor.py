@@ -0,0 +1,144 @@
+"""
+Tests para la escritura diferida en segundo plano.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+import time
+
+import pytest
+
+from sistema_turnos.datos import persistencia
+from sistema_turnos.datos.escritor import EscritorDiferido
+
+class AlmacenLento:
+    """
+    Almacén en memoria que tarda en escribir y anota cada escritura.
+    """
+
+    def __init__(self):
+        self.escrituras = []
+        self.datos = {}
+        self.puede_escribir = threading.Event()
+
+    def cargar(self, coleccion):
+        return list(self.datos.get(coleccion, []))
+
+    def guardar(self, coleccion, datos):
+        self.puede_escribir.wait()
+        if datos == ["falla"]:
+            raise OSError("disco lleno")
+        self.escrituras.append(("guardar", coleccion, len(datos)))
+        self.datos[coleccion] = list(datos)
+
+    def registrar(self, coleccion, operacion, registro, datos):
+        self.puede_escribir.wait()
+        self.escrituras.append((operacion, coleccion, len(datos)))
+        self.datos[coleccion] = list(datos)
+
+def test_guardar_no_bloquea_y_coalesce():
+    almacen = AlmacenLento()
+    escritor = EscritorDiferido(almacen)
+    reservas = []
+
+    inicio = time.perf_counter()
+    for numero in range(50):
+        reservas.append({"documento": str(numero)})
+        escritor.registrar("reservas", "alta", reservas[-1], reservas)
+    assert time.perf_counter() - inicio < 1
+
+    almacen.puede_escribir.set()
+    escritor.vaciar()
+    # La primera escritura ya estaba en curso o encolada; el resto se juntó en pocas
+    assert len(almacen.escrituras) < 50
+    assert almacen.cargar("reservas") == reservas
+    escritor.cerrar()
+
+def test_las_escrituras_no_ven_cambios_posteriores():
+    almacen = AlmacenLento()
+    escritor = EscritorDiferido(almacen)
+    reservas = [{"documento": "1", "estado": "Pendiente"}]
+    escritor.guardar("reservas", reservas)
+    reservas[0]["estado"] = "Atendida"
+    almacen.puede_escribir.set()
+    escritor.vaciar()
+    assert almacen.datos["reservas"] == [{"documento": "1", "estado": "Pendiente"}]
+    escritor.cerrar()
+
+def test_vaciar_relanza_errores():
+    almacen = AlmacenLento()
+    almacen.puede_escribir.set()
+    escritor = EscritorDiferido(almacen)
+    escritor.guardar("reservas", ["falla"])
+    with pytest.raises(OSError):
+        escritor.vaciar()
+    escritor.guardar("reservas", [{"documento": "1"}])
+    escritor.vaciar()
+    escritor.cerrar()
+
+def test_persistencia_diferida(tmp_path):
+    reserva = {"nombre": "Ana", "documento": "1", "turno": {}, "estado": "Pendiente", "montoCobrado": None}
+    try:
+        persistencia.configurar_almacenamiento("json", diferido=True, directorio=str(tmp_path))
+        persistencia.guardar_reservas([reserva])
+        persistencia.vaciar_escrituras()
+        assert (tmp_path / "reservas.json").exists()
+        assert persistencia.cargar_reservas() == [reserva]
+    finally:
+        persistencia.configurar_almacenamiento("json")
+
+class AlmacenIncremental(AlmacenLento):
+    """
+    Almacén lento que guarda cada cambio sin necesitar la colección.
+    """
+
+    registro_incremental = True
+
+    def registrar(self, coleccion, operacion, registro, datos):
+        self.puede_escribir.wait()
+        if registro == {"documento": "falla"}:
+            raise OSError("disco lleno")
+        assert datos is None
+        self.escrituras.append((operacion, coleccion, registro["documento"]))
+
+def test_almacen_incremental_copia_solo_el_registro():
+    almacen = AlmacenIncremental()
+    escritor = EscritorDiferido(almacen)
+    reservas = [{"documento": str(numero)} for numero in range(1000)]
+    for numero in range(3):
+        reservas.append({"documento": f"nueva{numero}"})
+        escritor.registrar("reservas", "alta", reservas[-1], reservas)
+    with escritor.grupo():
+        escritor.registrar("reservas", "baja", reservas[0], reservas)
+        escritor.registrar("reservas", "baja", reservas[1], reservas)
+    almacen.puede_escribir.set()
+    escritor.vaciar()
+    # Ningún guardado completo: los cambios llegan en orden, de a uno
+    assert almacen.escrituras == [("alta", "reservas", f"nueva{n}") for n in range(3)] + [
+        ("baja", "reservas", "0"), ("baja", "reservas", "1")
+    ]
+
+    # Después de un error, el próximo cambio guarda la colección completa
+    escritor.registrar("reservas", "alta", {"documento": "falla"}, reservas)
+    escritor._cola.join()
+    with pytest.raises(OSError):
+        escritor.revisar()
+    escritor.registrar("reservas", "alta", reservas[-1], reservas)
+    escritor.vaciar()
+    assert almacen.escrituras[-1] == ("guardar", "reservas", len(reservas))
+    escritor.cerrar()
+
+def test_atributos_no_esperan_al_disco():
+    almacen = AlmacenLento()
+    almacen.directorio = "datos"
+    escritor = EscritorDiferido(almacen)
+    escritor.guardar("reservas", [{"documento": "1"}])
+    # Con la escritura trabada, preguntar por atributos no se bloquea
+    assert escritor.directorio == "datos"
+    assert not hasattr(escritor, "particiones")
+    almacen.puede_escribir.set()
+    assert escritor.cargar("reservas") == [{"documento": "1"}]
+    escritor.cerrar()
@@ -0,0 +1,56 @@
+"""
+Tests para las estadísticas incrementales de reservas.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema_turnos.utils.indices import ColeccionIndexada
+from sistema_turnos.logica.estadisticas import EstadisticasReservas, estadisticas_de
+from sistema_turnos.logica.atencion import (
+    marcar_como_atendida, marcar_como_no_asistio, cambiar_monto_cobrado, obtener_estadisticas_reservas
+)
+
+def _reservas():
+    return [
+        {"documento": str(10000000 + i), "nombre": "Cliente", "telefono": "1234567890",
+         "turno": {"fecha_hora": ["2025-07-01", hora], "profesional": profesional, "servicio": "Semi"},
+         "estado": "Pendiente", "montoCobrado": None}
+        for i, (hora, profesional) in enumerate([("09:00", "Marisol"), ("10:30", "Marisol"), ("09:00", "Gisela")])
+    ]
+
+def test_estadisticas_incrementales_coinciden_con_recalculo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    reservas = ColeccionIndexada("reservas", _reservas())
+    inicial = obtener_estadisticas_reservas(reservas)
+    assert inicial["pendientes"] == 3
+    estadisticas = estadisticas_de(reservas)
+    assert estadisticas is not None
+
+    marcar_como_atendida(reservas[0], reservas)
+    cambiar_monto_cobrado(reservas[0], "2500", reservas)
+    marcar_como_no_asistio(reservas[2], reservas)
+    reservas.remove(reservas[1])
+
+    stats = obtener_estadisticas_reservas(reservas)
+    assert stats == EstadisticasReservas(reservas.copy()).resumen()
+    assert stats["atendidas"] == 1 and stats["no_asistieron"] == 1 and stats["pendientes"] == 0
+    assert stats["por_profesional"]["Marisol"] == {"total": 1, "atendidas": 1, "ingresos": 2500.0}
+    assert estadisticas.verificar(reservas)
+
+def test_montos_con_decimales_no_acumulan_errores():
+    reservas = _reservas()
+    estadisticas = EstadisticasReservas(reservas)
+    for reserva in reservas:
+        anterior, reserva["estado"] = reserva["estado"], "Atendida"
+        estadisticas.al_actualizar(reserva, "estado", anterior)
+    # Cambiar el monto muchas veces: en punto flotante 0.1 + 0.2 - 0.1 ... deja restos
+    for monto in [0.1, 0.2, 1234.56, 0.7, 99.99] * 200:
+        for reserva in reservas:
+            anterior, reserva["montoCobrado"] = reserva["montoCobrado"], monto
+            estadisticas.al_actualizar(reserva, "montoCobrado", anterior)
+
+    assert estadisticas.verificar(reservas)
+    assert estadisticas.resumen()["ingresos_totales"] == 299.97
+    assert estadisticas.resumen()["por_profesional"]["Gisela"]["ingresos"] == 99.99
@@ -0,0 +1,78 @@
+"""
+Tests para la lectura y escritura de listas JSON de a un registro (datos/flujo_json.py).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import json
+import tracemalloc
+
+import pytest
+
+from benchmarks.datos_sinteticos import generar_datos
+from sistema_turnos.datos import persistencia
+from sistema_turnos.datos.flujo_json import escribir_registros, leer_registros
+from sistema_turnos.datos.modelos import Turno
+
+REGISTROS = [
+    {"nombre": "Ña, [Ana]", "nota": "dice \"hola\"\ny chau", "turno": {"fecha_hora": ["2025-08-01", "09:00"]}},
+    {"lista": [], "vacio": {}, "monto": 4500.5, "estado": None},
+    {"emoji": "💅", "numero": 12345678901234567890}
+]
+
+@pytest.mark.parametrize("indent", [None, 4])
+def test_escribir_igual_que_json_dump(indent):
+    for registros in (REGISTROS, []):
+        salida = io.StringIO()
+        assert escribir_registros(salida, registros, indent=indent) == len(registros)
+        separadores = (",", ":") if indent is None else None
+        assert salida.getvalue() == json.dumps(registros, ensure_ascii=False, indent=indent, separators=separadores)
+
+@pytest.mark.parametrize("tamanio_bloque", [1, 7, 64 * 1024])
+def test_leer_de_a_un_registro(tamanio_bloque):
+    for texto in (json.dumps(REGISTROS, indent=4, ensure_ascii=False), json.dumps(REGISTROS), "  [ ]  "):
+        leidos = list(leer_registros(io.StringIO(texto), tamanio_bloque))
+        assert leidos == json.loads(texto)
+
+def test_modelos_y_archivo_danado():
+    salida = io.StringIO()
+    escribir_registros(salida, [Turno.desde_dict({"fecha_hora": ["2025-08-01", "09:00"], "profesional": "Gisela", "servicio": "Semi"})])
+    assert list(leer_registros(io.StringIO(salida.getvalue())))[0]["profesional"] == "Gisela"
+
+    registros = leer_registros(io.StringIO('[{"a": 1}, {"b": 2} {"c": 3}]'), 4)
+    assert next(registros) == {"a": 1}
+    with pytest.raises(json.JSONDecodeError):
+        list(registros)
+    with pytest.raises(json.JSONDecodeError):
+        list(leer_registros(io.StringIO('{"no": "es una lista"}')))
+
+def test_recorrer_filtrar_y_exportar_sin_cargar_todo(tmp_path):
+    persistencia.configurar_almacenamiento("json", directorio=str(tmp_path))
+    try:
+        reservas = generar_datos(20000, semilla=5)[1]
+        persistencia.guardar_reservas(reservas)
+        del reservas
+        tamanio = os.path.getsize(tmp_path / "reservas.json")
+
+        tracemalloc.start()
+        try:
+            total = sum(1 for _ in persistencia.recorrer_reservas())
+            exportadas = persistencia.exportar("reservas", str(tmp_path / "atendidas.json"), estado="Atendida")
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert total == 20000
+        # Con json.load el pico sería varias veces el tamaño del archivo
+        assert pico < tamanio / 4
+
+        atendidas = persistencia.consultar("reservas", estado="atendida")
+        assert exportadas == len(atendidas) > 0
+        assert list(leer_registros(str(tmp_path / "atendidas.json"))) == atendidas
+        assert len(list(persistencia.recorrer_reservas(desde="2025-03", hasta="2025-04"))) == sum(
+            1 for r in persistencia.cargar_reservas() if r["turno"]["fecha_hora"][0].startswith("2025-03")
+        )
+    finally:
+        persistencia.configurar_almacenamiento("json")
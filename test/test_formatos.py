@@ -0,0 +1,129 @@
+"""
+Tests para los formatos de archivo (datos/formatos.py) y su uso desde el motor JSON.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import json
+
+import pytest
+
+from benchmarks import ejecutar
+from benchmarks.formatos import comparar_formatos
+from sistema_turnos.datos import formatos, persistencia
+from sistema_turnos.datos.almacen_sqlite import AlmacenSQLite
+from sistema_turnos.datos.archivos import leer_json
+from sistema_turnos.datos.formatos import (
+    archivo_completo, detectar_formato, escribir_datos, formatos_disponibles, leer_datos, recorrer_datos, validar_formato
+)
+from sistema_turnos.datos.modelos import Turno
+from sistema_turnos.datos.persistencia import AlmacenJSON
+
+REGISTROS = [
+    {"nombre": "Ña, [Ana]", "nota": "dice \"hola\"\ny chau 💅", "turno": {"fecha_hora": ["2025-08-01", "09:00"]}},
+    {"lista": [], "vacio": {}, "monto": 4500.0, "propina": 12.75, "estado": None, "activa": True, "baja": False},
+    {"enteros": [0, -1, 127, 128, -300, 2 ** 62, -(2 ** 62)], "anidado": [{"a": [1, {"b": None}]}]},
+    {"nombre": "Ña, [Ana]", "monto": -0.5}
+]
+
+def _escribir(ruta, registros, formato):
+    with open(ruta, "wb") as archivo:
+        escribir_datos(archivo, registros, formato)
+
+@pytest.mark.parametrize("formato", formatos_disponibles())
+def test_ida_y_vuelta_en_cada_formato(tmp_path, formato):
+    ruta = tmp_path / "datos"
+    _escribir(ruta, REGISTROS, formato)
+    leidos = leer_datos(ruta)
+    assert leidos == REGISTROS
+    assert [type(r.get("monto")) for r in leidos] == [type(r.get("monto")) for r in REGISTROS]
+    assert list(recorrer_datos(ruta)) == REGISTROS
+    assert detectar_formato(ruta.read_bytes()) == formato.replace("-compacto", "").replace("orjson", "json")
+
+    _escribir(ruta, [], formato)
+    assert leer_datos(ruta) == [] and list(recorrer_datos(ruta)) == []
+
+def test_modelos_y_formato_json_de_siempre(tmp_path):
+    turno = Turno.desde_dict({"fecha_hora": ["2025-08-01", "09:00"], "profesional": "Gisela", "servicio": "Semi"})
+    for formato in ("json", "binario+gzip"):
+        _escribir(tmp_path / "turnos", [turno], formato)
+        assert leer_datos(tmp_path / "turnos")[0]["profesional"] == "Gisela"
+
+    salida = io.BytesIO()
+    escribir_datos(salida, REGISTROS, "json")
+    assert salida.getvalue().decode("utf-8") == json.dumps(REGISTROS, ensure_ascii=False, indent=4)
+
+def test_formatos_invalidos_y_sin_orjson(tmp_path, monkeypatch):
+    for formato in ("xml", "json+zip", "binario+"):
+        with pytest.raises(ValueError):
+            validar_formato(formato)
+
+    _escribir(tmp_path / "datos", REGISTROS, "json-compacto")
+    monkeypatch.setattr(formatos, "orjson", None)
+    with pytest.raises(ValueError):
+        validar_formato("orjson")
+    assert "orjson" not in formatos_disponibles()
+    assert leer_datos(tmp_path / "datos") == REGISTROS
+    (tmp_path / "datos").write_text('[{"a": 1}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        leer_datos(tmp_path / "datos")
+
+def test_motor_json_cambia_de_formato_sin_convertir(tmp_path):
+    almacen = AlmacenJSON(str(tmp_path), formato="binario+gzip")
+    almacen.guardar("reservas", REGISTROS)
+    assert detectar_formato((tmp_path / "reservas.json").read_bytes()) == "binario+gzip"
+
+    # Otro formato configurado lee lo que hay y escribe en el suyo
+    otro = AlmacenJSON(str(tmp_path), formato="json-compacto+lzma")
+    assert otro.cargar("reservas") == REGISTROS
+    with otro.grupo():
+        otro.guardar("reservas", REGISTROS[:2])
+    assert detectar_formato((tmp_path / "reservas.json").read_bytes()) == "json+lzma"
+    assert list(otro.recorrer("reservas")) == REGISTROS[:2]
+
+    # Un archivo comprimido cortado se recupera del .bak
+    contenido = (tmp_path / "reservas.json").read_bytes()
+    (tmp_path / "reservas.json").write_bytes(contenido[:len(contenido) // 2])
+    assert leer_json(str(tmp_path / "reservas.json")) == REGISTROS
+
+    with pytest.raises(ValueError):
+        AlmacenJSON(str(tmp_path), formato="yaml")
+
+@pytest.mark.parametrize("formato", ["json", "json-compacto+gzip", "json+lzma", "binario"])
+def test_recorrer_un_archivo_cortado_usa_la_ultima_version_buena(tmp_path, formato):
+    almacen = AlmacenJSON(str(tmp_path), formato=formato)
+    almacen.guardar("reservas", REGISTROS)
+    almacen.guardar("reservas", REGISTROS[:2])
+    ruta = tmp_path / "reservas.json"
+    assert archivo_completo(str(ruta))
+    contenido = ruta.read_bytes()
+    ruta.write_bytes(contenido[:len(contenido) - 10])
+
+    assert not archivo_completo(str(ruta)) or formato == "binario"
+    assert list(almacen.recorrer("reservas")) == REGISTROS
+    # El archivo cortado queda apartado para revisarlo
+    assert any(nombre.startswith("reservas.json.danado-") for nombre in os.listdir(tmp_path))
+
+def test_formato_por_variable_de_entorno_e_importacion_sqlite(tmp_path, monkeypatch):
+    monkeypatch.setenv("SISTEMA_TURNOS_FORMATO", "binario")
+    monkeypatch.setattr(persistencia, "_almacen", None)
+    try:
+        assert persistencia.obtener_almacen().formato == "binario"
+    finally:
+        persistencia.configurar_almacenamiento("json")
+
+    _escribir(tmp_path / "reservas.json", REGISTROS[:1], "json-compacto+gzip")
+    almacen = AlmacenSQLite(directorio=str(tmp_path))
+    try:
+        assert [r["nombre"] for r in almacen.cargar("reservas")] == ["Ña, [Ana]"]
+    finally:
+        almacen.cerrar()
+
+def test_benchmark_de_formatos(monkeypatch):
+    monkeypatch.setattr(ejecutar, "TIEMPO_MINIMO", 0)
+    resultados = comparar_formatos(300, ["json", "binario+gzip"], repeticiones=1, informar=lambda linea: None)
+    assert [r["formato"] for r in resultados] == ["json", "binario+gzip"]
+    assert resultados[1]["tamanio_bytes"] < resultados[0]["tamanio_bytes"] / 4
@@ -0,0 +1,148 @@
+"""
+Tests para los índices en memoria de turnos y reservas.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema_turnos.utils.indices import ColeccionIndexada, asignar_campo
+from sistema_turnos.utils.intervalos import IndiceIntervalos
+from sistema_turnos.utils.filtros import (
+    filtrar_turnos, filtrar_reservas_por_dni, filtrar_reservas_por_estado,
+    filtrar_reservas_por_fecha, filtrar_reservas_por_profesional
+)
+from sistema_turnos.logica.reservas import crear_reserva, cancelar_reserva
+
+def _turnos():
+    return [
+        {"fecha_hora": ["2025-07-02", "09:00"], "profesional": "Marisol", "servicio": "Kapping"},
+        {"fecha_hora": ["2025-07-01", "13:30"], "profesional": "Marisol", "servicio": "Semi"},
+        {"fecha_hora": ["2025-07-03", "10:30"], "profesional": "Gisela", "servicio": "Kapping"}
+    ]
+
+def _reservas():
+    return [
+        {"documento": str(10000000 + i), "nombre": "Cliente", "turno": turno,
+         "estado": "Pendiente", "montoCobrado": None}
+        for i, turno in enumerate(_turnos())
+    ]
+
+def test_filtros_indexados_coinciden_con_lineales():
+    turnos = ColeccionIndexada("turnos", _turnos())
+    reservas = ColeccionIndexada("reservas", _reservas())
+
+    lista_turnos, lista_reservas = turnos.copy(), reservas.copy()
+
+    assert filtrar_turnos(turnos, "kapping", "marisol") == filtrar_turnos(lista_turnos, "kapping", "marisol")
+    assert filtrar_turnos(turnos) == lista_turnos
+    assert filtrar_reservas_por_dni(reservas, "10000001") == filtrar_reservas_por_dni(lista_reservas, "10000001")
+    assert filtrar_reservas_por_fecha(reservas, "2025-07-03") == filtrar_reservas_por_fecha(lista_reservas, "2025-07-03")
+    assert filtrar_reservas_por_profesional(reservas, "GISELA") == filtrar_reservas_por_profesional(lista_reservas, "GISELA")
+
+def test_indices_se_mantienen_al_cambiar():
+    reservas = ColeccionIndexada("reservas", _reservas())
+    primera = reservas[0]
+
+    asignar_campo(reservas, primera, "estado", "Atendida")
+    assert filtrar_reservas_por_estado(reservas, "atendida") == [primera]
+    assert len(filtrar_reservas_por_estado(reservas, "pendiente")) == 2
+
+    reservas.remove(primera)
+    assert filtrar_reservas_por_estado(reservas, "atendida") == []
+    assert primera not in reservas
+    assert len(reservas) == 2
+
+def test_buscar_respeta_el_orden_de_la_coleccion():
+    reservas = ColeccionIndexada("reservas", _reservas())
+    # La última vuelve a pendiente después que las demás: su grupo del índice la tiene primero
+    asignar_campo(reservas, reservas[2], "estado", "Atendida")
+    for reserva in reservas:
+        asignar_campo(reservas, reserva, "estado", "Atendida")
+    assert reservas.buscar(estado="atendida") == reservas.copy()
+    assert reservas.buscar(estado="atendida", profesional="marisol") == reservas.copy()[:2]
+
+def test_agregar_una_clave_repetida_reemplaza_al_registro():
+    reservas = ColeccionIndexada("reservas", _reservas())
+    repetida = dict(reservas[0], estado="Atendida")
+    reservas.append(repetida)
+
+    assert len(reservas) == 3 and reservas[2] is repetida
+    assert len(reservas.entre_fechas()) == 3
+    assert reservas.buscar(estado="pendiente") == reservas.copy()[:2]
+    reservas.remove(repetida)
+    # No quedó un intervalo suelto del registro reemplazado
+    assert not reservas.se_superpone(repetida["turno"])
+    assert len(reservas.entre_fechas()) == 2
+
+def test_entre_fechas_ordenado():
+    turnos = ColeccionIndexada("turnos", _turnos())
+    fechas = [t["fecha_hora"][0] for t in turnos.entre_fechas("2025-07-01", "2025-07-02")]
+    assert fechas == ["2025-07-01", "2025-07-02"]
+
+def test_crear_y_cancelar_reserva_con_registro_indexado():
+    reservas = ColeccionIndexada("reservas", _reservas())
+    turno_libre = {"fecha_hora": ["2025-07-04", "09:00"], "profesional": "Valentina", "servicio": "Semi"}
+    turno_ocupado = dict(_turnos()[0])
+
+    assert crear_reserva(turno_libre, "Ana", "1234567890", "10000000", reservas)["exito"] == False
+    assert crear_reserva(turno_ocupado, "Ana", "1234567890", "20000000", reservas)["exito"] == False
+    assert crear_reserva(turno_libre, "Ana", "1234567890", "20000000", reservas)["exito"] == True
+
+    resultado = cancelar_reserva("10000000", turno_ocupado, reservas)
+    assert resultado["exito"] == True
+    assert resultado["reserva"] is reservas[0]
+    assert cancelar_reserva("99999999", turno_ocupado, reservas)["exito"] == False
+
+def test_ids_estables_y_pertenencia_por_id():
+    turnos = ColeccionIndexada("turnos", _turnos())
+    reservas = ColeccionIndexada("reservas", [])
+    ids = [t["id"] for t in turnos]
+    assert len(set(ids)) == 3
+    assert ids == [t["id"] for t in ColeccionIndexada("turnos", _turnos())]
+
+    # Una copia se reconoce por su identidad (fecha, hora, profesional, servicio), no por el ID
+    assert {k: v for k, v in turnos[1].items() if k != "id"} in turnos
+    assert dict(turnos[1], servicio="Otro") not in turnos
+    assert turnos.obtener(ids[1]) is turnos[1]
+
+    reserva = crear_reserva(turnos[1], "Ana", "1234567890", "20000000", reservas)["reserva"]
+    assert "id" in reserva
+
+def test_crear_reserva_rechaza_superposicion():
+    reservas = ColeccionIndexada("reservas", _reservas())
+    # Kapping de Marisol el 2025-07-02 a las 09:00 dura 90 minutos
+    superpuesto = {"fecha_hora": ["2025-07-02", "10:00"], "profesional": "Marisol", "servicio": "Semi"}
+    contiguo = {"fecha_hora": ["2025-07-02", "10:30"], "profesional": "Marisol", "servicio": "Semi"}
+    otra_profesional = {"fecha_hora": ["2025-07-02", "10:00"], "profesional": "Gisela", "servicio": "Semi"}
+
+    assert "superpone" in crear_reserva(superpuesto, "Ana", "1234567890", "20000000", reservas)["error"]
+    assert "superpone" in crear_reserva(superpuesto, "Ana", "1234567890", "20000000", reservas.copy())["error"]
+    assert crear_reserva(contiguo, "Ana", "1234567890", "20000000", reservas)["exito"] == True
+    assert crear_reserva(otra_profesional, "Ana", "1234567890", "20000000", reservas)["exito"] == True
+
+    reservas.remove(reservas[0])
+    assert crear_reserva(superpuesto, "Ana", "1234567890", "20000000", reservas)["exito"] == True
+
+def test_intervalos_superpuestos_de_datos_viejos():
+    indice = IndiceIntervalos()
+    # Reservas viejas superpuestas: una larga y una corta que empieza adentro
+    indice.agregar("marisol", 0, 180, "larga")
+    indice.agregar("marisol", 30, 60, "corta")
+    assert indice.se_superpone("marisol", 100, 120)
+    assert not indice.se_superpone("marisol", 180, 240)
+    indice.quitar("marisol", 0, 180, "larga")
+    assert not indice.se_superpone("marisol", 100, 120)
+    assert indice.se_superpone("marisol", 50, 70)
+
+def test_ids_que_chocan_no_pisan_otro_registro():
+    # Dos reservas distintas con el mismo ID (como si el hash corto chocara)
+    reservas = [dict(reserva, id="abcdef012345") for reserva in _reservas()[:2]]
+    coleccion = ColeccionIndexada("reservas", reservas)
+    assert len(coleccion) == 2 and len(coleccion.entre_fechas()) == 2
+    assert reservas[0]["id"] == "abcdef012345" and reservas[1]["id"] != "abcdef012345"
+    assert [coleccion.obtener(r["id"]) for r in reservas] == reservas
+
+    coleccion.remove(reservas[0])
+    assert coleccion.obtener("abcdef012345") is None
+    assert coleccion.obtener(reservas[1]["id"]) is reservas[1]
@@ -0,0 +1,76 @@
+"""
+Tests para la lista virtual de las pantallas curses (sin terminal real).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import curses
+
+from sistema_turnos.interfaz import lista_virtual
+from sistema_turnos.interfaz.lista_virtual import ListaVirtual
+
+class PantallaFalsa:
+    """
+    Registra las escrituras en lugar de pintarlas.
+    """
+
+    def __init__(self):
+        self.escrituras = []
+
+    def addstr(self, y, x, texto, atributo=0):
+        if texto.strip():
+            self.escrituras.append((y, texto, atributo))
+
+    def noutrefresh(self):
+        pass
+
+def _lista(elementos, monkeypatch, **opciones):
+    monkeypatch.setattr(lista_virtual.curses, "doupdate", lambda: None)
+    formateadas = []
+
+    def formatear(posicion, elemento):
+        formateadas.append(posicion)
+        return f"{posicion}: {elemento}"
+
+    pantalla = PantallaFalsa()
+    lista = ListaVirtual(pantalla, elementos, formatear, 0, 0, 10, 40, atributo_seleccion=1, **opciones)
+    return lista, pantalla, formateadas
+
+def test_solo_formatea_y_pinta_lo_visible(monkeypatch):
+    lista, pantalla, formateadas = _lista(list(range(100000)), monkeypatch)
+    lista.dibujar()
+    assert formateadas == list(range(10))
+    assert len(pantalla.escrituras) == 10
+
+    # Bajar una fila solo repinta la anterior y la nueva selección
+    pantalla.escrituras.clear()
+    lista.manejar_tecla(curses.KEY_DOWN)
+    lista.dibujar()
+    assert [(y, atributo) for y, _, atributo in pantalla.escrituras] == [(0, 0), (1, 1)]
+    assert formateadas == list(range(10))
+
+def test_saltos_de_pagina_y_extremos(monkeypatch):
+    lista, _, formateadas = _lista(list(range(100000)), monkeypatch)
+    lista.manejar_tecla(curses.KEY_NPAGE)
+    assert lista.seleccion == 10
+    lista.manejar_tecla(curses.KEY_END)
+    lista.dibujar()
+    assert lista.seleccion == 99999
+    assert lista.scroll == 99990
+    assert len(formateadas) == 10
+    lista.manejar_tecla(curses.KEY_PPAGE)
+    assert lista.seleccion == 99989
+    lista.manejar_tecla(curses.KEY_HOME)
+    assert (lista.seleccion, lista.scroll) == (0, 0)
+
+def test_salta_filas_no_seleccionables(monkeypatch):
+    filas = ["encabezado", "a", "b", "", "encabezado", "c"]
+    lista, _, _ = _lista(filas, monkeypatch, seleccionable=lambda fila: fila in ("a", "b", "c"))
+    assert lista.elemento_seleccionado() == "a"
+    lista.manejar_tecla(curses.KEY_DOWN)
+    lista.manejar_tecla(curses.KEY_DOWN)
+    assert lista.elemento_seleccionado() == "c"
+    lista.manejar_tecla(curses.KEY_HOME)
+    assert lista.elemento_seleccionado() == "a"
@@ -0,0 +1,117 @@
+"""
+Tests para las operaciones por lotes (lote.py y sistema_turnos/lotes.py).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+
+import pytest
+
+import lote
+from sistema_turnos.datos import persistencia
+from sistema_turnos.lotes import leer_filas, procesar_lote
+from sistema_turnos.servicio import ServicioTurnos
+
+TURNOS = [
+    {"fecha_hora": ["2025-08-01", hora], "profesional": "Gisela", "servicio": "Semi"}
+    for hora in ("09:00", "10:30", "12:00", "13:30")
+]
+
+@pytest.fixture(params=["json", "sqlite"])
+def directorio(request, tmp_path):
+    persistencia.configurar_almacenamiento(request.param, directorio=str(tmp_path))
+    persistencia.guardar_turnos(TURNOS)
+    persistencia.guardar_reservas([])
+    try:
+        yield tmp_path
+    finally:
+        persistencia.configurar_almacenamiento("json")
+
+def _fila(hora, documento, profesional="Gisela"):
+    return {
+        "fecha": "2025-08-01", "hora": hora, "profesional": profesional, "servicio": "Semi",
+        "nombre": "Ana", "telefono": "1234567890", "documento": documento
+    }
+
+def test_reservar_lote_guarda_una_vez(directorio, monkeypatch):
+    escrituras = []
+    original = persistencia.escribir_atomicos
+    monkeypatch.setattr(persistencia, "escribir_atomicos", lambda tareas, **opciones: escrituras.append(
+        sorted(os.path.basename(ruta) for ruta, _ in tareas)) or original(tareas, **opciones))
+
+    filas = [
+        _fila("09:00", "30111222"),
+        _fila("10:30", "30111333", profesional="gisela"),
+        _fila("10:30", "30111444"),            # turno ya tomado en este mismo lote
+        _fila("20:00", "30111555"),            # turno que no se ofrece
+        {"fecha": "2025-08-01", "hora": "12:00"}
+    ]
+    resumen = procesar_lote(ServicioTurnos(), "reservar", filas)
+
+    assert (resumen["total"], resumen["aplicadas"], resumen["fallidas"]) == (5, 2, 3)
+    assert [r["exito"] for r in resumen["resultados"]] == [True, True, False, False, False]
+    assert "Faltan campos" in resumen["resultados"][4]["error"]
+    if isinstance(persistencia.obtener_almacen(), persistencia.AlmacenJSON):
+        # Una sola escritura al final, con las dos colecciones
+        assert escrituras == [["reservas.json", "turnos.json"]]
+
+    reservas = persistencia.cargar_reservas()
+    assert sorted(r["documento"] for r in reservas) == ["30111222", "30111333"]
+    # Se usa el turno tal como se ofrece, aunque el lote traiga otra capitalización
+    assert all(r["turno"]["profesional"] == "Gisela" for r in reservas)
+    assert len(persistencia.cargar_turnos()) == 2
+
+def test_atender_y_cancelar_lote(directorio):
+    servicio = ServicioTurnos()
+    procesar_lote(servicio, "reservar", [_fila("09:00", "30111222"), _fila("10:30", "30111333"), _fila("12:00", "30111444")])
+    identificador = servicio.reservas_de("30111333")[0]["id"]
+
+    resumen = procesar_lote(servicio, "atender", [
+        {"documento": "30111222", "monto": "4500"},
+        {"id": identificador},
+        {"documento": "30111444", "monto": "-1"},
+        {"documento": "99999999"}
+    ])
+    assert [r["exito"] for r in resumen["resultados"]] == [True, True, False, False]
+
+    resumen = procesar_lote(servicio, "cancelar", [
+        {"documento": "30111444", "fecha": "2025-08-01", "hora": "12:00", "profesional": "Gisela", "servicio": "Semi"}
+    ])
+    assert resumen["aplicadas"] == 1
+
+    guardadas = {r["documento"]: r for r in persistencia.cargar_reservas()}
+    assert guardadas["30111222"]["estado"] == "Atendida" and guardadas["30111222"]["montoCobrado"] == 4500
+    assert guardadas["30111333"]["estado"] == "Atendida"
+    assert "30111444" not in guardadas
+    assert len(persistencia.cargar_turnos()) == 2
+
+def test_leer_filas_csv_y_json(tmp_path):
+    ruta_csv = tmp_path / "lote.csv"
+    ruta_csv.write_text("documento,monto\n30111222,4500\n30111333,\n", encoding="utf-8")
+    assert leer_filas(str(ruta_csv)) == [{"documento": "30111222", "monto": "4500"}, {"documento": "30111333"}]
+
+    ruta_json = tmp_path / "lote.json"
+    ruta_json.write_text(json.dumps([{"id": "abc"}]), encoding="utf-8")
+    assert leer_filas(str(ruta_json)) == [{"id": "abc"}]
+
+    ruta_json.write_text(json.dumps({"id": "abc"}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        leer_filas(str(ruta_json))
+    with pytest.raises(ValueError):
+        leer_filas(str(tmp_path / "lote.txt"))
+
+def test_linea_de_comandos(directorio, capsys):
+    ruta = directorio / "reservas_lote.csv"
+    ruta.write_text(
+        "fecha,hora,profesional,servicio,nombre,telefono,documento\n"
+        "2025-08-01,09:00,Gisela,Semi,Ana,1234567890,30111222\n"
+        "2025-08-01,09:00,Gisela,Semi,Eva,1234567890,30111333\n",
+        encoding="utf-8"
+    )
+    salida = directorio / "resultado.json"
+    assert lote.main(["reservar", str(ruta), "--salida", str(salida)]) == 1
+    assert "reservar: 1 de 2 filas aplicadas" in capsys.readouterr().out
+    assert json.loads(salida.read_text(encoding="utf-8"))["fallidas"] == 1
@@ -0,0 +1,56 @@
+"""
+Tests para los modelos compactos Turno y Reserva.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from sistema_turnos.datos.modelos import Turno, Reserva
+from sistema_turnos.datos import persistencia
+
+RESERVA_JSON = {
+    "nombre": "Ana",
+    "telefono": "1234567890",
+    "documento": "12345678",
+    "turno": {"fecha_hora": ["2025-07-10", "13:30"], "profesional": "Gisela", "servicio": "Semi"},
+    "estado": "Pendiente",
+    "montoCobrado": None
+}
+
+def test_turno_ida_y_vuelta_json():
+    turno = Turno.desde_dict(RESERVA_JSON["turno"])
+    assert turno.momento == 202507101330
+    assert turno["fecha_hora"] == ["2025-07-10", "13:30"] == RESERVA_JSON["turno"]["fecha_hora"]
+    assert turno.a_dict() == RESERVA_JSON["turno"]
+    assert not hasattr(turno, "__dict__")
+
+def test_reserva_acceso_estilo_diccionario():
+    reserva = Reserva.desde_dict(RESERVA_JSON)
+    assert reserva["turno"]["profesional"] == "Gisela"
+    reserva["montoCobrado"] = 1500.0
+    assert reserva.monto_cobrado == 1500.0
+    assert reserva.get("estado", "Pendiente") == "Pendiente"
+    assert reserva.a_dict()["montoCobrado"] == 1500.0
+
+def test_ordenar_turnos_por_momento():
+    tardes = Turno(202507101330, "Gisela", "Semi")
+    mananas = Turno(202507100900, "Marisol", "Semi")
+    assert sorted([tardes, mananas]) == [mananas, tardes]
+    assert Turno(202507101330, "Gisela", "Semi") == tardes
+    with pytest.raises(TypeError):
+        sorted([tardes, RESERVA_JSON["turno"]])
+    with pytest.raises(TypeError):
+        Reserva.desde_dict(RESERVA_JSON) < RESERVA_JSON
+
+def test_guardar_y_cargar_modelos(tmp_path):
+    try:
+        persistencia.configurar_almacenamiento("json", directorio=str(tmp_path))
+        persistencia.guardar_reservas([Reserva.desde_dict(RESERVA_JSON)])
+        assert persistencia.cargar_reservas() == [RESERVA_JSON]
+        cargadas = persistencia.cargar_reservas(como_modelos=True)
+        assert cargadas == [Reserva.desde_dict(RESERVA_JSON)]
+    finally:
+        persistencia.configurar_almacenamiento("json")
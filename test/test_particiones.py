@@ -0,0 +1,146 @@
+"""
+Tests para el almacenamiento particionado por mes (datos/particiones.py).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+from datetime import date
+
+import pytest
+
+from sistema_turnos.datos import particiones, persistencia
+from sistema_turnos.datos.particiones import AlmacenParticionado
+from sistema_turnos.servicio import ServicioTurnos
+
+def _reserva(fecha, documento, estado="Pendiente", monto=None):
+    return {
+        "nombre": "Ana", "telefono": "1234567890", "documento": documento,
+        "turno": {"fecha_hora": [fecha, "10:00"], "profesional": "Gisela", "servicio": "Semi"},
+        "estado": estado, "montoCobrado": monto
+    }
+
+RESERVAS = [
+    _reserva("2024-11-05", "30000001", "Atendida", 4000),
+    _reserva("2024-12-10", "30000002", "Atendida", 5000),
+    _reserva("2025-01-15", "30000003"),
+    _reserva("2025-01-20", "30000004"),
+    _reserva("2025-02-03", "30000005")
+]
+
+@pytest.fixture
+def lecturas(monkeypatch):
+    leidos = []
+    original = particiones.leer_json
+    monkeypatch.setattr(particiones, "leer_json", lambda ruta, **opciones: leidos.append(os.path.basename(ruta)) or original(ruta, **opciones))
+    return leidos
+
+def _meses_leidos(leidos):
+    return sorted(nombre for nombre in leidos if not nombre.endswith(".particiones.json"))
+
+def test_un_archivo_por_mes_y_carga_por_rango(tmp_path, lecturas):
+    almacen = AlmacenParticionado(directorio=str(tmp_path))
+    almacen.guardar("reservas", RESERVAS)
+    assert almacen.particiones("reservas") == ["2024-11", "2024-12", "2025-01", "2025-02"]
+    assert len(json.loads((tmp_path / "reservas-2025-01.json").read_text(encoding="utf-8"))) == 2
+
+    lecturas.clear()
+    recientes = almacen.cargar("reservas", desde="2025-01")
+    assert [r["documento"] for r in recientes] == ["30000003", "30000004", "30000005"]
+    assert _meses_leidos(lecturas) == ["reservas-2025-01.json", "reservas-2025-02.json"]
+
+    lecturas.clear()
+    assert len(almacen.buscar("reservas", fecha="2024-12-10")) == 1
+    assert _meses_leidos(lecturas) == ["reservas-2024-12.json"]
+
+def test_cambios_y_guardado_no_tocan_los_meses_frios(tmp_path):
+    almacen = AlmacenParticionado(directorio=str(tmp_path))
+    almacen.guardar("reservas", RESERVAS)
+    viejo = (tmp_path / "reservas-2024-11.json").stat().st_mtime_ns
+
+    recientes = almacen.cargar("reservas", desde="2025-01")
+    recientes[0]["estado"] = "Atendida"
+    almacen.registrar("reservas", "modificacion", recientes[0], recientes)
+    nueva = _reserva("2025-03-01", "30000006")
+    with almacen.grupo():
+        almacen.registrar("reservas", "alta", nueva, recientes + [nueva])
+        almacen.registrar("reservas", "baja", recientes[2], recientes[:2] + [nueva])
+    # Un guardado completo de lo que hay en memoria no borra la historia
+    almacen.guardar("reservas", recientes[:2] + [nueva])
+
+    assert (tmp_path / "reservas-2024-11.json").stat().st_mtime_ns == viejo
+    todas = AlmacenParticionado(directorio=str(tmp_path)).cargar("reservas")
+    assert [(r["documento"], r["estado"]) for r in todas] == [
+        ("30000001", "Atendida"), ("30000002", "Atendida"),
+        ("30000003", "Atendida"), ("30000004", "Pendiente"), ("30000006", "Pendiente")
+    ]
+
+def test_importa_json_existente(tmp_path):
+    (tmp_path / "reservas.json").write_text(json.dumps(RESERVAS), encoding="utf-8")
+    almacen = AlmacenParticionado(directorio=str(tmp_path))
+    assert len(almacen.particiones("reservas")) == 4
+    assert sorted(r["documento"] for r in almacen.cargar("reservas")) == sorted(r["documento"] for r in RESERVAS)
+
+def test_servicio_carga_solo_lo_reciente(tmp_path):
+    persistencia.configurar_almacenamiento("particionado", directorio=str(tmp_path))
+    try:
+        hoy = date.today()
+        anterior = persistencia.primer_mes_reciente(hoy)
+        assert anterior < hoy.isoformat()[:7]
+        reservas = [
+            _reserva("2020-05-04", "30000001", "Atendida", 4000),
+            _reserva(f"{anterior}-10", "30000002", "Atendida", 5000),
+            _reserva(hoy.isoformat(), "30000003")
+        ]
+        persistencia.guardar_reservas(reservas)
+
+        servicio = ServicioTurnos()
+        assert servicio.desde == persistencia.primer_mes_reciente()
+        assert sorted(r["documento"] for r in servicio.listar_reservas()) == ["30000002", "30000003"]
+        assert [r["documento"] for r in servicio.reservas_pendientes()] == ["30000003"]
+        assert servicio.estadisticas()["desde"] == servicio.desde
+        # El DNI de una reserva vieja (fuera de memoria) tampoco puede volver a reservar
+        turno = {"fecha_hora": [hoy.isoformat(), "16:00"], "profesional": "Gisela", "servicio": "Semi"}
+        servicio.turnos.append(turno)
+        resultado = servicio.reservar(turno, "Ana", "1234567890", "30000001")
+        assert resultado == {"exito": False, "error": "Ya hay un turno reservado con este DNI."}
+        # El reporte incluye la historia que no está en memoria
+        assert sum(fila["ingresos"] for fila in servicio.reporte("mes", "profesional")) == 9000
+
+        servicio.marcar_como_atendida(servicio.reservas_de("30000003")[0])
+        assert [r["estado"] for r in persistencia.cargar_reservas()] == ["Atendida"] * 3
+    finally:
+        persistencia.configurar_almacenamiento("json")
+
+def test_indice_de_documentos_de_la_historia(tmp_path, lecturas):
+    almacen = AlmacenParticionado(directorio=str(tmp_path))
+    almacen.guardar("reservas", RESERVAS)
+    assert almacen.meses_de_documento("30000002", "2025-02") == ["2024-12"]
+    assert almacen.meses_de_documento("30000005", "2025-02") == []
+
+    # Con el índice armado, buscar un DNI no lee ningún mes
+    lecturas.clear()
+    assert AlmacenParticionado(directorio=str(tmp_path)).meses_de_documento("30000001", "2025-02") == ["2024-11"]
+    assert _meses_leidos(lecturas) == []
+
+    # Un cambio en un mes de la historia actualiza el índice en la misma escritura
+    almacen.registrar("reservas", "baja", RESERVAS[0], None)
+    almacen.registrar("reservas", "alta", _reserva("2024-11-20", "30000009"), None)
+    assert almacen.meses_de_documento("30000001", "2025-02") == []
+    assert almacen.meses_de_documento("30000009", "2025-02") == ["2024-11"]
+    # Al avanzar el límite solo se leen los meses nuevos
+    lecturas.clear()
+    assert almacen.meses_de_documento("30000004", "2025-03") == ["2025-01"]
+    assert _meses_leidos(lecturas) == ["reservas-2025-02.json"]
+
+def test_otros_motores_filtran_por_mes(tmp_path):
+    persistencia.configurar_almacenamiento("json", directorio=str(tmp_path))
+    try:
+        persistencia.guardar_reservas(RESERVAS)
+        assert persistencia.primer_mes_reciente() is None
+        assert len(persistencia.cargar_reservas(desde="2025-01")) == 3
+        assert len(persistencia.cargar_reservas(hasta="2025-01")) == 2
+    finally:
+        persistencia.configurar_almacenamiento("json")
@@ -0,0 +1,107 @@
+"""
+Tests para la recuperación a un momento dado (datos/recuperacion.py).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from sistema_turnos.datos import persistencia
+from sistema_turnos.datos import recuperacion
+from sistema_turnos.datos.recuperacion import RegistroCambios, backup_anterior
+from sistema_turnos.servicio import ServicioTurnos
+
+TURNOS = [
+    {"fecha_hora": ["2025-08-01", hora], "profesional": "Gisela", "servicio": "Semi"}
+    for hora in ("09:00", "10:30", "12:00", "13:30", "15:00")
+]
+
+@pytest.fixture(params=["json", "bitacora", "particionado"])
+def servicio(request, tmp_path):
+    persistencia.configurar_almacenamiento(request.param, directorio=str(tmp_path))
+    persistencia.guardar_turnos(TURNOS)
+    persistencia.guardar_reservas([])
+    persistencia.activar_registro_de_cambios()
+    try:
+        yield ServicioTurnos()
+    finally:
+        persistencia.configurar_almacenamiento("json")
+
+def _estados():
+    return sorted((r["documento"], r["estado"], r.get("montoCobrado")) for r in persistencia.cargar_reservas())
+
+def test_backup_anterior_por_bisect():
+    identificadores = ["20250801_100000_000000", "20250801_120000_000000", "20250802_090000_000000"]
+    assert backup_anterior(identificadores, datetime(2025, 8, 1, 9)) is None
+    assert backup_anterior(identificadores, datetime(2025, 8, 1, 12)) == identificadores[1]
+    assert backup_anterior(identificadores, datetime(2025, 8, 1, 23)) == identificadores[1]
+    assert backup_anterior(identificadores, datetime(2025, 9, 1)) == identificadores[2]
+
+def test_registro_de_cambios_compartido_entre_terminales(tmp_path):
+    turno = TURNOS[0]
+    primera, segunda = RegistroCambios(str(tmp_path)), RegistroCambios(str(tmp_path))
+    try:
+        primera.anotar("turnos", "baja", turno)
+        # Un backup hecho desde la segunda terminal empieza el segmento para las dos
+        segunda.rotar("20990101_000000_000000")
+        primera.anotar("turnos", "alta", turno)
+        segunda.anotar("turnos", "baja", turno)
+        cambios = list(primera.leer("20990101_000000_000000", datetime.now()))
+        assert [cambio["op"] for cambio in cambios] == ["alta", "baja"]
+
+        primera.borrar_anteriores("20990101_000000_000000")
+        assert primera.segmentos() == ["20990101_000000_000000"]
+    finally:
+        primera.cerrar()
+        segunda.cerrar()
+
+def test_volver_a_antes_de_un_cierre_equivocado(servicio):
+    for numero, turno in enumerate(list(servicio.turnos)[:3]):
+        assert servicio.reservar(turno, "Ana", "1234567890", str(30111220 + numero))["exito"]
+    antes_del_cierre = datetime.now()
+    esperado = _estados()
+
+    # Cierre del día equivocado, con un backup en el medio
+    with servicio.transaccion():
+        for reserva in servicio.listar_reservas():
+            servicio.marcar_como_no_asistio(reserva)
+    persistencia.crear_backup()
+    servicio.cancelar("30111220", servicio.reservas_de("30111220")[0]["turno"])
+    despues = _estados()
+
+    simulacion = persistencia.restaurar_a_momento(antes_del_cierre)
+    assert simulacion["aplicado"] is False
+    diferencia = simulacion["diferencias"]["reservas"]
+    assert len(diferencia["altas"]) == 1 and len(diferencia["modificadas"]) == 2
+    assert len(simulacion["diferencias"]["turnos"]["bajas"]) == 1
+    # La simulación no cambia nada
+    assert _estados() == despues
+
+    resultado = persistencia.restaurar_a_momento(antes_del_cierre, simular=False)
+    assert resultado["cambios_reaplicados"] > 0
+    assert _estados() == esperado
+    assert len(persistencia.cargar_turnos()) == 2
+
+    # También se puede volver al estado de después (la restauración quedó registrada)
+    persistencia.restaurar_a_momento(datetime.now() - timedelta(microseconds=1), simular=False)
+    assert _estados() == esperado
+
+def test_sin_backups_anteriores(servicio):
+    with pytest.raises(ValueError):
+        persistencia.restaurar_a_momento(datetime(2000, 1, 1))
+
+def test_linea_de_comandos(servicio, capsys):
+    turno = list(servicio.turnos)[0]
+    servicio.reservar(turno, "Ana", "1234567890", "30111222")
+    momento = datetime.now()
+    servicio.marcar_como_atendida(servicio.reservas_de("30111222")[0])
+
+    assert recuperacion.main(["--momento", momento.isoformat(sep=" ")]) == 0
+    salida = capsys.readouterr().out
+    assert "reservas: 0 altas, 0 bajas, 1 modificadas" in salida
+    assert "Simulación" in salida
+    assert _estados()[0][1] == "Atendida"
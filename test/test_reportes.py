@@ -0,0 +1,63 @@
+"""
+Tests para los reportes por período.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import date
+
+from sistema_turnos.logica.reportes import generar_reporte, clave_periodo, etiqueta_periodo, fin_periodo, ColumnasReservas
+from sistema_turnos.utils.intervalos import duracion_servicio
+
+def _reserva(fecha, hora, profesional, servicio, estado="Pendiente", monto=None):
+    return {
+        "nombre": "Ana", "telefono": "1234567890", "documento": "12345678",
+        "turno": {"fecha_hora": [fecha, hora], "profesional": profesional, "servicio": servicio},
+        "estado": estado, "montoCobrado": monto
+    }
+
+RESERVAS = [
+    _reserva("2025-07-07", "09:00", "Gisela", "Semi", "Atendida", 1000.0),
+    _reserva("2025-07-08", "09:00", "Gisela", "Kapping", "No asistió"),
+    _reserva("2025-07-09", "10:30", "Marisol", "Semi", "Atendida", 1500.0),
+    _reserva("2025-08-01", "09:00", "Gisela", "Semi", "Pendiente")
+]
+
+def test_periodos():
+    lunes = clave_periodo(date(2025, 7, 10).toordinal(), "semana")
+    assert etiqueta_periodo(lunes, "dia") == "2025-07-07"
+    assert etiqueta_periodo(lunes, "semana") == "2025-W28"
+    assert etiqueta_periodo(clave_periodo(lunes, "mes"), "dia") == "2025-07-01"
+    assert etiqueta_periodo(fin_periodo(lunes, "semana"), "dia") == "2025-07-13"
+    assert etiqueta_periodo(fin_periodo(date(2025, 12, 3).toordinal(), "mes"), "dia") == "2025-12-31"
+
+def test_reporte_mensual_por_profesional():
+    filas = generar_reporte(RESERVAS, "mes", "profesional")
+    por_clave = {(f["periodo"], f["grupo"]): f for f in filas}
+    assert list(por_clave) == [("2025-07", "Gisela"), ("2025-07", "Marisol"), ("2025-08", "Gisela")]
+
+    gisela = por_clave[("2025-07", "Gisela")]
+    assert gisela["reservas"] == 2
+    assert gisela["atendidas"] == 1
+    assert gisela["no_asistieron"] == 1
+    assert gisela["ingresos"] == 1000.0
+    assert gisela["tasa_ausencia"] == 0.5
+    assert 0 < gisela["utilizacion"] < 1
+
+    # Una sola reserva el 1 de agosto: se divide por todo el mes de trabajo (21 días hábiles de 6 horas)
+    agosto = por_clave[("2025-08", "Gisela")]
+    assert agosto["utilizacion"] == duracion_servicio("Semi") / (21 * 360)
+
+def test_reporte_por_servicio_sin_numpy_coincide():
+    columnas = ColumnasReservas(RESERVAS)
+    sin_numpy = generar_reporte(columnas, "semana", "servicio", usar_numpy=False)
+    assert generar_reporte(columnas, "semana", "servicio") == sin_numpy
+    semi = [f for f in sin_numpy if f["periodo"] == "2025-W28" and f["grupo"] == "Semi"][0]
+    assert semi["reservas"] == 2
+    assert semi["ingresos"] == 2500.0
+    assert semi["tasa_ausencia"] == 0.0
+
+def test_reporte_vacio():
+    assert generar_reporte([]) == []
@@ -0,0 +1,150 @@
+"""
+Tests para los backups incrementales (datos/respaldos.py y persistencia.crear_backup).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.datos_sinteticos import generar_datos
+from sistema_turnos.datos import persistencia
+from sistema_turnos.datos.respaldos import RepositorioRespaldos, fragmentar, politica_de_retencion
+
+@pytest.fixture(params=["json", "bitacora", "sqlite"])
+def datos(request, tmp_path):
+    persistencia.configurar_almacenamiento(request.param, directorio=str(tmp_path))
+    turnos, reservas = generar_datos(3000, 500, semilla=7)
+    persistencia.guardar_turnos(turnos)
+    persistencia.guardar_reservas(reservas)
+    try:
+        yield tmp_path, reservas
+    finally:
+        persistencia.configurar_almacenamiento("json")
+
+def test_fragmentar_corta_por_contenido():
+    contenido = b"".join(f'    "documento": "{numero}",\n'.encode() for numero in range(20000))
+    fragmentos = list(fragmentar(io.BytesIO(contenido)))
+    assert b"".join(fragmentos) == contenido
+    assert len(fragmentos) > 1
+
+    # Insertar una línea al principio solo cambia el primer fragmento
+    modificado = list(fragmentar(io.BytesIO(b'    "nuevo": 1,\n' + contenido)))
+    assert len(set(modificado) - set(fragmentos)) == 1
+
+def test_backup_incremental_y_restauracion(datos):
+    directorio, reservas = datos
+    primero = persistencia.crear_backup()
+    repositorio = RepositorioRespaldos(os.path.join(directorio, "backups"))
+    manifiesto = repositorio.manifiesto(primero)
+    assert manifiesto["fragmentos_nuevos"] > 0
+
+    # Un backup sin cambios no agrega nada
+    assert repositorio.manifiesto(persistencia.crear_backup())["fragmentos_nuevos"] == 0
+
+    # Un cambio chico agrega pocos fragmentos
+    indice = next(i for i, reserva in enumerate(reservas) if reserva["estado"] == "Pendiente")
+    reservas[indice]["estado"] = "Atendida"
+    persistencia.registrar_cambio("reservas", "modificacion", reservas[indice], reservas)
+    segundo = persistencia.crear_backup()
+    nuevos = repositorio.manifiesto(segundo)["fragmentos_nuevos"]
+    assert 0 < nuevos <= 3
+
+    # Perder datos y volver al primer backup
+    persistencia.guardar_reservas(reservas[:5])
+    persistencia.restaurar_backup(primero)
+    restauradas = persistencia.cargar_reservas()
+    assert len(restauradas) == len(reservas)
+    assert restauradas[indice]["estado"] == "Pendiente"
+
+    persistencia.restaurar_backup(segundo)
+    assert persistencia.cargar_reservas()[indice]["estado"] == "Atendida"
+
+def test_backup_en_segundo_plano_espera_el_grupo_de_escrituras(datos):
+    directorio, reservas = datos
+    reservas[0]["estado"] = "Cancelada"
+    with persistencia.grupo_de_escrituras():
+        persistencia.registrar_cambio("reservas", "modificacion", reservas[0], reservas)
+        hilo = persistencia.crear_backup(segundo_plano=True)
+        # El backup no copia los datos a mitad del grupo
+        hilo.join(0.3)
+        assert hilo.is_alive()
+        reservas[1]["estado"] = "Cancelada"
+        persistencia.registrar_cambio("reservas", "modificacion", reservas[1], reservas)
+    hilo.join(10)
+
+    identificador = persistencia.listar_backups()[-1]
+    reservas[2]["estado"] = "Cancelada"
+    persistencia.registrar_cambio("reservas", "modificacion", reservas[2], reservas)
+    persistencia.restaurar_backup(identificador)
+    estados = [reserva["estado"] for reserva in persistencia.cargar_reservas()[:3]]
+    assert estados[:2] == ["Cancelada", "Cancelada"] and estados[2] != "Cancelada"
+
+def test_compresion_lzma_y_backup_en_segundo_plano(tmp_path):
+    persistencia.configurar_almacenamiento("json", directorio=str(tmp_path))
+    try:
+        persistencia.guardar_reservas(generar_datos(500, semilla=3)[1])
+        hilo = persistencia.crear_backup(compresion="lzma", segundo_plano=True)
+        hilo.join(10)
+        identificadores = persistencia.listar_backups()
+        assert len(identificadores) == 1
+        fragmentos = [
+            nombre
+            for _, _, nombres in os.walk(tmp_path / "backups" / "fragmentos")
+            for nombre in nombres
+        ]
+        assert fragmentos and all(nombre.endswith(".xz") for nombre in fragmentos)
+        tamanio = sum(
+            os.path.getsize(os.path.join(raiz, nombre))
+            for raiz, _, nombres in os.walk(tmp_path / "backups" / "fragmentos")
+            for nombre in nombres
+        )
+        assert tamanio < os.path.getsize(tmp_path / "reservas.json") / 4
+    finally:
+        persistencia.configurar_almacenamiento("json")
+
+def test_retencion_espera_a_otra_terminal(tmp_path):
+    origen = tmp_path / "datos.json"
+    origen.write_bytes(os.urandom(40_000))
+    terminal = RepositorioRespaldos(str(tmp_path / "backups"))
+    otra = RepositorioRespaldos(str(tmp_path / "backups"))
+    with terminal.bloqueo:
+        hilo = threading.Thread(target=otra.aplicar_retencion, kwargs={"ultimos": 0, "diarios": 0, "semanales": 0})
+        hilo.start()
+        hilo.join(0.3)
+        # La poda de la otra terminal no corre mientras esta guarda fragmentos
+        assert hilo.is_alive()
+        terminal.crear([str(origen)])
+    hilo.join(10)
+    assert terminal.listar() == []
+
+def test_politica_de_retencion():
+    ahora = datetime(2025, 8, 1, 20, 0)
+    # Un backup por hora durante 30 días
+    momentos = [ahora - timedelta(hours=horas) for horas in range(30 * 24)]
+    conservar = politica_de_retencion(momentos, ultimos=5, diarios=7, semanales=4)
+    assert set(momentos[:5]) <= conservar
+    assert len({momento.date() for momento in conservar}) >= 7
+    assert len(conservar) <= 5 + 7 + 4
+
+def test_retencion_borra_backups_y_fragmentos(tmp_path):
+    origen = tmp_path / "datos.json"
+    repositorio = RepositorioRespaldos(str(tmp_path / "backups"))
+    for numero in range(6):
+        origen.write_bytes(os.urandom(40_000))
+        repositorio.crear([str(origen)])
+    borrados, fragmentos = repositorio.aplicar_retencion(ultimos=2, diarios=0, semanales=0)
+    assert len(borrados) == 4 and fragmentos > 0
+    restantes = repositorio.listar()
+    assert len(restantes) == 2
+
+    # Los backups que quedan se siguen pudiendo restaurar
+    destino = tmp_path / "restaurado"
+    destino.mkdir()
+    repositorio.restaurar(restantes[-1], str(destino))
+    assert (destino / "datos.json").read_bytes() == origen.read_bytes()
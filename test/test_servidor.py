@@ -0,0 +1,156 @@
+"""
+Tests para el servidor de reservas y su adaptador para las terminales.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from sistema_turnos.datos import persistencia
+from sistema_turnos.datos.persistencia import AlmacenJSON
+from sistema_turnos.servicio import ServicioTurnos
+from sistema_turnos.servidor import ErrorServidor, ServicioRemoto, ServidorTurnos
+
+TURNOS = [
+    {"fecha_hora": [f"2025-08-{dia:02d}", "09:00"], "profesional": "Gisela", "servicio": "Semi", "duracion": 60}
+    for dia in range(1, 11)
+]
+
+def _iniciar(servicio):
+    """
+    Levanta el servidor en un hilo con su propio bucle de eventos, en un puerto libre.
+    """
+    servidor = ServidorTurnos(servicio)
+    bucle = asyncio.new_event_loop()
+    direccion = bucle.run_until_complete(servidor.iniciar("127.0.0.1:0"))
+    hilo = threading.Thread(target=bucle.run_forever, daemon=True)
+    hilo.start()
+
+    def detener():
+        asyncio.run_coroutine_threadsafe(servidor.detener(), bucle).result(5)
+        bucle.call_soon_threadsafe(bucle.stop)
+        hilo.join(5)
+        bucle.close()
+    return direccion, detener
+
+@pytest.fixture
+def remoto(tmp_path):
+    persistencia.configurar_almacenamiento("json", diferido=True, directorio=str(tmp_path))
+    direccion, detener = _iniciar(ServicioTurnos(list(TURNOS), []))
+    cliente = ServicioRemoto(direccion)
+    try:
+        yield cliente
+    finally:
+        cliente.cerrar()
+        detener()
+        persistencia.configurar_almacenamiento("json")
+
+def test_reservar_cancelar_y_atender_por_el_servidor(remoto, tmp_path):
+    turno = remoto.turnos_disponibles()[0]
+    resultado = remoto.reservar(turno=turno, nombre="Ana", telefono="1234567890", documento="30111222")
+    assert resultado["exito"]
+    assert len(remoto.turnos_disponibles()) == len(TURNOS) - 1
+
+    # El mismo turno no se puede reservar dos veces
+    repetido = remoto.reservar(turno=turno, nombre="Eva", telefono="1234567890", documento="30111333")
+    assert not repetido["exito"]
+
+    reserva = remoto.reservas_de(documento="30111222")[0]
+    assert remoto.marcar_como_atendida(reserva=reserva)["exito"]
+    assert remoto.cambiar_monto_cobrado(reserva=reserva, monto=5000)["exito"]
+    assert remoto.filtrar_reservas_por_estado(estado="Atendida")[0]["montoCobrado"] == 5000
+
+    otro = remoto.turnos_disponibles()[0]
+    assert remoto.reservar(turno=otro, nombre="Eva", telefono="1234567890", documento="30111333")["exito"]
+    assert remoto.cancelar(documento="30111333", turno=otro)["exito"]
+    assert remoto.reservas_de(documento="30111333") == []
+
+    # Lo hecho en el servidor queda guardado
+    persistencia.vaciar_escrituras()
+    guardadas = AlmacenJSON(str(tmp_path)).cargar("reservas")
+    assert [r["documento"] for r in guardadas] == ["30111222"]
+
+def test_varias_terminales_no_reservan_el_mismo_turno(remoto):
+    direccion = remoto.direccion
+    exitos = []
+
+    def terminal(numero):
+        cliente = ServicioRemoto(direccion)
+        for indice, turno in enumerate(TURNOS):
+            # Un DNI por intento: solo se admite una reserva por DNI
+            documento = f"30{numero}{indice:05d}"
+            if cliente.reservar(turno=turno, nombre="Ana", telefono="1234567890", documento=documento)["exito"]:
+                exitos.append(turno["fecha_hora"][0])
+        cliente.cerrar()
+
+    hilos = [threading.Thread(target=terminal, args=(numero,)) for numero in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert sorted(exitos) == sorted(t["fecha_hora"][0] for t in TURNOS)
+    assert remoto.turnos_disponibles() == []
+
+def test_operacion_desconocida_o_invalida(remoto):
+    with pytest.raises(AttributeError):
+        remoto.borrar_todo
+    with pytest.raises(ErrorServidor):
+        remoto.llamar("borrar_todo")
+    with pytest.raises(ErrorServidor):
+        remoto.reservar(turno=TURNOS[0])
+    # La conexión sigue sirviendo después de un error
+    assert remoto.version() == 0
+
+def test_pedidos_raros_no_cortan_la_conexion(remoto):
+    servidor = ServidorTurnos(ServicioTurnos(list(TURNOS), []))
+    assert "error" in servidor.procesar(5)
+    assert "error" in servidor.procesar(["reservar"])
+    servidor.servicio.turnos_disponibles = lambda: 1 / 0
+    assert "error" in servidor.procesar({"operacion": "turnos_disponibles"})
+
+    # Por la red: la respuesta llega y la conexión sigue sirviendo
+    remoto._conectar()
+    remoto._conexion.sendall(b"5\n")
+    assert json.loads(remoto._archivo.readline()) == {"error": "Pedido inválido: se esperaba un objeto JSON", "id": None}
+    assert remoto.version() == 0
+
+class ConexionCortada:
+    """
+    Conexión falsa que acepta lo enviado y se corta antes de responder.
+    """
+
+    def __init__(self, enviados):
+        self.enviados = enviados
+
+    def sendall(self, linea):
+        self.enviados.append(linea)
+
+    def readline(self):
+        return b""
+
+    def close(self):
+        pass
+
+def test_solo_se_reintentan_las_consultas(monkeypatch):
+    cliente = ServicioRemoto("127.0.0.1:1")
+    enviados = []
+
+    def conectar():
+        cliente._conexion = cliente._archivo = ConexionCortada(enviados)
+    monkeypatch.setattr(cliente, "_conectar", conectar)
+
+    with pytest.raises(ErrorServidor):
+        cliente.version()
+    assert len(enviados) == 2
+
+    enviados.clear()
+    with pytest.raises(ErrorServidor):
+        cliente.reservar(turno=TURNOS[0], nombre="Ana", telefono="1234567890", documento="30111222")
+    assert len(enviados) == 1
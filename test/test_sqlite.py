@@ -0,0 +1,58 @@
+"""
+Tests para el motor de almacenamiento SQLite.
+"""
+
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sistema_turnos.datos import persistencia
+from sistema_turnos.datos.almacen_sqlite import AlmacenSQLite
+
+def _reserva(documento, profesional, estado="Pendiente"):
+    return {
+        "nombre": "Ana",
+        "telefono": "1234567890",
+        "documento": documento,
+        "turno": {"fecha_hora": ["2025-07-01", "09:00"], "profesional": profesional, "servicio": "Semi"},
+        "estado": estado,
+        "montoCobrado": None
+    }
+
+def test_sqlite_guardar_buscar_y_modificar(tmp_path):
+    almacen = AlmacenSQLite(directorio=str(tmp_path))
+    reservas = [_reserva("11111111", "Marisol"), _reserva("22222222", "Gisela")]
+    almacen.guardar("reservas", reservas)
+
+    assert [r["documento"] for r in almacen.buscar("reservas", profesional="MARISOL")] == ["11111111"]
+
+    reservas[1]["estado"] = "Atendida"
+    almacen.registrar("reservas", "modificacion", reservas[1], reservas)
+    atendidas = almacen.buscar("reservas", estado="atendida")
+    assert [r["documento"] for r in atendidas] == ["22222222"]
+
+    almacen.registrar("reservas", "baja", reservas[0], reservas[1:])
+    assert [r["documento"] for r in almacen.cargar("reservas")] == ["22222222"]
+    almacen.cerrar()
+
+def test_sqlite_importa_json_existente(tmp_path):
+    turnos = [{"fecha_hora": ["2025-07-01", "09:00"], "profesional": "Marisol", "servicio": "Kapping"}]
+    with open(tmp_path / "turnos.json", "w", encoding="utf-8") as archivo:
+        json.dump(turnos, archivo)
+
+    almacen = AlmacenSQLite(directorio=str(tmp_path))
+    assert almacen.cargar("turnos") == turnos
+    almacen.cerrar()
+
+def test_consultar_con_motor_configurado(tmp_path):
+    try:
+        persistencia.configurar_almacenamiento("sqlite", directorio=str(tmp_path))
+        persistencia.guardar_reservas([_reserva("11111111", "Marisol"), _reserva("22222222", "Gisela")])
+        assert len(persistencia.consultar("reservas", documento="22222222")) == 1
+
+        persistencia.configurar_almacenamiento("json", directorio=str(tmp_path))
+        persistencia.guardar_reservas([_reserva("11111111", "Marisol")])
+        assert len(persistencia.consultar("reservas", profesional="marisol")) == 1
+    finally:
+        persistencia.configurar_almacenamiento("json")
@@ -0,0 +1,135 @@
+"""
+Tests para las transacciones de atención (logica/transaccion.py).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from sistema_turnos.controlador.manicurista import ControladorManicurista
+from sistema_turnos.datos import persistencia
+from sistema_turnos.logica.atencion import obtener_estadisticas_reservas
+from sistema_turnos.logica.transaccion import Transaccion
+from sistema_turnos.servicio import ServicioTurnos
+from sistema_turnos.utils.indices import ColeccionIndexada
+
+def _reservas(cantidad):
+    return [
+        {
+            "nombre": f"Cliente {numero}", "telefono": "1234567890", "documento": str(30_000_000 + numero),
+            "turno": {"fecha_hora": ["2025-08-01", f"{9 + numero:02d}:00"], "profesional": "Gisela", "servicio": "Semi"},
+            "estado": "Pendiente", "montoCobrado": None
+        }
+        for numero in range(cantidad)
+    ]
+
+@pytest.fixture
+def almacen(tmp_path, monkeypatch):
+    persistencia.configurar_almacenamiento("json", directorio=str(tmp_path))
+    persistencia.guardar_reservas(_reservas(5))
+    escrituras = []
+    original = persistencia.escribir_atomicos
+    monkeypatch.setattr(persistencia, "escribir_atomicos",
+                        lambda tareas, **opciones: escrituras.append(len(tareas)) or original(tareas, **opciones))
+    try:
+        yield escrituras
+    finally:
+        persistencia.configurar_almacenamiento("json")
+
+def test_confirmar_guarda_una_sola_vez(almacen):
+    reservas = ColeccionIndexada("reservas", persistencia.cargar_reservas())
+    with Transaccion(reservas) as transaccion:
+        for reserva in list(reservas)[:4]:
+            assert transaccion.marcar_como_atendida(reserva)["exito"]
+            assert transaccion.cambiar_monto_cobrado(reserva, "4500")["exito"]
+        assert transaccion.marcar_como_no_asistio(list(reservas)[4])["exito"]
+        # Los cambios ya se ven en memoria, pero todavía no se guardaron
+        assert obtener_estadisticas_reservas(reservas)["atendidas"] == 4
+        assert almacen == []
+
+    assert transaccion.resultado == {"exito": True, "cambios": 5}
+    assert almacen == [1]
+    guardadas = persistencia.cargar_reservas()
+    assert [r["estado"] for r in guardadas] == ["Atendida"] * 4 + ["No asistió"]
+    assert all(r["montoCobrado"] == 4500 for r in guardadas[:4])
+
+def test_operacion_invalida_deshace_todo(almacen):
+    reservas = ColeccionIndexada("reservas", persistencia.cargar_reservas())
+    primera, segunda = list(reservas)[:2]
+    with Transaccion(reservas) as transaccion:
+        assert transaccion.marcar_como_atendida(primera)["exito"]
+        assert transaccion.cambiar_monto_cobrado(primera, "4500")["exito"]
+        resultado = transaccion.cambiar_monto_cobrado(segunda, "-10")
+        assert resultado == {"exito": False, "error": "El monto no puede ser negativo."}
+
+    assert transaccion.resultado["exito"] is False
+    assert almacen == []
+    assert primera["estado"] == "Pendiente" and primera["montoCobrado"] is None
+    # Los índices y estadísticas vuelven a como estaban
+    assert len(reservas.buscar(estado="Pendiente")) == 5
+    assert obtener_estadisticas_reservas(reservas)["atendidas"] == 0
+
+def test_no_atomica_guarda_lo_valido_y_excepcion_deshace(almacen):
+    reservas = ColeccionIndexada("reservas", persistencia.cargar_reservas())
+    primera, segunda = list(reservas)[:2]
+    with Transaccion(reservas, atomica=False) as transaccion:
+        transaccion.marcar_como_atendida(primera)
+        assert not transaccion.cambiar_monto_cobrado(primera, "abc")["exito"]
+    assert transaccion.resultado == {"exito": True, "cambios": 1}
+    assert persistencia.cargar_reservas()[0]["estado"] == "Atendida"
+
+    with pytest.raises(RuntimeError):
+        with Transaccion(reservas, atomica=False) as transaccion:
+            transaccion.marcar_como_no_asistio(segunda)
+            raise RuntimeError("corte")
+    assert segunda["estado"] == "Pendiente"
+    assert persistencia.cargar_reservas()[1]["estado"] == "Pendiente"
+
+def test_servicio_usa_la_transaccion(almacen):
+    servicio = ServicioTurnos([], persistencia.cargar_reservas())
+    identificadores = [r["id"] for r in servicio.listar_reservas()]
+    with servicio.transaccion(atomica=False):
+        for identificador in identificadores:
+            assert servicio.marcar_como_atendida(identificador)["exito"]
+            assert servicio.cambiar_monto_cobrado(identificador, 3000)["exito"]
+        assert almacen == []
+    assert almacen == [1]
+    assert servicio.version() == 10
+
+    # Fuera de la transacción cada cambio se guarda enseguida
+    servicio.marcar_como_no_asistio(identificadores[0])
+    assert almacen == [1, 1]
+
+def test_grupo_con_escritura_diferida(tmp_path):
+    persistencia.configurar_almacenamiento("json", diferido=True, directorio=str(tmp_path))
+    try:
+        servicio = ServicioTurnos([], _reservas(3))
+        with servicio.transaccion():
+            for reserva in servicio.listar_reservas():
+                servicio.marcar_como_atendida(reserva)
+        persistencia.vaciar_escrituras()
+        assert [r["estado"] for r in persistencia.cargar_reservas()] == ["Atendida"] * 3
+    finally:
+        persistencia.configurar_almacenamiento("json")
+
+class InterfazCortada:
+    """
+    Interfaz falsa: atiende la primera reserva de la lista y después se corta (Ctrl-C).
+    """
+
+    def mostrar_lista_reservas_navegable(self, reservas, nota=None):
+        if len(reservas) < 5:
+            raise KeyboardInterrupt
+        return reservas[0]
+
+    def mostrar_opciones_reserva(self, reserva, servicio):
+        servicio.marcar_como_atendida(reserva=reserva)
+
+def test_pantalla_de_pendientes_guarda_cada_cambio(almacen):
+    servicio = ServicioTurnos([], persistencia.cargar_reservas())
+    with pytest.raises(KeyboardInterrupt):
+        ControladorManicurista(InterfazCortada(), servicio).gestionar_reservas_pendientes()
+    # Lo marcado antes del corte quedó guardado
+    assert [r["estado"] for r in persistencia.cargar_reservas()][0] == "Atendida"